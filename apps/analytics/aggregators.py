@@ -4,23 +4,180 @@ Data aggregators for analytics app.
 Aggregators compute statistics and metrics from database models.
 They provide reusable business logic for data analysis and visualization.
 
+Per-project execution totals and per-department student counts are read
+from the database views v_project_execution_rate and
+v_department_student_stats (see ProjectExecutionRate and
+DepartmentStudentStats), so they are computed in one scan by the database.
+Percentages are still quantized in Python (ROUND_HALF_EVEN) from the
+view totals, because PostgreSQL ROUND rounds half away from zero. Per-row
+rates are computed for the whole result in one NumPy pass on exact
+integers (see _percentages).
+
+Per-author counts and co-authorship queries read the author index
+(authors / publication_authors, see apps.analytics.authors) instead of
+splitting Publication.co_authors.
+
+Dashboard tiles (distinct department count, top first authors) can be
+answered approximately from HyperLogLog / Count-Min sketches stored per
+upload (see apps.analytics.sketches for the error bounds). With
+approximate (default: the ANALYTICS_APPROXIMATE_TILES setting) those
+methods read the sketches; approximate=False always runs the exact query.
+
+Publication and execution trends are served from the monthly rollup
+tables (see apps.analytics.rollups). With use_rollups (default: the
+ANALYTICS_USE_ROLLUPS setting) the existing publication/execution methods
+also read the rollups whenever their filters are rollup dimensions.
+
+Counts, sums and averages over whole tables can be answered in process
+from columnar snapshots (see apps.analytics.columnar) instead of the
+database. With columnar (default: the ANALYTICS_COLUMNAR_SNAPSHOTS
+setting) those methods use the snapshot of their data type while it is
+current, and the queries below (including rollups) otherwise. Results
+are the same either way.
+
+Aggregators take the PermissionScope of the requesting user (scope;
+default unrestricted) and restrict every query to its departments, so
+ANALYTICS_DEPARTMENT_SCOPING holds without row-level security. Sketches
+and columnar snapshots cover all departments, so restricted scopes always
+run the (scoped) queries.
+
 Classes:
 - DepartmentKPIAggregator: Department KPI metrics
 - PublicationAggregator: Publication statistics
 - ResearchBudgetAggregator: Research budget and execution analysis
 - StudentAggregator: Student enrollment and demographics
 """
-from django.db.models import Count, Sum, Avg, Q, F
-from django.db.models.functions import Coalesce
+from django.conf import settings
+from django.db.models import Count, Sum, Avg, F, Q
+from django.db.models.functions import Coalesce, ExtractYear, Greatest, Least, TruncQuarter
 from decimal import Decimal
 
+import numpy as np
+
 from apps.analytics.models import (
     DepartmentKPI,
     Publication,
-    ResearchProject,
     ExecutionRecord,
-    Student
+    Student,
+    ProjectExecutionRate,
+    DepartmentStudentStats,
+    PublicationRollup,
+    ExecutionRollup,
+    PublicationAuthor,
 )
+from apps.analytics.authors import normalize_author_name
+from apps.analytics.columnar import decimal_value, get_snapshot
+from apps.analytics.filters import PermissionScope, filter_by_year
+from apps.analytics.sketches import estimate_distinct, estimate_top
+
+TREND_GRANULARITIES = ('year', 'quarter', 'month')
+
+RATE_SCALE = 10000  # part / total * 100, in hundredths
+HUNDREDTH = Decimal('0.01')
+
+
+def _percentage(part, total):
+    """Return part / total * 100 quantized to 0.01, or 0.00 if total is 0."""
+    if not total or total <= 0:
+        return Decimal('0.00')
+    return (Decimal(part) / Decimal(total) * 100).quantize(Decimal('0.01'))
+
+
+def _amounts(values):
+    """Integer amounts (None as 0) as int64, or Python ints if too large."""
+    values = [value or 0 for value in values]
+    try:
+        return np.array(values, dtype=np.int64)
+    except OverflowError:
+        return np.array([int(value) for value in values], dtype=object)
+
+
+def _percentages(parts, totals):
+    """
+    Return _percentage(part, total) for each pair of integer amounts.
+
+    part * 10000 / total is rounded half to even with integer division, so
+    the results equal _percentage's without a Decimal division per row
+    (amounts are BIGINT, far below the 28 digits where Decimal's own
+    rounding could differ). int64 is used when part * 10000 cannot
+    overflow, Python ints otherwise.
+    """
+    parts = _amounts(parts)
+    totals = _amounts(totals)
+    if not len(parts):
+        return []
+
+    limit = np.iinfo(np.int64).max // RATE_SCALE
+    if parts.dtype == object or totals.dtype == object or max(abs(parts).max(), abs(totals).max()) > limit:
+        parts = parts.astype(object)
+        totals = totals.astype(object)
+
+    positive = totals > 0
+    divisors = np.where(positive, totals, 1)
+    scaled = parts * RATE_SCALE
+    quotient = scaled // divisors
+    twice_remainder = scaled % divisors * 2
+    round_up = (twice_remainder > divisors) | ((twice_remainder == divisors) & (quotient % 2 == 1))
+    hundredths = np.where(positive, quotient + round_up.astype(np.int64), 0)
+    return [HUNDREDTH * value for value in hundredths.tolist()]
+
+
+def _average(total, count):
+    """Return total / count quantized to 0.01, or None if count is 0."""
+    if not count:
+        return None
+    return (Decimal(total) / Decimal(count)).quantize(Decimal('0.01'))
+
+
+def _use_rollups(use_rollups):
+    """Resolve an aggregator's use_rollups argument against the setting."""
+    if use_rollups is None:
+        return getattr(settings, 'ANALYTICS_USE_ROLLUPS', False)
+    return use_rollups
+
+
+def _resolve_scope(scope):
+    """Resolve an aggregator's scope argument (None: unrestricted)."""
+    return PermissionScope() if scope is None else scope
+
+
+def _scoped(scope, model):
+    """All rows of a model visible to a scope."""
+    return scope.filter(model.objects.all())
+
+
+def _use_sketches(approximate):
+    """Resolve an aggregator's approximate argument against the setting."""
+    if approximate is None:
+        return getattr(settings, 'ANALYTICS_APPROXIMATE_TILES', False)
+    return approximate
+
+
+def _use_columnar(columnar):
+    """Resolve an aggregator's columnar argument against the setting."""
+    if columnar is None:
+        return getattr(settings, 'ANALYTICS_COLUMNAR_SNAPSHOTS', False)
+    return columnar
+
+
+def _rollup_periods(queryset, granularity):
+    """
+    Annotate rollup rows with their trend period.
+
+    year -> int, quarter/month -> first day of the period (date).
+
+    Raises:
+        ValueError: If granularity is not year, quarter or month
+    """
+    if granularity == 'year':
+        return queryset.annotate(period=ExtractYear('period_month'))
+    if granularity == 'quarter':
+        return queryset.annotate(period=TruncQuarter('period_month'))
+    if granularity == 'month':
+        return queryset.annotate(period=F('period_month'))
+    raise ValueError(
+        f"Unsupported granularity '{granularity}'. Available: {', '.join(TREND_GRANULARITIES)}"
+    )
 
 
 class DepartmentKPIAggregator:
@@ -32,8 +189,26 @@ class DepartmentKPIAggregator:
     - get_kpi_by_department: Get KPI for specific departments
     - get_kpi_trend_by_year: Analyze KPI trends over years
     - get_kpi_by_college: Get all KPIs for a college
+    - get_department_count: Number of departments (approximate for tiles)
     """
 
+    def __init__(self, approximate=None, columnar=None, scope=None):
+        """
+        Args:
+            approximate (bool, optional): Answer tile methods from sketches
+                when built (default: ANALYTICS_APPROXIMATE_TILES setting)
+            columnar (bool, optional): Answer from the in-process snapshot
+                when current (default: ANALYTICS_COLUMNAR_SNAPSHOTS setting)
+            scope (PermissionScope, optional): Departments visible to the
+                caller (default: unrestricted)
+        """
+        self.scope = _resolve_scope(scope)
+        self.approximate = _use_sketches(approximate) and self.scope.unrestricted
+        self.columnar = _use_columnar(columnar) and self.scope.unrestricted
+
+    def _snapshot(self):
+        return get_snapshot('department_kpi') if self.columnar else None
+
     def get_average_employment_rate(self, year=None):
         """
         Calculate average employment rate.
@@ -44,7 +219,14 @@ class DepartmentKPIAggregator:
         Returns:
             Decimal: Average employment rate, or None if no data
         """
-        queryset = DepartmentKPI.objects.all()
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            table = snapshot['department_kpi']
+            if year:
+                table = table.where('evaluation_year', year)
+            return _average(decimal_value(table.sum('employment_rate')), table.count('employment_rate'))
+
+        queryset = _scoped(self.scope, DepartmentKPI)
 
         if year:
             queryset = queryset.filter(evaluation_year=year)
@@ -69,7 +251,7 @@ class DepartmentKPIAggregator:
         Returns:
             QuerySet: Department KPI records
         """
-        queryset = DepartmentKPI.objects.filter(department__in=departments)
+        queryset = _scoped(self.scope, DepartmentKPI).filter(department__in=departments)
 
         if year:
             queryset = queryset.filter(evaluation_year=year)
@@ -87,7 +269,7 @@ class DepartmentKPIAggregator:
         Returns:
             QuerySet: KPI records ordered by year (DESC)
         """
-        return DepartmentKPI.objects.filter(
+        return _scoped(self.scope, DepartmentKPI).filter(
             department=department,
             evaluation_year__in=years
         ).order_by('-evaluation_year')
@@ -103,13 +285,32 @@ class DepartmentKPIAggregator:
         Returns:
             QuerySet: Department KPI records for the college
         """
-        queryset = DepartmentKPI.objects.filter(college=college)
+        queryset = _scoped(self.scope, DepartmentKPI).filter(college=college)
 
         if year:
             queryset = queryset.filter(evaluation_year=year)
 
         return queryset.order_by('department')
 
+    def get_department_count(self):
+        """
+        Count distinct departments with KPI data.
+
+        Returns:
+            int: Number of departments (a HyperLogLog estimate when
+            approximate and the sketch exists, exact otherwise)
+        """
+        if self.approximate:
+            estimate = estimate_distinct('department_kpi.department')
+            if estimate is not None:
+                return estimate
+
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot['department_kpi'].distinct_count('department')
+
+        return _scoped(self.scope, DepartmentKPI).values('department').distinct().count()
+
 
 class PublicationAggregator:
     """
@@ -120,8 +321,33 @@ class PublicationAggregator:
     - get_publications_by_journal_grade: Distribution by journal grade
     - get_average_impact_factor: Average impact factor
     - get_publications_by_first_author: Publication count by author
+    - get_publications_by_author: Publication count by author incl. co-authorship
+    - get_author_publications: Publications of one author
+    - get_collaboration_edges: Co-authorship network edges
+    - get_department_collaboration_matrix: Co-authorship between departments
+    - get_publication_trend: Publication counts per period (rollups)
     """
 
+    def __init__(self, use_rollups=None, approximate=None, columnar=None, scope=None):
+        """
+        Args:
+            use_rollups (bool, optional): Answer from publication_rollups
+                when possible (default: ANALYTICS_USE_ROLLUPS setting)
+            approximate (bool, optional): Answer tile methods from sketches
+                when built (default: ANALYTICS_APPROXIMATE_TILES setting)
+            columnar (bool, optional): Answer from the in-process snapshot
+                when current (default: ANALYTICS_COLUMNAR_SNAPSHOTS setting)
+            scope (PermissionScope, optional): Departments visible to the
+                caller (default: unrestricted)
+        """
+        self.scope = _resolve_scope(scope)
+        self.use_rollups = _use_rollups(use_rollups)
+        self.approximate = _use_sketches(approximate) and self.scope.unrestricted
+        self.columnar = _use_columnar(columnar) and self.scope.unrestricted
+
+    def _snapshot(self):
+        return get_snapshot('publication') if self.columnar else None
+
     def get_total_publication_count(self, department=None, year=None):
         """
         Get total publication count.
@@ -133,14 +359,30 @@ class PublicationAggregator:
         Returns:
             int: Total publication count
         """
-        queryset = Publication.objects.all()
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            table = snapshot['publications']
+            if department:
+                table = table.where('department', department)
+            if year:
+                table = table.where('publication_date', year)
+            return len(table)
+
+        if self.use_rollups:
+            queryset = _scoped(self.scope, PublicationRollup)
+            date_field = 'period_month'
+        else:
+            queryset = _scoped(self.scope, Publication)
+            date_field = 'publication_date'
 
         if department:
             queryset = queryset.filter(department=department)
 
         if year:
-            queryset = queryset.filter(publication_date__year=year)
+            queryset = filter_by_year(queryset, date_field, year)
 
+        if self.use_rollups:
+            return queryset.aggregate(total=Coalesce(Sum('publication_count'), 0))['total']
         return queryset.count()
 
     def get_publications_by_journal_grade(self):
@@ -150,7 +392,18 @@ class PublicationAggregator:
         Returns:
             dict: Journal grade -> count mapping
         """
-        result = Publication.objects.values('journal_grade').annotate(
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot['publications'].group_count('journal_grade')
+
+        if self.use_rollups:
+            result = _scoped(self.scope, PublicationRollup).values('journal_grade').annotate(
+                count=Sum('publication_count')
+            )
+            # Rollups store a missing grade as ''
+            return {item['journal_grade'] or None: item['count'] for item in result}
+
+        result = _scoped(self.scope, Publication).values('journal_grade').annotate(
             count=Count('id')
         )
 
@@ -166,7 +419,24 @@ class PublicationAggregator:
         Returns:
             Decimal: Average impact factor, or None if no data
         """
-        queryset = Publication.objects.exclude(impact_factor__isnull=True)
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            table = snapshot['publications']
+            if journal_grade:
+                table = table.where('journal_grade', journal_grade)
+            return _average(decimal_value(table.sum('impact_factor')), table.count('impact_factor'))
+
+        if self.use_rollups:
+            queryset = _scoped(self.scope, PublicationRollup)
+            if journal_grade:
+                queryset = queryset.filter(journal_grade=journal_grade)
+            result = queryset.aggregate(
+                total=Sum('impact_factor_sum'),
+                count=Sum('impact_factor_count')
+            )
+            return _average(result['total'], result['count'])
+
+        queryset = _scoped(self.scope, Publication).exclude(impact_factor__isnull=True)
 
         if journal_grade:
             queryset = queryset.filter(journal_grade=journal_grade)
@@ -186,14 +456,193 @@ class PublicationAggregator:
             limit (int): Maximum number of authors to return
 
         Returns:
-            list: List of dicts with 'first_author' and 'count'
-        """
-        result = Publication.objects.values('first_author').annotate(
+            list: List of dicts with 'first_author' and 'count' (Count-Min
+            estimates, never below the true count, when approximate and
+            the sketch exists)
+        """
+        if self.approximate:
+            top = estimate_top('publication.first_author', limit)
+            if top is not None:
+                return [{'first_author': author, 'count': count} for author, count in top]
+
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            # Ties, which the query leaves in database order, are ordered by name
+            counts = snapshot['publications'].group_count('first_author')
+            top = sorted(counts.items(), key=lambda item: (-item[1], item[0]))[:limit]
+            return [{'first_author': author, 'count': count} for author, count in top]
+
+        result = _scoped(self.scope, Publication).values('first_author').annotate(
             count=Count('id')
         ).order_by('-count')[:limit]
 
         return list(result)
 
+    def get_publications_by_author(self, department=None, limit=10):
+        """
+        Get publication count by author, counting co-authorships too.
+
+        Args:
+            department (str, optional): Filter by author department
+            limit (int): Maximum number of authors to return
+
+        Returns:
+            list: Dicts with 'author', 'department', 'count' and
+            'first_author_count', most publications first
+        """
+        authorships = _scoped(self.scope, PublicationAuthor)
+        if department:
+            authorships = authorships.filter(author__department=department)
+
+        result = authorships.values('author__name', 'author__department').annotate(
+            count=Count('id'),
+            first_author_count=Count('id', filter=Q(position=0)),
+        ).order_by('-count', 'author__name')[:limit]
+
+        return [
+            {
+                'department': item['author__department'],
+                'author': item['author__name'],
+                'count': item['count'],
+                'first_author_count': item['first_author_count'],
+            }
+            for item in result
+        ]
+
+    def get_author_publications(self, author):
+        """
+        Get the publications of an author (first author or co-author).
+
+        Args:
+            author (str): Author name
+
+        Returns:
+            list: Dicts with 'publication_id', 'title', 'publication_date',
+            'journal_name', 'journal_grade' and 'position' (0 = first
+            author), newest first
+        """
+        result = _scoped(self.scope, Publication).filter(
+            authorships__author__name=normalize_author_name(author)
+        ).values(
+            'publication_id',
+            'title',
+            'publication_date',
+            'journal_name',
+            'journal_grade',
+            position=F('authorships__position'),
+        ).order_by('-publication_date', 'publication_id')
+
+        return list(result)
+
+    def get_collaboration_edges(self, department=None, min_count=1, limit=None):
+        """
+        Get co-authorship network edges.
+
+        Each pair of authors on the same publication is one edge; its count
+        is the number of publications they share.
+
+        Args:
+            department (str, optional): Only edges with an author in this department
+            min_count (int): Minimum number of shared publications
+            limit (int, optional): Maximum number of edges to return
+
+        Returns:
+            list: Dicts with 'source', 'target' (author names) and 'count',
+            strongest edges first
+        """
+        # Self-join through the shared publication; a single filter() call so
+        # both conditions apply to the same co-author row
+        conditions = Q(publication__authorships__author_id__gt=F('author_id'))
+        if department:
+            conditions &= (
+                Q(author__department=department)
+                | Q(publication__authorships__author__department=department)
+            )
+
+        result = _scoped(self.scope, PublicationAuthor).filter(conditions).values(
+            source=F('author__name'),
+            target=F('publication__authorships__author__name'),
+        ).annotate(
+            count=Count('publication_id'),
+        ).filter(count__gte=min_count).order_by('-count', 'source', 'target')
+
+        if limit is not None:
+            result = result[:limit]
+        return list(result)
+
+    def get_department_collaboration_matrix(self):
+        """
+        Get the number of co-authored publications between departments.
+
+        Authors are placed in their department (see Author.department);
+        authors without one are left out. The diagonal counts publications
+        with two or more authors from the same department.
+
+        Returns:
+            dict: 'departments' (sorted names) and 'matrix', a symmetric
+            list of rows of publication counts in department order
+        """
+        # One row per department pair (ordered so each pair appears once)
+        pairs = _scoped(self.scope, PublicationAuthor).filter(
+            publication__authorships__author_id__gt=F('author_id'),
+            author__department__isnull=False,
+            publication__authorships__author__department__isnull=False,
+        ).annotate(
+            source=Least('author__department', 'publication__authorships__author__department'),
+            target=Greatest('author__department', 'publication__authorships__author__department'),
+        ).values('source', 'target').annotate(
+            count=Count('publication_id', distinct=True)
+        ).order_by()
+
+        counts = {(pair['source'], pair['target']): pair['count'] for pair in pairs}
+        departments = sorted({department for pair in counts for department in pair})
+        positions = {department: i for i, department in enumerate(departments)}
+        matrix = [[0] * len(departments) for _ in departments]
+        for (source, target), count in counts.items():
+            matrix[positions[source]][positions[target]] = count
+            matrix[positions[target]][positions[source]] = count
+
+        return {'departments': departments, 'matrix': matrix}
+
+    def get_publication_trend(self, granularity='year', department=None, college=None,
+                              journal_grade=None):
+        """
+        Get publication counts per period from publication_rollups.
+
+        Args:
+            granularity (str): 'year', 'quarter' or 'month'
+            department (str, optional): Filter by department
+            college (str, optional): Filter by college
+            journal_grade (str, optional): Filter by journal grade
+
+        Returns:
+            list: Dicts with 'period' (year int, or first day of the
+            quarter/month), 'count' and 'average_impact_factor', in period order
+        """
+        queryset = _scoped(self.scope, PublicationRollup)
+
+        if department:
+            queryset = queryset.filter(department=department)
+        if college:
+            queryset = queryset.filter(college=college)
+        if journal_grade:
+            queryset = queryset.filter(journal_grade=journal_grade)
+
+        periods = _rollup_periods(queryset, granularity).values('period').annotate(
+            count=Sum('publication_count'),
+            impact_factor_sum=Sum('impact_factor_sum'),
+            impact_factor_count=Sum('impact_factor_count')
+        ).order_by('period')
+
+        return [
+            {
+                'period': item['period'],
+                'count': item['count'],
+                'average_impact_factor': _average(item['impact_factor_sum'], item['impact_factor_count'])
+            }
+            for item in periods
+        ]
+
 
 class ResearchBudgetAggregator:
     """
@@ -204,8 +653,26 @@ class ResearchBudgetAggregator:
     - get_budget_by_department: Budget aggregation by department
     - get_execution_by_category: Execution amount by category
     - get_execution_rate_by_project: Execution rate per project
+    - get_execution_trend: Execution amount per period and category (rollups)
     """
 
+    def __init__(self, use_rollups=None, columnar=None, scope=None):
+        """
+        Args:
+            use_rollups (bool, optional): Answer from execution_rollups
+                when possible (default: ANALYTICS_USE_ROLLUPS setting)
+            columnar (bool, optional): Answer from the in-process snapshot
+                when current (default: ANALYTICS_COLUMNAR_SNAPSHOTS setting)
+            scope (PermissionScope, optional): Departments visible to the
+                caller (default: unrestricted)
+        """
+        self.scope = _resolve_scope(scope)
+        self.use_rollups = _use_rollups(use_rollups)
+        self.columnar = _use_columnar(columnar) and self.scope.unrestricted
+
+    def _snapshot(self):
+        return get_snapshot('research_budget') if self.columnar else None
+
     def get_total_budget_and_execution(self):
         """
         Calculate total budget and execution.
@@ -217,27 +684,24 @@ class ResearchBudgetAggregator:
                 'execution_rate': Decimal
             }
         """
-        budget_result = ResearchProject.objects.aggregate(
-            total_budget=Coalesce(Sum('total_budget'), 0)
-        )
-
-        execution_result = ExecutionRecord.objects.aggregate(
-            total_executed=Coalesce(Sum('amount'), 0)
-        )
-
-        total_budget = budget_result['total_budget']
-        total_executed = execution_result['total_executed']
-
-        if total_budget > 0:
-            execution_rate = Decimal(total_executed) / Decimal(total_budget) * 100
-            execution_rate = execution_rate.quantize(Decimal('0.01'))
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            projects = snapshot['research_projects']
+            total_budget = projects.sum('total_budget')
+            total_executed = projects.sum('total_executed')
         else:
-            execution_rate = Decimal('0.00')
+            result = _scoped(self.scope, ProjectExecutionRate).aggregate(
+                total_budget=Coalesce(Sum('total_budget'), 0),
+                total_executed=Coalesce(Sum('total_executed'), 0)
+            )
+
+            total_budget = result['total_budget']
+            total_executed = result['total_executed']
 
         return {
             'total_budget': total_budget,
             'total_executed': total_executed,
-            'execution_rate': execution_rate
+            'execution_rate': _percentage(total_executed, total_budget)
         }
 
     def get_budget_by_department(self):
@@ -247,44 +711,31 @@ class ResearchBudgetAggregator:
         Returns:
             list: List of dicts with department, budget, and execution data
         """
-        # Aggregate budget by department
-        projects = ResearchProject.objects.values('department').annotate(
-            total_budget=Sum('total_budget')
-        )
-
-        # Create department -> budget mapping
-        dept_budgets = {p['department']: p['total_budget'] for p in projects}
-
-        # Aggregate execution by department via project FK
-        executions = ExecutionRecord.objects.values(
-            'project__department'
-        ).annotate(
-            total_executed=Sum('amount')
-        )
-
-        # Create department -> execution mapping
-        dept_executions = {
-            e['project__department']: e['total_executed']
-            for e in executions
-        }
-
-        # Combine results
-        result = []
-        for dept, budget in dept_budgets.items():
-            executed = dept_executions.get(dept, 0)
-            execution_rate = Decimal('0.00')
-            if budget > 0:
-                execution_rate = Decimal(executed) / Decimal(budget) * 100
-                execution_rate = execution_rate.quantize(Decimal('0.01'))
-
-            result.append({
-                'department': dept,
-                'total_budget': budget,
-                'total_executed': executed,
-                'execution_rate': execution_rate
-            })
-
-        return result
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            # Departments in code point order (PostgreSQL's C collation)
+            projects = snapshot['research_projects']
+            budgets = projects.group_sum('department', 'total_budget')
+            executed = projects.group_sum('department', 'total_executed')
+            rows = [(department, budgets[department], executed[department]) for department in sorted(budgets)]
+        else:
+            departments = _scoped(self.scope, ProjectExecutionRate).values('department').annotate(
+                total_budget=Sum('total_budget'),
+                total_executed=Sum('total_executed')
+            ).order_by('department')
+
+            rows = list(departments.values_list('department', 'total_budget', 'total_executed'))
+        rates = _percentages([row[2] for row in rows], [row[1] for row in rows])
+
+        return [
+            {
+                'department': department,
+                'total_budget': total_budget,
+                'total_executed': total_executed,
+                'execution_rate': rate
+            }
+            for (department, total_budget, total_executed), rate in zip(rows, rates)
+        ]
 
     def get_execution_by_category(self):
         """
@@ -293,9 +744,18 @@ class ResearchBudgetAggregator:
         Returns:
             dict: Category -> total amount mapping
         """
-        result = ExecutionRecord.objects.values('expense_category').annotate(
-            total_amount=Sum('amount')
-        )
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot['execution_records'].group_sum('expense_category', 'amount')
+
+        if self.use_rollups:
+            result = _scoped(self.scope, ExecutionRollup).values('expense_category').annotate(
+                total_amount=Sum('amount_sum')
+            )
+        else:
+            result = _scoped(self.scope, ExecutionRecord).values('expense_category').annotate(
+                total_amount=Sum('amount')
+            )
 
         return {item['expense_category']: item['total_amount'] for item in result}
 
@@ -306,36 +766,63 @@ class ResearchBudgetAggregator:
         Returns:
             list: List of dicts with project info and execution rate
         """
-        # Get all projects with their execution sums
-        projects = ResearchProject.objects.annotate(
-            total_executed=Coalesce(Sum('execution_records__amount'), 0)
-        ).values(
-            'project_number',
-            'project_name',
-            'total_budget',
-            'total_executed'
-        )
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            projects = snapshot['research_projects']  # In id order
+            rows = list(zip(*(
+                projects.values(column)
+                for column in ('project_number', 'project_name', 'total_budget', 'total_executed')
+            )))
+        else:
+            rows = list(_scoped(self.scope, ProjectExecutionRate).values_list(
+                'project_number',
+                'project_name',
+                'total_budget',
+                'total_executed'
+            ).order_by('id'))
+        rates = _percentages([row[3] for row in rows], [row[2] for row in rows])
+
+        return [
+            {
+                'project_number': project_number,
+                'project_name': project_name,
+                'total_budget': total_budget,
+                'total_executed': total_executed,
+                'execution_rate': rate
+            }
+            for (project_number, project_name, total_budget, total_executed), rate in zip(rows, rates)
+        ]
 
-        result = []
-        for project in projects:
-            budget = project['total_budget']
-            executed = project['total_executed']
+    def get_execution_trend(self, granularity='month', department=None, expense_category=None,
+                            year=None):
+        """
+        Get execution amount per period and expense category from execution_rollups.
 
-            if budget > 0:
-                execution_rate = Decimal(executed) / Decimal(budget) * 100
-                execution_rate = execution_rate.quantize(Decimal('0.01'))
-            else:
-                execution_rate = Decimal('0.00')
+        Args:
+            granularity (str): 'year', 'quarter' or 'month'
+            department (str, optional): Filter by project department
+            expense_category (str, optional): Filter by expense category
+            year (int, optional): Filter by execution year
 
-            result.append({
-                'project_number': project['project_number'],
-                'project_name': project['project_name'],
-                'total_budget': budget,
-                'total_executed': executed,
-                'execution_rate': execution_rate
-            })
+        Returns:
+            list: Dicts with 'period', 'expense_category', 'total_amount'
+            and 'record_count', ordered by period then category
+        """
+        queryset = _scoped(self.scope, ExecutionRollup)
+
+        if department:
+            queryset = queryset.filter(department=department)
+        if expense_category:
+            queryset = queryset.filter(expense_category=expense_category)
+        if year:
+            queryset = filter_by_year(queryset, 'period_month', year)
 
-        return result
+        return list(
+            _rollup_periods(queryset, granularity).values('period', 'expense_category').annotate(
+                total_amount=Sum('amount_sum'),
+                record_count=Sum('record_count')
+            ).order_by('period', 'expense_category')
+        )
 
 
 class StudentAggregator:
@@ -350,6 +837,20 @@ class StudentAggregator:
     - get_students_by_program_type: Student distribution by program type
     """
 
+    def __init__(self, columnar=None, scope=None):
+        """
+        Args:
+            columnar (bool, optional): Answer from the in-process snapshot
+                when current (default: ANALYTICS_COLUMNAR_SNAPSHOTS setting)
+            scope (PermissionScope, optional): Departments visible to the
+                caller (default: unrestricted)
+        """
+        self.scope = _resolve_scope(scope)
+        self.columnar = _use_columnar(columnar) and self.scope.unrestricted
+
+    def _snapshot(self):
+        return get_snapshot('student') if self.columnar else None
+
     def get_total_students_and_enrollment_rate(self, department=None):
         """
         Calculate total students and enrollment rate.
@@ -364,24 +865,27 @@ class StudentAggregator:
                 'enrollment_rate': Decimal
             }
         """
-        queryset = Student.objects.all()
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            students = snapshot['students']
+            if department:
+                students = students.where('department', department)
+            result = {'total': len(students), 'enrolled': len(students.where('enrollment_status', '재학'))}
+        else:
+            queryset = _scoped(self.scope, DepartmentStudentStats)
 
-        if department:
-            queryset = queryset.filter(department=department)
+            if department:
+                queryset = queryset.filter(department=department)
 
-        total = queryset.count()
-        enrolled = queryset.filter(enrollment_status='재학').count()
-
-        if total > 0:
-            enrollment_rate = Decimal(enrolled) / Decimal(total) * 100
-            enrollment_rate = enrollment_rate.quantize(Decimal('0.01'))
-        else:
-            enrollment_rate = Decimal('0.00')
+            result = queryset.aggregate(
+                total=Coalesce(Sum('total_students'), 0),
+                enrolled=Coalesce(Sum('enrolled_students'), 0)
+            )
 
         return {
-            'total_students': total,
-            'enrolled_students': enrolled,
-            'enrollment_rate': enrollment_rate
+            'total_students': result['total'],
+            'enrolled_students': result['enrolled'],
+            'enrollment_rate': _percentage(result['enrolled'], result['total'])
         }
 
     def get_students_by_grade(self):
@@ -391,7 +895,11 @@ class StudentAggregator:
         Returns:
             dict: Grade -> count mapping
         """
-        result = Student.objects.values('grade').annotate(
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot['students'].group_count('grade')
+
+        result = _scoped(self.scope, Student).values('grade').annotate(
             count=Count('id')
         )
 
@@ -404,11 +912,27 @@ class StudentAggregator:
         Returns:
             list: List of dicts with department and student counts
         """
-        result = Student.objects.values('department').annotate(
-            total_students=Count('id'),
-            enrolled_students=Count('id', filter=Q(enrollment_status='재학')),
-            on_leave_students=Count('id', filter=Q(enrollment_status='휴학')),
-            graduated_students=Count('id', filter=Q(enrollment_status='졸업'))
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            students = snapshot['students']
+            totals = students.group_count('department')
+            counts = students.group_count_pairs('department', 'enrollment_status')
+            return [
+                {
+                    'department': department,
+                    'total_students': totals[department],
+                    'enrolled_students': counts.get((department, '재학'), 0),
+                    'on_leave_students': counts.get((department, '휴학'), 0),
+                    'graduated_students': counts.get((department, '졸업'), 0)
+                }
+                for department in sorted(totals)
+            ]
+
+        result = _scoped(self.scope, DepartmentStudentStats).values('department').annotate(
+            total_students=Sum('total_students'),
+            enrolled_students=Sum('enrolled_students'),
+            on_leave_students=Sum('leave_students'),
+            graduated_students=Sum('graduated_students')
         ).order_by('department')
 
         return list(result)
@@ -423,7 +947,14 @@ class StudentAggregator:
         Returns:
             dict: Year -> count mapping
         """
-        queryset = Student.objects.all()
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            students = snapshot['students']
+            if years:
+                students = students.where_in('admission_year', years)
+            return students.group_count('admission_year')
+
+        queryset = _scoped(self.scope, Student)
 
         if years:
             queryset = queryset.filter(admission_year__in=years)
@@ -441,7 +972,11 @@ class StudentAggregator:
         Returns:
             dict: Program type -> count mapping
         """
-        result = Student.objects.values('program_type').annotate(
+        snapshot = self._snapshot()
+        if snapshot is not None:
+            return snapshot['students'].group_count('program_type')
+
+        result = _scoped(self.scope, Student).values('program_type').annotate(
             count=Count('id')
         )
 
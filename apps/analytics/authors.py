@@ -0,0 +1,182 @@
+"""
+Author index built from Publication.first_author / co_authors.
+
+co_authors is a semicolon separated TEXT field, so "papers by this
+researcher" and collaboration queries would have to split every row.
+Uploads instead normalize the names into the authors table and link them
+to their publications in publication_authors (position 0 = first author).
+
+Names are normalized like the backfill in
+supabase/migrations/20261019000500_publication_authors.sql: surrounding
+whitespace stripped, inner whitespace collapsed, at most 100 characters.
+
+    >>> index_publication_authors(publications)  # After inserting them
+    >>> rebuild_author_index()  # Backfill / repair everything
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+
+from apps.analytics.models import Author, Publication, PublicationAuthor
+
+
+AUTHOR_BATCH_SIZE = 1000
+AUTHOR_NAME_MAX_LENGTH = 100
+
+
+def normalize_author_name(name: Optional[str]) -> str:
+    """Author name with whitespace collapsed ('' for blank names)."""
+    return ' '.join(str(name or '').split())[:AUTHOR_NAME_MAX_LENGTH]
+
+
+def split_authors(first_author: Optional[str], co_authors: Optional[str]) -> List[Tuple[str, int]]:
+    """
+    Authors of a publication with their position.
+
+    Duplicates keep their first position; blank entries are skipped but
+    still count towards the positions of later co-authors.
+
+    Example:
+        >>> split_authors('김교수', '이교수; ;박교수;김교수')
+        [('김교수', 0), ('이교수', 1), ('박교수', 3)]
+    """
+    names = [(first_author, 0)]
+    if co_authors:
+        names.extend((name, position) for position, name in enumerate(co_authors.split(';'), 1))
+
+    authors = {}
+    for name, position in names:
+        name = normalize_author_name(name)
+        if name and name not in authors:
+            authors[name] = position
+    return list(authors.items())
+
+
+def _batches(items: List, size: int = AUTHOR_BATCH_SIZE) -> Iterable[List]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def get_or_create_authors(names: Iterable[str]) -> Dict[str, int]:
+    """
+    Author ids by name, creating missing authors in bulk.
+
+    Returns:
+        Dict of normalized name -> Author id
+    """
+    names = sorted(set(names))
+    ids = {}
+    for batch in _batches(names):
+        ids.update(Author.objects.filter(name__in=batch).values_list('name', 'id'))
+
+    missing = [name for name in names if name not in ids]
+    if missing:
+        Author.objects.bulk_create(
+            [Author(name=name) for name in missing],
+            batch_size=AUTHOR_BATCH_SIZE,
+            ignore_conflicts=True,
+        )
+        for batch in _batches(missing):
+            ids.update(Author.objects.filter(name__in=batch).values_list('name', 'id'))
+    return ids
+
+
+def refresh_author_departments(author_ids: Iterable[int]) -> int:
+    """
+    Set authors' department from their latest first-authored publication.
+
+    Authors without a first-authored publication left get None.
+
+    Returns:
+        Number of authors updated
+    """
+    updated = 0
+    for batch in _batches(sorted(set(author_ids))):
+        latest = {}
+        first_authorships = (
+            PublicationAuthor.objects.filter(author_id__in=batch, position=0)
+            .order_by('author_id', '-publication__publication_date', '-publication_id')
+            .values_list('author_id', 'publication__department')
+        )
+        for author_id, department in first_authorships:
+            latest.setdefault(author_id, department)
+
+        by_department: Dict[str, List[int]] = {}
+        for author_id, department in latest.items():
+            by_department.setdefault(department, []).append(author_id)
+        for department, ids in by_department.items():
+            updated += Author.objects.filter(pk__in=ids).exclude(department=department).update(
+                department=department
+            )
+        updated += Author.objects.filter(pk__in=batch, department__isnull=False).exclude(
+            pk__in=list(latest)
+        ).update(department=None)
+    return updated
+
+
+def index_publication_authors(publications: Iterable[Publication]) -> int:
+    """
+    (Re)build the author links of saved publications.
+
+    Existing links of the publications are replaced. Publications without
+    a primary key (bulk_create on a database that does not return ids) are
+    looked up by publication_id.
+
+    Returns:
+        Number of publication_authors rows written
+    """
+    publications = list(publications)
+    missing = [publication.publication_id for publication in publications if publication.pk is None]
+    pks = {}
+    for batch in _batches(missing):
+        pks.update(Publication.objects.filter(publication_id__in=batch).values_list('publication_id', 'id'))
+
+    entries = []
+    for publication in publications:
+        pk = publication.pk or pks.get(publication.publication_id)
+        if pk is not None:
+            entries.append((pk, split_authors(publication.first_author, publication.co_authors)))
+    if not entries:
+        return 0
+
+    with transaction.atomic():
+        author_ids = get_or_create_authors(name for _, authors in entries for name, _ in authors)
+        for batch in _batches([pk for pk, _ in entries]):
+            PublicationAuthor.objects.filter(publication_id__in=batch).delete()
+
+        links = [
+            PublicationAuthor(publication_id=pk, author_id=author_ids[name], position=position)
+            for pk, authors in entries
+            for name, position in authors
+        ]
+        PublicationAuthor.objects.bulk_create(links, batch_size=AUTHOR_BATCH_SIZE)
+
+        refresh_author_departments(
+            author_ids[name] for _, authors in entries for name, position in authors if position == 0
+        )
+
+    return len(links)
+
+
+def rebuild_author_index() -> Dict[str, int]:
+    """
+    Rebuild authors and publication_authors from scratch.
+
+    Returns:
+        Dict with 'authors' and 'links' counts
+    """
+    links = 0
+    with transaction.atomic():
+        PublicationAuthor.objects.all().delete()
+        Author.objects.all().delete()
+
+        publications = Publication.objects.only('id', 'publication_id', 'first_author', 'co_authors')
+        batch = []
+        for publication in publications.order_by('id').iterator(chunk_size=AUTHOR_BATCH_SIZE):
+            batch.append(publication)
+            if len(batch) == AUTHOR_BATCH_SIZE:
+                links += index_publication_authors(batch)
+                batch = []
+        links += index_publication_authors(batch)
+
+    return {'authors': Author.objects.count(), 'links': links}
@@ -0,0 +1,393 @@
+"""
+In-process columnar snapshots of the analytics tables.
+
+The whole analytics dataset is small enough to hold in memory, so instead
+of a database round trip per aggregator call, the aggregators can answer
+their counts, sums and averages from NumPy arrays. A snapshot holds the
+columns the aggregators use, per data type:
+
+- department_kpi: department_kpi
+- publication: publications
+- research_budget: research_projects (with total_executed, as in
+  v_project_execution_rate) and execution_records
+- student: students
+
+Text columns are dictionary encoded (int32 codes, -1 for NULL), decimals
+are stored as int64 hundredths and dates as their year, so group-bys are
+bincounts and sums are exact integer sums.
+
+A snapshot is tagged with the data version of its data type (see
+apps.analytics.versions: a counter in the database that uploads,
+reverts, partition detaches and admin edits bump, so every worker
+process sees the same version). The version and the tables are read in
+one REPEATABLE READ transaction on one database alias, so they describe
+the same data. get_snapshot returns a snapshot only while its version is
+current. Otherwise it returns None, so the aggregator runs its ORM query,
+and a new snapshot is loaded in a background thread. The version check
+is one indexed lookup, made at most every ANALYTICS_COLUMNAR_VERSION_TTL
+seconds (default 5) per process and data type: a snapshot can keep
+answering for up to that many seconds after a change.
+
+Snapshots are per process and not department scoped, so they are never
+used with ANALYTICS_ENFORCE_RLS (rows visible to the database session
+depend on the user).
+
+    >>> snapshot = load_snapshot('publication')
+    >>> snapshot['publications'].where('department', '컴퓨터공학과').group_count('journal_grade')
+"""
+import logging
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.conf import settings
+from django.db import connections, router, transaction
+
+from apps.analytics.models import DepartmentKPI, ExecutionRecord, Publication, ResearchProject, Student
+from apps.analytics.versions import data_version
+
+logger = logging.getLogger(__name__)
+
+DECIMAL_SCALE = 100  # DecimalField(decimal_places=2) values are stored in hundredths
+DENSE_GROUP_RANGE = 4096  # Integer columns spanning at most this many values are grouped by offset
+
+
+class TableSpec(NamedTuple):
+    """A snapshot table: its model and columns as (field, kind) pairs."""
+    name: str
+    model: type
+    columns: Tuple[Tuple[str, str], ...]  # kind: 'int', 'text', 'decimal' or 'year'
+
+
+SNAPSHOT_TABLES: Dict[str, Tuple[TableSpec, ...]] = {
+    'department_kpi': (
+        TableSpec('department_kpi', DepartmentKPI, (
+            ('evaluation_year', 'int'), ('department', 'text'), ('employment_rate', 'decimal'),
+        )),
+    ),
+    'publication': (
+        TableSpec('publications', Publication, (
+            ('publication_date', 'year'), ('department', 'text'), ('first_author', 'text'),
+            ('journal_grade', 'text'), ('impact_factor', 'decimal'),
+        )),
+    ),
+    'research_budget': (
+        TableSpec('research_projects', ResearchProject, (
+            ('id', 'int'), ('project_number', 'text'), ('project_name', 'text'),
+            ('department', 'text'), ('total_budget', 'int'),
+        )),
+        TableSpec('execution_records', ExecutionRecord, (
+            ('project_id', 'int'), ('expense_category', 'text'), ('amount', 'int'),
+        )),
+    ),
+    'student': (
+        TableSpec('students', Student, (
+            ('department', 'text'), ('grade', 'int'), ('program_type', 'text'),
+            ('enrollment_status', 'text'), ('admission_year', 'int'),
+        )),
+    ),
+}
+
+
+class Column(NamedTuple):
+    """
+    One column of a snapshot table.
+
+    data holds int64 values (0 where NULL) or, for text columns, int32
+    codes into categories (-1 where NULL).
+    """
+    data: np.ndarray
+    valid: np.ndarray  # False where NULL
+    categories: Optional[List[Any]] = None
+
+    def take(self, mask: np.ndarray) -> 'Column':
+        return Column(self.data[mask], self.valid[mask], self.categories)
+
+
+def _column(values: List[Any], kind: str) -> Column:
+    """Build a Column from the values of one field."""
+    if kind == 'text':
+        codes, categories = pd.factorize(pd.Series(values, dtype=object), use_na_sentinel=True)
+        return Column(codes.astype(np.int32), codes >= 0, list(categories))
+
+    valid = np.array([value is not None for value in values], dtype=bool)
+    if kind == 'decimal':
+        values = [int(value * DECIMAL_SCALE) if value is not None else 0 for value in values]
+    elif kind == 'year':
+        values = [value.year if value is not None else 0 for value in values]
+    else:
+        values = [value if value is not None else 0 for value in values]
+    return Column(np.array(values, dtype=np.int64), valid)
+
+
+class Table:
+    """
+    Columns of equal length with filters and grouped aggregates.
+
+    Filters do not copy the columns: they narrow a row mask, and only the
+    columns an aggregate reads are selected.
+    """
+
+    def __init__(self, columns: Dict[str, Column], rows: int, mask: Optional[np.ndarray] = None):
+        self.columns = columns
+        self.rows = rows
+        self.mask = mask  # Selected rows; None: all
+
+    def __len__(self) -> int:
+        return self.rows if self.mask is None else int(np.count_nonzero(self.mask))
+
+    def __getitem__(self, name: str) -> Column:
+        """A column of the selected rows."""
+        column = self.columns[name]
+        return column if self.mask is None else column.take(self.mask)
+
+    def _filter(self, mask: np.ndarray) -> 'Table':
+        return Table(self.columns, self.rows, mask if self.mask is None else self.mask & mask)
+
+    def _equals(self, name: str, value: Any) -> np.ndarray:
+        column = self.columns[name]
+        if value is None:
+            return ~column.valid
+        if column.categories is not None:
+            try:
+                code = column.categories.index(value)
+            except ValueError:
+                return np.zeros(self.rows, dtype=bool)
+            return column.data == code
+        return column.valid & (column.data == value)
+
+    def where(self, name: str, value: Any) -> 'Table':
+        """Rows whose column equals value (None: NULL)."""
+        return self._filter(self._equals(name, value))
+
+    def where_in(self, name: str, values: Iterable[Any]) -> 'Table':
+        """Rows whose column is one of values."""
+        mask = np.zeros(self.rows, dtype=bool)
+        for value in values:
+            mask |= self._equals(name, value)
+        return self._filter(mask)
+
+    def values(self, name: str) -> List[Any]:
+        """Decoded values of a column, None for NULL."""
+        column = self[name]
+        if column.categories is not None:
+            keys = column.categories + [None]
+            return [keys[code] for code in column.data.tolist()]
+        return [value if valid else None for value, valid in zip(column.data.tolist(), column.valid.tolist())]
+
+    def _groups(self, name: str) -> Tuple[List[Any], np.ndarray]:
+        """Group keys of a column (None for NULL) and each selected row's group index."""
+        column = self[name]
+        if column.categories is not None:
+            keys = column.categories + [None]
+            return keys, np.where(column.valid, column.data, len(column.categories))
+
+        present = column.data[column.valid]
+        low, high = (int(present.min()), int(present.max())) if len(present) else (0, 0)
+        if high - low <= max(len(column.data), DENSE_GROUP_RANGE):
+            # Small range (years, grades): the offset is the group, no sort
+            keys = list(range(low, high + 1))
+            inverse = np.where(column.valid, column.data - low, 0)
+        else:
+            uniques, inverse = np.unique(np.where(column.valid, column.data, low), return_inverse=True)
+            keys = uniques.tolist()
+        if not column.valid.all():
+            inverse = np.where(column.valid, inverse, len(keys))
+            keys.append(None)
+        return keys, inverse
+
+    def group_count(self, name: str) -> Dict[Any, int]:
+        """Rows per value of a column (COUNT(*) ... GROUP BY)."""
+        keys, groups = self._groups(name)
+        counts = np.bincount(groups, minlength=len(keys))
+        return {key: count for key, count in zip(keys, counts.tolist()) if count}
+
+    def group_count_pairs(self, name: str, other_name: str) -> Dict[Tuple[Any, Any], int]:
+        """Rows per pair of values of two columns (COUNT(*) ... GROUP BY name, other_name)."""
+        keys, groups = self._groups(name)
+        other_keys, other_groups = self._groups(other_name)
+        counts = np.bincount(groups * len(other_keys) + other_groups, minlength=len(keys) * len(other_keys))
+        return {
+            (keys[index // len(other_keys)], other_keys[index % len(other_keys)]): count
+            for index, count in zip(np.flatnonzero(counts).tolist(), counts[counts > 0].tolist())
+        }
+
+    def group_sum(self, name: str, value_name: str) -> Dict[Any, int]:
+        """Sum of value_name per value of a column (SUM() ... GROUP BY), NULLs as 0."""
+        keys, groups = self._groups(name)
+        counts = np.bincount(groups, minlength=len(keys))
+        sums = np.zeros(len(keys), dtype=np.int64)
+        np.add.at(sums, groups, self[value_name].data)
+        return {key: total for key, total, count in zip(keys, sums.tolist(), counts.tolist()) if count}
+
+    def sum(self, name: str) -> int:
+        """Sum of the non-NULL values (0 if none)."""
+        column = self.columns[name]
+        if self.mask is None:
+            return int(column.data.sum())
+        return int(column.data.sum(where=self.mask))
+
+    def count(self, name: str) -> int:
+        """Number of non-NULL values."""
+        valid = self.columns[name].valid
+        return int(np.count_nonzero(valid if self.mask is None else valid & self.mask))
+
+    def distinct_count(self, name: str) -> int:
+        """Distinct values of a column, NULL counting as one."""
+        return len(self.group_count(name))
+
+
+def decimal_value(hundredths: int) -> Decimal:
+    """A stored decimal column value (or sum) as Decimal."""
+    return Decimal(hundredths).scaleb(-2)
+
+
+def _add_execution_totals(tables: Dict[str, Table]) -> None:
+    """
+    Add research_projects.total_executed, the sum of each project's execution amounts.
+
+    Raises:
+        ValueError: If a record's project is not in the snapshot (tables
+            read from different states of the data)
+    """
+    projects = tables['research_projects']
+    records = tables['execution_records']
+    project_ids = projects['id'].data
+    record_project_ids = records['project_id'].data
+    order = np.argsort(project_ids)
+    sorted_ids = project_ids[order]
+    idx = np.searchsorted(sorted_ids, record_project_ids)
+    if (idx >= len(sorted_ids)).any() or not np.array_equal(sorted_ids[idx], record_project_ids):
+        raise ValueError('execution_records reference projects missing from research_projects')
+    positions = order[idx]
+    totals = np.zeros(len(projects), dtype=np.int64)
+    np.add.at(totals, positions, records['amount'].data)
+    projects.columns['total_executed'] = Column(totals, np.ones(len(projects), dtype=bool))
+
+
+DERIVED_COLUMNS: Dict[str, Callable[[Dict[str, Table]], None]] = {
+    'research_budget': _add_execution_totals,
+}
+
+
+class Snapshot(NamedTuple):
+    """Tables of one data type at one data version."""
+    data_type: str
+    version: int
+    tables: Dict[str, Table]
+
+    def __getitem__(self, name: str) -> Table:
+        return self.tables[name]
+
+
+_snapshots: Dict[str, Snapshot] = {}
+_version_checks: Dict[str, Tuple[float, int]] = {}  # data type -> (checked at, version)
+_loading = set()
+_lock = threading.Lock()
+
+
+def _data_version(data_type: str, using: Optional[str] = None) -> int:
+    return data_version(data_type, using=using)
+
+
+def current_version(data_type: str) -> int:
+    """Data version of a data type, looked up at most every ANALYTICS_COLUMNAR_VERSION_TTL seconds."""
+    ttl = getattr(settings, 'ANALYTICS_COLUMNAR_VERSION_TTL', 0)
+    now = time.monotonic()
+    checked = _version_checks.get(data_type)
+    if ttl and checked and now - checked[0] < ttl:
+        return checked[1]
+
+    version = _data_version(data_type)
+    _version_checks[data_type] = (now, version)
+    return version
+
+
+def load_snapshot(data_type: str) -> Optional[Snapshot]:
+    """
+    Read the tables of a data type into a new snapshot and keep it.
+
+    The version and every table are read from one database alias (routed
+    once) in one transaction, REPEATABLE READ on PostgreSQL, so they see
+    the same state of the data even with read replicas.
+
+    Returns:
+        The snapshot, or None if the data changed before it was kept
+    """
+    specs = SNAPSHOT_TABLES[data_type]
+    using = router.db_for_read(specs[0].model)
+    connection = connections[using]
+    set_isolation = connection.vendor == 'postgresql' and not connection.in_atomic_block
+    tables = {}
+    with transaction.atomic(using=using):
+        if set_isolation:
+            with connection.cursor() as cursor:
+                cursor.execute('SET TRANSACTION ISOLATION LEVEL REPEATABLE READ')
+        version = _data_version(data_type, using)
+        for spec in specs:
+            fields = [field for field, _ in spec.columns]
+            rows = list(spec.model.objects.using(using).order_by('pk').values_list(*fields))
+            values = list(zip(*rows)) if rows else [()] * len(fields)
+            tables[spec.name] = Table(
+                {field: _column(list(column), kind) for (field, kind), column in zip(spec.columns, values)},
+                len(rows),
+            )
+    if data_type in DERIVED_COLUMNS:
+        DERIVED_COLUMNS[data_type](tables)
+
+    if _data_version(data_type, using) != version:
+        return None
+    snapshot = Snapshot(data_type, version, tables)
+    with _lock:
+        _snapshots[data_type] = snapshot
+    return snapshot
+
+
+def _load_in_background(data_type: str) -> None:
+    try:
+        load_snapshot(data_type)
+    except Exception:
+        logger.exception('Loading the %s columnar snapshot failed', data_type)
+    finally:
+        with _lock:
+            _loading.discard(data_type)
+        connections.close_all()  # This thread's connections
+
+
+def _start_load(data_type: str) -> None:
+    """Load a snapshot in a background thread, unless one is loading."""
+    with _lock:
+        if data_type in _loading:
+            return
+        _loading.add(data_type)
+    threading.Thread(
+        target=_load_in_background, args=(data_type,), name=f'columnar-{data_type}', daemon=True
+    ).start()
+
+
+def get_snapshot(data_type: str) -> Optional[Snapshot]:
+    """
+    Current snapshot of a data type, or None to use the database.
+
+    A missing or stale snapshot starts a background load. Always None
+    with ANALYTICS_ENFORCE_RLS.
+    """
+    if getattr(settings, 'ANALYTICS_ENFORCE_RLS', False):
+        return None
+
+    snapshot = _snapshots.get(data_type)
+    if snapshot is not None and snapshot.version == current_version(data_type):
+        return snapshot
+
+    _start_load(data_type)
+    return None
+
+
+def clear_snapshots() -> None:
+    """Drop all snapshots (tests, memory)."""
+    with _lock:
+        _snapshots.clear()
+        _version_checks.clear()
@@ -0,0 +1,182 @@
+"""
+Streaming CSV/XLSX downloads of analytics data.
+
+Each analytics page offers its data as a download in the layout of the
+matching upload template (Korean headers from the parser's
+TEMPLATE_COLUMNS), so a downloaded file can be edited and uploaded again.
+
+Rows are read with QuerySet.iterator(chunk_size=...):
+- CSV is encoded chunk by chunk; the header row is sent before the query
+  runs, so the first byte arrives immediately.
+- XLSX uses openpyxl write-only mode (rows are flushed to a temp file
+  instead of kept as cell objects) and is spooled to disk before being
+  streamed, because the zip container is only complete after save().
+"""
+import csv
+import tempfile
+from typing import Any, Iterator, List, Tuple
+
+from django.db.models import QuerySet
+from openpyxl import Workbook
+
+from apps.analytics.exporters import build_export_queryset, get_export_source, parse_export_filters
+from apps.data_upload.parsers import (
+    DepartmentKPIParser,
+    PublicationParser,
+    ResearchBudgetParser,
+    StudentParser,
+)
+
+
+DEFAULT_CHUNK_SIZE = 2000
+XLSX_SPOOL_SIZE = 8 * 1024 * 1024  # Spool to disk above 8 MB
+STREAM_BLOCK_SIZE = 64 * 1024
+
+# dataset: (export source, parser providing the template columns, file name)
+DOWNLOAD_DATASETS = {
+    'department_kpi': ('department_kpi', DepartmentKPIParser, '학과별_KPI'),
+    'publications': ('publications', PublicationParser, '논문_실적'),
+    'research_budget': ('execution_records', ResearchBudgetParser, '연구비_집행내역'),
+    'students': ('students', StudentParser, '학생_명단'),
+}
+
+DOWNLOAD_FORMATS = {
+    # format: (content type, file extension)
+    'csv': ('text/csv; charset=utf-8', '.csv'),
+    'xlsx': ('application/vnd.openxmlformats-officedocument.spreadsheetml.sheet', '.xlsx'),
+}
+
+
+class _Echo:
+    """File-like object whose write() returns the value (for csv.writer)."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def get_template_columns(dataset: str) -> List[Tuple[str, str]]:
+    """
+    Return (Korean header, model lookup) pairs of a dataset.
+
+    Raises:
+        ValueError: If the dataset does not exist
+    """
+    if dataset not in DOWNLOAD_DATASETS:
+        raise ValueError(
+            f"Unknown dataset '{dataset}'. Available: {', '.join(DOWNLOAD_DATASETS)}"
+        )
+    return DOWNLOAD_DATASETS[dataset][1].TEMPLATE_COLUMNS
+
+
+def build_download_queryset(dataset: str, params: Any, user: Any) -> QuerySet:
+    """
+    Build the filtered queryset behind an analytics page.
+
+    Args:
+        dataset: Key of DOWNLOAD_DATASETS
+        params: Request GET parameters (department, college, start_date,
+            end_date, year, and quarter/semester for dated datasets)
+        user: Requesting user (permission filtering)
+
+    Returns:
+        Filtered queryset ordered by primary key
+
+    Raises:
+        ValueError: If the dataset or a parameter is invalid
+    """
+    get_template_columns(dataset)
+    source = get_export_source(DOWNLOAD_DATASETS[dataset][0])
+
+    filters = parse_export_filters(params)
+    filters['user'] = user
+
+    # department_kpi has no business date; its year is the evaluation year
+    # (same year filter as department_kpi_view)
+    year = filters.pop('year', None) if dataset == 'department_kpi' else None
+
+    queryset = build_export_queryset(source, filters)
+    if year:
+        queryset = queryset.filter(evaluation_year=year)
+
+    return queryset
+
+
+def iter_row_chunks(
+    queryset: QuerySet,
+    columns: List[Tuple[str, str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[List[Tuple]]:
+    """Yield lists of up to chunk_size value tuples in template column order."""
+    rows = queryset.values_list(*[lookup for _, lookup in columns]).iterator(chunk_size=chunk_size)
+
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(
+    queryset: QuerySet,
+    columns: List[Tuple[str, str]],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[str]:
+    """
+    Encode rows as CSV, one string per chunk.
+
+    Starts with a UTF-8 BOM so Excel detects the encoding (the upload
+    parsers read utf-8-sig as well).
+    """
+    writer = csv.writer(_Echo())
+    yield '\ufeff' + writer.writerow([header for header, _ in columns])
+
+    for chunk in iter_row_chunks(queryset, columns, chunk_size):
+        yield ''.join(writer.writerow(row) for row in chunk)
+
+
+def stream_xlsx(
+    queryset: QuerySet,
+    columns: List[Tuple[str, str]],
+    sheet_title: str = 'Sheet1',
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """Build a write-only workbook in a spooled temp file and yield it in blocks."""
+    workbook = Workbook(write_only=True)
+    worksheet = workbook.create_sheet(title=sheet_title)
+    worksheet.append([header for header, _ in columns])
+
+    for chunk in iter_row_chunks(queryset, columns, chunk_size):
+        for row in chunk:
+            worksheet.append(row)
+
+    with tempfile.SpooledTemporaryFile(max_size=XLSX_SPOOL_SIZE) as output:
+        workbook.save(output)
+        output.seek(0)
+        for block in iter(lambda: output.read(STREAM_BLOCK_SIZE), b''):
+            yield block
+
+
+def stream_download(dataset: str, export_format: str, queryset: QuerySet) -> Iterator:
+    """
+    Encode a dataset's queryset in the requested format.
+
+    Raises:
+        ValueError: If the dataset or format is not supported
+    """
+    columns = get_template_columns(dataset)
+    if export_format == 'csv':
+        return stream_csv(queryset, columns)
+    if export_format == 'xlsx':
+        return stream_xlsx(queryset, columns, sheet_title=DOWNLOAD_DATASETS[dataset][2])
+    raise ValueError(
+        f"Unsupported download format '{export_format}'. Available: {', '.join(DOWNLOAD_FORMATS)}"
+    )
+
+
+def download_filename(dataset: str, export_format: str) -> str:
+    """File name of a download, e.g. '학생_명단.csv'."""
+    return f'{DOWNLOAD_DATASETS[dataset][2]}{DOWNLOAD_FORMATS[export_format][1]}'
+
@@ -0,0 +1,349 @@
+"""
+Columnar export of analytics tables.
+
+Exports any analytics model to Parquet or Arrow IPC (stream format) with
+the same filters as apps.analytics.filters.apply_multiple_filters.
+
+Rows are read with QuerySet.iterator(chunk_size=...), which uses a
+server-side cursor on PostgreSQL, and every chunk is written as one record
+batch / Parquet row group as soon as it is read. Memory use is bounded by
+the chunk size regardless of the number of rows exported.
+
+Used by:
+- manage.py export_analytics
+- apps.analytics.views.export_view (streaming download)
+
+Requires the optional `pyarrow` package.
+"""
+import io
+from datetime import date
+from itertools import islice
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from django.db.models import F, Model, QuerySet
+
+from apps.analytics.filters import apply_multiple_filters
+from apps.analytics.models import (
+    DepartmentKPI,
+    ExecutionRecord,
+    Publication,
+    ResearchProject,
+    Student,
+)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Optional dependency
+    pa = None
+    pq = None
+
+
+DEFAULT_CHUNK_SIZE = 10000
+
+EXPORT_FORMATS = {
+    # format: (content type, file extension)
+    'parquet': ('application/vnd.apache.parquet', '.parquet'),
+    'arrow': ('application/vnd.apache.arrow.stream', '.arrows'),
+}
+
+
+class ExportSource(NamedTuple):
+    """An exportable analytics table."""
+    model: type
+    date_field: str
+    filter_keys: Tuple[str, ...]  # Supported apply_multiple_filters keys
+    annotations: Tuple[Tuple[str, str], ...] = ()  # (column, lookup) of related fields
+
+    def columns(self) -> List[str]:
+        """Exported column names: concrete field attnames, then annotations."""
+        names = [field.attname for field in self.model._meta.concrete_fields]
+        return names + [name for name, _ in self.annotations]
+
+    def queryset(self) -> QuerySet:
+        """Base queryset ordered by primary key, with annotations applied."""
+        queryset = self.model.objects.all()
+        if self.annotations:
+            queryset = queryset.annotate(**{name: F(lookup) for name, lookup in self.annotations})
+        return queryset.order_by('pk')
+
+
+ALL_FILTERS = ('start_date', 'end_date', 'departments', 'colleges', 'user')
+NO_COLLEGE_FILTERS = ('start_date', 'end_date', 'departments', 'user')
+PERIOD_FILTERS = ('year', 'quarter', 'semester')  # Only where date_field is a business date
+
+EXPORT_SOURCES: Dict[str, ExportSource] = {
+    'department_kpi': ExportSource(DepartmentKPI, 'created_at', ALL_FILTERS),
+    'publications': ExportSource(Publication, 'publication_date', ALL_FILTERS + PERIOD_FILTERS),
+    'research_projects': ExportSource(ResearchProject, 'created_at', NO_COLLEGE_FILTERS),
+    'execution_records': ExportSource(
+        ExecutionRecord,
+        'execution_date',
+        NO_COLLEGE_FILTERS + PERIOD_FILTERS,
+        annotations=(
+            ('project_number', 'project__project_number'),
+            ('department', 'project__department'),
+        ),
+    ),
+    'students': ExportSource(Student, 'created_at', ALL_FILTERS),
+}
+
+
+def require_pyarrow() -> None:
+    """Raise ImportError if pyarrow is not installed."""
+    if pa is None:
+        raise ImportError('Columnar export requires the pyarrow package (pip install pyarrow)')
+
+
+def get_export_source(name: str) -> ExportSource:
+    """
+    Look up an export source by name.
+
+    Raises:
+        ValueError: If the source does not exist
+    """
+    try:
+        return EXPORT_SOURCES[name]
+    except KeyError:
+        raise ValueError(
+            f"Unknown export source '{name}'. Available: {', '.join(EXPORT_SOURCES)}"
+        )
+
+
+def parse_export_filters(params: Any) -> Dict[str, Any]:
+    """
+    Build an apply_multiple_filters dict from request/command parameters.
+
+    Args:
+        params: QueryDict (or dict of lists) with optional department,
+            college, start_date and end_date (YYYY-MM-DD), year, quarter
+            and semester entries
+
+    Returns:
+        Filter dictionary (only the given keys)
+
+    Raises:
+        ValueError: If a date is not in ISO format or a period is not an integer
+    """
+    filters = {}
+
+    departments = [value for value in params.getlist('department') if value]
+    if departments:
+        filters['departments'] = departments
+
+    colleges = [value for value in params.getlist('college') if value]
+    if colleges:
+        filters['colleges'] = colleges
+
+    for key in ('start_date', 'end_date'):
+        value = params.get(key)
+        if value:
+            filters[key] = date.fromisoformat(value)
+
+    for key in ('year', 'quarter', 'semester'):
+        value = params.get(key)
+        if value:
+            filters[key] = int(value)
+
+    return filters
+
+
+def build_export_queryset(source: ExportSource, filters: Dict[str, Any]) -> QuerySet:
+    """
+    Apply filters to an export source.
+
+    Raises:
+        ValueError: If a filter is not supported by the source
+    """
+    unsupported = set(filters) - set(source.filter_keys)
+    if unsupported:
+        raise ValueError(
+            f"Unsupported filter(s) for {source.model._meta.db_table}: {', '.join(sorted(unsupported))}"
+        )
+    return apply_multiple_filters(source.queryset(), filters, source.date_field)
+
+
+def _resolve_field(model: type, lookup: str) -> Any:
+    """Resolve a (possibly related) lookup path to its model field."""
+    *relations, name = lookup.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    return model._meta.get_field(name)
+
+
+def _arrow_type(field: Any) -> Any:
+    """Map a Django model field to an Arrow type."""
+    if field.is_relation:
+        field = field.target_field
+
+    internal_type = field.get_internal_type()
+    if internal_type in ('BigAutoField', 'BigIntegerField'):
+        return pa.int64()
+    if internal_type in ('AutoField', 'IntegerField', 'PositiveIntegerField'):
+        return pa.int32()
+    if internal_type in ('SmallIntegerField', 'PositiveSmallIntegerField'):
+        return pa.int16()
+    if internal_type == 'DecimalField':
+        return pa.decimal128(field.max_digits, field.decimal_places)
+    if internal_type == 'FloatField':
+        return pa.float64()
+    if internal_type == 'BooleanField':
+        return pa.bool_()
+    if internal_type == 'DateField':
+        return pa.date32()
+    if internal_type == 'DateTimeField':
+        return pa.timestamp('us', tz='UTC')
+    return pa.string()
+
+
+def build_schema(source: ExportSource) -> Any:
+    """Build the Arrow schema of an export source."""
+    require_pyarrow()
+
+    lookups = {field.attname: field.attname for field in source.model._meta.concrete_fields}
+    lookups.update(dict(source.annotations))
+
+    return pa.schema([
+        pa.field(name, _arrow_type(_resolve_field(source.model, lookups[name])))
+        for name in source.columns()
+    ])
+
+
+def iter_record_batches(
+    queryset: QuerySet,
+    source: ExportSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """
+    Read a queryset in chunks and yield one Arrow RecordBatch per chunk.
+
+    Args:
+        queryset: Filtered queryset of source.model
+        source: Export source
+        chunk_size: Rows per database fetch and per record batch
+
+    Yields:
+        pyarrow.RecordBatch
+    """
+    schema = build_schema(source)
+    rows = queryset.values_list(*schema.names).iterator(chunk_size=chunk_size)
+
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+
+        columns = zip(*chunk)
+        yield pa.record_batch(
+            [pa.array(values, type=field.type) for values, field in zip(columns, schema)],
+            schema=schema,
+        )
+
+
+class _StreamBuffer(io.RawIOBase):
+    """Write-only sink whose contents are drained after every batch."""
+
+    def __init__(self):
+        super().__init__()
+        self._chunks = []
+        self._position = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _open_writer(export_format: str, sink: Any, schema: Any) -> Any:
+    if export_format == 'parquet':
+        return pq.ParquetWriter(sink, schema, compression='zstd')
+    if export_format == 'arrow':
+        return pa.ipc.new_stream(sink, schema)
+    raise ValueError(f"Unsupported export format '{export_format}'. Available: {', '.join(EXPORT_FORMATS)}")
+
+
+def stream_export(
+    queryset: QuerySet,
+    source: ExportSource,
+    export_format: str,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """
+    Encode a queryset as Parquet or Arrow IPC, yielding bytes per chunk.
+
+    Each chunk is written as a Parquet row group (or Arrow record batch)
+    and its bytes are yielded immediately, so the output can be sent to a
+    StreamingHttpResponse or a file without holding the export in memory.
+
+    Args:
+        queryset: Filtered queryset of source.model
+        source: Export source
+        export_format: 'parquet' or 'arrow'
+        chunk_size: Rows per chunk
+
+    Yields:
+        Encoded bytes
+
+    Returns:
+        Number of rows encoded (the generator's return value)
+    """
+    require_pyarrow()
+
+    rows = 0
+    sink = _StreamBuffer()
+    writer = _open_writer(export_format, sink, build_schema(source))
+    try:
+        for batch in iter_record_batches(queryset, source, chunk_size):
+            writer.write_batch(batch)
+            rows += batch.num_rows
+            data = sink.drain()
+            if data:
+                yield data
+    finally:
+        writer.close()
+
+    yield sink.drain()
+    return rows
+
+
+def export_to_file(
+    path: str,
+    source_name: str,
+    export_format: str,
+    filters: Optional[Dict[str, Any]] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> int:
+    """
+    Export a source to a file.
+
+    Args:
+        path: Output file path
+        source_name: Key of EXPORT_SOURCES
+        export_format: 'parquet' or 'arrow'
+        filters: apply_multiple_filters dictionary
+        chunk_size: Rows per chunk
+
+    Returns:
+        Number of rows exported (counted while writing, not queried again)
+    """
+    source = get_export_source(source_name)
+    queryset = build_export_queryset(source, filters or {})
+    chunks = stream_export(queryset, source, export_format, chunk_size)
+
+    with open(path, 'wb') as f:
+        while True:
+            try:
+                f.write(next(chunks))
+            except StopIteration as done:
+                return done.value
@@ -3,6 +3,7 @@ Data filtering functions for analytics.
 
 This module contains functions to filter Django querysets based on various criteria:
 - Date ranges
+- Calendar years, quarters and academic semesters
 - Department access
 - College access
 - User permissions (role-based)
@@ -10,15 +11,179 @@ This module contains functions to filter Django querysets based on various crite
 
 These filters are designed to work with permission-based data access control
 where admins/managers see all data, but viewers only see their own department.
+
+Date filters compile to half-open ranges (field >= start AND field < end)
+instead of __year/__month lookups or EXTRACT(), so they stay sargable: the
+planner can use a B-tree index on the date column, and DateTimeField values
+later on the last day are not cut off at midnight.
+
+Department scoping (ANALYTICS_DEPARTMENT_SCOPING) is described by a
+PermissionScope, computed once per request user. It compiles to one
+predicate per model (a join for models without a department column, e.g.
+ExecutionRecord via project__department) and can also be enforced by
+PostgreSQL row-level security (supabase/optional/department_rls.sql,
+ANALYTICS_ENFORCE_RLS).
 """
 
-from typing import List, Optional, Dict, Any
-from datetime import date
+import hashlib
+from typing import List, Optional, Dict, Any, FrozenSet, NamedTuple, Tuple
+from datetime import date, datetime, timedelta
+from django.conf import settings
 from django.db.models import QuerySet
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
+# Roles that see every department
+UNRESTRICTED_ROLES = ('admin', 'manager')
+
+# Department lookup of models without a department column
+# (model label -> field path); other models use 'department' if they have it
+DEPARTMENT_FIELDS = {
+    'analytics.executionrecord': 'project__department',
+    'analytics.publicationauthor': 'publication__department',
+}
+
+# Years whose half-open [Jan 1, Jan 1 of the next year) range fits in date
+MIN_YEAR = date.min.year
+MAX_YEAR = date.max.year - 1
+
+# Academic semesters: semester -> (start month, end month). The 2nd semester
+# (including winter session) runs into the following calendar year.
+ACADEMIC_SEMESTERS = {
+    1: (3, 9),
+    2: (9, 3),
+}
+
+
+def _check_year(year: int) -> None:
+    if not MIN_YEAR <= year <= MAX_YEAR:
+        raise ValueError(f'Year must be {MIN_YEAR}-{MAX_YEAR}, got {year}')
+
+
+def parse_year(value: Any) -> Optional[int]:
+    """
+    Parse a year request parameter.
+
+    Returns:
+        The year, or None if value is empty, not an integer or outside
+        MIN_YEAR-MAX_YEAR
+    """
+    try:
+        year = int(value) if value else None
+    except (ValueError, TypeError):
+        return None
+    if year is None or not MIN_YEAR <= year <= MAX_YEAR:
+        return None
+    return year
+
+
+def year_range(year: int) -> Tuple[date, date]:
+    """
+    Return the half-open [start, end) date range of a calendar year.
+
+    Raises:
+        ValueError: If year is outside MIN_YEAR-MAX_YEAR
+
+    Example:
+        >>> year_range(2023)
+        (datetime.date(2023, 1, 1), datetime.date(2024, 1, 1))
+    """
+    _check_year(year)
+    return date(year, 1, 1), date(year + 1, 1, 1)
+
+
+def quarter_range(year: int, quarter: int) -> Tuple[date, date]:
+    """
+    Return the half-open [start, end) date range of a calendar quarter.
+
+    Raises:
+        ValueError: If year is outside MIN_YEAR-MAX_YEAR or quarter is not 1-4
+    """
+    _check_year(year)
+    if quarter not in (1, 2, 3, 4):
+        raise ValueError(f'Quarter must be 1-4, got {quarter}')
+
+    start = date(year, 3 * quarter - 2, 1)
+    end = date(year + 1, 1, 1) if quarter == 4 else date(year, 3 * quarter + 1, 1)
+    return start, end
+
+
+def semester_range(year: int, semester: int) -> Tuple[date, date]:
+    """
+    Return the half-open [start, end) date range of an academic semester.
+
+    1st semester: March 1 - August 31, 2nd semester: September 1 - end of
+    February of the next year.
+
+    Raises:
+        ValueError: If year is outside MIN_YEAR-MAX_YEAR or semester is not 1 or 2
+
+    Example:
+        >>> semester_range(2023, 2)
+        (datetime.date(2023, 9, 1), datetime.date(2024, 3, 1))
+    """
+    _check_year(year)
+    if semester not in ACADEMIC_SEMESTERS:
+        raise ValueError(f'Semester must be 1 or 2, got {semester}')
+
+    start_month, end_month = ACADEMIC_SEMESTERS[semester]
+    end_year = year + 1 if end_month < start_month else year
+    return date(year, start_month, 1), date(end_year, end_month, 1)
+
+
+def filter_by_period(
+    queryset: QuerySet,
+    date_field: str,
+    start: date,
+    end: date
+) -> QuerySet:
+    """
+    Filter queryset to the half-open period [start, end).
+
+    Args:
+        queryset: Django queryset to filter
+        date_field: Name of the date field to filter on
+        start: First day of the period (inclusive)
+        end: First day after the period (exclusive)
+
+    Returns:
+        Filtered queryset
+    """
+    return queryset.filter(**{f'{date_field}__gte': start, f'{date_field}__lt': end})
+
+
+def filter_by_year(queryset: QuerySet, date_field: str, year: int) -> QuerySet:
+    """
+    Filter queryset to one calendar year.
+
+    Use instead of {date_field}__year, which is not index-friendly.
+
+    Example:
+        >>> pubs = filter_by_year(Publication.objects.all(), 'publication_date', 2023)
+    """
+    return filter_by_period(queryset, date_field, *year_range(year))
+
+
+def filter_by_quarter(queryset: QuerySet, date_field: str, year: int, quarter: int) -> QuerySet:
+    """
+    Filter queryset to one calendar quarter (1-4).
+
+    Raises:
+        ValueError: If quarter is not 1-4
+    """
+    return filter_by_period(queryset, date_field, *quarter_range(year, quarter))
+
+
+def filter_by_semester(queryset: QuerySet, date_field: str, year: int, semester: int) -> QuerySet:
+    """
+    Filter queryset to one academic semester (1 or 2) of an academic year.
+
+    Raises:
+        ValueError: If year is outside MIN_YEAR-MAX_YEAR or semester is not 1 or 2
+    """
+    return filter_by_period(queryset, date_field, *semester_range(year, semester))
+
 
 def filter_by_date_range(
     queryset: QuerySet,
@@ -33,7 +198,8 @@ def filter_by_date_range(
         queryset: Django queryset to filter
         date_field: Name of the date field to filter on
         start_date: Optional start date (inclusive)
-        end_date: Optional end date (inclusive)
+        end_date: Optional end date (inclusive; a date compiles to
+            < end_date + 1 day so the whole day is included)
 
     Returns:
         Filtered queryset
@@ -51,7 +217,11 @@ def filter_by_date_range(
         queryset = queryset.filter(**{f'{date_field}__gte': start_date})
 
     if end_date is not None:
-        queryset = queryset.filter(**{f'{date_field}__lte': end_date})
+        if isinstance(end_date, datetime):
+            queryset = queryset.filter(**{f'{date_field}__lte': end_date})
+        else:
+            # Whole end day, also for DateTimeField values after midnight
+            queryset = queryset.filter(**{f'{date_field}__lt': end_date + timedelta(days=1)})
 
     return queryset
 
@@ -110,6 +280,88 @@ def filter_by_college(
     return queryset
 
 
+def department_field(model) -> Optional[str]:
+    """
+    Field path of a model's department, or None if it has no department.
+
+    Example:
+        >>> department_field(ExecutionRecord)
+        'project__department'
+    """
+    label = model._meta.label_lower
+    if label in DEPARTMENT_FIELDS:
+        return DEPARTMENT_FIELDS[label]
+    if any(field.name == 'department' for field in model._meta.concrete_fields):
+        return 'department'
+    return None
+
+
+class PermissionScope(NamedTuple):
+    """
+    Departments a user may see.
+
+    departments is None for unrestricted access; an empty set sees nothing.
+    Scopes are immutable and hashable, so they can key caches directly or
+    through cache_key.
+    """
+    departments: Optional[FrozenSet[str]] = None
+
+    @classmethod
+    def for_user(cls, user) -> 'PermissionScope':
+        """
+        Scope of a user, computed once per user object (i.e. per request).
+
+        Without ANALYTICS_DEPARTMENT_SCOPING every user is unrestricted.
+        """
+        scope = getattr(user, '_permission_scope', None)
+        if scope is None:
+            if not getattr(settings, 'ANALYTICS_DEPARTMENT_SCOPING', False):
+                scope = cls()
+            elif getattr(user, 'role', None) in UNRESTRICTED_ROLES:
+                scope = cls()
+            else:
+                department = getattr(user, 'department', None)
+                scope = cls(frozenset([department]) if department else frozenset())
+            user._permission_scope = scope
+        return scope
+
+    @property
+    def unrestricted(self) -> bool:
+        return self.departments is None
+
+    @property
+    def cache_key(self) -> str:
+        """Short cache key component: 'all', 'none' or 'dept-<digest>'."""
+        if self.departments is None:
+            return 'all'
+        if not self.departments:
+            return 'none'
+        digest = hashlib.sha1('\x1f'.join(sorted(self.departments)).encode('utf-8')).hexdigest()
+        return f'dept-{digest[:16]}'
+
+    def allows(self, department: Optional[str]) -> bool:
+        """Whether rows of a department are visible."""
+        return self.departments is None or department in self.departments
+
+    def filter(self, queryset: QuerySet) -> QuerySet:
+        """
+        Restrict a queryset to the scope.
+
+        Models without a department (see department_field) are not
+        department data and are returned unchanged.
+        """
+        if self.departments is None:
+            return queryset
+        field = department_field(queryset.model)
+        if field is None:
+            return queryset
+        if not self.departments:
+            return queryset.none()
+        if len(self.departments) == 1:
+            return queryset.filter(**{field: next(iter(self.departments))})
+        return queryset.filter(**{f'{field}__in': sorted(self.departments)})
+
+
 def apply_user_permission_filter(
     queryset: QuerySet,
     user: User
@@ -117,24 +369,26 @@ def apply_user_permission_filter(
     """
     Apply permission-based filtering based on user role.
 
-    Permission rules (MVP):
-    - All authenticated users can see all data
-    - Only data UPLOAD is restricted to admin (handled in Django Admin)
+    Permission rules:
+    - Without ANALYTICS_DEPARTMENT_SCOPING (MVP default) all authenticated
+      users can see all data; only data UPLOAD is restricted to admin
+      (handled in Django Admin)
+    - With it, admins/managers see all data and viewers only their own
+      department (nothing if they have none)
 
     Args:
         queryset: Django queryset to filter
-        user: User object with role and department
+        user: User object with role and department, or a PermissionScope
 
     Returns:
-        Unfiltered queryset (all authenticated users can view all data)
+        Queryset restricted to the user's PermissionScope
 
     Example:
         >>> kpis = DepartmentKPI.objects.all()
         >>> filtered = apply_user_permission_filter(kpis, request.user)
     """
-    # All authenticated active users can see all data
-    # Data upload restriction is handled separately in Django Admin
-    return queryset
+    scope = user if isinstance(user, PermissionScope) else PermissionScope.for_user(user)
+    return scope.filter(queryset)
 
 
 def apply_multiple_filters(
@@ -151,6 +405,9 @@ def apply_multiple_filters(
     Supported filter keys:
     - 'start_date': Start date for date range
     - 'end_date': End date for date range
+    - 'year': Calendar year (academic year when 'semester' is given)
+    - 'quarter': Quarter (1-4) of 'year'
+    - 'semester': Academic semester (1 or 2) of 'year'
     - 'departments': List of department names
     - 'colleges': List of college names
     - 'user': User object for permission filtering
@@ -182,6 +439,16 @@ def apply_multiple_filters(
             end_date=filters.get('end_date')
         )
 
+    # Apply year / quarter / semester filter
+    if filters.get('year') is not None:
+        year = filters['year']
+        if filters.get('semester') is not None:
+            queryset = filter_by_semester(queryset, date_field, year, filters['semester'])
+        elif filters.get('quarter') is not None:
+            queryset = filter_by_quarter(queryset, date_field, year, filters['quarter'])
+        else:
+            queryset = filter_by_year(queryset, date_field, year)
+
     # Apply department filter
     if 'departments' in filters:
         queryset = filter_by_department(queryset, filters.get('departments'))
@@ -0,0 +1,58 @@
+"""
+Export an analytics table to Parquet or Arrow IPC.
+
+Usage:
+    python manage.py export_analytics students students.parquet
+    python manage.py export_analytics publications pubs.arrows --format arrow \
+        --department 컴퓨터공학과 --start-date 2023-01-01 --end-date 2023-12-31
+"""
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.exporters import (
+    DEFAULT_CHUNK_SIZE,
+    EXPORT_FORMATS,
+    EXPORT_SOURCES,
+    export_to_file,
+)
+
+
+class Command(BaseCommand):
+    help = 'Export an analytics table to Parquet or Arrow IPC in constant memory'
+
+    def add_arguments(self, parser):
+        parser.add_argument('source', choices=list(EXPORT_SOURCES), help='Table to export')
+        parser.add_argument('output', type=str, help='Output file path')
+        parser.add_argument('--format', choices=list(EXPORT_FORMATS), default='parquet')
+        parser.add_argument('--department', action='append', default=[], help='Department (repeatable)')
+        parser.add_argument('--college', action='append', default=[], help='College (repeatable)')
+        parser.add_argument('--start-date', type=date.fromisoformat, help='Start date (YYYY-MM-DD)')
+        parser.add_argument('--end-date', type=date.fromisoformat, help='End date (YYYY-MM-DD)')
+        parser.add_argument('--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='Rows per row group')
+
+    def handle(self, *args, **options):
+        filters = {}
+        if options['department']:
+            filters['departments'] = options['department']
+        if options['college']:
+            filters['colleges'] = options['college']
+        if options['start_date']:
+            filters['start_date'] = options['start_date']
+        if options['end_date']:
+            filters['end_date'] = options['end_date']
+
+        try:
+            rows = export_to_file(
+                options['output'],
+                options['source'],
+                options['format'],
+                filters=filters,
+                chunk_size=options['chunk_size'],
+            )
+        except (ImportError, ValueError) as e:
+            raise CommandError(str(e))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Exported {rows} rows from {options["source"]} to {options["output"]}'
+        ))
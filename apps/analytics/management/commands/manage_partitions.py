@@ -0,0 +1,109 @@
+"""
+Manage yearly partitions of execution_records and publications.
+
+Requires supabase/optional/partition_by_year.sql to have been applied
+(PostgreSQL only).
+
+Usage:
+    python manage.py manage_partitions status
+    python manage.py manage_partitions ensure --ahead 1      # e.g. from cron
+    python manage.py manage_partitions create --year 2027 --table publications
+    python manage.py manage_partitions detach --year 2015 --table execution_records \
+        --export-dir /backups --archive-schema archive
+    python manage.py manage_partitions detach --year 2015 --table execution_records --drop
+"""
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.exporters import export_to_file
+from apps.analytics.partitions import (
+    PARTITIONED_TABLES,
+    detach_year_partition,
+    ensure_future_partitions,
+    ensure_year_partitions,
+    is_partitioned,
+    list_partitions,
+    partition_name,
+)
+
+
+class Command(BaseCommand):
+    help = 'Show, create, and detach/archive yearly partitions'
+
+    def add_arguments(self, parser):
+        parser.add_argument('action', choices=['status', 'ensure', 'create', 'detach'])
+        parser.add_argument('--table', choices=list(PARTITIONED_TABLES), help='Table (default: all)')
+        parser.add_argument('--year', type=int, help='Partition year (create/detach)')
+        parser.add_argument('--ahead', type=int, default=1, help='Years ahead to create (ensure)')
+        parser.add_argument('--export-dir', help='Export the year to Parquet before detaching')
+        parser.add_argument('--archive-schema', help='Move the detached partition to this schema')
+        parser.add_argument('--drop', action='store_true', help='Drop the detached partition')
+
+    def handle(self, *args, **options):
+        tables = [options['table']] if options['table'] else list(PARTITIONED_TABLES)
+        action = options['action']
+
+        if action in ('create', 'detach') and options['year'] is None:
+            raise CommandError(f'{action} requires --year')
+
+        if action == 'status':
+            self.show_status(tables)
+        elif action == 'ensure':
+            created = ensure_future_partitions(ahead=options['ahead'])
+            for table in tables:
+                self.report_created(table, created[table])
+        elif action == 'create':
+            for table in tables:
+                self.require_partitioned(table)
+                self.report_created(table, ensure_year_partitions(table, [options['year']]))
+        else:
+            if not options['table']:
+                raise CommandError('detach requires --table')
+            self.detach(options['table'], options)
+
+    def require_partitioned(self, table):
+        if not is_partitioned(table):
+            raise CommandError(f'{table} is not partitioned (apply supabase/optional/partition_by_year.sql)')
+
+    def show_status(self, tables):
+        for table in tables:
+            if not is_partitioned(table):
+                self.stdout.write(f'{table}: not partitioned')
+                continue
+            self.stdout.write(f'{table}:')
+            for partition in list_partitions(table):
+                self.stdout.write(f'  {partition.name:<32} ~{partition.estimated_rows} rows  {partition.bound}')
+
+    def report_created(self, table, created):
+        if created:
+            self.stdout.write(self.style.SUCCESS(f'{table}: created {", ".join(created)}'))
+        else:
+            self.stdout.write(f'{table}: nothing to create')
+
+    def detach(self, table, options):
+        year = options['year']
+        self.require_partitioned(table)
+
+        if options['export_dir']:
+            path = os.path.join(options['export_dir'], f'{partition_name(table, year)}.parquet')
+            try:
+                rows = export_to_file(path, table, 'parquet', filters={'year': year})
+            except (ImportError, ValueError) as e:
+                raise CommandError(str(e))
+            self.stdout.write(f'Exported {rows} rows to {path}')
+
+        try:
+            detached = detach_year_partition(
+                table,
+                year,
+                archive_schema=options['archive_schema'],
+                drop=options['drop'],
+            )
+        except ValueError as e:
+            raise CommandError(str(e))
+
+        if detached:
+            self.stdout.write(self.style.SUCCESS(f'Detached {table} {year} as {detached}'))
+        else:
+            self.stdout.write(self.style.SUCCESS(f'Detached and dropped {table} {year}'))
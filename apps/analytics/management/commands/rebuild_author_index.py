@@ -0,0 +1,22 @@
+"""
+Rebuild the author index (authors / publication_authors) from publications.
+
+Uploads keep the index current; run this to backfill it, or to repair it
+after publications were changed outside the upload pipeline.
+
+Usage:
+    python manage.py rebuild_author_index
+"""
+from django.core.management.base import BaseCommand
+
+from apps.analytics.authors import rebuild_author_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild authors and publication_authors from publications'
+
+    def handle(self, *args, **options):
+        counts = rebuild_author_index()
+        self.stdout.write(self.style.SUCCESS(
+            f"{counts['authors']} authors, {counts['links']} publication links indexed"
+        ))
@@ -0,0 +1,45 @@
+"""
+Rebuild the monthly rollup tables from the base tables.
+
+Uploads keep the rollups current; run this to backfill them, or to repair
+them after data was changed outside the upload pipeline.
+
+Usage:
+    python manage.py refresh_rollups
+    python manage.py refresh_rollups --data-type publication
+    python manage.py refresh_rollups --data-type research_budget --month 2023-03
+"""
+from datetime import datetime
+
+from django.core.management.base import BaseCommand
+
+from apps.analytics.rollups import ROLLUPS, rebuild_rollups, refresh_rollups
+
+
+def parse_month(value):
+    """Parse YYYY-MM into the first day of the month."""
+    return datetime.strptime(value, '%Y-%m').date()
+
+
+class Command(BaseCommand):
+    help = 'Rebuild monthly publication/execution rollups'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--data-type', choices=list(ROLLUPS), help='Rollup to rebuild (default: all)')
+        parser.add_argument(
+            '--month', type=parse_month, action='append', default=[],
+            help='Rebuild only this month (YYYY-MM, repeatable)'
+        )
+
+    def handle(self, *args, **options):
+        if options['month']:
+            data_types = [options['data_type']] if options['data_type'] else list(ROLLUPS)
+            written = {
+                data_type: refresh_rollups(data_type, options['month'])
+                for data_type in data_types
+            }
+        else:
+            written = rebuild_rollups(options['data_type'])
+
+        for data_type, rows in written.items():
+            self.stdout.write(self.style.SUCCESS(f'{data_type}: {rows} rollup rows written'))
@@ -0,0 +1,27 @@
+"""
+Rebuild approximate-count sketches from the base tables.
+
+Uploads store a new sketch version each time; run this to build the first
+version, or after data was changed outside the upload pipeline.
+
+Usage:
+    python manage.py refresh_sketches
+    python manage.py refresh_sketches --name publication.first_author
+"""
+from django.core.management.base import BaseCommand
+
+from apps.analytics.sketches import SKETCHES, rebuild_sketch
+
+
+class Command(BaseCommand):
+    help = 'Rebuild HyperLogLog / Count-Min sketches for dashboard tiles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--name', choices=list(SKETCHES), help='Sketch to rebuild (default: all)')
+
+    def handle(self, *args, **options):
+        names = [options['name']] if options['name'] else list(SKETCHES)
+
+        for name in names:
+            record = rebuild_sketch(name)
+            self.stdout.write(self.style.SUCCESS(f'{name}: {record.row_count} rows sketched'))
@@ -0,0 +1,40 @@
+"""
+Migration to align the test upload_history table with the Supabase schema.
+
+0001 created upload_history with legacy columns (file_type, uploaded_by_id,
+upload_status) that the UploadHistory model does not use.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def recreate_upload_history_table(apps, schema_editor):
+    """Recreate upload_history matching supabase/migrations/*_initial_schema.sql"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only recreate table for test database
+        schema_editor.execute("DROP TABLE IF EXISTS upload_history")
+        schema_editor.execute("""
+            CREATE TABLE upload_history (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                user_id INTEGER NOT NULL,
+                file_name VARCHAR(255) NOT NULL,
+                file_size BIGINT NOT NULL,
+                data_type VARCHAR(50) NOT NULL,
+                upload_date TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                status VARCHAR(20) NOT NULL,
+                rows_processed INTEGER,
+                error_message TEXT,
+                FOREIGN KEY (user_id) REFERENCES users (id)
+            )
+        """)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0001_create_test_tables'),
+        ('authentication', '0003_align_test_users_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(recreate_upload_history_table, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+"""
+Migration to create the upload_fingerprints table for testing.
+Mirrors supabase/migrations/20261019000000_upload_fingerprints.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def create_fingerprint_table(apps, schema_editor):
+    """Create upload_fingerprints and add upload_history.diff_summary"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create tables for test database
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS upload_fingerprints (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                data_type VARCHAR(50) NOT NULL,
+                row_key VARCHAR(255) NOT NULL,
+                row_hash VARCHAR(16) NOT NULL,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (data_type, row_key)
+            )
+        """)
+        schema_editor.execute("ALTER TABLE upload_history ADD COLUMN diff_summary TEXT")
+
+
+def drop_fingerprint_table(apps, schema_editor):
+    """Drop upload_fingerprints"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        schema_editor.execute("DROP TABLE IF EXISTS upload_fingerprints")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0002_align_test_upload_history_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_fingerprint_table, drop_fingerprint_table),
+    ]
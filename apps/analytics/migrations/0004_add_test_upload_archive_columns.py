@@ -0,0 +1,27 @@
+"""
+Migration to add upload archive columns to the test upload_history table.
+Mirrors supabase/migrations/20261019000100_upload_archive.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def add_archive_columns(apps, schema_editor):
+    """Add upload_history.content_hash and upload_history.sheet_name"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only alter tables for test database
+        schema_editor.execute("ALTER TABLE upload_history ADD COLUMN content_hash VARCHAR(64)")
+        schema_editor.execute("ALTER TABLE upload_history ADD COLUMN sheet_name VARCHAR(255)")
+        schema_editor.execute(
+            "CREATE INDEX idx_upload_content_hash ON upload_history(content_hash, sheet_name, status)"
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0003_create_test_fingerprint_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_archive_columns, migrations.RunPython.noop),
+    ]
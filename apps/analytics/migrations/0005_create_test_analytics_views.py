@@ -0,0 +1,81 @@
+"""
+Migration to create the analytics views for testing.
+
+SQLite equivalents of v_project_execution_rate, v_department_student_stats
+and v_publication_stats from supabase/migrations/20251102000000_initial_schema.sql
+(SUM(CASE ...) instead of COUNT(*) FILTER, strftime instead of EXTRACT).
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def create_analytics_views(apps, schema_editor):
+    """Create analytics views for testing"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create views for test database
+
+        # Project execution rate view
+        schema_editor.execute("""
+            CREATE VIEW v_project_execution_rate AS
+            SELECT
+                p.id,
+                p.project_number,
+                p.project_name,
+                p.principal_investigator,
+                p.department,
+                p.funding_agency,
+                p.total_budget,
+                COALESCE(SUM(e.amount), 0) AS total_executed,
+                CASE
+                    WHEN p.total_budget > 0 THEN
+                        ROUND(CAST(COALESCE(SUM(e.amount), 0) AS REAL) / p.total_budget * 100, 2)
+                    ELSE 0
+                END AS execution_rate_percent
+            FROM research_projects p
+            LEFT JOIN execution_records e ON p.id = e.project_id
+            GROUP BY p.id, p.project_number, p.project_name, p.principal_investigator,
+                     p.department, p.funding_agency, p.total_budget
+        """)
+
+        # Department student stats view
+        schema_editor.execute("""
+            CREATE VIEW v_department_student_stats AS
+            SELECT
+                college,
+                department,
+                COUNT(*) AS total_students,
+                SUM(CASE WHEN enrollment_status = '재학' THEN 1 ELSE 0 END) AS enrolled_students,
+                SUM(CASE WHEN enrollment_status = '휴학' THEN 1 ELSE 0 END) AS leave_students,
+                SUM(CASE WHEN enrollment_status = '졸업' THEN 1 ELSE 0 END) AS graduated_students,
+                SUM(CASE WHEN gender = '남' THEN 1 ELSE 0 END) AS male_students,
+                SUM(CASE WHEN gender = '여' THEN 1 ELSE 0 END) AS female_students,
+                SUM(CASE WHEN program_type = '학사' THEN 1 ELSE 0 END) AS undergraduate_students,
+                SUM(CASE WHEN program_type = '석사' THEN 1 ELSE 0 END) AS graduate_students
+            FROM students
+            GROUP BY college, department
+        """)
+
+        # Publication stats view
+        schema_editor.execute("""
+            CREATE VIEW v_publication_stats AS
+            SELECT
+                CAST(strftime('%Y', publication_date) AS INTEGER) AS publication_year,
+                college,
+                department,
+                journal_grade,
+                COUNT(*) AS publication_count,
+                AVG(impact_factor) AS avg_impact_factor,
+                SUM(CASE WHEN project_linked = 'Y' THEN 1 ELSE 0 END) AS project_linked_count
+            FROM publications
+            GROUP BY strftime('%Y', publication_date), college, department, journal_grade
+        """)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0004_add_test_upload_archive_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_analytics_views, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,66 @@
+"""
+Migration to create the analytics indexes for testing.
+
+Mirrors the resulting index set of supabase/migrations/20251102000000_initial_schema.sql
+and 20261019000200_analytics_index_pack.sql so the EXPLAIN harness
+(apps/analytics/query_plans.py) sees the same access paths. SQLite has no
+INCLUDE clause, so covering columns are appended to the index key.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+TEST_INDEXES = [
+    # department_kpi
+    'CREATE INDEX idx_dept_kpi_year ON department_kpi(evaluation_year)',
+    'CREATE INDEX idx_dept_kpi_college_dept ON department_kpi(college, department)',
+    'CREATE INDEX idx_dept_kpi_dept_year ON department_kpi(department, evaluation_year DESC, employment_rate)',
+
+    # publications
+    'CREATE INDEX idx_pub_date ON publications(publication_date)',
+    'CREATE INDEX idx_pub_college_dept ON publications(college, department)',
+    'CREATE INDEX idx_pub_first_author ON publications(first_author)',
+    'CREATE INDEX idx_pub_dept_date ON publications(department, publication_date)',
+    'CREATE INDEX idx_pub_grade_if ON publications(journal_grade, impact_factor)',
+    # Same expression as the GROUP BY of the SQLite v_publication_stats view
+    "CREATE INDEX idx_pub_year_expr ON publications(strftime('%Y', publication_date), "
+    "college, department, journal_grade, impact_factor, project_linked)",
+
+    # research_projects
+    'CREATE INDEX idx_project_number ON research_projects(project_number)',
+    'CREATE INDEX idx_project_funding_agency ON research_projects(funding_agency)',
+    'CREATE INDEX idx_project_principal_investigator ON research_projects(principal_investigator)',
+    'CREATE INDEX idx_project_dept_budget ON research_projects(department, total_budget)',
+
+    # execution_records
+    'CREATE INDEX idx_exec_date ON execution_records(execution_date)',
+    'CREATE INDEX idx_exec_status ON execution_records(status)',
+    'CREATE INDEX idx_exec_project_amount ON execution_records(project_id, amount)',
+    'CREATE INDEX idx_exec_category_amount ON execution_records(expense_category, amount)',
+
+    # students
+    'CREATE INDEX idx_student_status ON students(enrollment_status)',
+    'CREATE INDEX idx_student_admission ON students(admission_year)',
+    'CREATE INDEX idx_student_advisor ON students(advisor)',
+    'CREATE INDEX idx_student_grade_program ON students(grade, program_type)',
+    'CREATE INDEX idx_student_dept_stats ON students(college, department, enrollment_status, gender, program_type)',
+    'CREATE INDEX idx_student_program ON students(program_type)',
+]
+
+
+def create_analytics_indexes(apps, schema_editor):
+    """Create analytics indexes for testing"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create indexes for test database
+        for statement in TEST_INDEXES:
+            schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0005_create_test_analytics_views'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_analytics_indexes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,61 @@
+"""
+Migration to create the monthly rollup tables for testing.
+Mirrors supabase/migrations/20261019000300_analytics_rollups.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def create_rollup_tables(apps, schema_editor):
+    """Create publication_rollups and execution_rollups"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create tables for test database
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS publication_rollups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                period_month DATE NOT NULL,
+                college VARCHAR(100) NOT NULL,
+                department VARCHAR(100) NOT NULL,
+                journal_grade VARCHAR(20) NOT NULL DEFAULT '',
+                publication_count INTEGER NOT NULL,
+                impact_factor_sum DECIMAL(14, 2) NOT NULL DEFAULT 0,
+                impact_factor_count INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (period_month, college, department, journal_grade)
+            )
+        """)
+        schema_editor.execute(
+            'CREATE INDEX idx_pub_rollup_dept_month ON publication_rollups(department, period_month)'
+        )
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS execution_rollups (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                period_month DATE NOT NULL,
+                department VARCHAR(100) NOT NULL,
+                expense_category VARCHAR(100) NOT NULL,
+                record_count INTEGER NOT NULL,
+                amount_sum BIGINT NOT NULL,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                UNIQUE (period_month, department, expense_category)
+            )
+        """)
+        schema_editor.execute(
+            'CREATE INDEX idx_exec_rollup_category_month ON execution_rollups(expense_category, period_month)'
+        )
+
+
+def drop_rollup_tables(apps, schema_editor):
+    """Drop rollup tables"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        schema_editor.execute("DROP TABLE IF EXISTS publication_rollups")
+        schema_editor.execute("DROP TABLE IF EXISTS execution_rollups")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0006_create_test_analytics_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_rollup_tables, drop_rollup_tables),
+    ]
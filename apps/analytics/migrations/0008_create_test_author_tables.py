@@ -0,0 +1,50 @@
+"""
+Migration to create the author index tables for testing.
+Mirrors supabase/migrations/20261019000500_publication_authors.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def create_author_tables(apps, schema_editor):
+    """Create authors and publication_authors"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create tables for test database
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS authors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name VARCHAR(100) NOT NULL UNIQUE,
+                department VARCHAR(100),
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        schema_editor.execute('CREATE INDEX idx_author_department ON authors(department, name)')
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS publication_authors (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                publication_id BIGINT NOT NULL REFERENCES publications(id) ON DELETE CASCADE,
+                author_id BIGINT NOT NULL REFERENCES authors(id) ON DELETE CASCADE,
+                position SMALLINT NOT NULL,
+                UNIQUE (publication_id, author_id)
+            )
+        """)
+        schema_editor.execute(
+            'CREATE INDEX idx_pub_author_author ON publication_authors(author_id, position, publication_id)'
+        )
+
+
+def drop_author_tables(apps, schema_editor):
+    """Drop author index tables"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        schema_editor.execute("DROP TABLE IF EXISTS publication_authors")
+        schema_editor.execute("DROP TABLE IF EXISTS authors")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0007_create_test_rollup_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_author_tables, drop_author_tables),
+    ]
@@ -0,0 +1,41 @@
+"""
+Migration to create the data_sketches table for testing.
+Mirrors supabase/migrations/20261019000600_data_sketches.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def create_sketch_table(apps, schema_editor):
+    """Create data_sketches"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create tables for test database
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS data_sketches (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                name VARCHAR(100) NOT NULL,
+                kind VARCHAR(20) NOT NULL,
+                upload_id BIGINT REFERENCES upload_history(id) ON DELETE SET NULL,
+                row_count BIGINT NOT NULL,
+                metadata TEXT NOT NULL DEFAULT '{}',
+                payload BLOB NOT NULL,
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+        schema_editor.execute('CREATE INDEX idx_sketch_name_id ON data_sketches(name, id DESC)')
+
+
+def drop_sketch_table(apps, schema_editor):
+    """Drop data_sketches"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        schema_editor.execute("DROP TABLE IF EXISTS data_sketches")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0008_create_test_author_tables'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sketch_table, drop_sketch_table),
+    ]
@@ -0,0 +1,39 @@
+"""
+Migration to add upload batch ids to the test data tables.
+Mirrors supabase/migrations/20261019000700_upload_batch_ids.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+BATCH_TABLES = [
+    ('department_kpi', 'idx_kpi_upload_batch'),
+    ('publications', 'idx_pub_upload_batch'),
+    ('research_projects', 'idx_project_upload_batch'),
+    ('execution_records', 'idx_exec_upload_batch'),
+    ('students', 'idx_student_upload_batch'),
+]
+
+
+def add_upload_batch_columns(apps, schema_editor):
+    """Add upload_batch_id with its partial index"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only alter tables for test database
+        for table, index in BATCH_TABLES:
+            schema_editor.execute(
+                f'ALTER TABLE {table} ADD COLUMN upload_batch_id BIGINT '
+                f'REFERENCES upload_history(id) ON DELETE SET NULL'
+            )
+            schema_editor.execute(
+                f'CREATE INDEX {index} ON {table}(upload_batch_id) WHERE upload_batch_id IS NOT NULL'
+            )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0009_create_test_sketch_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(add_upload_batch_columns, migrations.RunPython.noop),
+    ]
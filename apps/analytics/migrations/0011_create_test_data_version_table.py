@@ -0,0 +1,35 @@
+"""
+Migration to create the data_versions table for testing.
+Mirrors supabase/migrations/20261019000800_data_versions.sql.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def create_data_version_table(apps, schema_editor):
+    """Create data_versions"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only create tables for test database
+        schema_editor.execute("""
+            CREATE TABLE IF NOT EXISTS data_versions (
+                data_type VARCHAR(50) PRIMARY KEY,
+                version BIGINT NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+
+def drop_data_version_table(apps, schema_editor):
+    """Drop data_versions"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        schema_editor.execute("DROP TABLE IF EXISTS data_versions")
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('analytics', '0010_add_test_upload_batch_columns'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_data_version_table, drop_data_version_table),
+    ]
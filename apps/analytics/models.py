@@ -11,6 +11,18 @@ Models:
 - ExecutionRecord: Research budget execution details
 - Student: Student enrollment data
 - UploadHistory: File upload tracking
+- UploadFingerprint: Per-row content hashes for incremental uploads
+- PublicationRollup: Monthly publication counts (maintained by uploads)
+- ExecutionRollup: Monthly execution amounts (maintained by uploads)
+- Author: Normalized author names (maintained by uploads)
+- PublicationAuthor: Publication-author links (maintained by uploads)
+- DataSketch: HyperLogLog / Count-Min sketches per data version
+- DataVersion: Change counter per data type (see apps.analytics.versions)
+
+Read-only models over database views (managed=False, never written):
+- ProjectExecutionRate: v_project_execution_rate
+- DepartmentStudentStats: v_department_student_stats
+- PublicationStats: v_publication_stats
 """
 from django.db import models
 from django.utils import timezone
@@ -79,6 +91,17 @@ class DepartmentKPI(models.Model):
         verbose_name='생성일시'
     )
 
+    upload_batch = models.ForeignKey(
+        'UploadHistory',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='upload_batch_id',
+        related_name='+',
+        verbose_name='업로드 배치',
+        help_text='Upload that inserted this row (see apps.data_upload.revert)'
+    )
+
     class Meta:
         db_table = 'department_kpi'
         managed = False  # Supabase manages schema
@@ -180,6 +203,17 @@ class Publication(models.Model):
         verbose_name='생성일시'
     )
 
+    upload_batch = models.ForeignKey(
+        'UploadHistory',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='upload_batch_id',
+        related_name='+',
+        verbose_name='업로드 배치',
+        help_text='Upload that inserted this row (see apps.data_upload.revert)'
+    )
+
     class Meta:
         db_table = 'publications'
         managed = False  # Supabase manages schema
@@ -238,6 +272,17 @@ class ResearchProject(models.Model):
         verbose_name='수정일시'
     )
 
+    upload_batch = models.ForeignKey(
+        'UploadHistory',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='upload_batch_id',
+        related_name='+',
+        verbose_name='업로드 배치',
+        help_text='Upload that first created this project (see apps.data_upload.revert)'
+    )
+
     class Meta:
         db_table = 'research_projects'
         managed = False  # Supabase manages schema
@@ -306,6 +351,17 @@ class ExecutionRecord(models.Model):
         verbose_name='생성일시'
     )
 
+    upload_batch = models.ForeignKey(
+        'UploadHistory',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='upload_batch_id',
+        related_name='+',
+        verbose_name='업로드 배치',
+        help_text='Upload that inserted this row (see apps.data_upload.revert)'
+    )
+
     class Meta:
         db_table = 'execution_records'
         managed = False  # Supabase manages schema
@@ -417,6 +473,17 @@ class Student(models.Model):
         verbose_name='수정일시'
     )
 
+    upload_batch = models.ForeignKey(
+        'UploadHistory',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        db_column='upload_batch_id',
+        related_name='+',
+        verbose_name='업로드 배치',
+        help_text='Upload that inserted this row (see apps.data_upload.revert)'
+    )
+
     class Meta:
         db_table = 'students'
         managed = False  # Supabase manages schema
@@ -445,6 +512,8 @@ class UploadHistory(models.Model):
     STATUS_CHOICES = [
         ('success', 'Success'),
         ('failed', 'Failed'),
+        ('reverted', 'Reverted'),
+        ('in_progress', 'In progress'),
     ]
 
     id = models.BigAutoField(primary_key=True)
@@ -494,6 +563,27 @@ class UploadHistory(models.Model):
         verbose_name='오류 메시지',
         help_text='Error message (failure case)'
     )
+    diff_summary = models.JSONField(
+        null=True,
+        blank=True,
+        verbose_name='변경 요약',
+        help_text='Incremental upload diff counts (inserted/changed/deleted/unchanged)'
+    )
+    content_hash = models.CharField(
+        max_length=64,
+        null=True,
+        blank=True,
+        db_index=True,
+        verbose_name='파일 해시',
+        help_text='SHA-256 of the archived source file'
+    )
+    sheet_name = models.CharField(
+        max_length=255,
+        null=True,
+        blank=True,
+        verbose_name='시트명',
+        help_text='Worksheet name for multi-sheet workbook parts'
+    )
 
     class Meta:
         db_table = 'upload_history'
@@ -504,3 +594,384 @@ class UploadHistory(models.Model):
 
     def __str__(self):
         return f'{self.file_name} - {self.data_type} ({self.status})'
+
+
+class UploadFingerprint(models.Model):
+    """
+    Content hash of one ingested row, keyed by its business key.
+
+    Maps to: upload_fingerprints table
+    Primary purpose: Diff new uploads against previously ingested data
+    so only inserted/changed/deleted rows are written
+    """
+    id = models.BigAutoField(primary_key=True)
+    data_type = models.CharField(
+        max_length=50,
+        choices=UploadHistory.DATA_TYPE_CHOICES,
+        verbose_name='데이터 타입',
+        help_text='Type of data the row belongs to'
+    )
+    row_key = models.CharField(
+        max_length=255,
+        verbose_name='행 키',
+        help_text='Business key (e.g., publication_id, or year|college|department for KPI)'
+    )
+    row_hash = models.CharField(
+        max_length=16,
+        verbose_name='행 해시',
+        help_text='64-bit content hash of the row (hex)'
+    )
+    updated_at = models.DateTimeField(
+        default=timezone.now,
+        verbose_name='수정일시'
+    )
+
+    class Meta:
+        db_table = 'upload_fingerprints'
+        managed = False  # Supabase manages schema
+        verbose_name = '업로드 행 지문'
+        verbose_name_plural = '업로드 행 지문 목록'
+        unique_together = [('data_type', 'row_key')]
+
+    def __str__(self):
+        return f'{self.data_type}:{self.row_key}'
+
+
+class ReadOnlyViewModel(models.Model):
+    """
+    Base class for models over database views.
+
+    Views are read-only; saving or deleting raises NotImplementedError.
+    """
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        raise NotImplementedError(f'{self._meta.db_table} is a read-only view')
+
+    def delete(self, *args, **kwargs):
+        raise NotImplementedError(f'{self._meta.db_table} is a read-only view')
+
+
+class ProjectExecutionRate(ReadOnlyViewModel):
+    """
+    Per-project budget execution totals.
+
+    Maps to: v_project_execution_rate view (one row per research project)
+    Primary purpose: Execution rates computed in one scan by the database
+    """
+    id = models.BigIntegerField(primary_key=True)  # research_projects.id
+    project_number = models.CharField(max_length=50, verbose_name='과제번호')
+    project_name = models.CharField(max_length=300, verbose_name='과제명')
+    principal_investigator = models.CharField(max_length=100, verbose_name='연구책임자')
+    department = models.CharField(max_length=100, verbose_name='소속학과')
+    funding_agency = models.CharField(max_length=100, verbose_name='지원기관')
+    total_budget = models.BigIntegerField(verbose_name='총연구비')
+    total_executed = models.BigIntegerField(verbose_name='집행금액 합계')
+    execution_rate_percent = models.DecimalField(
+        max_digits=10,
+        decimal_places=2,
+        verbose_name='집행률 (%)',
+        help_text='Rounded by the database (half away from zero)'
+    )
+
+    class Meta:
+        db_table = 'v_project_execution_rate'
+        managed = False  # Supabase manages schema
+        verbose_name = '과제별 집행률'
+        verbose_name_plural = '과제별 집행률 목록'
+
+    def __str__(self):
+        return f'{self.project_number}: {self.execution_rate_percent}%'
+
+
+class DepartmentStudentStats(ReadOnlyViewModel):
+    """
+    Student counts per college/department.
+
+    Maps to: v_department_student_stats view
+    The view has no key column; department is declared as the primary key
+    only to satisfy Django. Query it with values()/aggregate().
+    """
+    college = models.CharField(max_length=100, verbose_name='단과대학')
+    department = models.CharField(max_length=100, primary_key=True, verbose_name='학과')
+    total_students = models.IntegerField(verbose_name='전체 학생 수')
+    enrolled_students = models.IntegerField(verbose_name='재학생 수')
+    leave_students = models.IntegerField(verbose_name='휴학생 수')
+    graduated_students = models.IntegerField(verbose_name='졸업생 수')
+    male_students = models.IntegerField(verbose_name='남학생 수')
+    female_students = models.IntegerField(verbose_name='여학생 수')
+    undergraduate_students = models.IntegerField(verbose_name='학사과정 학생 수')
+    graduate_students = models.IntegerField(verbose_name='석사과정 학생 수')
+
+    class Meta:
+        db_table = 'v_department_student_stats'
+        managed = False  # Supabase manages schema
+        verbose_name = '학과별 학생 통계'
+        verbose_name_plural = '학과별 학생 통계 목록'
+
+    def __str__(self):
+        return f'{self.college} {self.department}: {self.total_students}명'
+
+
+class PublicationStats(ReadOnlyViewModel):
+    """
+    Publication counts per year/college/department/journal grade.
+
+    Maps to: v_publication_stats view
+    The view has no key column; publication_year is declared as the
+    primary key only to satisfy Django. Query it with values()/aggregate().
+    """
+    publication_year = models.IntegerField(primary_key=True, verbose_name='게재년도')
+    college = models.CharField(max_length=100, verbose_name='단과대학')
+    department = models.CharField(max_length=100, verbose_name='학과')
+    journal_grade = models.CharField(max_length=20, null=True, verbose_name='저널등급')
+    publication_count = models.IntegerField(verbose_name='논문 수')
+    avg_impact_factor = models.DecimalField(
+        max_digits=10,
+        decimal_places=3,
+        null=True,
+        verbose_name='평균 Impact Factor'
+    )
+    project_linked_count = models.IntegerField(verbose_name='과제연계 논문 수')
+
+    class Meta:
+        db_table = 'v_publication_stats'
+        managed = False  # Supabase manages schema
+        verbose_name = '논문 게재 통계'
+        verbose_name_plural = '논문 게재 통계 목록'
+
+    def __str__(self):
+        return f'{self.publication_year} {self.department} {self.journal_grade}: {self.publication_count}'
+
+
+class PublicationRollup(models.Model):
+    """
+    Monthly publication counts per college/department/journal grade.
+
+    Maps to: publication_rollups table
+    Primary purpose: Serve publication trends without grouping the whole
+    publications table. Rows are rebuilt per touched month by the upload
+    pipeline (see apps.analytics.rollups).
+    """
+    id = models.BigAutoField(primary_key=True)
+    period_month = models.DateField(
+        verbose_name='기준월',
+        help_text='First day of the month'
+    )
+    college = models.CharField(max_length=100, verbose_name='단과대학')
+    department = models.CharField(max_length=100, verbose_name='학과')
+    journal_grade = models.CharField(
+        max_length=20,
+        blank=True,
+        default='',
+        verbose_name='저널등급',
+        help_text="Empty string for publications without a grade"
+    )
+    publication_count = models.IntegerField(verbose_name='논문 수')
+    impact_factor_sum = models.DecimalField(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        verbose_name='Impact Factor 합계'
+    )
+    impact_factor_count = models.IntegerField(
+        default=0,
+        verbose_name='Impact Factor 보유 논문 수'
+    )
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name='수정일시')
+
+    class Meta:
+        db_table = 'publication_rollups'
+        managed = False  # Supabase manages schema
+        verbose_name = '월별 논문 집계'
+        verbose_name_plural = '월별 논문 집계 목록'
+        unique_together = [('period_month', 'college', 'department', 'journal_grade')]
+
+    def __str__(self):
+        return f'{self.period_month:%Y-%m} {self.department} {self.journal_grade}: {self.publication_count}'
+
+
+class ExecutionRollup(models.Model):
+    """
+    Monthly execution amounts per department/expense category.
+
+    Maps to: execution_rollups table
+    Primary purpose: Serve spending trends without grouping the whole
+    execution_records table. department is the project's department
+    (research projects have no college).
+    """
+    id = models.BigAutoField(primary_key=True)
+    period_month = models.DateField(
+        verbose_name='기준월',
+        help_text='First day of the month'
+    )
+    department = models.CharField(max_length=100, verbose_name='소속학과')
+    expense_category = models.CharField(max_length=100, verbose_name='집행항목')
+    record_count = models.IntegerField(verbose_name='집행 건수')
+    amount_sum = models.BigIntegerField(verbose_name='집행금액 합계')
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name='수정일시')
+
+    class Meta:
+        db_table = 'execution_rollups'
+        managed = False  # Supabase manages schema
+        verbose_name = '월별 집행 집계'
+        verbose_name_plural = '월별 집행 집계 목록'
+        unique_together = [('period_month', 'department', 'expense_category')]
+
+    def __str__(self):
+        return f'{self.period_month:%Y-%m} {self.department} {self.expense_category}: {self.amount_sum}'
+
+
+class Author(models.Model):
+    """
+    Normalized author names from publications.
+
+    Maps to: authors table
+    Primary purpose: Index first authors and co-authors (Publication.co_authors
+    is a semicolon separated TEXT field). department is the department of
+    the author's latest first-authored publication, None for authors who
+    only appear as co-authors (see apps.analytics.authors).
+    """
+    id = models.BigAutoField(primary_key=True)
+    name = models.CharField(
+        max_length=100,
+        unique=True,
+        verbose_name='저자명',
+        help_text='Author name (whitespace normalized)'
+    )
+    department = models.CharField(
+        max_length=100,
+        null=True,
+        blank=True,
+        verbose_name='소속학과',
+        help_text="Department of the author's latest first-authored publication"
+    )
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='생성일시')
+
+    class Meta:
+        db_table = 'authors'
+        managed = False  # Supabase manages schema
+        verbose_name = '저자'
+        verbose_name_plural = '저자 목록'
+        ordering = ['name']
+
+    def __str__(self):
+        return self.name
+
+
+class PublicationAuthor(models.Model):
+    """
+    Link between a publication and one of its authors.
+
+    Maps to: publication_authors table
+    Primary purpose: Per-author counts and co-authorship queries without
+    splitting co_authors. position 0 is the first author, co-authors keep
+    their 1-based position in co_authors.
+    """
+    id = models.BigAutoField(primary_key=True)
+    publication = models.ForeignKey(
+        Publication,
+        on_delete=models.CASCADE,
+        related_name='authorships',
+        verbose_name='논문'
+    )
+    author = models.ForeignKey(
+        Author,
+        on_delete=models.CASCADE,
+        related_name='authorships',
+        verbose_name='저자'
+    )
+    position = models.SmallIntegerField(
+        verbose_name='저자 순서',
+        help_text='0 = first author, 1.. = position in co-authors'
+    )
+
+    class Meta:
+        db_table = 'publication_authors'
+        managed = False  # Supabase manages schema
+        verbose_name = '논문 저자'
+        verbose_name_plural = '논문 저자 목록'
+        unique_together = [('publication', 'author')]
+
+    def __str__(self):
+        return f'{self.publication_id} - {self.author_id} ({self.position})'
+
+
+class DataSketch(models.Model):
+    """
+    Serialized approximate-count sketch of one column, per data version.
+
+    Maps to: data_sketches table
+    Primary purpose: Answer dashboard tiles (distinct counts, top-K) from a
+    HyperLogLog or Count-Min sketch instead of grouping the base table.
+    Each successful upload writes a new version; see apps.analytics.sketches.
+    """
+    KIND_CHOICES = [
+        ('hll', 'HyperLogLog'),
+        ('cms_topk', 'Count-Min top-K'),
+    ]
+
+    id = models.BigAutoField(primary_key=True)
+    name = models.CharField(
+        max_length=100,
+        verbose_name='스케치명',
+        help_text='Key of apps.analytics.sketches.SKETCHES (e.g. publication.first_author)'
+    )
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, verbose_name='종류')
+    upload = models.ForeignKey(
+        UploadHistory,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='sketches',
+        verbose_name='업로드',
+        help_text='Upload that produced this version (None for rebuilds)'
+    )
+    row_count = models.BigIntegerField(verbose_name='반영 행 수')
+    metadata = models.JSONField(
+        default=dict,
+        verbose_name='메타데이터',
+        help_text='Sketch parameters and top-K candidates'
+    )
+    payload = models.BinaryField(verbose_name='스케치 데이터')
+    created_at = models.DateTimeField(default=timezone.now, verbose_name='생성일시')
+
+    class Meta:
+        db_table = 'data_sketches'
+        managed = False  # Supabase manages schema
+        verbose_name = '근사 집계 스케치'
+        verbose_name_plural = '근사 집계 스케치 목록'
+        ordering = ['-id']
+
+    def __str__(self):
+        return f'{self.name} v{self.pk} ({self.row_count} rows)'
+
+
+class DataVersion(models.Model):
+    """
+    Change counter of one data type's tables.
+
+    Maps to: data_versions table
+    Primary purpose: Tag caches of the data (admin facets, columnar
+    snapshots) with a version every process sees. Writes bump it in their
+    transaction; see apps.analytics.versions.
+    """
+    data_type = models.CharField(
+        max_length=50,
+        primary_key=True,
+        choices=UploadHistory.DATA_TYPE_CHOICES,
+        verbose_name='데이터 타입'
+    )
+    version = models.BigIntegerField(default=0, verbose_name='버전')
+    updated_at = models.DateTimeField(default=timezone.now, verbose_name='수정일시')
+
+    class Meta:
+        db_table = 'data_versions'
+        managed = False  # Supabase manages schema
+        verbose_name = '데이터 버전'
+        verbose_name_plural = '데이터 버전 목록'
+
+    def __str__(self):
+        return f'{self.data_type} v{self.version}'
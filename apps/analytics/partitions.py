@@ -0,0 +1,238 @@
+"""
+Yearly range partitions of execution_records and publications.
+
+Partitioning is optional (supabase/optional/partition_by_year.sql) and
+PostgreSQL-only. Every helper here checks the catalog first and is a
+no-op on an unpartitioned table or another database, so callers such as
+the upload parsers don't need to know whether partitioning is enabled.
+
+- ensure_year_partitions(): create missing year partitions (uploads call
+  it for the years they load, so rows never land in the default partition)
+- ensure_future_partitions(): create partitions for the coming year(s)
+- detach_year_partition(): detach an old year. Detaching only changes the
+  catalog, so it is cheap. The table can then be moved to an archive schema
+  or dropped, optionally after exporting it to Parquet.
+
+    >>> ensure_future_partitions(ahead=1)
+    >>> detach_year_partition('execution_records', 2015, archive_schema='archive')
+"""
+import re
+from datetime import date
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.db import connection, transaction
+
+from apps.analytics.models import ExecutionRecord, Publication
+from apps.analytics.rollups import refresh_rollups
+from apps.analytics.versions import bump_data_version
+
+
+# table: (model, partition key date field, rollup data type)
+PARTITIONED_TABLES = {
+    'execution_records': (ExecutionRecord, 'execution_date', 'research_budget'),
+    'publications': (Publication, 'publication_date', 'publication'),
+}
+
+# table: (link table, column) rows that reference the table's id without a
+# foreign key once it is partitioned; deleted when a partition is detached
+PARTITION_LINKS = {
+    'publications': ('publication_authors', 'publication_id'),
+}
+
+# table: (key table, key column) enforcing global uniqueness of the business
+# key (maintained by triggers on the parent table); a detached partition's
+# keys are deleted so they can be loaded again
+PARTITION_KEYS = {
+    'execution_records': ('execution_record_keys', 'execution_id'),
+    'publications': ('publication_keys', 'publication_id'),
+}
+
+# pg_get_expr(relpartbound) of a yearly partition
+YEAR_BOUND = re.compile(r"FROM \('(?P<start>\d{4})-01-01'\) TO \('(?P<end>\d{4})-01-01'\)")
+
+
+class PartitionInfo(NamedTuple):
+    """One partition of a partitioned table."""
+    name: str
+    year: Optional[int]  # None for the default partition (or a non-yearly bound)
+    bound: str
+    estimated_rows: int
+
+
+def partition_name(table: str, year: int) -> str:
+    """Name of a year partition, e.g. execution_records_y2024."""
+    return f'{table}_y{year}'
+
+
+def partition_year(bound: str) -> Optional[int]:
+    """
+    Year of a partition bound expression, or None if it is not one year.
+
+    Example:
+        >>> partition_year("FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')")
+        2024
+    """
+    match = YEAR_BOUND.search(bound)
+    if match and int(match.group('end')) == int(match.group('start')) + 1:
+        return int(match.group('start'))
+    return None
+
+
+def _check_table(table: str) -> None:
+    if table not in PARTITIONED_TABLES:
+        raise ValueError(
+            f"Unknown partitioned table '{table}'. Available: {', '.join(PARTITIONED_TABLES)}"
+        )
+
+
+def is_partitioned(table: str) -> bool:
+    """Whether a table is a partitioned PostgreSQL table."""
+    _check_table(table)
+    if connection.vendor != 'postgresql':
+        return False
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            'SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)',
+            [table],
+        )
+        return cursor.fetchone() is not None
+
+
+def list_partitions(table: str) -> List[PartitionInfo]:
+    """Partitions of a table with their year and estimated row count."""
+    if not is_partitioned(table):
+        return []
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT c.relname, pg_get_expr(c.relpartbound, c.oid), GREATEST(c.reltuples, 0)::BIGINT
+            FROM pg_inherits i
+            JOIN pg_class c ON c.oid = i.inhrelid
+            WHERE i.inhparent = to_regclass(%s)
+            ORDER BY c.relname
+            """,
+            [table],
+        )
+        rows = cursor.fetchall()
+
+    return [
+        PartitionInfo(name, partition_year(bound), bound, estimated_rows)
+        for name, bound, estimated_rows in rows
+    ]
+
+
+def ensure_year_partitions(table: str, years: Iterable[int]) -> List[str]:
+    """
+    Create missing year partitions of a partitioned table.
+
+    Uses create_year_partition() from partition_by_year.sql, which also
+    moves matching rows out of the default partition.
+
+    Returns:
+        Names of partitions created (empty if the table is not partitioned)
+    """
+    if not is_partitioned(table):
+        return []
+
+    existing = {partition.year for partition in list_partitions(table)}
+    created = []
+    with connection.cursor() as cursor:
+        for year in sorted(set(years) - existing):
+            cursor.execute('SELECT create_year_partition(%s, %s)', [table, year])
+            created.append(cursor.fetchone()[0])
+    return created
+
+
+def ensure_future_partitions(ahead: int = 1, today: Optional[date] = None) -> Dict[str, List[str]]:
+    """
+    Create partitions from the current year through `ahead` years ahead.
+
+    Meant to run periodically (manage.py manage_partitions ensure).
+
+    Returns:
+        Dict of table -> partitions created
+    """
+    year = (today or date.today()).year
+    years = range(year, year + ahead + 1)
+    return {table: ensure_year_partitions(table, years) for table in PARTITIONED_TABLES}
+
+
+def detach_year_partition(
+    table: str,
+    year: int,
+    archive_schema: Optional[str] = None,
+    drop: bool = False,
+) -> str:
+    """
+    Detach a year partition so its rows leave the table.
+
+    The detached table is kept as-is, moved to archive_schema, or dropped.
+    Link rows pointing at its rows (PARTITION_LINKS), its business keys
+    (PARTITION_KEYS) and their upload fingerprints are deleted, rollup
+    months of the year are rebuilt and the data version is bumped, all in
+    the same transaction.
+
+    Args:
+        table: Partitioned table name
+        year: Partition year
+        archive_schema: Schema to move the detached table to (created if missing)
+        drop: Drop the detached table
+
+    Returns:
+        Qualified name of the detached table ('' if dropped)
+
+    Raises:
+        ValueError: If the table is not partitioned or has no such partition
+    """
+    if not is_partitioned(table):
+        raise ValueError(f'{table} is not partitioned')
+
+    name = partition_name(table, year)
+    if name not in {partition.name for partition in list_partitions(table)}:
+        raise ValueError(f'{table} has no partition for {year}')
+
+    qn = connection.ops.quote_name
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(f'ALTER TABLE {qn(table)} DETACH PARTITION {qn(name)}')
+        if table in PARTITION_LINKS:
+            link_table, link_column = PARTITION_LINKS[table]
+            cursor.execute(
+                f'DELETE FROM {qn(link_table)} WHERE {qn(link_column)} IN (SELECT id FROM {qn(name)})'
+            )
+        key_table, key_column = PARTITION_KEYS[table]
+        cursor.execute(
+            f'DELETE FROM {qn(key_table)} WHERE {qn(key_column)} IN (SELECT {qn(key_column)} FROM {qn(name)})'
+        )
+        _, _, data_type = PARTITIONED_TABLES[table]
+        cursor.execute(
+            f'DELETE FROM upload_fingerprints WHERE data_type = %s '
+            f'AND row_key IN (SELECT {qn(key_column)} FROM {qn(name)})',
+            [data_type]
+        )
+        if drop:
+            cursor.execute(f'DROP TABLE {qn(name)}')
+            detached = ''
+        elif archive_schema:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {qn(archive_schema)}')
+            cursor.execute(f'ALTER TABLE {qn(name)} SET SCHEMA {qn(archive_schema)}')
+            detached = f'{archive_schema}.{name}'
+        else:
+            detached = name
+
+        refresh_rollups(data_type, [date(year, month, 1) for month in range(1, 13)])
+        bump_data_version(data_type)
+
+    return detached
+
+
+def prepare_partitions(model: type, dates: Iterable[date]) -> None:
+    """
+    Make sure year partitions exist for dates about to be bulk loaded.
+
+    No-op for models whose table is not partitioned.
+    """
+    table = model._meta.db_table
+    if table in PARTITIONED_TABLES:
+        ensure_year_partitions(table, {value.year for value in dates})
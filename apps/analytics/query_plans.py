@@ -0,0 +1,177 @@
+"""
+EXPLAIN harness for analytics queries.
+
+Captures the SQL issued by a callable (e.g. an aggregator method), runs
+EXPLAIN on every statement and reports how each base table is accessed:
+through an index, index-only (covering), or with a full table scan.
+
+Supports PostgreSQL (EXPLAIN text output) and SQLite (EXPLAIN QUERY PLAN),
+so the same assertions run against the test database and against a
+production-like database:
+
+    >>> from apps.analytics.query_plans import explain_callable, full_scans
+    >>> plans = explain_callable(PublicationAggregator().get_publications_by_journal_grade)
+    >>> full_scans(plans)
+    []
+"""
+import re
+from typing import Any, Callable, List, NamedTuple, Optional
+
+from django.db import connection
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
+
+
+class TableAccess(NamedTuple):
+    """How one base table is read by a query plan."""
+    table: str
+    index: Optional[str]  # None for a full table scan
+    index_only: bool
+    detail: str
+
+
+class QueryPlan(NamedTuple):
+    """EXPLAIN output of one captured statement."""
+    sql: str
+    lines: List[str]
+    accesses: List[TableAccess]
+
+
+# SQLite: "SCAN t", "SCAN t USING COVERING INDEX i", "SEARCH t USING INDEX i (a=?)",
+# "SEARCH t USING INTEGER PRIMARY KEY (rowid=?)"
+SQLITE_ACCESS = re.compile(
+    r'^(?:SCAN|SEARCH) (?P<table>\w+)'
+    r'(?: USING (?P<kind>(?:AUTOMATIC )?(?:PARTIAL )?COVERING INDEX|INDEX|INTEGER PRIMARY KEY|PRIMARY KEY)'
+    r'(?: (?P<index>\w+))?)?'
+)
+
+# PostgreSQL: "Seq Scan on t", "Index Scan using i on t", "Index Only Scan using i on t",
+# "Bitmap Index Scan on i" (followed by "Bitmap Heap Scan on t")
+POSTGRES_ACCESS = re.compile(
+    r'(?P<kind>Seq Scan|Index Only Scan|Index Scan|Bitmap Heap Scan)'
+    r'(?: Backward)?(?: using (?P<index>\w+))? on (?P<table>\w+)'
+)
+POSTGRES_BITMAP_INDEX = re.compile(r'Bitmap Index Scan on (?P<index>\w+)')
+
+
+def view_names() -> List[str]:
+    """Names of database views in the current database."""
+    all_names = set(connection.introspection.table_names(include_views=True))
+    return sorted(all_names - set(connection.introspection.table_names(include_views=False)))
+
+
+def explain_sql(sql: str) -> List[str]:
+    """
+    Run EXPLAIN on an SQL statement with parameters already inlined.
+
+    Returns:
+        Plan lines (SQLite: the detail column of EXPLAIN QUERY PLAN)
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}')
+            return [row[-1] for row in cursor.fetchall()]
+        if connection.vendor == 'postgresql':
+            cursor.execute(f'EXPLAIN {sql}')
+            return [row[0] for row in cursor.fetchall()]
+    raise NotImplementedError(f'EXPLAIN parsing is not supported for {connection.vendor}')
+
+
+def parse_plan(lines: List[str], vendor: Optional[str] = None) -> List[TableAccess]:
+    """
+    Extract base table accesses from EXPLAIN lines.
+
+    Scans of views/subqueries (e.g. SQLite co-routines) are skipped; the
+    tables inside them are reported instead. SQLite reports aliased tables
+    by their alias (e.g. 'p' for research_projects in a view).
+
+    Args:
+        lines: EXPLAIN output lines
+        vendor: 'sqlite' or 'postgresql' (default: current connection)
+    """
+    views = set(view_names())
+    accesses = []
+
+    if (vendor or connection.vendor) == 'sqlite':
+        for line in lines:
+            match = SQLITE_ACCESS.match(line.strip())
+            if not match or match.group('table') in views or match.group('table') == 'CONSTANT':
+                continue
+            kind = match.group('kind') or ''
+            index = match.group('index') or (kind if 'PRIMARY KEY' in kind else None)
+            accesses.append(TableAccess(
+                table=match.group('table'),
+                index=index,
+                index_only='COVERING' in kind,
+                detail=line.strip(),
+            ))
+        return accesses
+
+    bitmap_index = None
+    for line in lines:
+        bitmap = POSTGRES_BITMAP_INDEX.search(line)
+        if bitmap:
+            bitmap_index = bitmap.group('index')
+            continue
+
+        match = POSTGRES_ACCESS.search(line)
+        if not match or match.group('table') in views:
+            continue
+        kind = match.group('kind')
+        index = match.group('index')
+        if kind == 'Bitmap Heap Scan':
+            index = bitmap_index
+        accesses.append(TableAccess(
+            table=match.group('table'),
+            index=None if kind == 'Seq Scan' else index,
+            index_only=kind == 'Index Only Scan',
+            detail=line.strip(),
+        ))
+    return accesses
+
+
+def explain_queryset(queryset: QuerySet) -> QueryPlan:
+    """EXPLAIN the SQL of a queryset."""
+    with CaptureQueriesContext(connection) as context:
+        list(queryset)
+    return explain_statements([query['sql'] for query in context.captured_queries])[0]
+
+
+def explain_statements(statements: List[str]) -> List[QueryPlan]:
+    """EXPLAIN SELECT statements (others, e.g. SAVEPOINT, are skipped)."""
+    plans = []
+    for sql in statements:
+        if not sql.lstrip().upper().startswith('SELECT'):
+            continue
+        lines = explain_sql(sql)
+        plans.append(QueryPlan(sql=sql, lines=lines, accesses=parse_plan(lines)))
+    return plans
+
+
+def explain_callable(func: Callable[[], Any]) -> List[QueryPlan]:
+    """
+    Run a callable and EXPLAIN every SELECT it issues.
+
+    Returned querysets are evaluated so lazy results are captured too.
+
+    Args:
+        func: Zero-argument callable (e.g. a bound aggregator method)
+
+    Returns:
+        One QueryPlan per SELECT statement
+    """
+    with CaptureQueriesContext(connection) as context:
+        result = func()
+        if isinstance(result, QuerySet):
+            list(result)
+    return explain_statements([query['sql'] for query in context.captured_queries])
+
+
+def full_scans(plans: List[QueryPlan]) -> List[TableAccess]:
+    """Table accesses that read a base table without any index."""
+    return [access for plan in plans for access in plan.accesses if access.index is None]
+
+
+def indexes_used(plans: List[QueryPlan]) -> List[str]:
+    """Names of indexes used by the plans (in order of appearance)."""
+    return [access.index for plan in plans for access in plan.accesses if access.index]
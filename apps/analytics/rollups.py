@@ -0,0 +1,205 @@
+"""
+Pre-aggregated monthly rollups of publications and execution records.
+
+Trend charts group publications and execution records by period. Instead
+of grouping the whole base table on every request, monthly rollup tables
+hold count / sum / impact-factor sum+count per (month, dimensions):
+
+- publication_rollups: (month, college, department, journal_grade)
+- execution_rollups: (month, department, expense_category)
+
+Rollups are maintained incrementally: an upload records the months of
+the rows it inserts or deletes, and only those months are rebuilt from the
+base table (a range scan on the date index) in the upload's transaction.
+Coarser periods (quarter, year) are sums of months.
+
+    >>> refresh_rollups('publication', [date(2023, 3, 15)])
+    >>> rebuild_rollups()  # Backfill / repair everything
+"""
+from datetime import date
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+import pandas as pd
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
+
+from apps.analytics.filters import filter_by_period
+from apps.analytics.models import (
+    ExecutionRecord,
+    ExecutionRollup,
+    Publication,
+    PublicationRollup,
+)
+
+
+ROLLUP_BATCH_SIZE = 1000
+
+
+class RollupSpec(NamedTuple):
+    """A monthly rollup table and how it is computed from its base table."""
+    model: type  # Rollup model
+    source: type  # Base table model
+    date_field: str  # Base table date bucketed by month
+    dimensions: Tuple[Tuple[str, str], ...]  # (rollup field, base table lookup)
+    measures: Tuple[Tuple[str, Any], ...]  # (rollup field, aggregate)
+
+
+# Keyed by UploadHistory data type
+ROLLUPS: Dict[str, RollupSpec] = {
+    'publication': RollupSpec(
+        model=PublicationRollup,
+        source=Publication,
+        date_field='publication_date',
+        dimensions=(
+            ('college', 'college'),
+            ('department', 'department'),
+            ('journal_grade', 'journal_grade'),
+        ),
+        measures=(
+            ('publication_count', Count('id')),
+            ('impact_factor_sum', Sum('impact_factor')),
+            ('impact_factor_count', Count('impact_factor')),
+        ),
+    ),
+    'research_budget': RollupSpec(
+        model=ExecutionRollup,
+        source=ExecutionRecord,
+        date_field='execution_date',
+        dimensions=(
+            ('department', 'project__department'),
+            ('expense_category', 'expense_category'),
+        ),
+        measures=(
+            ('record_count', Count('id')),
+            ('amount_sum', Sum('amount')),
+        ),
+    ),
+}
+
+
+def month_start(value: Any) -> date:
+    """First day of the month of a date, datetime or pandas Timestamp."""
+    return date(value.year, value.month, 1)
+
+
+def next_month(month: date) -> date:
+    """First day of the following month."""
+    if month.month == 12:
+        return date(month.year + 1, 1, 1)
+    return date(month.year, month.month + 1, 1)
+
+
+def touched_months(values: Iterable[Any]) -> Set[date]:
+    """Months of the given dates (None/NaT are skipped)."""
+    return {month_start(value) for value in values if not pd.isna(value)}
+
+
+def month_runs(months: Iterable[date]) -> List[Tuple[date, date]]:
+    """
+    Group months into contiguous half-open [start, end) ranges.
+
+    Example:
+        >>> month_runs([date(2023, 1, 1), date(2023, 2, 1), date(2023, 5, 1)])
+        [(date(2023, 1, 1), date(2023, 3, 1)), (date(2023, 5, 1), date(2023, 6, 1))]
+    """
+    runs = []
+    for month in sorted(set(months)):
+        if runs and runs[-1][1] == month:
+            runs[-1] = (runs[-1][0], next_month(month))
+        else:
+            runs.append((month, next_month(month)))
+    return runs
+
+
+def get_rollup_spec(data_type: str) -> RollupSpec:
+    """
+    Look up the rollup of a data type.
+
+    Raises:
+        ValueError: If the data type has no rollup
+    """
+    try:
+        return ROLLUPS[data_type]
+    except KeyError:
+        raise ValueError(
+            f"No rollup for data type '{data_type}'. Available: {', '.join(ROLLUPS)}"
+        )
+
+
+def _build_rows(spec: RollupSpec, start: date, end: date) -> List[Any]:
+    """Aggregate the base table over [start, end) into unsaved rollup rows."""
+    lookups = [lookup for _, lookup in spec.dimensions]
+    groups = (
+        filter_by_period(spec.source.objects.all(), spec.date_field, start, end)
+        .annotate(rollup_month=TruncMonth(spec.date_field))
+        .values('rollup_month', *lookups)
+        .annotate(**dict(spec.measures))
+        .order_by()
+    )
+
+    now = timezone.now()
+    rows = []
+    for group in groups:
+        fields = {field: group[lookup] or '' for field, lookup in spec.dimensions}
+        fields.update({field: group[field] or 0 for field, _ in spec.measures})
+        rows.append(spec.model(
+            period_month=month_start(group['rollup_month']),
+            updated_at=now,
+            **fields,
+        ))
+    return rows
+
+
+def refresh_rollups(data_type: str, months: Iterable[Any]) -> int:
+    """
+    Rebuild the rollup rows of the given months from the base table.
+
+    Args:
+        data_type: UploadHistory data type (key of ROLLUPS)
+        months: Dates within the months to rebuild
+
+    Returns:
+        Number of rollup rows written
+    """
+    spec = get_rollup_spec(data_type)
+    written = 0
+
+    with transaction.atomic():
+        for start, end in month_runs(touched_months(months)):
+            spec.model.objects.filter(period_month__gte=start, period_month__lt=end).delete()
+            rows = _build_rows(spec, start, end)
+            spec.model.objects.bulk_create(rows, batch_size=ROLLUP_BATCH_SIZE)
+            written += len(rows)
+
+    return written
+
+
+def rebuild_rollups(data_type: Optional[str] = None) -> Dict[str, int]:
+    """
+    Rebuild rollups from scratch (backfill, or repair after direct edits).
+
+    Args:
+        data_type: Rebuild only this data type (default: all)
+
+    Returns:
+        Dict of data type -> rollup rows written
+    """
+    data_types = [data_type] if data_type else list(ROLLUPS)
+    written = {}
+
+    for name in data_types:
+        spec = get_rollup_spec(name)
+        with transaction.atomic():
+            spec.model.objects.all().delete()
+            bounds = spec.source.objects.aggregate(
+                first=Min(spec.date_field), last=Max(spec.date_field)
+            )
+            rows = []
+            if bounds['first'] is not None:
+                rows = _build_rows(spec, month_start(bounds['first']), next_month(month_start(bounds['last'])))
+                spec.model.objects.bulk_create(rows, batch_size=ROLLUP_BATCH_SIZE)
+        written[name] = len(rows)
+
+    return written
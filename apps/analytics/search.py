@@ -0,0 +1,164 @@
+"""
+Ranked search over publications (title, first author, journal name).
+
+Text is split into words and every word into its distinct character
+bigrams (one-character words are kept whole), so Korean titles can be
+searched without a morphological analyzer: '반도체' -> {'반도', '도체'}.
+A publication matches when it contains every bigram of the query.
+
+Fields are weighted like the tsvector weights in
+supabase/migrations/20261019000400_publication_search.sql
+(title A, first author B, journal name C).
+
+- PostgreSQL: GIN expression index idx_pub_search, ranked with ts_rank
+- Other databases (SQLite tests): NgramIndex, a pure-Python inverted index
+  built from the queryset with the same tokenization
+
+    >>> search_publications('반도체 공정', limit=10)
+"""
+import re
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db import connections
+from django.db.models import BooleanField, Case, FloatField, QuerySet, Value, When
+from django.db.models.expressions import RawSQL
+
+from apps.analytics.models import Publication
+
+
+# ts_rank default weights of A, B, C
+FIELD_WEIGHTS = {
+    'title': 1.0,
+    'first_author': 0.4,
+    'journal_name': 0.2,
+}
+
+SEARCH_VECTOR_SQL = 'publication_search_vector({table}.title, {table}.first_author, {table}.journal_name)'
+
+WORD_SEPARATOR = re.compile(r'[\W_]+')
+
+
+def bigrams(text: Optional[str]) -> List[str]:
+    """
+    Distinct search tokens of a text, in order of first occurrence.
+
+    Matches search_bigrams() in the SQL migration.
+
+    Example:
+        >>> bigrams('반도체 AI')
+        ['반도', '도체', 'ai']
+    """
+    grams = {}
+    for word in WORD_SEPARATOR.split((text or '').lower()):
+        if len(word) == 1:
+            grams[word] = None
+        for i in range(len(word) - 1):
+            grams[word[i:i + 2]] = None
+    return list(grams)
+
+
+class NgramIndex:
+    """
+    In-memory bigram inverted index over publications.
+
+    Each posting keeps the highest weight of the fields the bigram occurs
+    in. The score of a match is the mean weight over the query bigrams,
+    an approximation of ts_rank's ordering.
+    """
+
+    def __init__(self, weights: Dict[str, float] = FIELD_WEIGHTS):
+        self.weights = weights
+        self.postings: Dict[str, Dict[Any, float]] = defaultdict(dict)
+
+    def add(self, key: Any, fields: Dict[str, Optional[str]]) -> None:
+        """Index one document (fields by name; unknown fields are ignored)."""
+        for field, weight in self.weights.items():
+            for gram in bigrams(fields.get(field)):
+                postings = self.postings[gram]
+                if weight > postings.get(key, 0):
+                    postings[key] = weight
+
+    @classmethod
+    def from_queryset(cls, queryset: QuerySet, weights: Dict[str, float] = FIELD_WEIGHTS) -> 'NgramIndex':
+        """Build an index of a publication queryset keyed by primary key."""
+        index = cls(weights)
+        for row in queryset.values('pk', *weights).iterator():
+            index.add(row.pop('pk'), row)
+        return index
+
+    def search(self, query: str) -> List[Tuple[Any, float]]:
+        """
+        Keys containing every bigram of the query, best score first.
+
+        Returns:
+            List of (key, score); empty if the query has no tokens
+        """
+        grams = bigrams(query)
+        if not grams:
+            return []
+
+        postings = [self.postings.get(gram, {}) for gram in grams]
+        keys = set(min(postings, key=len))
+        for posting in postings:
+            keys.intersection_update(posting)
+
+        scores = [(key, sum(posting[key] for posting in postings) / len(grams)) for key in keys]
+        scores.sort(key=lambda item: -item[1])
+        return scores
+
+
+def search_queryset(queryset: QuerySet, query: str) -> QuerySet:
+    """
+    Restrict a publication queryset to search matches, annotated with `rank`.
+
+    Args:
+        queryset: Publication queryset (permission/period filters applied)
+        query: Search text
+
+    Returns:
+        Matching publications (unordered); none if the query has no tokens
+    """
+    no_matches = queryset.none().annotate(rank=Value(0.0, output_field=FloatField()))
+    if not bigrams(query):
+        return no_matches
+
+    connection = connections[queryset.db]
+    if connection.vendor == 'postgresql':
+        vector = SEARCH_VECTOR_SQL.format(table=connection.ops.quote_name(queryset.model._meta.db_table))
+        return queryset.filter(
+            RawSQL(f'{vector} @@ publication_search_query(%s)', [query], output_field=BooleanField())
+        ).annotate(
+            rank=RawSQL(f'ts_rank({vector}, publication_search_query(%s))', [query], output_field=FloatField())
+        )
+
+    matches = NgramIndex.from_queryset(queryset).search(query)
+    if not matches:
+        return no_matches
+    return queryset.filter(pk__in=[key for key, _ in matches]).annotate(
+        rank=Case(
+            *[When(pk=key, then=Value(score)) for key, score in matches],
+            output_field=FloatField(),
+        )
+    )
+
+
+def search_publications(
+    query: str,
+    limit: int = 20,
+    queryset: Optional[QuerySet] = None,
+) -> List[Publication]:
+    """
+    Best matching publications for a search text.
+
+    Args:
+        query: Search text
+        limit: Maximum number of results
+        queryset: Publications to search (default: all)
+
+    Returns:
+        Publications with a `rank` attribute, best rank then newest first
+    """
+    if queryset is None:
+        queryset = Publication.objects.all()
+    return list(search_queryset(queryset, query).order_by('-rank', '-publication_date', 'pk')[:limit])
@@ -0,0 +1,324 @@
+"""
+Approximate distinct counts and top-K for dashboard tiles.
+
+Tiles such as "number of departments" or "top first authors" would
+otherwise group the whole base table on every request. Instead, each
+successful upload stores a new version of small sketches in data_sketches
+(DataSketch):
+
+- HyperLogLog (distinct count), 2**14 one-byte registers (16 KB)
+- Count-Min sketch plus a candidate list (top-K), 5 x 2**16 32-bit
+  counters (1.3 MB)
+
+A regular upload only appends rows, so its values are added to the
+previous version. Incremental uploads delete rows, and sketches cannot
+forget values, so those rebuild from the table after their transaction
+commits. Rows changed outside
+uploads (admin edits) are reflected by manage.py refresh_sketches.
+
+Error bounds (N = rows sketched):
+
+- HyperLogLog: relative standard error 1.04 / sqrt(2**14) = 0.81%, so
+  about 95% of estimates are within 1.6% of the true count. Below
+  2.5 * 2**14 = 40,960 distinct values linear counting is used, which is
+  exact or off by a few at dashboard scales (tens to hundreds).
+- Count-Min: estimates never undercount, and overcount by at most
+  e / 2**16 * N = 0.0041% of N with probability 1 - e**-5 = 99.3% per
+  value. Top-K entries whose counts differ by less than that may be
+  swapped.
+
+Exact results stay available: the aggregators only use sketches when
+asked to (approximate=True or the ANALYTICS_APPROXIMATE_TILES setting)
+and fall back to exact queries when no sketch has been built yet.
+
+    >>> estimate_distinct('department_kpi.department')
+    >>> estimate_top('publication.first_author', 10)
+"""
+import math
+from functools import partial
+from itertools import islice
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from django.db import transaction
+
+from apps.analytics.models import DataSketch, DepartmentKPI, Publication
+
+
+SKETCH_CHUNK_SIZE = 50000
+SKETCH_VERSIONS_KEPT = 3
+
+HLL_PRECISION = 14
+CMS_WIDTH = 2 ** 16
+CMS_DEPTH = 5
+TOPK_CAPACITY = 100
+
+
+class SketchSpec(NamedTuple):
+    """A sketched column and where uploads find its values."""
+    data_type: str  # UploadHistory data type that changes the column
+    kind: str  # 'hll' or 'cms_topk'
+    model: type  # Base table model
+    field: str  # Base table column
+    column: str  # Upload DataFrame column (Korean template header)
+
+
+SKETCHES: Dict[str, SketchSpec] = {
+    'department_kpi.department': SketchSpec('department_kpi', 'hll', DepartmentKPI, 'department', '학과'),
+    'publication.first_author': SketchSpec('publication', 'cms_topk', Publication, 'first_author', '주저자'),
+}
+
+
+def hash_values(values: Iterable[Any]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    64-bit hashes of non-null values.
+
+    pandas' hash_array uses a fixed SipHash key, so hashes are stable
+    across processes and stored sketches stay valid.
+
+    Returns:
+        (values, hashes) with nulls dropped
+    """
+    values = pd.Series(list(values), dtype=object).dropna().to_numpy()
+    return values, pd.util.hash_array(values)
+
+
+class HyperLogLog:
+    """HyperLogLog distinct counter over 64-bit hashes."""
+
+    def __init__(self, precision: int = HLL_PRECISION, registers: Optional[np.ndarray] = None):
+        self.precision = precision
+        self.registers = registers if registers is not None else np.zeros(2 ** precision, dtype=np.uint8)
+
+    def add_hashes(self, hashes: np.ndarray) -> None:
+        """Add hashed values."""
+        if not len(hashes):
+            return
+        rest_bits = 64 - self.precision
+        index = (hashes >> np.uint64(rest_bits)).astype(np.int64)
+        rest = hashes & np.uint64((1 << rest_bits) - 1)
+        # Position of the leftmost 1 bit; rest < 2**53 is exact as float64
+        _, bit_length = np.frexp(rest.astype(np.float64))
+        rank = (rest_bits - bit_length + 1).astype(np.uint8)
+        np.maximum.at(self.registers, index, rank)
+
+    def estimate(self) -> int:
+        """Estimated number of distinct values."""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        raw = alpha * m * m / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if raw <= 2.5 * m and zeros:
+            return round(m * math.log(m / zeros))  # Linear counting
+        return round(raw)
+
+    def to_bytes(self) -> bytes:
+        return self.registers.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes, precision: int) -> 'HyperLogLog':
+        return cls(precision, np.frombuffer(payload, dtype=np.uint8).copy())
+
+
+class CountMinTopK:
+    """
+    Count-Min sketch with a list of heavy-hitter candidates.
+
+    After each batch, the batch's values are estimated against the
+    cumulative sketch and the best TOPK_CAPACITY estimates are kept. A
+    value is estimated at its last occurrence with all of its count, so
+    every value with a top estimate ends up in the list.
+    """
+
+    def __init__(self, width: int = CMS_WIDTH, depth: int = CMS_DEPTH,
+                 capacity: int = TOPK_CAPACITY, counters: Optional[np.ndarray] = None,
+                 candidates: Optional[Dict[str, int]] = None, total: int = 0):
+        self.width = width
+        self.depth = depth
+        self.capacity = capacity
+        self.counters = counters if counters is not None else np.zeros((depth, width), dtype=np.uint32)
+        self.candidates = dict(candidates or {})
+        self.total = total
+
+    def _columns(self, hashes: np.ndarray) -> np.ndarray:
+        """Counter column of each hash in each row (double hashing)."""
+        low = hashes & np.uint64(0xFFFFFFFF)
+        high = hashes >> np.uint64(32)
+        rows = np.arange(self.depth, dtype=np.uint64)[:, None]
+        return ((low[None, :] + rows * high[None, :]) % np.uint64(self.width)).astype(np.int64)
+
+    def estimate_hashes(self, hashes: np.ndarray) -> np.ndarray:
+        """Estimated counts of hashed values."""
+        columns = self._columns(hashes)
+        return self.counters[np.arange(self.depth)[:, None], columns].min(axis=0)
+
+    def add(self, values: Iterable[Any]) -> None:
+        """Count a batch of values and update the candidates."""
+        values, hashes = hash_values(values)
+        if not len(values):
+            return
+        columns = self._columns(hashes)
+        for row in range(self.depth):
+            np.add.at(self.counters[row], columns[row], 1)
+        self.total += len(values)
+
+        unique, first = np.unique(hashes, return_index=True)
+        estimates = self.estimate_hashes(unique)
+        for value, estimate in zip(values[first], estimates):
+            self.candidates[str(value)] = int(estimate)
+        self._prune()
+
+    def estimate(self, values: Iterable[Any]) -> List[int]:
+        """Estimated counts of values."""
+        _, hashes = hash_values(values)
+        return [int(count) for count in self.estimate_hashes(hashes)] if len(hashes) else []
+
+    def _prune(self) -> None:
+        if len(self.candidates) > self.capacity:
+            self.candidates = dict(self.top(self.capacity))
+
+    def top(self, n: int) -> List[Tuple[str, int]]:
+        """Top n (value, estimated count), highest first."""
+        return sorted(self.candidates.items(), key=lambda item: (-item[1], item[0]))[:n]
+
+    def to_bytes(self) -> bytes:
+        return self.counters.tobytes()
+
+    @classmethod
+    def from_bytes(cls, payload: bytes, metadata: Dict[str, Any]) -> 'CountMinTopK':
+        counters = np.frombuffer(payload, dtype=np.uint32).reshape(metadata['depth'], metadata['width']).copy()
+        return cls(
+            metadata['width'], metadata['depth'], metadata['capacity'], counters,
+            dict(metadata['candidates']), metadata['total'],
+        )
+
+
+def get_sketch_spec(name: str) -> SketchSpec:
+    """
+    Look up a sketch definition.
+
+    Raises:
+        ValueError: If no sketch has this name
+    """
+    try:
+        return SKETCHES[name]
+    except KeyError:
+        raise ValueError(f"Unknown sketch '{name}'. Available: {', '.join(SKETCHES)}")
+
+
+def _new_sketch(kind: str) -> Any:
+    return HyperLogLog() if kind == 'hll' else CountMinTopK()
+
+
+def _add_values(sketch: Any, values: Iterable[Any]) -> int:
+    """Add values to a sketch in chunks; returns the number of values read."""
+    iterator = iter(values)
+    read = 0
+    while True:
+        chunk = list(islice(iterator, SKETCH_CHUNK_SIZE))
+        if not chunk:
+            return read
+        read += len(chunk)
+        if isinstance(sketch, HyperLogLog):
+            sketch.add_hashes(hash_values(chunk)[1])
+        else:
+            sketch.add(chunk)
+
+
+def _serialize(sketch: Any) -> Tuple[Dict[str, Any], bytes]:
+    if isinstance(sketch, HyperLogLog):
+        return {'precision': sketch.precision}, sketch.to_bytes()
+    metadata = {
+        'width': sketch.width,
+        'depth': sketch.depth,
+        'capacity': sketch.capacity,
+        'total': sketch.total,
+        'candidates': sketch.top(sketch.capacity),
+    }
+    return metadata, sketch.to_bytes()
+
+
+def _deserialize(record: DataSketch) -> Any:
+    if record.kind == 'hll':
+        return HyperLogLog.from_bytes(bytes(record.payload), record.metadata['precision'])
+    return CountMinTopK.from_bytes(bytes(record.payload), record.metadata)
+
+
+def latest_sketch(name: str) -> Optional[DataSketch]:
+    """Current version of a sketch, or None if it was never built."""
+    get_sketch_spec(name)
+    return DataSketch.objects.filter(name=name).order_by('-id').first()
+
+
+def load_sketch(name: str) -> Optional[Any]:
+    """Current HyperLogLog / CountMinTopK of a sketch, or None."""
+    record = latest_sketch(name)
+    return _deserialize(record) if record else None
+
+
+def save_sketch(name: str, sketch: Any, row_count: int, upload: Any = None) -> DataSketch:
+    """Store a new version of a sketch and drop versions beyond SKETCH_VERSIONS_KEPT."""
+    spec = get_sketch_spec(name)
+    metadata, payload = _serialize(sketch)
+    with transaction.atomic():
+        record = DataSketch.objects.create(
+            name=name, kind=spec.kind, upload=upload, row_count=row_count,
+            metadata=metadata, payload=payload,
+        )
+        stale = DataSketch.objects.filter(name=name).order_by('-id').values_list('id', flat=True)[SKETCH_VERSIONS_KEPT:]
+        DataSketch.objects.filter(id__in=list(stale)).delete()
+    return record
+
+
+def rebuild_sketch(name: str, upload: Any = None) -> DataSketch:
+    """Build a sketch from a full read of its column."""
+    spec = get_sketch_spec(name)
+    sketch = _new_sketch(spec.kind)
+    values = spec.model.objects.order_by().values_list(spec.field, flat=True).iterator(chunk_size=SKETCH_CHUNK_SIZE)
+    row_count = _add_values(sketch, values)
+    return save_sketch(name, sketch, row_count, upload)
+
+
+def update_sketches(data_type: str, upload: Any = None, appended: Optional[pd.DataFrame] = None) -> List[DataSketch]:
+    """
+    Write new sketch versions after an upload of a data type.
+
+    Args:
+        data_type: UploadHistory data type of the upload
+        upload: UploadHistory row of the upload (the version)
+        appended: Rows the upload appended, when it only appended. The
+            previous version is extended with them; otherwise (or if there
+            is no previous version) sketches are rebuilt from the table.
+
+    Rebuilds read the whole column, so inside a transaction they run once
+    it commits (outside of it, and without its locks); a failed rebuild
+    is logged and leaves the previous version until refresh_sketches.
+
+    Returns:
+        New DataSketch versions written now (not the deferred rebuilds)
+    """
+    records = []
+    for name, spec in SKETCHES.items():
+        if spec.data_type != data_type:
+            continue
+        previous = latest_sketch(name)
+        if appended is None or previous is None:
+            transaction.on_commit(partial(rebuild_sketch, name, upload), robust=True)
+            continue
+        sketch = _deserialize(previous)
+        row_count = previous.row_count + _add_values(sketch, appended[spec.column])
+        records.append(save_sketch(name, sketch, row_count, upload))
+    return records
+
+
+def estimate_distinct(name: str) -> Optional[int]:
+    """Approximate distinct count from an 'hll' sketch, or None if not built."""
+    sketch = load_sketch(name)
+    return sketch.estimate() if sketch is not None else None
+
+
+def estimate_top(name: str, n: int) -> Optional[List[Tuple[str, int]]]:
+    """Approximate top n (value, count) from a 'cms_topk' sketch, or None if not built."""
+    sketch = load_sketch(name)
+    return sketch.top(n) if sketch is not None else None
@@ -0,0 +1,81 @@
+"""
+Shared publication fixtures for analytics and upload tests.
+
+- create_publication: a Publication row with defaults for every field
+  the test does not set
+- publication_rows: a publication upload DataFrame (PublicationParser
+  columns) with defaults for every column the test does not set
+"""
+from datetime import date
+
+import pandas as pd
+
+from apps.analytics.authors import index_publication_authors
+from apps.analytics.models import Publication
+
+
+PUBLICATION_ROW_DEFAULTS = {
+    '게재일': '2023-03-01',
+    '단과대학': '공과대학',
+    '학과': '컴퓨터공학과',
+    '주저자': '김교수',
+    '참여저자': None,
+    '학술지명': 'Journal',
+    '저널등급': 'SCIE',
+    'Impact Factor': None,
+    '과제연계여부': 'N',
+}
+
+PUBLICATION_COLUMNS = [
+    '논문ID', '게재일', '단과대학', '학과', '논문제목', '주저자', '참여저자',
+    '학술지명', '저널등급', 'Impact Factor', '과제연계여부',
+]
+
+
+def create_publication(publication_id, index_authors=False, **fields):
+    """
+    Create a Publication.
+
+    Args:
+        publication_id: 논문ID
+        index_authors: Also index its authors, as uploads do
+        **fields: Publication fields overriding the defaults
+
+    Returns:
+        The saved Publication
+    """
+    values = {
+        'publication_date': date(2023, 3, 1),
+        'college': '공과대학',
+        'department': '컴퓨터공학과',
+        'title': f'논문 {publication_id}',
+        'first_author': '김교수',
+        'journal_name': 'Journal',
+        'journal_grade': 'SCIE',
+    }
+    values.update(fields)
+    publication = Publication.objects.create(publication_id=publication_id, **values)
+    if index_authors:
+        index_publication_authors([publication])
+    return publication
+
+
+def publication_rows(rows, columns=('논문ID', '게재일', '주저자')):
+    """
+    Build a publication upload DataFrame.
+
+    Args:
+        rows: Tuples of values for columns
+        columns: Upload columns given by the tuples; the others take
+            PUBLICATION_ROW_DEFAULTS, and 논문제목 is derived from 논문ID
+
+    Returns:
+        DataFrame with the PublicationParser columns
+    """
+    df = pd.DataFrame([list(row) for row in rows], columns=list(columns), dtype=object)
+    for column, value in PUBLICATION_ROW_DEFAULTS.items():
+        if column not in df:
+            df[column] = value
+    if '논문제목' not in df:
+        df['논문제목'] = '논문 ' + df['논문ID'].astype(str)
+    return df[PUBLICATION_COLUMNS]
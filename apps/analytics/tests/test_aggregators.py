@@ -25,8 +25,11 @@ from apps.analytics.aggregators import (
     DepartmentKPIAggregator,
     PublicationAggregator,
     ResearchBudgetAggregator,
-    StudentAggregator
+    StudentAggregator,
+    _percentage,
+    _percentages
 )
+from apps.analytics.filters import PermissionScope
 
 
 class DepartmentKPIAggregatorTest(TestCase):
@@ -356,6 +359,41 @@ class ResearchBudgetAggregatorTest(TestCase):
         self.assertEqual(proj1['execution_rate'], Decimal('50.00'))
 
 
+class PercentagesTest(TestCase):
+    """Test the vectorized rate helper against _percentage"""
+
+    def assertMatchesPercentage(self, parts, totals):
+        expected = [_percentage(part, total) for part, total in zip(parts, totals)]
+        result = _percentages(parts, totals)
+        self.assertEqual(result, expected)
+        self.assertEqual([str(rate) for rate in result], [str(rate) for rate in expected])
+
+    def test_half_even_ties(self):
+        """Exact ties round to the even hundredth like Decimal.quantize"""
+        # 1/8 = 12.5%, 1/16 = 6.25%, 1/32 = 3.125%, 3/32 = 9.375%, 1/400 = 0.25%
+        self.assertMatchesPercentage([1, 1, 1, 3, 1, 5], [8, 16, 32, 32, 400, 80000])
+
+    def test_zero_negative_and_missing_totals(self):
+        """Non-positive or missing totals give 0.00"""
+        self.assertMatchesPercentage([5, 5, 0, 7], [0, -10, 100, None])
+
+    def test_random_amounts(self):
+        """Random budgets and executions (including overruns) match"""
+        import random
+        rng = random.Random(0)
+        totals = [rng.randint(1, 10 ** 12) for _ in range(2000)]
+        parts = [rng.randint(0, total * 2) for total in totals]
+        self.assertMatchesPercentage(parts, totals)
+
+    def test_amounts_beyond_int64_scale(self):
+        """Amounts too large for int64 * 10000 fall back to exact Python ints"""
+        self.assertMatchesPercentage([10 ** 18 + 1, 1], [3 * 10 ** 17, 3])
+
+    def test_empty(self):
+        """No rows, no rates"""
+        self.assertEqual(_percentages([], []), [])
+
+
 class StudentAggregatorTest(TestCase):
     """Test StudentAggregator class"""
 
@@ -484,3 +522,46 @@ class StudentAggregatorTest(TestCase):
         self.assertIsInstance(result, dict)
         self.assertEqual(result['학사'], 3)
         self.assertEqual(result['석사'], 1)
+
+
+class ScopedAggregatorTest(TestCase):
+    """Test aggregators restricted to a PermissionScope"""
+
+    def setUp(self):
+        """Set up data in two departments"""
+        for number, department in [('1', '컴퓨터공학과'), ('2', '전자공학과'), ('3', '전자공학과')]:
+            Publication.objects.create(
+                publication_id=f'PUB-{number}', publication_date=date(2025, 3, 1), college='공과대학',
+                department=department, title=f'논문 {number}', first_author='김교수',
+                journal_name='Journal', journal_grade='SCIE',
+            )
+            Student.objects.create(
+                student_number=f'2023000{number}', name='학생', college='공과대학', department=department,
+                grade=1, program_type='학사', enrollment_status='재학', gender='남', admission_year=2023,
+            )
+        self.scope = PermissionScope(frozenset(['컴퓨터공학과']))
+
+    def test_queries_restricted_to_scope(self):
+        """A restricted scope only counts its departments' rows"""
+        publications = PublicationAggregator(scope=self.scope)
+        students = StudentAggregator(scope=self.scope)
+
+        self.assertEqual(publications.get_total_publication_count(), 1)
+        self.assertEqual(publications.get_publications_by_journal_grade(), {'SCIE': 1})
+        self.assertEqual([row['department'] for row in students.get_students_by_department()], ['컴퓨터공학과'])
+        self.assertEqual(PublicationAggregator().get_total_publication_count(), 3)
+
+    def test_empty_scope_sees_nothing(self):
+        """A scope without departments counts no rows"""
+        aggregator = StudentAggregator(scope=PermissionScope(frozenset()))
+
+        self.assertEqual(aggregator.get_students_by_department(), [])
+
+    def test_restricted_scope_skips_sketches_and_snapshots(self):
+        """Sketches and snapshots cover every department, so restricted scopes query"""
+        aggregator = PublicationAggregator(approximate=True, columnar=True, scope=self.scope)
+
+        self.assertFalse(aggregator.approximate)
+        self.assertFalse(aggregator.columnar)
+        self.assertEqual(aggregator.get_total_publication_count(), 1)
+        self.assertTrue(PublicationAggregator(approximate=True, columnar=True).columnar)
@@ -0,0 +1,203 @@
+"""
+Tests for the publication author index.
+
+Test Coverage:
+- Author name normalization and co-author splitting
+- Index maintained by regular and incremental uploads
+- Author departments from first-authored publications
+- Per-author counts, collaboration edges and department matrix
+- rebuild_author_index command
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.analytics.aggregators import PublicationAggregator
+from apps.analytics.authors import split_authors
+from apps.analytics.models import Author, Publication, PublicationAuthor
+from apps.analytics.tests.factories import create_publication, publication_rows
+from apps.authentication.models import User
+from apps.data_upload.parsers import PublicationParser
+
+
+class SplitAuthorsTest(TestCase):
+    """Test author name parsing."""
+
+    def test_positions_whitespace_and_duplicates(self):
+        """Names are normalized, blanks skipped, duplicates keep their first position."""
+        self.assertEqual(
+            split_authors(' 김  교수 ', '이교수; ;박교수;김 교수'),
+            [('김 교수', 0), ('이교수', 1), ('박교수', 3)],
+        )
+
+    def test_no_co_authors(self):
+        """A publication without co-authors has only its first author."""
+        self.assertEqual(split_authors('김교수', None), [('김교수', 0)])
+
+
+class UploadAuthorIndexTest(TestCase):
+    """Test the index maintained by PublicationParser."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write_csv(self, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+    def links(self):
+        return sorted(PublicationAuthor.objects.values_list(
+            'publication__publication_id', 'author__name', 'position'
+        ))
+
+    def test_upload_links_first_and_co_authors(self):
+        """Every author gets one Author row and one link per publication."""
+        result = PublicationParser().parse(self.write_csv('pubs.csv', publication_rows([
+            ('P1', '컴퓨터공학과', '김교수', '이교수;박교수'),
+            ('P2', '전자공학과', '이교수', '김교수'),
+        ], columns=('논문ID', '학과', '주저자', '참여저자'))), self.user)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(Author.objects.count(), 3)
+        self.assertEqual(self.links(), [
+            ('P1', '김교수', 0), ('P1', '박교수', 2), ('P1', '이교수', 1),
+            ('P2', '김교수', 1), ('P2', '이교수', 0),
+        ])
+        self.assertEqual(
+            dict(Author.objects.values_list('name', 'department')),
+            {'김교수': '컴퓨터공학과', '이교수': '전자공학과', '박교수': None},
+        )
+
+    def test_incremental_upload_replaces_links(self):
+        """Changed and deleted publications update their links."""
+        PublicationParser().parse(self.write_csv('v1.csv', publication_rows([
+            ('P1', '컴퓨터공학과', '김교수', '이교수'),
+            ('P2', '컴퓨터공학과', '김교수', None),
+        ], columns=('논문ID', '학과', '주저자', '참여저자'))), self.user)
+
+        # P1 changes co-authors, P2 is removed
+        PublicationParser(incremental=True).parse(self.write_csv('v2.csv', publication_rows([
+            ('P1', '컴퓨터공학과', '김교수', '최교수'),
+        ], columns=('논문ID', '학과', '주저자', '참여저자'))), self.user)
+
+        self.assertEqual(self.links(), [('P1', '김교수', 0), ('P1', '최교수', 1)])
+
+    def test_removed_publications_update_author_departments(self):
+        """Incremental and staged uploads recompute departments of removed first authors."""
+        columns = ('논문ID', '학과', '주저자', '참여저자')
+        PublicationParser().parse(self.write_csv('v1.csv', publication_rows([
+            ('P1', '컴퓨터공학과', '김교수', None),
+            ('P2', '전자공학과', '이교수', None),
+            ('P3', '화학공학과', '최교수', None),
+        ], columns)), self.user)
+
+        PublicationParser(incremental=True).parse(self.write_csv('v2.csv', publication_rows([
+            ('P1', '컴퓨터공학과', '김교수', None),
+            ('P3', '화학공학과', '최교수', None),
+        ], columns)), self.user)
+        self.assertEqual(Author.objects.get(name='이교수').department, None)
+
+        PublicationParser(staged=True).parse(self.write_csv('v3.csv', publication_rows([
+            ('P1', '컴퓨터공학과', '김교수', '최교수'),
+        ], columns)), self.user)
+        self.assertEqual(
+            dict(Author.objects.values_list('name', 'department')),
+            {'김교수': '컴퓨터공학과', '이교수': None, '최교수': None},
+        )
+
+
+class AuthorAggregatorTest(TestCase):
+    """Test author and collaboration aggregator methods."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_publication('P1', first_author='김교수', co_authors='이교수;박교수', index_authors=True)
+        create_publication('P2', first_author='이교수', co_authors='김교수', index_authors=True,
+                           department='전자공학과', publication_date=date(2023, 5, 1))
+        create_publication('P3', first_author='최교수', co_authors='김교수;이교수', index_authors=True)
+        create_publication('P4', first_author='김교수', index_authors=True, publication_date=date(2024, 1, 1))
+
+    def test_publications_by_author_counts_co_authorship(self):
+        """Counts include co-authored publications."""
+        result = PublicationAggregator().get_publications_by_author(limit=2)
+
+        self.assertEqual(result, [
+            {'author': '김교수', 'department': '컴퓨터공학과', 'count': 4, 'first_author_count': 2},
+            {'author': '이교수', 'department': '전자공학과', 'count': 3, 'first_author_count': 1},
+        ])
+
+    def test_publications_by_author_department_filter(self):
+        """Only authors of the department are counted."""
+        result = PublicationAggregator().get_publications_by_author(department='전자공학과')
+
+        self.assertEqual([row['author'] for row in result], ['이교수'])
+
+    def test_author_publications(self):
+        """An author's publications are listed newest first with their position."""
+        result = PublicationAggregator().get_author_publications('김교수')
+
+        self.assertEqual(
+            [(row['publication_id'], row['position']) for row in result],
+            [('P4', 0), ('P2', 1), ('P1', 0), ('P3', 1)],
+        )
+
+    def test_collaboration_edges(self):
+        """Edges count the publications shared by each author pair."""
+        edges = PublicationAggregator().get_collaboration_edges()
+        weights = {frozenset((edge['source'], edge['target'])): edge['count'] for edge in edges}
+
+        self.assertEqual(weights, {
+            frozenset(('김교수', '이교수')): 3,
+            frozenset(('김교수', '박교수')): 1,
+            frozenset(('이교수', '박교수')): 1,
+            frozenset(('김교수', '최교수')): 1,
+            frozenset(('이교수', '최교수')): 1,
+        })
+        self.assertEqual(edges[0]['count'], 3)
+        self.assertEqual(len(PublicationAggregator().get_collaboration_edges(min_count=2)), 1)
+
+    def test_collaboration_edges_department_filter(self):
+        """Department filter keeps edges with an author in the department."""
+        edges = PublicationAggregator().get_collaboration_edges(department='전자공학과')
+
+        self.assertTrue(all('이교수' in (edge['source'], edge['target']) for edge in edges))
+        self.assertEqual(len(edges), 3)
+
+    def test_department_collaboration_matrix(self):
+        """Co-authored publications between author departments."""
+        result = PublicationAggregator().get_department_collaboration_matrix()
+
+        # 박교수 has no department; 김(컴퓨터)-이(전자) share P1, P2, P3;
+        # 김/최 (both 컴퓨터) share P3
+        self.assertEqual(result['departments'], ['전자공학과', '컴퓨터공학과'])
+        self.assertEqual(result['matrix'], [[0, 3], [3, 1]])
+
+
+class RebuildAuthorIndexCommandTest(TestCase):
+    """Test manage.py rebuild_author_index."""
+
+    def test_command_backfills_index(self):
+        """The command indexes publications that have no links yet."""
+        Publication.objects.create(
+            publication_id='P1', publication_date=date(2023, 3, 1), college='공과대학',
+            department='컴퓨터공학과', title='논문', first_author='김교수',
+            co_authors='이교수', journal_name='Journal',
+        )
+        out = io.StringIO()
+
+        call_command('rebuild_author_index', stdout=out)
+
+        self.assertEqual(PublicationAuthor.objects.count(), 2)
+        self.assertIn('2 authors, 2 publication links indexed', out.getvalue())
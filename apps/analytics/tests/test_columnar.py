@@ -0,0 +1,333 @@
+"""
+Tests for the in-process columnar snapshots.
+
+Test Coverage:
+- Every aggregator method with a columnar path returns what the ORM
+  path returns on the same data (parity)
+- Stale snapshots (new upload, admin edit) fall back to the ORM and
+  start a reload; RLS disables snapshots
+- Table filters and grouped aggregates, including NULLs
+"""
+import os
+import random
+import tempfile
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+import numpy as np
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from apps.analytics import columnar
+from apps.analytics.aggregators import (
+    DepartmentKPIAggregator,
+    PublicationAggregator,
+    ResearchBudgetAggregator,
+    StudentAggregator,
+)
+from apps.analytics.columnar import Column, Table, clear_snapshots, get_snapshot, load_snapshot
+from apps.analytics.models import (
+    DepartmentKPI,
+    ExecutionRecord,
+    Publication,
+    ResearchProject,
+    Student,
+)
+from apps.analytics.tests.factories import publication_rows
+from apps.analytics.versions import bump_data_version
+from apps.authentication.models import User
+from apps.data_upload.parsers import PublicationParser
+
+DEPARTMENTS = ['컴퓨터공학과', '전자공학과', '수학과', '경영학과']
+AUTHORS = ['김교수', '이교수', '박교수', '최교수', '정교수']
+
+
+def create_dataset(rng):
+    """A few dozen rows per table, with NULLs in every nullable column used."""
+    for year in (2023, 2024):
+        for department in DEPARTMENTS:
+            DepartmentKPI.objects.create(
+                evaluation_year=year, college='공과대학', department=department,
+                employment_rate=rng.choice([None, Decimal(rng.randint(5000, 9999)) / 100]),
+            )
+
+    for i in range(40):
+        Publication.objects.create(
+            publication_id=f'PUB-{i:03d}',
+            publication_date=date(rng.choice([2022, 2023, 2024]), rng.randint(1, 12), 1),
+            college='공과대학', department=rng.choice(DEPARTMENTS), title=f'논문 {i}',
+            first_author=rng.choice(AUTHORS), journal_name='Journal',
+            journal_grade=rng.choice(['SCIE', 'KCI', None]),
+            impact_factor=rng.choice([None, Decimal(rng.randint(0, 999)) / 100]),
+        )
+
+    for i in range(8):
+        project = ResearchProject.objects.create(
+            project_number=f'NRF-{i:03d}', project_name=f'과제 {i}', principal_investigator='김교수',
+            department=rng.choice(DEPARTMENTS[:3]), funding_agency='한국연구재단',
+            total_budget=rng.choice([0, rng.randint(10 ** 7, 10 ** 9)]),
+        )
+        for j in range(rng.randint(0, 5)):
+            ExecutionRecord.objects.create(
+                execution_id=f'EX-{i}-{j}', project=project, execution_date=date(2024, 3, 1),
+                expense_category=rng.choice(['인건비', '장비비', '재료비']),
+                amount=rng.randint(10 ** 5, 10 ** 8), status='집행완료',
+            )
+
+    for i in range(50):
+        Student.objects.create(
+            student_number=f'2024{i:04d}', name=f'학생{i}', college='공과대학',
+            department=rng.choice(DEPARTMENTS), grade=rng.choice([None, 1, 2, 3, 4]),
+            program_type=rng.choice(['학사', '석사', None]),
+            enrollment_status=rng.choice(['재학', '휴학', '졸업']),
+            admission_year=rng.choice([2021, 2022, 2023, 2024]),
+        )
+
+
+def typed(result):
+    """repr of a result, so types and Decimal exponents are compared; dicts in key order."""
+    if isinstance(result, dict):
+        return repr(sorted(result.items(), key=repr))
+    return repr(result)
+
+
+@override_settings(ANALYTICS_COLUMNAR_VERSION_TTL=0)
+class ColumnarTestCase(TestCase):
+    """Fresh snapshots and version counters per test, checked on every call."""
+
+    def setUp(self):
+        cache.clear()
+        clear_snapshots()
+        self.addCleanup(clear_snapshots)
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def load_all(self):
+        for data_type in columnar.SNAPSHOT_TABLES:
+            self.assertIsNotNone(load_snapshot(data_type))
+
+
+class AggregatorParityTest(ColumnarTestCase):
+    """Columnar and ORM paths agree on the same data."""
+
+    CALLS = [
+        (DepartmentKPIAggregator, 'get_average_employment_rate', {}),
+        (DepartmentKPIAggregator, 'get_average_employment_rate', {'year': 2024}),
+        (DepartmentKPIAggregator, 'get_average_employment_rate', {'year': 1999}),
+        (DepartmentKPIAggregator, 'get_department_count', {}),
+        (PublicationAggregator, 'get_total_publication_count', {}),
+        (PublicationAggregator, 'get_total_publication_count', {'department': '수학과', 'year': 2023}),
+        (PublicationAggregator, 'get_total_publication_count', {'department': '없는학과'}),
+        (PublicationAggregator, 'get_publications_by_journal_grade', {}),
+        (PublicationAggregator, 'get_average_impact_factor', {}),
+        (PublicationAggregator, 'get_average_impact_factor', {'journal_grade': 'SCIE'}),
+        (ResearchBudgetAggregator, 'get_total_budget_and_execution', {}),
+        (ResearchBudgetAggregator, 'get_budget_by_department', {}),
+        (ResearchBudgetAggregator, 'get_execution_by_category', {}),
+        (ResearchBudgetAggregator, 'get_execution_rate_by_project', {}),
+        (StudentAggregator, 'get_total_students_and_enrollment_rate', {}),
+        (StudentAggregator, 'get_total_students_and_enrollment_rate', {'department': '수학과'}),
+        (StudentAggregator, 'get_students_by_grade', {}),
+        (StudentAggregator, 'get_students_by_department', {}),
+        (StudentAggregator, 'get_students_by_admission_year', {}),
+        (StudentAggregator, 'get_students_by_admission_year', {'years': [2022, 2024]}),
+        (StudentAggregator, 'get_students_by_program_type', {}),
+    ]
+
+    def assert_parity(self):
+        self.load_all()
+        for aggregator_class, method, kwargs in self.CALLS:
+            with self.subTest(method=method, **kwargs):
+                expected = getattr(aggregator_class(columnar=False), method)(**kwargs)
+                with self.assertNumQueries(1):  # The data version lookup
+                    actual = getattr(aggregator_class(columnar=True), method)(**kwargs)
+                self.assertEqual(actual, expected)
+                self.assertEqual(typed(actual), typed(expected))
+
+    def test_parity(self):
+        for seed in range(3):
+            with self.subTest(seed=seed):
+                for model in (DepartmentKPI, Publication, ExecutionRecord, ResearchProject, Student):
+                    model.objects.all().delete()
+                create_dataset(random.Random(seed))
+                self.assert_parity()
+
+    def test_parity_without_data(self):
+        self.assert_parity()
+
+    def test_first_authors(self):
+        create_dataset(random.Random(0))
+        self.load_all()
+
+        expected = PublicationAggregator(columnar=False, approximate=False).get_publications_by_first_author(limit=10)
+        actual = PublicationAggregator(columnar=True, approximate=False).get_publications_by_first_author(limit=10)
+
+        # The query leaves ties in database order
+        self.assertEqual(
+            sorted(actual, key=lambda item: (-item['count'], item['first_author'])),
+            sorted(expected, key=lambda item: (-item['count'], item['first_author'])),
+        )
+        self.assertEqual(actual, sorted(actual, key=lambda item: (-item['count'], item['first_author'])))
+
+
+class SnapshotFreshnessTest(ColumnarTestCase):
+    """Snapshots are only used for the data version they were loaded at."""
+
+    def setUp(self):
+        super().setUp()
+        create_dataset(random.Random(0))
+        start_load = mock.patch.object(columnar, '_start_load')
+        self.start_load = start_load.start()
+        self.addCleanup(start_load.stop)
+
+    def add_publication(self):
+        Publication.objects.create(
+            publication_id='PUB-NEW', publication_date=date(2024, 5, 1), college='공과대학',
+            department='수학과', title='새 논문', first_author='김교수', journal_name='Journal',
+        )
+
+    def test_missing_snapshot_starts_load(self):
+        self.assertIsNone(get_snapshot('publication'))
+        self.start_load.assert_called_once_with('publication')
+
+    def test_current_snapshot_is_used(self):
+        load_snapshot('publication')
+
+        self.assertIsNotNone(get_snapshot('publication'))
+        self.start_load.assert_not_called()
+
+    def test_new_upload_makes_snapshot_stale(self):
+        load_snapshot('publication')
+        with tempfile.TemporaryDirectory() as test_dir:
+            path = os.path.join(test_dir, 'p.csv')
+            publication_rows([('PUB-NEW', '2024-05-01', '김교수')]).to_csv(path, index=False, encoding='utf-8-sig')
+            self.assertTrue(PublicationParser().parse(path, self.user)['success'])
+
+        count = PublicationAggregator(columnar=True).get_total_publication_count()
+
+        self.assertEqual(count, Publication.objects.count())
+        self.start_load.assert_called_once_with('publication')
+
+    def test_admin_edit_makes_snapshot_stale(self):
+        load_snapshot('publication')
+        self.add_publication()
+        bump_data_version('publication')
+
+        self.assertIsNone(get_snapshot('publication'))
+
+    def test_other_data_types_stay_current(self):
+        load_snapshot('student')
+        bump_data_version('publication')
+
+        self.assertIsNotNone(get_snapshot('student'))
+
+    def test_snapshot_changed_while_loading_is_dropped(self):
+        with mock.patch.object(columnar, '_data_version', side_effect=[1, 2]):
+            self.assertIsNone(load_snapshot('student'))
+        self.assertIsNone(get_snapshot('student'))
+
+    def test_load_reads_one_alias(self):
+        """The version and every table are read from the alias routed once, in one transaction."""
+        with mock.patch.object(columnar.router, 'db_for_read', return_value='default') as db_for_read, \
+                mock.patch.object(columnar.transaction, 'atomic', wraps=columnar.transaction.atomic) as atomic:
+            self.assertIsNotNone(load_snapshot('research_budget'))
+
+        db_for_read.assert_called_once_with(ResearchProject)
+        atomic.assert_called_once_with(using='default')
+
+    def test_records_of_missing_projects_are_rejected(self):
+        """Execution totals need every referenced project in the snapshot."""
+        def column(values):
+            return Column(np.array(values, dtype=np.int64), np.ones(len(values), dtype=bool))
+
+        tables = {
+            'research_projects': Table({'id': column([3, 1])}, 2),
+            'execution_records': Table({'project_id': column([1, 2]), 'amount': column([10, 20])}, 2),
+        }
+
+        with self.assertRaises(ValueError):
+            columnar.DERIVED_COLUMNS['research_budget'](tables)
+
+    @override_settings(ANALYTICS_COLUMNAR_VERSION_TTL=60)
+    def test_version_ttl(self):
+        load_snapshot('student')
+        self.assertIsNotNone(get_snapshot('student'))
+        bump_data_version('student')
+
+        with self.assertNumQueries(0):
+            self.assertIsNotNone(get_snapshot('student'))
+
+    @override_settings(ANALYTICS_ENFORCE_RLS=True)
+    def test_disabled_with_rls(self):
+        load_snapshot('student')
+
+        self.assertIsNone(get_snapshot('student'))
+        self.start_load.assert_not_called()
+
+    def test_disabled_by_default(self):
+        load_snapshot('student')
+
+        with mock.patch.object(columnar, 'get_snapshot') as get:
+            StudentAggregator().get_students_by_grade()
+        get.assert_not_called()
+
+
+class BackgroundLoadTest(ColumnarTestCase):
+    """Only one load per data type runs at a time."""
+
+    def test_one_load_per_data_type(self):
+        with mock.patch.object(columnar.threading, 'Thread') as thread:
+            columnar._start_load('student')
+            columnar._start_load('student')
+            columnar._start_load('publication')
+        self.assertEqual(thread.call_count, 2)
+
+        with mock.patch.object(columnar, 'connections'):
+            columnar._load_in_background('student')
+        self.assertIsNotNone(get_snapshot('student'))
+        self.assertNotIn('student', columnar._loading)
+        columnar._loading.clear()
+
+
+class TableTest(SimpleTestCase):
+    """Test filters and grouped aggregates."""
+
+    def setUp(self):
+        self.table = Table({
+            'department': columnar._column(['수학과', None, '수학과', '경영학과'], 'text'),
+            'grade': columnar._column([1, 2, None, 1], 'int'),
+            'amount': columnar._column([10, 20, 30, 40], 'int'),
+            'rate': columnar._column([Decimal('1.25'), None, Decimal('2.50'), Decimal('0.05')], 'decimal'),
+        }, 4)
+
+    def test_group_count_includes_null(self):
+        self.assertEqual(self.table.group_count('department'), {'수학과': 2, None: 1, '경영학과': 1})
+        self.assertEqual(self.table.group_count('grade'), {1: 2, 2: 1, None: 1})
+
+    def test_group_count_pairs(self):
+        self.assertEqual(
+            self.table.group_count_pairs('department', 'grade'),
+            {('수학과', 1): 1, ('수학과', None): 1, (None, 2): 1, ('경영학과', 1): 1},
+        )
+
+    def test_group_sum(self):
+        self.assertEqual(self.table.group_sum('grade', 'amount'), {1: 50, 2: 20, None: 30})
+
+    def test_filters(self):
+        self.assertEqual(len(self.table.where('department', '수학과')), 2)
+        self.assertEqual(len(self.table.where('department', '없는학과')), 0)
+        self.assertEqual(len(self.table.where('grade', None)), 1)
+        self.assertEqual(self.table.where_in('grade', [1, 2]).values('amount'), [10, 20, 40])
+
+    def test_decimals_are_exact(self):
+        self.assertEqual(self.table.sum('rate'), 380)
+        self.assertEqual(self.table.count('rate'), 3)
+        self.assertEqual(columnar.decimal_value(self.table.sum('rate')), Decimal('3.80'))
+        self.assertEqual(self.table.values('rate'), [125, None, 250, 5])
+
+    def test_empty_table(self):
+        empty = Table({'grade': Column(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=bool))}, 0)
+        self.assertEqual(empty.group_count('grade'), {})
+        self.assertEqual(empty.sum('grade'), 0)
@@ -0,0 +1,123 @@
+"""
+Tests for streaming CSV/XLSX downloads.
+
+Test Coverage:
+- Korean template headers and values in CSV
+- Downloaded CSV accepted by the upload parser (round trip)
+- Write-only XLSX output
+- Per-page download endpoints and their filters
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+
+import pandas as pd
+from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from apps.analytics.models import DepartmentKPI, ExecutionRecord, ResearchProject, Student
+from apps.authentication.models import User
+from apps.data_upload.parsers import StudentParser
+
+
+class DownloadViewTest(TestCase):
+    """Test /analytics/<page>/download/ endpoints."""
+
+    def setUp(self):
+        self.user = User(email='viewer@test.com', name='조회자', role='viewer', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+        self.client.force_login(self.user)
+
+        Student.objects.create(
+            student_number='2023001', name='김철수', college='공과대학', department='컴퓨터공학과',
+            grade=1, program_type='학사', enrollment_status='재학', gender='남', admission_year=2023,
+        )
+        Student.objects.create(
+            student_number='2023002', name='이영희', college='공과대학', department='전자공학과',
+            grade=2, program_type='학사', enrollment_status='휴학', gender='여', admission_year=2022,
+        )
+
+    def get_csv(self, url_name, params=None):
+        response = self.client.get(reverse(url_name), params or {})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return b''.join(response.streaming_content).decode('utf-8-sig')
+
+    def test_students_csv_uses_template_headers(self):
+        """CSV columns match the student upload template."""
+        content = self.get_csv('analytics:students_download', {'format': 'csv'})
+
+        lines = content.splitlines()
+        self.assertEqual(lines[0], '학번,이름,단과대학,학과,학년,과정구분,학적상태,성별,입학년도')
+        self.assertEqual(lines[1], '2023001,김철수,공과대학,컴퓨터공학과,1,학사,재학,남,2023')
+        self.assertEqual(len(lines), 3)
+
+    def test_downloaded_csv_can_be_uploaded_again(self):
+        """The download is a valid upload file for the same parser."""
+        content = self.get_csv('analytics:students_download')
+        test_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, test_dir, True)
+        path = os.path.join(test_dir, 'students.csv')
+        with open(path, 'w', encoding='utf-8-sig') as f:
+            f.write(content)
+
+        df = StudentParser().prepare(path)
+
+        self.assertEqual(list(df['학번'].astype(str)), ['2023001', '2023002'])
+
+    def test_department_filter(self):
+        """GET filters narrow the download."""
+        content = self.get_csv('analytics:students_download', {'department': '전자공학과'})
+
+        self.assertNotIn('김철수', content)
+        self.assertIn('이영희', content)
+
+    def test_research_budget_joins_project_columns(self):
+        """Execution rows carry their project columns in upload order."""
+        project = ResearchProject.objects.create(
+            project_number='P001', project_name='AI 연구', principal_investigator='김교수',
+            department='컴퓨터공학과', funding_agency='NRF', total_budget=1000000,
+        )
+        ExecutionRecord.objects.create(
+            execution_id='E001', project=project, execution_date=date(2023, 3, 15),
+            expense_category='인건비', amount=50000, status='집행완료',
+        )
+
+        content = self.get_csv('analytics:research_budget_download')
+
+        df = pd.read_csv(io.StringIO(content))
+        self.assertEqual(list(df.columns)[:3], ['집행ID', '과제번호', '과제명'])
+        self.assertEqual(df.loc[0, '총연구비'], 1000000)
+        self.assertEqual(df.loc[0, '집행일자'], '2023-03-15')
+
+    def test_department_kpi_year_filter(self):
+        """The KPI download honors the page's year filter."""
+        for year in (2022, 2023):
+            DepartmentKPI.objects.create(
+                evaluation_year=year, college='공과대학', department='컴퓨터공학과',
+            )
+
+        content = self.get_csv('analytics:department_kpi_download', {'year': '2023'})
+
+        self.assertEqual(len(content.splitlines()), 2)
+        self.assertIn('2023,공과대학', content)
+
+    def test_students_xlsx(self):
+        """XLSX downloads contain a header row plus one row per record."""
+        response = self.client.get(reverse('analytics:students_download'), {'format': 'xlsx'})
+
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], '학번')
+        self.assertEqual(rows[2][:2], ('2023002', '이영희'))
+
+    def test_invalid_format_is_bad_request(self):
+        """Unknown formats are rejected."""
+        response = self.client.get(reverse('analytics:students_download'), {'format': 'pdf'})
+
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,159 @@
+"""
+Tests for columnar (Parquet / Arrow IPC) export.
+
+Test Coverage:
+- Chunked record batches with typed schema
+- Filters shared with apply_multiple_filters
+- Parquet row groups written per chunk
+- export_analytics management command
+- Authenticated streaming export endpoint
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipIf
+
+from django.core.management import call_command
+from django.db.models import QuerySet
+from django.test import TestCase
+from django.urls import reverse
+
+from apps.analytics import exporters
+from apps.analytics.models import ExecutionRecord, ResearchProject, Student
+from apps.authentication.models import User
+
+if exporters.pa is not None:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+
+def create_students(count):
+    Student.objects.bulk_create([
+        Student(
+            student_number=f'2023{i:04d}',
+            name=f'학생{i}',
+            college='공과대학',
+            department='컴퓨터공학과' if i % 2 == 0 else '전자공학과',
+            grade=1,
+            program_type='학사',
+            enrollment_status='재학',
+            admission_year=2023,
+        )
+        for i in range(count)
+    ])
+
+
+@skipIf(exporters.pa is None, 'pyarrow not installed')
+class ColumnarExportTest(TestCase):
+    """Test encoding querysets as Parquet / Arrow IPC."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_parquet_writes_row_group_per_chunk(self):
+        """Each fetched chunk becomes one Parquet row group."""
+        create_students(25)
+        path = os.path.join(self.test_dir, 'students.parquet')
+
+        with mock.patch.object(QuerySet, 'count') as count:
+            rows = exporters.export_to_file(path, 'students', 'parquet', chunk_size=10)
+
+        parquet = pq.ParquetFile(path)
+        count.assert_not_called()  # Rows are counted while streaming
+        self.assertEqual(rows, 25)
+        self.assertEqual(parquet.metadata.num_rows, 25)
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        self.assertEqual(parquet.schema_arrow.field('grade').type, pa.int32())
+
+    def test_arrow_stream_applies_filters_and_annotations(self):
+        """Execution records carry project department and honor department filters."""
+        cs = ResearchProject.objects.create(
+            project_number='P001', project_name='AI', principal_investigator='김교수',
+            department='컴퓨터공학과', total_budget=1000,
+        )
+        ee = ResearchProject.objects.create(
+            project_number='P002', project_name='반도체', principal_investigator='이교수',
+            department='전자공학과', total_budget=2000,
+        )
+        for i, project in enumerate([cs, cs, ee]):
+            ExecutionRecord.objects.create(
+                execution_id=f'E{i}', project=project, execution_date=date(2023, 3, i + 1),
+                expense_category='인건비', amount=Decimal('100'), status='집행완료',
+            )
+
+        source = exporters.get_export_source('execution_records')
+        queryset = exporters.build_export_queryset(source, {'departments': ['컴퓨터공학과']})
+        data = b''.join(exporters.stream_export(queryset, source, 'arrow', chunk_size=1))
+
+        table = pa.ipc.open_stream(data).read_all()
+        self.assertEqual(table.num_rows, 2)
+        self.assertEqual(table.column('department').to_pylist(), ['컴퓨터공학과'] * 2)
+        self.assertEqual(table.column('project_number').to_pylist(), ['P001'] * 2)
+        self.assertEqual(table.column('execution_date').to_pylist()[0], date(2023, 3, 1))
+
+    def test_unsupported_filter_is_rejected(self):
+        """Filters a table cannot honor raise instead of being ignored."""
+        source = exporters.get_export_source('research_projects')
+
+        with self.assertRaises(ValueError):
+            exporters.build_export_queryset(source, {'colleges': ['공과대학']})
+
+    def test_command_exports_file(self):
+        """manage.py export_analytics writes the requested format."""
+        create_students(4)
+        path = os.path.join(self.test_dir, 'students.arrows')
+
+        call_command(
+            'export_analytics', 'students', path,
+            '--format', 'arrow', '--department', '전자공학과',
+            stdout=io.StringIO(),
+        )
+
+        with open(path, 'rb') as f:
+            self.assertEqual(pa.ipc.open_stream(f).read_all().num_rows, 2)
+
+
+class ExportViewTest(TestCase):
+    """Test the streaming export endpoint."""
+
+    def setUp(self):
+        self.user = User(email='viewer@test.com', name='조회자', role='viewer', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def test_login_required(self):
+        """Anonymous users are redirected to login."""
+        response = self.client.get(reverse('analytics:export', args=['students', 'parquet']))
+
+        self.assertEqual(response.status_code, 302)
+
+    @skipIf(exporters.pa is None, 'pyarrow not installed')
+    def test_streams_parquet(self):
+        """Authenticated users receive a streamed Parquet attachment."""
+        create_students(3)
+        self.client.force_login(self.user)
+
+        response = self.client.get(
+            reverse('analytics:export', args=['students', 'parquet']),
+            {'department': '컴퓨터공학과'},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn('students.parquet', response['Content-Disposition'])
+        table = pq.read_table(pa.BufferReader(b''.join(response.streaming_content)))
+        self.assertEqual(table.num_rows, 2)
+
+    def test_unknown_source_is_bad_request(self):
+        """Unknown tables are rejected."""
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('analytics:export', args=['users', 'arrow']))
+
+        self.assertEqual(response.status_code, 400 if exporters.pa is not None else 501)
@@ -3,6 +3,7 @@ Tests for data filtering functions.
 
 This module contains tests for functions that filter querysets based on:
 - Date ranges
+- Calendar years, quarters and academic semesters
 - Department access
 - College access
 - User permissions (role-based)
@@ -13,6 +14,7 @@ Test Coverage:
 - Department filtering
 - College filtering
 - Permission-based filtering (admin/manager/viewer)
+- PermissionScope predicates, joins and cache keys
 - Multiple filters combined
 - Edge cases: None values, empty results, invalid inputs
 
@@ -22,21 +24,32 @@ Following TDD RED-GREEN-REFACTOR cycle:
 - REFACTOR: Optimize and clean up
 """
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.contrib.auth import get_user_model
 from datetime import date, timedelta
 from apps.analytics.models import (
     DepartmentKPI,
+    ExecutionRecord,
     Publication,
     ResearchProject,
     Student,
+    UploadHistory,
 )
 from apps.analytics.filters import (
     filter_by_date_range,
+    filter_by_year,
+    filter_by_quarter,
+    filter_by_semester,
+    quarter_range,
+    semester_range,
+    year_range,
+    parse_year,
+    MAX_YEAR,
     filter_by_department,
     filter_by_college,
     apply_user_permission_filter,
     apply_multiple_filters,
+    PermissionScope,
 )
 
 User = get_user_model()
@@ -146,6 +159,113 @@ class FilterByDateRangeTest(TestCase):
         self.assertEqual(result.count(), 0)
 
 
+class FilterByPeriodTest(TestCase):
+    """
+    Test suite for year / quarter / semester filters.
+
+    Validates half-open [start, end) boundaries on date fields.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        """Create publications on period boundaries."""
+        for i, publication_date in enumerate([
+            date(2022, 12, 31),
+            date(2023, 1, 1),
+            date(2023, 3, 31),
+            date(2023, 4, 1),
+            date(2023, 8, 31),
+            date(2023, 9, 1),
+            date(2024, 2, 29),
+            date(2024, 3, 1),
+        ]):
+            Publication.objects.create(
+                publication_id=f'PUB{i:03d}',
+                title=f'논문 {i}',
+                first_author='김교수',
+                college='공과대학',
+                department='컴퓨터공학과',
+                journal_name='Journal',
+                journal_grade='SCIE',
+                publication_date=publication_date,
+            )
+
+    def dates(self, queryset):
+        return sorted(queryset.values_list('publication_date', flat=True))
+
+    def test_filter_by_year(self):
+        """Should include Jan 1 through Dec 31 of the year."""
+        result = filter_by_year(Publication.objects.all(), 'publication_date', 2023)
+
+        self.assertEqual(self.dates(result), [
+            date(2023, 1, 1), date(2023, 3, 31), date(2023, 4, 1),
+            date(2023, 8, 31), date(2023, 9, 1),
+        ])
+
+    def test_filter_by_quarter(self):
+        """Should end the quarter before the first day of the next one."""
+        result = filter_by_quarter(Publication.objects.all(), 'publication_date', 2023, 1)
+
+        self.assertEqual(self.dates(result), [date(2023, 1, 1), date(2023, 3, 31)])
+
+    def test_filter_by_second_semester_spans_new_year(self):
+        """Should include winter session through the end of February."""
+        result = filter_by_semester(Publication.objects.all(), 'publication_date', 2023, 2)
+
+        self.assertEqual(self.dates(result), [date(2023, 9, 1), date(2024, 2, 29)])
+
+    def test_ranges_are_half_open(self):
+        """Should return [start, end) ranges."""
+        self.assertEqual(quarter_range(2023, 4), (date(2023, 10, 1), date(2024, 1, 1)))
+        self.assertEqual(semester_range(2023, 1), (date(2023, 3, 1), date(2023, 9, 1)))
+
+    def test_invalid_period(self):
+        """Should reject quarters outside 1-4 and semesters outside 1-2."""
+        with self.assertRaises(ValueError):
+            quarter_range(2023, 5)
+        with self.assertRaises(ValueError):
+            semester_range(2023, 3)
+
+    def test_years_outside_date_range(self):
+        """Should reject years without a representable range; parse_year ignores them."""
+        self.assertEqual(year_range(MAX_YEAR)[1], date(MAX_YEAR + 1, 1, 1))
+        with self.assertRaises(ValueError):
+            year_range(MAX_YEAR + 1)
+        with self.assertRaises(ValueError):
+            semester_range(0, 1)
+
+        self.assertEqual(parse_year('2023'), 2023)
+        for value in (None, '', 'abc', '0', '-5', '9999', '100000'):
+            self.assertIsNone(parse_year(value), value)
+
+    def test_date_range_end_date_includes_whole_day(self):
+        """Should keep DateTimeField values later on the end date."""
+        from django.utils import timezone
+        kpi = DepartmentKPI.objects.create(
+            department='컴퓨터공학과',
+            college='공과대학',
+            evaluation_year=2023,
+            employment_rate=85.5,
+        )
+        DepartmentKPI.objects.filter(pk=kpi.pk).update(
+            created_at=timezone.make_aware(timezone.datetime(2023, 6, 30, 15, 0))
+        )
+
+        result = filter_by_date_range(
+            DepartmentKPI.objects.all(), 'created_at', date(2023, 6, 1), date(2023, 6, 30)
+        )
+
+        self.assertEqual(list(result), [kpi])
+
+    def test_apply_multiple_filters_semester(self):
+        """Should apply year + semester keys on the date field."""
+        result = apply_multiple_filters(
+            Publication.objects.all(), {'year': 2023, 'semester': 1}, date_field='publication_date'
+        )
+
+        self.assertEqual(self.dates(result), [date(2023, 3, 31), date(2023, 4, 1), date(2023, 8, 31)])
+
+
 class FilterByDepartmentTest(TestCase):
     """
     Test suite for filter_by_department function.
@@ -588,3 +708,81 @@ class ApplyMultipleFiltersTest(TestCase):
 
         # Assert
         self.assertEqual(result.count(), 0)
+
+
+@override_settings(ANALYTICS_DEPARTMENT_SCOPING=True)
+class PermissionScopeTest(TestCase):
+    """Test department scopes compiled per request user."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for number, department in [('P-1', '컴퓨터공학과'), ('P-2', '전자공학과')]:
+            project = ResearchProject.objects.create(
+                project_number=number, project_name='과제', principal_investigator='김교수',
+                department=department, funding_agency='한국연구재단', total_budget=1000,
+            )
+            ExecutionRecord.objects.create(
+                execution_id=f'E-{number}', project=project, execution_date=date(2023, 3, 1),
+                expense_category='인건비', amount=100, status='집행완료',
+            )
+
+    def make_user(self, role, department):
+        return User(email=f'{role}@test.com', name=role, role=role, department=department, status='active')
+
+    def test_scope_by_role(self):
+        """Admins/managers are unrestricted; viewers get their department."""
+        self.assertTrue(PermissionScope.for_user(self.make_user('admin', '컴퓨터공학과')).unrestricted)
+        self.assertTrue(PermissionScope.for_user(self.make_user('manager', None)).unrestricted)
+        self.assertEqual(
+            PermissionScope.for_user(self.make_user('viewer', '컴퓨터공학과')).departments,
+            frozenset(['컴퓨터공학과']),
+        )
+        self.assertEqual(PermissionScope.for_user(self.make_user('viewer', None)).departments, frozenset())
+
+    def test_scope_computed_once_per_user(self):
+        """The scope is cached on the user object."""
+        user = self.make_user('viewer', '컴퓨터공학과')
+        scope = PermissionScope.for_user(user)
+        user.department = '전자공학과'
+
+        self.assertIs(PermissionScope.for_user(user), scope)
+
+    def test_execution_records_filtered_through_project_join(self):
+        """ExecutionRecord is scoped by a join on its project, not a subquery."""
+        scope = PermissionScope(frozenset(['전자공학과']))
+        queryset = scope.filter(ExecutionRecord.objects.all())
+
+        self.assertEqual(list(queryset.values_list('execution_id', flat=True)), ['E-P-2'])
+        sql = str(queryset.query).upper()
+        self.assertIn('JOIN', sql)
+        self.assertEqual(sql.count('SELECT'), 1)
+
+    def test_empty_scope_and_models_without_department(self):
+        """An empty scope sees nothing; models without a department are not filtered."""
+        scope = PermissionScope(frozenset())
+
+        self.assertEqual(apply_user_permission_filter(ResearchProject.objects.all(), scope).count(), 0)
+        self.assertEqual(
+            str(scope.filter(UploadHistory.objects.all()).query),
+            str(UploadHistory.objects.all().query),
+        )
+
+    def test_cache_key(self):
+        """Cache keys are short, stable and independent of department order."""
+        self.assertEqual(PermissionScope().cache_key, 'all')
+        self.assertEqual(PermissionScope(frozenset()).cache_key, 'none')
+        self.assertEqual(
+            PermissionScope(frozenset(['전자공학과', '컴퓨터공학과'])).cache_key,
+            PermissionScope(frozenset(['컴퓨터공학과', '전자공학과'])).cache_key,
+        )
+        self.assertNotEqual(
+            PermissionScope(frozenset(['전자공학과'])).cache_key,
+            PermissionScope(frozenset(['컴퓨터공학과'])).cache_key,
+        )
+
+    @override_settings(ANALYTICS_DEPARTMENT_SCOPING=False)
+    def test_scoping_disabled(self):
+        """Without ANALYTICS_DEPARTMENT_SCOPING viewers see all data."""
+        viewer = self.make_user('viewer', '컴퓨터공학과')
+
+        self.assertEqual(apply_user_permission_filter(ResearchProject.objects.all(), viewer).count(), 2)
@@ -22,7 +22,10 @@ from apps.analytics.models import (
     ResearchProject,
     ExecutionRecord,
     Student,
-    UploadHistory
+    UploadHistory,
+    ProjectExecutionRate,
+    DepartmentStudentStats,
+    PublicationStats,
 )
 from apps.authentication.models import User
 
@@ -374,3 +377,87 @@ class UploadHistoryModelTest(TestCase):
 
         expected = 'department_kpi.csv - department_kpi (success)'
         self.assertEqual(str(upload), expected)
+
+
+class AnalyticsViewModelTest(TestCase):
+    """Test read-only models over the analytics database views"""
+
+    def setUp(self):
+        self.project = ResearchProject.objects.create(
+            project_number='NRF-2023-001',
+            project_name='AI 연구',
+            principal_investigator='김교수',
+            department='컴퓨터공학과',
+            funding_agency='한국연구재단',
+            total_budget=3
+        )
+        ResearchProject.objects.create(
+            project_number='NRF-2023-002',
+            project_name='미집행 과제',
+            principal_investigator='이교수',
+            department='전자공학과',
+            funding_agency='한국연구재단',
+            total_budget=0
+        )
+        ExecutionRecord.objects.create(
+            execution_id='T001',
+            project=self.project,
+            execution_date=date(2023, 6, 15),
+            expense_category='인건비',
+            amount=2,
+            status='집행완료'
+        )
+
+    def test_models_are_unmanaged_views(self):
+        """Test that view models map to the v_* views and are not managed"""
+        self.assertEqual(ProjectExecutionRate._meta.db_table, 'v_project_execution_rate')
+        self.assertEqual(DepartmentStudentStats._meta.db_table, 'v_department_student_stats')
+        self.assertEqual(PublicationStats._meta.db_table, 'v_publication_stats')
+        self.assertFalse(ProjectExecutionRate._meta.managed)
+
+    def test_project_execution_rate(self):
+        """Test per-project totals, including projects without executions"""
+        rates = {r.project_number: r for r in ProjectExecutionRate.objects.all()}
+
+        self.assertEqual(rates['NRF-2023-001'].total_executed, 2)
+        self.assertEqual(rates['NRF-2023-001'].execution_rate_percent, Decimal('66.67'))
+        self.assertEqual(rates['NRF-2023-002'].total_executed, 0)
+        self.assertEqual(rates['NRF-2023-002'].execution_rate_percent, Decimal('0'))
+
+    def test_department_student_stats(self):
+        """Test conditional counts per department"""
+        for number, status, gender in [('1', '재학', '남'), ('2', '휴학', '여'), ('3', '재학', '여')]:
+            Student.objects.create(
+                student_number=number, name='학생', college='공과대학',
+                department='컴퓨터공학과', program_type='학사',
+                enrollment_status=status, gender=gender, admission_year=2023
+            )
+
+        stats = DepartmentStudentStats.objects.values().get(department='컴퓨터공학과')
+
+        self.assertEqual(stats['total_students'], 3)
+        self.assertEqual(stats['enrolled_students'], 2)
+        self.assertEqual(stats['leave_students'], 1)
+        self.assertEqual(stats['female_students'], 2)
+        self.assertEqual(stats['undergraduate_students'], 3)
+
+    def test_publication_stats(self):
+        """Test counts per publication year and journal grade"""
+        for pub_id, linked in [('P1', 'Y'), ('P2', 'N')]:
+            Publication.objects.create(
+                publication_id=pub_id, publication_date=date(2023, 3, 1),
+                college='공과대학', department='컴퓨터공학과', title='논문',
+                first_author='김교수', journal_name='학술지', journal_grade='SCIE',
+                project_linked=linked
+            )
+
+        stats = PublicationStats.objects.values().get()
+
+        self.assertEqual(stats['publication_year'], 2023)
+        self.assertEqual(stats['publication_count'], 2)
+        self.assertEqual(stats['project_linked_count'], 1)
+
+    def test_view_models_are_read_only(self):
+        """Test that saving a view row is rejected"""
+        with self.assertRaises(NotImplementedError):
+            ProjectExecutionRate.objects.first().save()
@@ -0,0 +1,124 @@
+"""
+Tests for yearly partition tooling.
+
+Partitioning itself is PostgreSQL-only; on other databases (the SQLite
+test database) every helper must be a no-op so uploads keep working.
+
+Test Coverage:
+- Partition bound parsing
+- No-op behaviour on unpartitioned tables
+- Partition-aware bulk loading in the upload parsers
+- manage_partitions command
+"""
+import io
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.analytics import partitions
+from apps.analytics.models import ExecutionRecord, ResearchProject
+from apps.data_upload.parsers import ResearchBudgetParser
+
+
+class PartitionHelpersTest(TestCase):
+    """Test partition helpers."""
+
+    def test_partition_year_parses_yearly_bounds(self):
+        """Only [Jan 1, Jan 1 next year) bounds are year partitions."""
+        self.assertEqual(
+            partitions.partition_year("FOR VALUES FROM ('2024-01-01') TO ('2025-01-01')"), 2024
+        )
+        self.assertIsNone(partitions.partition_year('DEFAULT'))
+        self.assertIsNone(
+            partitions.partition_year("FOR VALUES FROM ('2020-01-01') TO ('2023-01-01')")
+        )
+
+    def test_helpers_are_noops_without_partitioning(self):
+        """Unpartitioned tables have no partitions and nothing is created."""
+        self.assertFalse(partitions.is_partitioned('execution_records'))
+        self.assertEqual(partitions.list_partitions('publications'), [])
+        self.assertEqual(partitions.ensure_year_partitions('publications', [2027]), [])
+        self.assertEqual(
+            partitions.ensure_future_partitions(today=date(2026, 10, 19)),
+            {'execution_records': [], 'publications': []},
+        )
+
+    def test_unknown_table_is_rejected(self):
+        """Only execution_records and publications can be partitioned."""
+        with self.assertRaises(ValueError):
+            partitions.is_partitioned('students')
+
+    def test_detach_requires_partitioned_table(self):
+        """Detaching from an unpartitioned table fails."""
+        with self.assertRaises(ValueError):
+            partitions.detach_year_partition('execution_records', 2015)
+
+
+class PartitionAwareLoadTest(TestCase):
+    """Test bulk loading through the parsers."""
+
+    def budget_rows(self):
+        return pd.DataFrame({
+            '집행ID': ['E1', 'E2', 'E3'],
+            '과제번호': ['R1', 'R1', 'R2'],
+            '과제명': ['AI', 'AI', '반도체'],
+            '연구책임자': ['김교수', '김교수', '이교수'],
+            '소속학과': ['컴퓨터공학과', '컴퓨터공학과', '전자공학과'],
+            '지원기관': ['NRF', 'NRF', 'IITP'],
+            '총연구비': [1000, 1000, 2000],
+            '집행일자': ['2024-02-01', '2022-05-03', '2023-07-09'],
+            '집행항목': ['인건비', '장비비', '인건비'],
+            '집행금액': [10, 20, 30],
+            '상태': ['집행완료', '집행완료', '처리중'],
+            '비고': [None, None, None],
+        })
+
+    def test_research_budget_save_bulk_loads_by_date(self):
+        """Executions are inserted in date order after preparing partitions."""
+        with mock.patch('apps.data_upload.parsers.prepare_partitions') as prepare:
+            rows = ResearchBudgetParser().save(self.budget_rows())
+
+        self.assertEqual(rows, 3)
+        model, dates = prepare.call_args.args
+        self.assertIs(model, ExecutionRecord)
+        self.assertEqual(dates, [date(2022, 5, 3), date(2023, 7, 9), date(2024, 2, 1)])
+        self.assertEqual(
+            list(ExecutionRecord.objects.order_by('id').values_list('execution_id', flat=True)),
+            ['E2', 'E3', 'E1'],
+        )
+
+    def test_research_budget_save_creates_each_project_once(self):
+        """Rows of the same project share one ResearchProject."""
+        ResearchBudgetParser().save(self.budget_rows())
+
+        self.assertEqual(ResearchProject.objects.count(), 2)
+        self.assertEqual(ResearchProject.objects.get(project_number='R1').execution_records.count(), 2)
+
+
+class ManagePartitionsCommandTest(TestCase):
+    """Test manage.py manage_partitions."""
+
+    def test_status_reports_unpartitioned_tables(self):
+        """status lists each table's partitioning state."""
+        out = io.StringIO()
+
+        call_command('manage_partitions', 'status', stdout=out)
+
+        self.assertIn('execution_records: not partitioned', out.getvalue())
+        self.assertIn('publications: not partitioned', out.getvalue())
+
+    def test_create_requires_year(self):
+        """create and detach need --year."""
+        with self.assertRaises(CommandError):
+            call_command('manage_partitions', 'create', stdout=io.StringIO())
+
+    def test_detach_unpartitioned_table_fails(self):
+        """detach refuses tables that are not partitioned."""
+        with self.assertRaises(CommandError):
+            call_command(
+                'manage_partitions', 'detach', '--table', 'publications', '--year', '2015',
+                stdout=io.StringIO(),
+            )
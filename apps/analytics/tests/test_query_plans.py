@@ -0,0 +1,201 @@
+"""
+Query plan tests for the analytics index pack.
+
+Runs every aggregator method (and the hot view queries) through the
+EXPLAIN harness in apps/analytics/query_plans.py and asserts that each
+base table is read through an index, index-only where the index covers
+the query. The test database mirrors the index set of
+supabase/migrations/20261019000200_analytics_index_pack.sql
+(analytics migration 0006).
+
+Run: python manage.py test apps.analytics.tests.test_query_plans
+"""
+from django.db.models import Count, Max
+from django.test import TestCase
+
+from apps.analytics.aggregators import (
+    DepartmentKPIAggregator,
+    PublicationAggregator,
+    ResearchBudgetAggregator,
+    StudentAggregator,
+)
+from apps.analytics.filters import filter_by_quarter, filter_by_semester, filter_by_year
+from apps.analytics.models import DepartmentKPI, ExecutionRecord, Publication
+from apps.analytics.query_plans import (
+    explain_callable,
+    explain_queryset,
+    full_scans,
+    indexes_used,
+    parse_plan,
+)
+
+
+class AggregatorQueryPlanTest(TestCase):
+    """Every aggregator query should use an index"""
+
+    def assert_no_full_scans(self, func, *args):
+        plans = explain_callable(lambda: func(*args))
+
+        self.assertTrue(plans, f'{func.__qualname__} issued no SELECT')
+        self.assertEqual(
+            full_scans(plans), [],
+            f'{func.__qualname__}{args} scans a table without an index'
+        )
+        return plans
+
+    def test_department_kpi_aggregator(self):
+        """Test DepartmentKPIAggregator methods use indexes"""
+        aggregator = DepartmentKPIAggregator()
+
+        self.assert_no_full_scans(aggregator.get_average_employment_rate)
+        self.assert_no_full_scans(aggregator.get_average_employment_rate, 2023)
+        self.assert_no_full_scans(aggregator.get_kpi_by_department, ['컴퓨터공학과'])
+        self.assert_no_full_scans(aggregator.get_kpi_trend_by_year, '컴퓨터공학과', [2022, 2023])
+        self.assert_no_full_scans(aggregator.get_kpi_by_college, '공과대학')
+
+    def test_publication_aggregator(self):
+        """Test PublicationAggregator methods use indexes"""
+        aggregator = PublicationAggregator()
+
+        self.assert_no_full_scans(aggregator.get_total_publication_count)
+        self.assert_no_full_scans(aggregator.get_total_publication_count, '컴퓨터공학과', 2023)
+        self.assert_no_full_scans(aggregator.get_publications_by_journal_grade)
+        self.assert_no_full_scans(aggregator.get_average_impact_factor, 'SCIE')
+        self.assert_no_full_scans(aggregator.get_publications_by_first_author)
+
+    def test_author_index_queries(self):
+        """Test author and collaboration methods read the author index"""
+        aggregator = PublicationAggregator()
+
+        plans = self.assert_no_full_scans(aggregator.get_publications_by_author)
+        self.assertIn('idx_pub_author_author', indexes_used(plans))
+        self.assert_no_full_scans(aggregator.get_publications_by_author, '컴퓨터공학과')
+        self.assert_no_full_scans(aggregator.get_author_publications, '김교수')
+        self.assert_no_full_scans(aggregator.get_collaboration_edges)
+        self.assert_no_full_scans(aggregator.get_department_collaboration_matrix)
+
+    def test_research_budget_aggregator(self):
+        """Test ResearchBudgetAggregator methods use indexes"""
+        aggregator = ResearchBudgetAggregator()
+
+        self.assert_no_full_scans(aggregator.get_total_budget_and_execution)
+        self.assert_no_full_scans(aggregator.get_budget_by_department)
+        self.assert_no_full_scans(aggregator.get_execution_by_category)
+        plans = self.assert_no_full_scans(aggregator.get_execution_rate_by_project)
+
+        # Execution sums are read from the covering (project_id, amount) index
+        self.assertIn('idx_exec_project_amount', indexes_used(plans))
+
+    def test_student_aggregator(self):
+        """Test StudentAggregator methods use indexes"""
+        aggregator = StudentAggregator()
+
+        self.assert_no_full_scans(aggregator.get_total_students_and_enrollment_rate)
+        self.assert_no_full_scans(aggregator.get_students_by_grade)
+        self.assert_no_full_scans(aggregator.get_students_by_admission_year, [2023])
+        self.assert_no_full_scans(aggregator.get_students_by_program_type)
+        plans = self.assert_no_full_scans(aggregator.get_students_by_department)
+
+        # v_department_student_stats is answered from the index alone
+        self.assertTrue(all(access.index_only for plan in plans for access in plan.accesses))
+
+    def test_execution_by_category_is_index_only(self):
+        """Test category totals are read from idx_exec_category_amount only"""
+        plans = explain_callable(ResearchBudgetAggregator().get_execution_by_category)
+
+        access = plans[0].accesses[0]
+        self.assertEqual(access.index, 'idx_exec_category_amount')
+        self.assertTrue(access.index_only)
+
+
+class ViewQueryPlanTest(TestCase):
+    """Hot queries issued directly by the analytics views"""
+
+    def test_dashboard_latest_year_per_department(self):
+        """Test Max(evaluation_year) per department uses (department, evaluation_year)"""
+        plan = explain_queryset(
+            DepartmentKPI.objects.values('department').annotate(latest_year=Max('evaluation_year'))
+        )
+
+        self.assertEqual(plan.accesses[0].index, 'idx_dept_kpi_dept_year')
+        self.assertTrue(plan.accesses[0].index_only)
+
+    def test_publications_by_department(self):
+        """Test publication counts per department are index-only"""
+        plan = explain_queryset(
+            Publication.objects.values('department').annotate(count=Count('id')).order_by('department')
+        )
+
+        self.assertEqual(plan.accesses[0].index, 'idx_pub_dept_date')
+        self.assertTrue(plan.accesses[0].index_only)
+
+
+class PeriodFilterQueryPlanTest(TestCase):
+    """Year / quarter / semester filters compile to sargable ranges"""
+
+    def test_year_filter_uses_date_index(self):
+        """Test filter_by_year searches idx_pub_date"""
+        plan = explain_queryset(
+            filter_by_year(Publication.objects.all(), 'publication_date', 2023)
+        )
+
+        self.assertEqual(plan.accesses[0].index, 'idx_pub_date')
+        self.assertTrue(plan.accesses[0].detail.startswith('SEARCH'))
+        self.assertNotIn('strftime', plan.sql)
+
+    def test_quarter_and_semester_filters_use_date_index(self):
+        """Test quarter/semester ranges search the date indexes"""
+        quarter = explain_queryset(
+            filter_by_quarter(ExecutionRecord.objects.all(), 'execution_date', 2023, 2)
+        )
+        semester = explain_queryset(
+            filter_by_semester(Publication.objects.all(), 'publication_date', 2023, 2)
+        )
+
+        self.assertEqual(quarter.accesses[0].index, 'idx_exec_date')
+        self.assertEqual(semester.accesses[0].index, 'idx_pub_date')
+
+    def test_department_year_count_is_index_only(self):
+        """Test get_total_publication_count(department, year) reads idx_pub_dept_date only"""
+        plans = explain_callable(
+            lambda: PublicationAggregator().get_total_publication_count('컴퓨터공학과', 2023)
+        )
+
+        access = plans[0].accesses[0]
+        self.assertEqual(access.index, 'idx_pub_dept_date')
+        self.assertTrue(access.index_only)
+
+
+class ParsePlanTest(TestCase):
+    """Test parsing of EXPLAIN output"""
+
+    def test_sqlite_plan(self):
+        """Test SQLite SCAN/SEARCH lines"""
+        accesses = parse_plan([
+            'SCAN publications',
+            'SEARCH students USING COVERING INDEX idx_student_admission (admission_year=?)',
+            'SCAN v_project_execution_rate',
+        ], vendor='sqlite')
+
+        self.assertEqual([a.table for a in accesses], ['publications', 'students'])
+        self.assertIsNone(accesses[0].index)
+        self.assertTrue(accesses[1].index_only)
+
+    def test_postgres_plan(self):
+        """Test PostgreSQL EXPLAIN text lines"""
+        accesses = parse_plan([
+            'HashAggregate  (cost=1.05..1.07 rows=2 width=40)',
+            '  ->  Seq Scan on students  (cost=0.00..1.03 rows=3 width=32)',
+            '  ->  Index Only Scan using idx_exec_project_amount on execution_records e  (cost=0.15..8.17)',
+            '  ->  Bitmap Heap Scan on publications  (cost=4.18..12.64 rows=4 width=8)',
+            '        ->  Bitmap Index Scan on idx_pub_date  (cost=0.00..4.18 rows=4 width=0)',
+        ], vendor='postgresql')
+
+        self.assertEqual(
+            [(a.table, a.index, a.index_only) for a in accesses],
+            [
+                ('students', None, False),
+                ('execution_records', 'idx_exec_project_amount', True),
+                ('publications', None, False),
+            ],
+        )
@@ -0,0 +1,264 @@
+"""
+Tests for monthly publication/execution rollups.
+
+Test Coverage:
+- Month helpers and contiguous month ranges
+- Rebuilding touched months from the base tables
+- Rollups maintained by regular and incremental uploads
+- Trend aggregator methods and use_rollups parity with base-table queries
+- refresh_rollups management command
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+from decimal import Decimal
+
+import pandas as pd
+from django.core.management import call_command
+from django.db.models import Sum
+from django.test import TestCase
+
+from apps.analytics.aggregators import PublicationAggregator, ResearchBudgetAggregator
+from apps.analytics.models import (
+    ExecutionRecord,
+    ExecutionRollup,
+    PublicationRollup,
+    ResearchProject,
+)
+from apps.analytics.rollups import month_runs, rebuild_rollups, refresh_rollups
+from apps.analytics.tests.factories import create_publication, publication_rows
+from apps.authentication.models import User
+from apps.data_upload.parsers import PublicationParser, ResearchBudgetParser
+
+
+class MonthRunsTest(TestCase):
+    """Test grouping months into ranges."""
+
+    def test_contiguous_months_are_merged(self):
+        """Adjacent months become one half-open range, across year ends."""
+        runs = month_runs([date(2023, 12, 1), date(2023, 11, 1), date(2024, 1, 1), date(2024, 5, 1)])
+
+        self.assertEqual(runs, [
+            (date(2023, 11, 1), date(2024, 2, 1)),
+            (date(2024, 5, 1), date(2024, 6, 1)),
+        ])
+
+
+class RefreshRollupsTest(TestCase):
+    """Test rebuilding rollup months from the base tables."""
+
+    def test_publication_rollup_groups_by_month_and_dimensions(self):
+        """Counts and impact factor sums per month/department/grade."""
+        create_publication('P1', publication_date=date(2023, 3, 2), impact_factor=Decimal('2.50'))
+        create_publication('P2', publication_date=date(2023, 3, 30), impact_factor=Decimal('3.00'))
+        create_publication('P3', publication_date=date(2023, 3, 15), journal_grade=None)
+        create_publication('P4', publication_date=date(2023, 4, 1))
+
+        written = refresh_rollups('publication', [date(2023, 3, 10)])
+
+        self.assertEqual(written, 2)
+        scie = PublicationRollup.objects.get(period_month=date(2023, 3, 1), journal_grade='SCIE')
+        self.assertEqual(scie.publication_count, 2)
+        self.assertEqual(scie.impact_factor_sum, Decimal('5.50'))
+        self.assertEqual(scie.impact_factor_count, 2)
+        self.assertTrue(PublicationRollup.objects.filter(journal_grade='').exists())
+        self.assertFalse(PublicationRollup.objects.filter(period_month=date(2023, 4, 1)).exists())
+
+    def test_refresh_replaces_stale_rows(self):
+        """Rebuilding a month drops groups that no longer exist."""
+        publication = create_publication('P1', publication_date=date(2023, 3, 2))
+        refresh_rollups('publication', [date(2023, 3, 1)])
+
+        publication.delete()
+        refresh_rollups('publication', [date(2023, 3, 1)])
+
+        self.assertEqual(PublicationRollup.objects.count(), 0)
+
+    def test_execution_rollup_uses_project_department(self):
+        """Execution rollups are keyed by the project's department."""
+        project = ResearchProject.objects.create(
+            project_number='R1', project_name='AI', principal_investigator='김교수',
+            department='전자공학과', total_budget=1000,
+        )
+        for i, amount in enumerate([100, 250]):
+            ExecutionRecord.objects.create(
+                execution_id=f'E{i}', project=project, execution_date=date(2023, 5, 10 + i),
+                expense_category='인건비', amount=amount, status='집행완료',
+            )
+
+        rebuild_rollups('research_budget')
+
+        rollup = ExecutionRollup.objects.get()
+        self.assertEqual(rollup.department, '전자공학과')
+        self.assertEqual((rollup.record_count, rollup.amount_sum), (2, 350))
+
+
+class UploadRollupMaintenanceTest(TestCase):
+    """Test rollups kept current by the upload pipeline."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write_csv(self, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+    def monthly_counts(self):
+        return dict(
+            PublicationRollup.objects.values_list('period_month').annotate(
+                total=Sum('publication_count')
+            )
+        )
+
+    def test_upload_refreshes_touched_months(self):
+        """A regular upload rebuilds the months of its rows."""
+        path = self.write_csv('pubs.csv', publication_rows([
+            ('P1', '2023-03-02', 'SCIE', 2.5),
+            ('P2', '2023-05-20', 'KCI', None),
+        ], columns=('논문ID', '게재일', '저널등급', 'Impact Factor')))
+
+        result = PublicationParser().parse(path, self.user)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(self.monthly_counts(), {date(2023, 3, 1): 1, date(2023, 5, 1): 1})
+
+    def test_incremental_upload_moves_changed_and_deleted_rows(self):
+        """Old months of changed/deleted rows are rebuilt too."""
+        PublicationParser().parse(self.write_csv('v1.csv', publication_rows([
+            ('P1', '2023-03-02', 'SCIE', 2.5),
+            ('P2', '2023-04-20', 'KCI', None),
+        ], columns=('논문ID', '게재일', '저널등급', 'Impact Factor'))), self.user)
+
+        # P1 moves to June, P2 is removed
+        PublicationParser(incremental=True).parse(self.write_csv('v2.csv', publication_rows([
+            ('P1', '2023-06-02', 'SCIE', 2.5),
+        ], columns=('논문ID', '게재일', '저널등급', 'Impact Factor'))), self.user)
+
+        self.assertEqual(self.monthly_counts(), {date(2023, 6, 1): 1})
+
+    def test_research_budget_upload_refreshes_execution_rollups(self):
+        """Execution uploads maintain execution_rollups."""
+        path = self.write_csv('budget.csv', pd.DataFrame({
+            '집행ID': ['E1', 'E2'],
+            '과제번호': ['R1', 'R1'],
+            '과제명': ['AI', 'AI'],
+            '연구책임자': ['김교수', '김교수'],
+            '소속학과': ['컴퓨터공학과', '컴퓨터공학과'],
+            '지원기관': ['NRF', 'NRF'],
+            '총연구비': [1000000, 1000000],
+            '집행일자': ['2023-03-02', '2023-03-20'],
+            '집행항목': ['인건비', '인건비'],
+            '집행금액': [1000, 2000],
+            '상태': ['집행완료', '집행완료'],
+            '비고': [None, None],
+        }))
+
+        result = ResearchBudgetParser().parse(path, self.user)
+
+        self.assertTrue(result['success'])
+        rollup = ExecutionRollup.objects.get()
+        self.assertEqual((rollup.period_month, rollup.amount_sum), (date(2023, 3, 1), 3000))
+
+
+class RollupAggregatorTest(TestCase):
+    """Test trend methods and use_rollups fallbacks."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_publication('P1', publication_date=date(2022, 11, 5), impact_factor=Decimal('1.25'))
+        create_publication('P2', publication_date=date(2023, 2, 1), impact_factor=Decimal('2.00'))
+        create_publication('P3', publication_date=date(2023, 8, 9), department='전자공학과', journal_grade='KCI')
+        create_publication('P4', publication_date=date(2023, 8, 30), journal_grade=None)
+
+        project = ResearchProject.objects.create(
+            project_number='R1', project_name='AI', principal_investigator='김교수',
+            department='컴퓨터공학과', total_budget=1000,
+        )
+        for i, (day, category, amount) in enumerate([
+            (date(2023, 1, 5), '인건비', 100),
+            (date(2023, 1, 9), '장비비', 40),
+            (date(2023, 2, 1), '인건비', 60),
+        ]):
+            ExecutionRecord.objects.create(
+                execution_id=f'E{i}', project=project, execution_date=day,
+                expense_category=category, amount=amount, status='집행완료',
+            )
+
+        rebuild_rollups()
+
+    def test_publication_trend_by_year(self):
+        """Yearly counts and average impact factor from monthly rollups."""
+        trend = PublicationAggregator().get_publication_trend()
+
+        self.assertEqual(trend, [
+            {'period': 2022, 'count': 1, 'average_impact_factor': Decimal('1.25')},
+            {'period': 2023, 'count': 3, 'average_impact_factor': Decimal('2.00')},
+        ])
+
+    def test_publication_trend_by_quarter_with_filter(self):
+        """Quarter periods are the first day of the quarter."""
+        trend = PublicationAggregator().get_publication_trend('quarter', department='컴퓨터공학과')
+
+        self.assertEqual(
+            [(item['period'], item['count']) for item in trend],
+            [(date(2022, 10, 1), 1), (date(2023, 1, 1), 1), (date(2023, 7, 1), 1)],
+        )
+
+    def test_execution_trend_by_month(self):
+        """Monthly spending per category."""
+        trend = ResearchBudgetAggregator().get_execution_trend(year=2023)
+
+        self.assertEqual(
+            [(item['period'], item['expense_category'], item['total_amount']) for item in trend],
+            [
+                (date(2023, 1, 1), '인건비', 100),
+                (date(2023, 1, 1), '장비비', 40),
+                (date(2023, 2, 1), '인건비', 60),
+            ],
+        )
+
+    def test_invalid_granularity(self):
+        """Unknown granularities are rejected."""
+        with self.assertRaises(ValueError):
+            PublicationAggregator().get_publication_trend('week')
+
+    def test_use_rollups_matches_base_tables(self):
+        """Rollup-backed methods return the same results as base-table queries."""
+        base = PublicationAggregator(use_rollups=False)
+        rollup = PublicationAggregator(use_rollups=True)
+
+        self.assertEqual(rollup.get_total_publication_count(), base.get_total_publication_count())
+        self.assertEqual(
+            rollup.get_total_publication_count('컴퓨터공학과', 2023),
+            base.get_total_publication_count('컴퓨터공학과', 2023),
+        )
+        self.assertEqual(rollup.get_publications_by_journal_grade(), base.get_publications_by_journal_grade())
+        self.assertEqual(rollup.get_average_impact_factor(), base.get_average_impact_factor())
+        self.assertEqual(rollup.get_average_impact_factor('KCI'), base.get_average_impact_factor('KCI'))
+        self.assertEqual(
+            ResearchBudgetAggregator(use_rollups=True).get_execution_by_category(),
+            ResearchBudgetAggregator(use_rollups=False).get_execution_by_category(),
+        )
+
+
+class RefreshRollupsCommandTest(TestCase):
+    """Test manage.py refresh_rollups."""
+
+    def test_command_rebuilds_rollups(self):
+        """The command backfills rollups from existing rows."""
+        create_publication('P1', publication_date=date(2023, 3, 2))
+        out = io.StringIO()
+
+        call_command('refresh_rollups', '--data-type', 'publication', stdout=out)
+
+        self.assertEqual(PublicationRollup.objects.get().publication_count, 1)
+        self.assertIn('publication: 1 rollup rows written', out.getvalue())
@@ -0,0 +1,166 @@
+"""
+Tests for ranked publication search.
+
+The test database is SQLite, so searches go through the Python n-gram
+index fallback; it uses the same tokenization and field weights as the
+PostgreSQL GIN index.
+
+Test Coverage:
+- Bigram tokenization (Korean and Latin text)
+- Matching and ranking (AND semantics, title before author/journal)
+- Search page and JSON API
+- Admin search integration
+"""
+from datetime import date
+
+from django.contrib.admin.sites import AdminSite
+from django.test import RequestFactory, TestCase
+from django.urls import reverse
+
+from apps.analytics.models import Publication
+from apps.analytics.search import NgramIndex, bigrams, search_publications, search_queryset
+from apps.analytics.tests.factories import create_publication
+from apps.authentication.models import User
+from apps.data_upload.admin import PublicationAdmin
+
+
+class BigramsTest(TestCase):
+    """Test search tokenization."""
+
+    def test_korean_words_split_into_bigrams(self):
+        """Each word yields its distinct two-character grams."""
+        self.assertEqual(bigrams('반도체 공정'), ['반도', '도체', '공정'])
+
+    def test_case_punctuation_and_single_characters(self):
+        """Text is lowercased, split on punctuation, one-letter words kept."""
+        self.assertEqual(bigrams('Deep-Learning, A'), ['de', 'ee', 'ep', 'le', 'ea', 'ar', 'rn', 'ni', 'in', 'ng', 'a'])
+        self.assertEqual(bigrams('  ...  '), [])
+        self.assertEqual(bigrams(None), [])
+
+
+class NgramIndexTest(TestCase):
+    """Test the in-memory inverted index."""
+
+    def test_all_query_bigrams_must_match(self):
+        """Documents missing any query bigram are excluded."""
+        index = NgramIndex()
+        index.add(1, {'title': '반도체 공정 연구'})
+        index.add(2, {'title': '반도체 설계'})
+
+        self.assertEqual([key for key, _ in index.search('반도체 공정')], [1])
+        self.assertEqual(index.search('양자'), [])
+
+    def test_title_matches_score_higher(self):
+        """Title matches outrank author and journal matches."""
+        index = NgramIndex()
+        index.add('journal', {'title': '연구', 'journal_name': '반도체학회지'})
+        index.add('title', {'title': '반도체 연구'})
+        index.add('author', {'title': '연구', 'first_author': '반도체'})
+
+        self.assertEqual([key for key, _ in index.search('반도체')], ['title', 'author', 'journal'])
+
+
+class SearchPublicationsTest(TestCase):
+    """Test searching the publications table."""
+
+    @classmethod
+    def setUpTestData(cls):
+        create_publication('P1', title='차세대 반도체 공정 기술', publication_date=date(2022, 1, 1))
+        create_publication('P2', title='딥러닝 기반 영상 분석', first_author='반도현')
+        create_publication('P3', title='반도체 소자 모델링', publication_date=date(2024, 1, 1))
+        create_publication('P4', title='Quantum Computing Survey', journal_name='IEEE Quantum')
+
+    def test_ranked_by_field_then_newest(self):
+        """Title matches first, newest first among equal ranks."""
+        results = search_publications('반도')
+
+        self.assertEqual([p.publication_id for p in results], ['P3', 'P1', 'P2'])
+        self.assertGreater(results[0].rank, results[2].rank)
+
+    def test_search_respects_queryset_and_limit(self):
+        """Only the given queryset is searched."""
+        queryset = Publication.objects.filter(publication_date__year=2022)
+
+        self.assertEqual([p.publication_id for p in search_publications('반도체', queryset=queryset)], ['P1'])
+        self.assertEqual(len(search_publications('반도', limit=1)), 1)
+
+    def test_latin_text_is_case_insensitive(self):
+        """Latin queries match regardless of case."""
+        self.assertEqual([p.publication_id for p in search_publications('quantum')], ['P4'])
+
+    def test_query_without_tokens_matches_nothing(self):
+        """Punctuation-only or unmatched queries return no rows."""
+        self.assertFalse(search_queryset(Publication.objects.all(), '!!!').exists())
+        self.assertEqual(search_publications('없는검색어'), [])
+
+
+class SearchViewTest(TestCase):
+    """Test the search page and JSON API."""
+
+    def setUp(self):
+        self.user = User(email='viewer@test.com', name='조회자', role='viewer', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+        create_publication('P1', title='반도체 공정 기술')
+        create_publication('P2', title='영상 분석')
+
+    def test_search_page_lists_results(self):
+        """The page renders matching publications."""
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('analytics:publication_search'), {'q': '반도체'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([p.publication_id for p in response.context['results']], ['P1'])
+        self.assertContains(response, '반도체 공정 기술')
+
+    def test_search_api_returns_ranked_json(self):
+        """The API returns results with their rank."""
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('analytics:publication_search_api'), {'q': '공정', 'limit': '5'})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data['count'], 1)
+        self.assertEqual(data['results'][0]['publication_id'], 'P1')
+        self.assertEqual(data['results'][0]['publication_date'], '2023-03-01')
+
+    def test_search_api_requires_query(self):
+        """A missing query is a bad request."""
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('analytics:publication_search_api'))
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_inactive_user_is_forbidden(self):
+        """Pending users cannot search."""
+        self.user.status = 'pending'
+        self.user.save()
+        self.client.force_login(self.user)
+
+        response = self.client.get(reverse('analytics:publication_search_api'), {'q': '공정'})
+
+        self.assertIn(response.status_code, (302, 403))
+
+
+class PublicationAdminSearchTest(TestCase):
+    """Test admin changelist search."""
+
+    def test_admin_search_uses_index_and_exact_id(self):
+        """Admin search matches the exact ID or the search index."""
+        create_publication('P1', title='반도체 공정')
+        create_publication('P2', title='영상 분석', first_author='공정민')
+        create_publication('P10', title='자연어 처리')
+        model_admin = PublicationAdmin(Publication, AdminSite())
+        request = RequestFactory().get('/admin/')
+
+        queryset, may_have_duplicates = model_admin.get_search_results(
+            request, Publication.objects.all(), '공정'
+        )
+        self.assertFalse(may_have_duplicates)
+        self.assertEqual(sorted(queryset.values_list('publication_id', flat=True)), ['P1', 'P2'])
+
+        queryset, _ = model_admin.get_search_results(request, Publication.objects.all(), 'P1')
+        self.assertEqual(list(queryset.values_list('publication_id', flat=True)), ['P1'])
@@ -0,0 +1,177 @@
+"""
+Tests for approximate-count sketches.
+
+Test Coverage:
+- HyperLogLog accuracy within the documented error bound
+- Count-Min top-K (never undercounts, finds heavy hitters)
+- Sketch versions written by uploads (append vs. rebuild)
+- Approximate aggregator modes and exact fallback
+- refresh_sketches command
+"""
+import io
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from apps.analytics import sketches
+from apps.analytics.aggregators import DepartmentKPIAggregator, PublicationAggregator
+from apps.analytics.models import DataSketch, DepartmentKPI
+from apps.analytics.sketches import CountMinTopK, HyperLogLog, hash_values
+from apps.analytics.tests.factories import create_publication, publication_rows
+from apps.authentication.models import User
+from apps.data_upload.parsers import PublicationParser
+
+
+class HyperLogLogTest(TestCase):
+    """Test distinct count estimates."""
+
+    def test_small_cardinalities_are_exact(self):
+        """Linear counting is exact at dashboard scales."""
+        hll = HyperLogLog()
+        hll.add_hashes(hash_values([f'학과{i % 37}' for i in range(1000)] + [None])[1])
+
+        self.assertEqual(hll.estimate(), 37)
+
+    def test_large_cardinality_within_error_bound(self):
+        """Estimates stay within 3 standard errors (2.4%)."""
+        hll = HyperLogLog()
+        for start in range(0, 200000, 50000):
+            hll.add_hashes(hash_values([f'v{i}' for i in range(start, start + 50000)])[1])
+
+        self.assertLess(abs(hll.estimate() - 200000) / 200000, 0.024)
+
+    def test_serialization_round_trip(self):
+        """Registers survive to_bytes/from_bytes."""
+        hll = HyperLogLog()
+        hll.add_hashes(hash_values(['a', 'b', 'c'])[1])
+
+        self.assertEqual(HyperLogLog.from_bytes(hll.to_bytes(), hll.precision).estimate(), 3)
+
+
+class CountMinTopKTest(TestCase):
+    """Test top-K estimates."""
+
+    def test_heavy_hitters_found_without_undercounting(self):
+        """Top values are found across batches and never undercounted."""
+        rng = np.random.default_rng(0)
+        values = [f'a{i}' for i in rng.zipf(1.5, 20000) % 5000]
+        exact = pd.Series(values).value_counts()
+        sketch = CountMinTopK(width=2 ** 12, depth=4, capacity=20)
+        for start in range(0, len(values), 3000):
+            sketch.add(values[start:start + 3000])
+
+        top = sketch.top(5)
+        self.assertEqual([value for value, _ in top], list(exact.index[:5]))
+        for value, count in top:
+            self.assertGreaterEqual(count, exact[value])
+            self.assertLessEqual(count - exact[value], np.e / 2 ** 12 * len(values))
+        self.assertEqual(sketch.total, len(values))
+
+
+class UploadSketchTest(TestCase):
+    """Test sketch versions written by uploads."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def upload(self, name, rows, incremental=False, commit=True):
+        path = os.path.join(self.test_dir, name)
+        publication_rows(rows, columns=('논문ID', '주저자')).to_csv(path, index=False, encoding='utf-8-sig')
+        with self.captureOnCommitCallbacks(execute=commit):  # Sketch rebuilds
+            return PublicationParser(incremental=incremental).parse(path, self.user)
+
+    def test_uploads_extend_previous_version(self):
+        """Each upload stores a new version with the appended rows."""
+        self.upload('v1.csv', [('P1', '김교수'), ('P2', '김교수')])
+        self.upload('v2.csv', [('P3', '이교수'), ('P4', '김교수')])
+
+        latest = sketches.latest_sketch('publication.first_author')
+        self.assertEqual(DataSketch.objects.filter(name='publication.first_author').count(), 2)
+        self.assertEqual(latest.row_count, 4)
+        self.assertIsNotNone(latest.upload)
+        self.assertEqual(sketches.estimate_top('publication.first_author', 2), [('김교수', 3), ('이교수', 1)])
+
+    def test_incremental_upload_rebuilds_from_table(self):
+        """Deleted rows leave the sketch after an incremental upload commits."""
+        self.upload('v1.csv', [('P1', '김교수'), ('P2', '이교수')])
+
+        self.upload('v2.csv', [('P1', '김교수')], incremental=True, commit=False)
+        self.assertEqual(len(sketches.estimate_top('publication.first_author', 5)), 2)
+
+        self.upload('v3.csv', [('P1', '김교수')], incremental=True)
+        self.assertEqual(sketches.estimate_top('publication.first_author', 5), [('김교수', 1)])
+
+    def test_old_versions_are_pruned(self):
+        """Only SKETCH_VERSIONS_KEPT versions are kept."""
+        for i in range(sketches.SKETCH_VERSIONS_KEPT + 2):
+            self.upload(f'v{i}.csv', [(f'P{i}', '김교수')])
+
+        self.assertEqual(
+            DataSketch.objects.filter(name='publication.first_author').count(),
+            sketches.SKETCH_VERSIONS_KEPT,
+        )
+
+
+class ApproximateAggregatorTest(TestCase):
+    """Test approximate tile methods."""
+
+    @classmethod
+    def setUpTestData(cls):
+        for i, author in enumerate(['김교수', '김교수', '이교수']):
+            create_publication(f'P{i}', first_author=author)
+        for department in ['컴퓨터공학과', '전자공학과']:
+            DepartmentKPI.objects.create(evaluation_year=2023, college='공과대학', department=department)
+
+    def test_falls_back_to_exact_without_sketch(self):
+        """Approximate mode runs the exact query when nothing was sketched."""
+        self.assertEqual(DepartmentKPIAggregator(approximate=True).get_department_count(), 2)
+        self.assertEqual(
+            PublicationAggregator(approximate=True).get_publications_by_first_author(1),
+            [{'first_author': '김교수', 'count': 2}],
+        )
+
+    def test_sketch_results_match_exact(self):
+        """Approximate results equal exact ones at small scale."""
+        call_command('refresh_sketches', stdout=io.StringIO())
+
+        for approximate in (True, False):
+            self.assertEqual(DepartmentKPIAggregator(approximate=approximate).get_department_count(), 2)
+            self.assertEqual(
+                PublicationAggregator(approximate=approximate).get_publications_by_first_author(2),
+                [{'first_author': '김교수', 'count': 2}, {'first_author': '이교수', 'count': 1}],
+            )
+
+    @override_settings(ANALYTICS_APPROXIMATE_TILES=True)
+    def test_exact_on_demand(self):
+        """approximate=False ignores a stale sketch."""
+        call_command('refresh_sketches', stdout=io.StringIO())
+        DepartmentKPI.objects.create(evaluation_year=2023, college='공과대학', department='기계공학과')
+
+        self.assertEqual(DepartmentKPIAggregator().get_department_count(), 2)
+        self.assertEqual(DepartmentKPIAggregator(approximate=False).get_department_count(), 3)
+
+
+class RefreshSketchesCommandTest(TestCase):
+    """Test manage.py refresh_sketches."""
+
+    def test_command_builds_sketches(self):
+        """The command builds a version of every sketch."""
+        create_publication('P1', first_author='김교수')
+        out = io.StringIO()
+
+        call_command('refresh_sketches', stdout=out)
+
+        self.assertIn('publication.first_author: 1 rows sketched', out.getvalue())
+        self.assertIn('department_kpi.department: 0 rows sketched', out.getvalue())
+        self.assertIsNone(sketches.latest_sketch('publication.first_author').upload)
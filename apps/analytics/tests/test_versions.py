@@ -0,0 +1,81 @@
+"""
+Tests for per-data-type data versions.
+
+Test Coverage:
+- Counters start at 0, are created on the first bump and are independent
+- Bumps roll back with the transaction that made them
+- Uploads, failed uploads and reverts
+"""
+import os
+import shutil
+import tempfile
+
+from django.db import transaction
+from django.test import TestCase
+
+from apps.analytics.models import UploadHistory
+from apps.analytics.tests.factories import publication_rows
+from apps.analytics.versions import bump_data_version, data_version
+from apps.authentication.models import User
+from apps.data_upload.parsers import PublicationParser
+from apps.data_upload.revert import revert_upload
+
+
+class DataVersionTest(TestCase):
+    """Test the version counters."""
+
+    def test_bump(self):
+        """The first bump creates the row; each bump adds one to its data type only."""
+        self.assertEqual(data_version('publication'), 0)
+
+        bump_data_version('publication')
+        bump_data_version('publication')
+        bump_data_version('student')
+
+        self.assertEqual(data_version('publication'), 2)
+        self.assertEqual(data_version('student'), 1)
+        self.assertEqual(data_version('department_kpi'), 0)
+
+    def test_rolled_back_bump(self):
+        """A bump is undone with its transaction."""
+        bump_data_version('publication')
+
+        with self.assertRaises(RuntimeError), transaction.atomic():
+            bump_data_version('publication')
+            raise RuntimeError
+
+        self.assertEqual(data_version('publication'), 1)
+
+
+class WriteVersionTest(TestCase):
+    """Test that writes to the data bump its version."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def upload(self, df):
+        path = os.path.join(self.test_dir, 'publications.csv')
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return PublicationParser().parse(path, self.user)
+
+    def test_upload_and_revert(self):
+        """Successful uploads and reverts bump the version."""
+        self.assertTrue(self.upload(publication_rows([('PUB-1', '2023-03-01', '김교수')]))['success'])
+        uploaded = data_version('publication')
+        self.assertGreater(uploaded, 0)
+
+        revert_upload(UploadHistory.objects.get(status='success'))
+
+        self.assertGreater(data_version('publication'), uploaded)
+
+    def test_failed_upload(self):
+        """A failed upload leaves the version unchanged."""
+        self.assertFalse(self.upload(publication_rows([('PUB-1', 'not a date', '김교수')]))['success'])
+
+        self.assertEqual(data_version('publication'), 0)
@@ -7,8 +7,12 @@ URL Patterns:
 - / or /dashboard/ - Main dashboard
 - /department-kpi/ - Department KPI visualization
 - /publications/ - Publications analysis
+- /publications/search/ - Ranked publication search page
+- /api/publications/search/ - Ranked publication search (JSON)
 - /research-budget/ - Research budget analysis
 - /students/ - Student statistics
+- /<page>/download/ - Streaming CSV/XLSX download of a page's data
+- /export/<source>/<format>/ - Streaming Parquet/Arrow export
 """
 from django.urls import path
 from apps.analytics import views
@@ -22,13 +26,22 @@ urlpatterns = [
 
     # Department KPI
     path('department-kpi/', views.department_kpi_view, name='department_kpi'),
+    path('department-kpi/download/', views.download_view, {'dataset': 'department_kpi'}, name='department_kpi_download'),
 
     # Publications
     path('publications/', views.publications_view, name='publications'),
+    path('publications/download/', views.download_view, {'dataset': 'publications'}, name='publications_download'),
+    path('publications/search/', views.publication_search_view, name='publication_search'),
+    path('api/publications/search/', views.publication_search_api, name='publication_search_api'),
 
     # Research Budget
     path('research-budget/', views.research_budget_view, name='research_budget'),
+    path('research-budget/download/', views.download_view, {'dataset': 'research_budget'}, name='research_budget_download'),
 
     # Students
     path('students/', views.students_view, name='students'),
+    path('students/download/', views.download_view, {'dataset': 'students'}, name='students_download'),
+
+    # Columnar export (Parquet / Arrow IPC)
+    path('export/<str:source>/<str:export_format>/', views.export_view, name='export'),
 ]
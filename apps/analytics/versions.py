@@ -0,0 +1,55 @@
+"""
+Data versions: one change counter per data type, in the database.
+
+Caches built from a data type's tables (admin facet choices, columnar
+snapshots) are tagged with its version and discarded once it changes.
+Every write to the tables (uploads, reverts, partition detaches, admin
+edits) calls bump_data_version() in its own transaction, so the new
+version becomes visible in every process exactly when the new data does,
+and a rolled back write leaves it unchanged.
+
+    >>> version = data_version('publication')
+    >>> with transaction.atomic():
+    ...     Publication.objects.filter(pk=pk).update(journal_grade='SCIE')
+    ...     bump_data_version('publication')
+    >>> data_version('publication') == version + 1
+    True
+"""
+from typing import Optional
+
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from apps.analytics.models import DataVersion
+
+
+def data_version(data_type: str, using: Optional[str] = None) -> int:
+    """Current version of a data type (0 before its first change), read from using (default: routed)."""
+    version = (
+        DataVersion.objects.using(using).filter(data_type=data_type)
+        .values_list('version', flat=True).first()
+    )
+    return version or 0
+
+
+def bump_data_version(data_type: str) -> None:
+    """
+    Increment the version of a data type.
+
+    Call inside the transaction that writes the data; the row stays locked
+    until it commits, so concurrent writers are serialized on it.
+    """
+    if _increment(data_type):
+        return
+    try:
+        with transaction.atomic():
+            DataVersion.objects.create(data_type=data_type, version=1)
+    except IntegrityError:
+        _increment(data_type)  # Created concurrently
+
+
+def _increment(data_type: str) -> int:
+    return DataVersion.objects.filter(data_type=data_type).update(
+        version=F('version') + 1, updated_at=timezone.now(),
+    )
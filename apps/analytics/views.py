@@ -7,14 +7,18 @@ Views:
 - dashboard_view: Main dashboard with overall KPI summary
 - department_kpi_view: Department KPI analysis and visualization
 - publications_view: Publication statistics and analysis
+- publication_search_view: Ranked publication search page
+- publication_search_api: Ranked publication search (JSON)
 - research_budget_view: Research budget and execution analysis
 - students_view: Student enrollment and demographics
+- export_view: Streaming Parquet/Arrow export of an analytics table
+- download_view: Streaming CSV/XLSX download of the data behind a page
 
 All views require login and apply role-based permission filtering.
 """
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
-from django.db.models import Count, Sum, Avg, Q, Max
+from django.db.models import Count, Sum, Avg, Q, Max, F
 from decimal import Decimal
 import json
 
@@ -23,7 +27,8 @@ from apps.analytics.models import (
     Publication,
     ResearchProject,
     ExecutionRecord,
-    Student
+    Student,
+    ProjectExecutionRate,
 )
 from apps.analytics.aggregators import (
     DepartmentKPIAggregator,
@@ -36,7 +41,14 @@ from apps.analytics.serializers import (
     to_line_chart_data,
     to_pie_chart_data,
 )
-from apps.analytics.filters import apply_user_permission_filter
+from apps.analytics.filters import (
+    PermissionScope,
+    apply_user_permission_filter,
+    filter_by_semester,
+    filter_by_year,
+    parse_year,
+)
+from apps.analytics.sketches import latest_sketch
 
 
 def _check_user_active(user):
@@ -67,6 +79,9 @@ def dashboard_view(request):
     - Admin/Manager: See all departments
     - Viewer: See only their own department
 
+    The department count tile may be a sketch estimate
+    (ANALYTICS_APPROXIMATE_TILES); ?exact=1 forces exact counts.
+
     Template: analytics/dashboard.html
     """
     # Check if user is active
@@ -81,13 +96,15 @@ def dashboard_view(request):
     students = apply_user_permission_filter(Student.objects.all(), request.user)
 
     # Get aggregated data using aggregators
-    kpi_aggregator = DepartmentKPIAggregator()
-    pub_aggregator = PublicationAggregator()
-    budget_aggregator = ResearchBudgetAggregator()
-    student_aggregator = StudentAggregator()
+    approximate = False if request.GET.get('exact') == '1' else None
+    scope = PermissionScope.for_user(request.user)
+    kpi_aggregator = DepartmentKPIAggregator(approximate=approximate, scope=scope)
+    pub_aggregator = PublicationAggregator(scope=scope)
+    budget_aggregator = ResearchBudgetAggregator(scope=scope)
+    student_aggregator = StudentAggregator(scope=scope)
 
     # Calculate summary statistics
-    total_departments = kpis.values('department').distinct().count()
+    total_departments = kpi_aggregator.get_department_count()
     total_publications = publications.count()
     total_students = students.count()
 
@@ -160,6 +177,7 @@ def dashboard_view(request):
 
     context = {
         'total_departments': total_departments,
+        'tiles_approximate': kpi_aggregator.approximate and latest_sketch('department_kpi.department') is not None,
         'total_publications': total_publications,
         'total_students': total_students,
         'avg_employment_rate': avg_employment_rate,
@@ -193,12 +211,7 @@ def department_kpi_view(request):
         return HttpResponseForbidden('Your account is pending approval.')
 
     # Get year filter from request
-    selected_year = request.GET.get('year')
-    if selected_year:
-        try:
-            selected_year = int(selected_year)
-        except (ValueError, TypeError):
-            selected_year = None
+    selected_year = parse_year(request.GET.get('year'))
 
     # Apply permission filtering
     kpis = apply_user_permission_filter(DepartmentKPI.objects.all(), request.user)
@@ -208,7 +221,7 @@ def department_kpi_view(request):
         kpis = kpis.filter(evaluation_year=selected_year)
 
     # Aggregator
-    kpi_aggregator = DepartmentKPIAggregator()
+    kpi_aggregator = DepartmentKPIAggregator(scope=PermissionScope.for_user(request.user))
 
     # Get trend data (year over year)
     trend_data = list(kpis.values('evaluation_year').annotate(
@@ -279,6 +292,9 @@ def publications_view(request):
     - Publications by department
     - Publication trends over time
 
+    Supports year and academic semester filtering via GET parameters
+    (semester is only applied together with year).
+
     Template: analytics/publications.html
     """
     # Check if user is active
@@ -286,11 +302,27 @@ def publications_view(request):
         from django.http import HttpResponseForbidden
         return HttpResponseForbidden('Your account is pending approval.')
 
+    # Get year / semester filter from request
+    selected_year = parse_year(request.GET.get('year'))
+    selected_semester = request.GET.get('semester')
+    try:
+        selected_semester = int(selected_semester) if selected_semester else None
+    except (ValueError, TypeError):
+        selected_semester = None
+    if selected_semester not in (1, 2):
+        selected_semester = None
+
     # Apply permission filtering
     publications = apply_user_permission_filter(Publication.objects.all(), request.user)
 
+    # Filter by publication date range (index-friendly half-open range)
+    if selected_year and selected_semester:
+        publications = filter_by_semester(publications, 'publication_date', selected_year, selected_semester)
+    elif selected_year:
+        publications = filter_by_year(publications, 'publication_date', selected_year)
+
     # Aggregator
-    pub_aggregator = PublicationAggregator()
+    pub_aggregator = PublicationAggregator(scope=PermissionScope.for_user(request.user))
 
     # Grade distribution
     grade_dist = list(publications.values('journal_grade').annotate(
@@ -319,11 +351,97 @@ def publications_view(request):
     context = {
         'grade_distribution_data': json.dumps(grade_distribution_data),
         'department_publication_data': json.dumps(department_publication_data),
+        'selected_year': selected_year,
+        'selected_semester': selected_semester,
     }
 
     return render(request, 'analytics/publications.html', context)
 
 
+def _parse_search_limit(value, default=20, maximum=100):
+    """Parse a result limit GET parameter, clamped to [1, maximum]."""
+    try:
+        limit = int(value) if value else default
+    except (ValueError, TypeError):
+        limit = default
+    return max(1, min(limit, maximum))
+
+
+@login_required(login_url='/login/')
+def publication_search_view(request):
+    """
+    Publication search page.
+
+    GET parameters:
+    - q: Search text (title, first author, journal name)
+    - limit: Maximum number of results (default 20, max 100)
+
+    Results are ranked by apps.analytics.search (title matches first).
+
+    Template: analytics/publication_search.html
+    """
+    from apps.analytics.search import search_publications
+
+    # Check if user is active
+    if not _check_user_active(request.user):
+        from django.http import HttpResponseForbidden
+        return HttpResponseForbidden('Your account is pending approval.')
+
+    query = request.GET.get('q', '').strip()
+    limit = _parse_search_limit(request.GET.get('limit'))
+
+    # Apply permission filtering
+    publications = apply_user_permission_filter(Publication.objects.all(), request.user)
+    results = search_publications(query, limit=limit, queryset=publications) if query else []
+
+    context = {
+        'query': query,
+        'results': results,
+    }
+
+    return render(request, 'analytics/publication_search.html', context)
+
+
+@login_required(login_url='/login/')
+def publication_search_api(request):
+    """
+    Ranked publication search as JSON.
+
+    URL: /analytics/api/publications/search/?q=...&limit=20
+
+    Response:
+        {"query": "...", "count": 2, "results": [{"publication_id": ..., "rank": 0.8, ...}]}
+    """
+    from django.http import HttpResponseBadRequest, HttpResponseForbidden, JsonResponse
+    from apps.analytics.search import search_publications
+
+    # Check if user is active
+    if not _check_user_active(request.user):
+        return HttpResponseForbidden('Your account is pending approval.')
+
+    query = request.GET.get('q', '').strip()
+    if not query:
+        return HttpResponseBadRequest('Missing search parameter: q')
+    limit = _parse_search_limit(request.GET.get('limit'))
+
+    publications = apply_user_permission_filter(Publication.objects.all(), request.user)
+    results = [
+        {
+            'publication_id': publication.publication_id,
+            'title': publication.title,
+            'first_author': publication.first_author,
+            'journal_name': publication.journal_name,
+            'journal_grade': publication.journal_grade,
+            'department': publication.department,
+            'publication_date': publication.publication_date.isoformat(),
+            'rank': round(publication.rank, 4),
+        }
+        for publication in search_publications(query, limit=limit, queryset=publications)
+    ]
+
+    return JsonResponse({'query': query, 'count': len(results), 'results': results})
+
+
 @login_required(login_url='/login/')
 def research_budget_view(request):
     """
@@ -345,29 +463,20 @@ def research_budget_view(request):
     projects = apply_user_permission_filter(ResearchProject.objects.all(), request.user)
 
     # Aggregator
-    budget_aggregator = ResearchBudgetAggregator()
+    budget_aggregator = ResearchBudgetAggregator(scope=PermissionScope.for_user(request.user))
 
     # Get execution records for accessible projects
     project_ids = projects.values_list('id', flat=True)
     executions = ExecutionRecord.objects.filter(project_id__in=project_ids)
 
-    # Calculate execution rate by project
-    execution_rates = []
-    for project in projects:
-        total_budget = project.total_budget
-        executed = executions.filter(project=project).aggregate(
-            total=Sum('amount')
-        )['total'] or Decimal('0')
-
-        rate = (executed / total_budget * 100) if total_budget > 0 else Decimal('0')
-
-        execution_rates.append({
-            'project_name': project.project_name,
-            'execution_rate': rate
-        })
-
-    # Limit to top 20 projects for readability
-    execution_rates_sorted = sorted(execution_rates, key=lambda x: x['execution_rate'], reverse=True)[:20]
+    # Execution rate by project (computed by the v_project_execution_rate view),
+    # limited to top 20 projects for readability
+    execution_rates_sorted = list(
+        ProjectExecutionRate.objects.filter(id__in=project_ids).values(
+            'project_name',
+            execution_rate=F('execution_rate_percent')
+        ).order_by('-execution_rate_percent')[:20]
+    )
 
     execution_rate_data = to_bar_chart_data(
         execution_rates_sorted,
@@ -417,7 +526,7 @@ def students_view(request):
     students = apply_user_permission_filter(Student.objects.all(), request.user)
 
     # Aggregator
-    student_aggregator = StudentAggregator()
+    student_aggregator = StudentAggregator(scope=PermissionScope.for_user(request.user))
 
     # Total students
     total_students = students.count()
@@ -453,3 +562,91 @@ def students_view(request):
     }
 
     return render(request, 'analytics/students.html', context)
+
+
+@login_required(login_url='/login/')
+def export_view(request, source, export_format):
+    """
+    Stream an analytics table as Parquet or Arrow IPC.
+
+    URL: /analytics/export/<source>/<parquet|arrow>/
+    GET parameters (optional, same as apply_multiple_filters):
+    - department, college (repeatable)
+    - start_date, end_date (YYYY-MM-DD)
+
+    Rows are read and encoded chunk by chunk (see apps.analytics.exporters),
+    so memory stays constant regardless of table size.
+    """
+    from django.http import (
+        HttpResponse,
+        HttpResponseBadRequest,
+        HttpResponseForbidden,
+        StreamingHttpResponse,
+    )
+    from apps.analytics import exporters
+
+    # Check if user is active
+    if not _check_user_active(request.user):
+        return HttpResponseForbidden('Your account is pending approval.')
+
+    if exporters.pa is None:
+        return HttpResponse('Columnar export is not available (pyarrow is not installed).', status=501)
+
+    if export_format not in exporters.EXPORT_FORMATS:
+        return HttpResponseBadRequest(f'Unsupported export format: {export_format}')
+
+    try:
+        export_source = exporters.get_export_source(source)
+        filters = exporters.parse_export_filters(request.GET)
+        filters['user'] = request.user
+        queryset = exporters.build_export_queryset(export_source, filters)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    content_type, extension = exporters.EXPORT_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        exporters.stream_export(queryset, export_source, export_format),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = f'attachment; filename="{source}{extension}"'
+    return response
+
+
+@login_required(login_url='/login/')
+def download_view(request, dataset):
+    """
+    Stream the data behind an analytics page as CSV or XLSX.
+
+    URLs: /analytics/<page>/download/?format=csv|xlsx
+    GET parameters (optional): department, college (repeatable),
+    start_date, end_date (YYYY-MM-DD), year (department KPI only)
+
+    Columns use the Korean headers of the upload templates
+    (see apps.analytics.downloads).
+    """
+    from django.http import HttpResponseBadRequest, HttpResponseForbidden, StreamingHttpResponse
+    from django.utils.http import content_disposition_header
+    from apps.analytics import downloads
+
+    # Check if user is active
+    if not _check_user_active(request.user):
+        return HttpResponseForbidden('Your account is pending approval.')
+
+    export_format = request.GET.get('format', 'csv')
+    if export_format not in downloads.DOWNLOAD_FORMATS:
+        return HttpResponseBadRequest(f'Unsupported download format: {export_format}')
+
+    try:
+        queryset = downloads.build_download_queryset(dataset, request.GET, request.user)
+    except ValueError as e:
+        return HttpResponseBadRequest(str(e))
+
+    content_type, _ = downloads.DOWNLOAD_FORMATS[export_format]
+    response = StreamingHttpResponse(
+        downloads.stream_download(dataset, export_format, queryset),
+        content_type=content_type,
+    )
+    response['Content-Disposition'] = content_disposition_header(
+        True, downloads.download_filename(dataset, export_format)
+    )
+    return response
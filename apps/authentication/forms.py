@@ -3,7 +3,7 @@ Authentication forms for user registration and login.
 """
 
 from django import forms
-from django.contrib.auth import authenticate
+from django.conf import settings
 from django.contrib.auth.forms import UserCreationForm
 from django.core.exceptions import ValidationError
 from .models import User
@@ -148,10 +148,12 @@ class LoginForm(forms.Form):
         password = cleaned_data.get('password')
 
         if email and password:
-            # Try to get user by email
-            try:
-                user = User.objects.get(email=email)
-            except User.DoesNotExist:
+            # One user query and one password hash per login; the view logs
+            # in get_user() instead of authenticating again
+            user = User.objects.filter(email=email).first()
+            if user is None:
+                if settings.LOGIN_EQUALIZE_TIMING:
+                    User().set_password(password)
                 raise ValidationError('이메일 또는 비밀번호가 올바르지 않습니다.')
 
             # Check if user is approved
@@ -160,16 +162,12 @@ class LoginForm(forms.Form):
             elif user.status == 'inactive':
                 raise ValidationError('비활성화된 계정입니다. 관리자에게 문의하세요.')
 
-            # Authenticate user
-            user = authenticate(
-                request=self.request,
-                username=email,  # Using email as username
-                password=password
-            )
-
-            if user is None:
+            # Verify password (rehashes outdated hashes, see User.check_password)
+            if not user.check_password(password):
                 raise ValidationError('이메일 또는 비밀번호가 올바르지 않습니다.')
 
+            # Record the backend for login(); this form replaces authenticate()
+            user.backend = settings.AUTHENTICATION_BACKENDS[0]
             self.user_cache = user
 
         return cleaned_data
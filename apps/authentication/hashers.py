@@ -0,0 +1,27 @@
+"""
+Password hashers for user logins.
+
+Every login verifies one PBKDF2 hash, which dominates login CPU. The
+iteration count of new hashes is set by PASSWORD_HASH_ITERATIONS (default:
+Django's PBKDF2 default). Lowering it makes logins cheaper to verify at the
+cost of cheaper offline guessing; raising it does the opposite.
+
+Stored hashes keep their own iteration count, so existing passwords keep
+working. On the next successful login User.check_password rehashes them
+with the configured count (see PBKDF2PasswordHasher.must_update).
+"""
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    PBKDF2-SHA256 with the iteration count of PASSWORD_HASH_ITERATIONS.
+
+    Uses Django's 'pbkdf2_sha256' algorithm name, so it verifies hashes made
+    by Django's hasher and replaces it in PASSWORD_HASHERS.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', None) or hashers.PBKDF2PasswordHasher.iterations
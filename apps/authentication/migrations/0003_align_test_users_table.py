@@ -0,0 +1,39 @@
+"""
+Migration to align the test users table with the Supabase schema.
+
+0002 created a users table with a NOT NULL username and no name column,
+so the User model could not be saved in the test database.
+This migration only runs in test database.
+"""
+from django.db import migrations
+
+
+def recreate_users_table(apps, schema_editor):
+    """Recreate users table matching supabase/migrations/*_initial_schema.sql"""
+    if schema_editor.connection.settings_dict.get('NAME', '').startswith('file:memorydb'):
+        # Only recreate table for test database
+        schema_editor.execute("DROP TABLE IF EXISTS users")
+        schema_editor.execute("""
+            CREATE TABLE users (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                email VARCHAR(255) UNIQUE NOT NULL,
+                password VARCHAR(255) NOT NULL,
+                name VARCHAR(100) NOT NULL,
+                department VARCHAR(100),
+                position VARCHAR(100),
+                role VARCHAR(20) NOT NULL DEFAULT 'viewer',
+                status VARCHAR(20) NOT NULL DEFAULT 'pending',
+                created_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                updated_at TIMESTAMP NOT NULL DEFAULT CURRENT_TIMESTAMP
+            )
+        """)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ('authentication', '0002_create_test_users_table'),
+    ]
+
+    operations = [
+        migrations.RunPython(recreate_users_table, migrations.RunPython.noop),
+    ]
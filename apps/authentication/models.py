@@ -134,5 +134,15 @@ class User(models.Model):
         self.password = make_password(raw_password)
 
     def check_password(self, raw_password):
-        """Check if the provided password is correct"""
-        return check_password(raw_password, self.password)
+        """
+        Check if the provided password is correct.
+
+        A correct password stored with an outdated hasher or iteration count
+        is rehashed with the current PASSWORD_HASHERS settings.
+        """
+        def setter(raw_password):
+            self.set_password(raw_password)
+            # Only the hash changes; keep updated_at as is
+            User.objects.filter(pk=self.pk).update(password=self.password)
+
+        return check_password(raw_password, self.password, setter if self.pk else None)
@@ -324,3 +324,81 @@ class LoginFormTest(TestCase):
 
         # Assert
         self.assertFalse(form.is_valid())
+
+
+class LoginPasswordCheckTest(TestCase):
+    """로그인당 비밀번호 검증 횟수와 재해시 테스트"""
+
+    def setUp(self):
+        self.user = User(email='active@university.ac.kr', name='활성 사용자', role='viewer', status='active')
+        self.user.set_password('test1234')
+        self.user.save()
+
+    def test_login_verifies_password_once(self):
+        """폼 검증과 로그인 뷰를 합쳐 비밀번호 해시는 한 번만 검증한다"""
+        from unittest import mock
+        from django.contrib.auth.hashers import check_password
+
+        with mock.patch('apps.authentication.models.check_password', side_effect=check_password) as checked:
+            response = self.client.post('/login/', {
+                'email': 'active@university.ac.kr',
+                'password': 'test1234',
+            })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(checked.call_count, 1)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
+
+    def test_outdated_hash_is_rehashed_on_login(self):
+        """설정과 다른 반복 횟수의 해시는 로그인 시 재해시된다 (updated_at 유지)"""
+        from django.test import override_settings
+        from apps.authentication.hashers import PBKDF2PasswordHasher
+
+        with override_settings(
+            PASSWORD_HASHERS=['apps.authentication.hashers.PBKDF2PasswordHasher'],
+            PASSWORD_HASH_ITERATIONS=1000,
+        ):
+            encoded = PBKDF2PasswordHasher().encode('test1234', 'salt1234salt', iterations=2000)
+            User.objects.filter(pk=self.user.pk).update(password=encoded)
+            updated_at = User.objects.get(pk=self.user.pk).updated_at
+
+            form = LoginForm(data={'email': 'active@university.ac.kr', 'password': 'test1234'})
+            self.assertTrue(form.is_valid())
+
+            user = User.objects.get(pk=self.user.pk)
+            self.assertTrue(user.password.startswith('pbkdf2_sha256$1000$'))
+            self.assertTrue(user.check_password('test1234'))
+            self.assertEqual(user.updated_at, updated_at)
+
+    def test_unknown_email_fails(self):
+        """존재하지 않는 이메일은 검증 실패"""
+        form = LoginForm(data={'email': 'nobody@university.ac.kr', 'password': 'test1234'})
+
+        self.assertFalse(form.is_valid())
+        self.assertIsNone(form.get_user())
+
+    def test_unknown_email_hash_follows_setting(self):
+        """존재하지 않는 이메일은 LOGIN_EQUALIZE_TIMING일 때만 비밀번호를 해시한다"""
+        from unittest import mock
+        from django.test import override_settings
+
+        data = {'email': 'nobody@university.ac.kr', 'password': 'test1234'}
+        for equalize, hashes in ((False, 0), (True, 1)):
+            with self.subTest(equalize=equalize), override_settings(LOGIN_EQUALIZE_TIMING=equalize), \
+                    mock.patch.object(User, 'set_password') as set_password:
+                self.assertFalse(LoginForm(data=data).is_valid())
+                self.assertEqual(set_password.call_count, hashes)
+
+    def test_login_uses_configured_backend(self):
+        """로그인 세션에는 AUTHENTICATION_BACKENDS의 첫 백엔드가 기록된다"""
+        from django.test import override_settings
+
+        backend = 'django.contrib.auth.backends.AllowAllUsersModelBackend'
+        with override_settings(AUTHENTICATION_BACKENDS=[backend]):
+            response = self.client.post('/login/', {
+                'email': 'active@university.ac.kr',
+                'password': 'test1234',
+            })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.client.session['_auth_user_backend'], backend)
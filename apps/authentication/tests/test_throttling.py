@@ -0,0 +1,164 @@
+"""
+Tests for cache-backed login throttling.
+
+Test Coverage:
+- Per-IP and per-(email, IP) limits over sliding windows
+- Rejection before any user query or password hash
+- Exponential backoff of repeated lockouts
+- Metrics counters
+- Simulated credential-stuffing burst: hashes stay bounded
+"""
+from unittest import mock
+
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.test.client import RequestFactory
+
+from apps.authentication import throttling
+from apps.authentication.models import User
+from apps.authentication.throttling import LoginThrottle, throttle_metrics
+
+
+THROTTLE_SETTINGS = dict(
+    LOGIN_THROTTLE_IP_LIMIT=10,
+    LOGIN_THROTTLE_IP_WINDOW=300,
+    LOGIN_THROTTLE_EMAIL_LIMIT=3,
+    LOGIN_THROTTLE_EMAIL_WINDOW=900,
+    LOGIN_THROTTLE_BACKOFF=30,
+    LOGIN_THROTTLE_MAX_BACKOFF=3600,
+)
+
+
+@override_settings(**THROTTLE_SETTINGS)
+class LoginThrottleTest(TestCase):
+    """Test LoginThrottle directly."""
+
+    def setUp(self):
+        cache.clear()
+        self.factory = RequestFactory()
+
+    def throttle(self, email='user@test.com', ip='10.0.0.1', now=1000.0):
+        request = self.factory.post('/login/', REMOTE_ADDR=ip)
+        with mock.patch('apps.authentication.throttling.time.time', return_value=now):
+            return LoginThrottle(request, email)
+
+    def test_email_limit_locks_out(self):
+        """The email rule locks after LOGIN_THROTTLE_EMAIL_LIMIT failures."""
+        for _ in range(3):
+            self.assertIsNone(self.throttle().check())
+            self.throttle().failure()
+
+        self.assertEqual(self.throttle(now=1001.0).check(), 29)
+        # Other emails from the same IP, and the email from other IPs, are still allowed
+        self.assertIsNone(self.throttle(email='other@test.com').check())
+        self.assertIsNone(self.throttle(ip='10.0.0.2').check())
+        # Email keys are case-insensitive
+        self.assertIsNotNone(self.throttle(email=' USER@test.com ').check())
+
+    def test_ip_limit_spans_emails(self):
+        """The IP rule counts failures for any email."""
+        for i in range(10):
+            self.throttle(email=f'user{i}@test.com').failure()
+
+        self.assertIsNotNone(self.throttle(email='new@test.com').check())
+        self.assertIsNone(self.throttle(email='new@test.com', ip='10.0.0.2').check())
+
+    def test_sliding_window_weights_previous_window(self):
+        """Failures of the previous window count by their overlap."""
+        for _ in range(2):
+            self.throttle(now=899.0).failure()  # Window [0, 900)
+
+        # At 1350 half of the previous window overlaps: 2 * 0.5 + 1 < 3
+        self.throttle(now=1350.0).failure()
+        self.assertIsNone(self.throttle(now=1350.0).check())
+        # At 1000 nearly all of it overlaps: 2 * 0.89 + 2 >= 3
+        self.throttle(now=1000.0).failure()
+        self.assertIsNotNone(self.throttle(now=1000.0).check())
+
+    def test_exponential_backoff(self):
+        """Each further lockout doubles the wait."""
+        for _ in range(3):
+            self.throttle().failure()
+        self.assertEqual(self.throttle(now=1000.0).check(), 30)
+
+        self.throttle(now=1031.0).failure()  # Lock expired, fails again
+        self.assertEqual(self.throttle(now=1031.0).check(), 60)
+
+        self.throttle(now=1092.0).failure()
+        self.assertEqual(self.throttle(now=1092.0).check(), 120)
+
+    def test_success_clears_email_failures(self):
+        """A successful login forgets the email's failures."""
+        for _ in range(2):
+            self.throttle().failure()
+        self.throttle().success()
+        self.throttle().failure()
+
+        self.assertIsNone(self.throttle().check())
+
+    def test_metrics(self):
+        """Failures, lockouts and rejections are counted."""
+        throttling.reset_throttle_metrics()
+        for _ in range(3):
+            self.throttle().failure()
+        self.throttle().check()
+
+        self.assertEqual(throttle_metrics(), {'rejected': 1, 'failures': 3, 'lockouts': 1})
+
+
+@override_settings(**THROTTLE_SETTINGS)
+class LoginViewThrottleTest(TestCase):
+    """Test throttling in the login view."""
+
+    def setUp(self):
+        cache.clear()
+        throttling.reset_throttle_metrics()
+        self.user = User(email='active@test.com', name='사용자', role='viewer', status='active')
+        self.user.set_password('correct-password')
+        self.user.save()
+
+    def post(self, email, password='wrong-password', ip='10.0.0.1'):
+        return self.client.post('/login/', {'email': email, 'password': password}, REMOTE_ADDR=ip)
+
+    def test_rejected_before_lookup_or_hash(self):
+        """Throttled requests get 429 without queries or hashing."""
+        for _ in range(3):
+            self.post('active@test.com')
+
+        with mock.patch('apps.authentication.models.check_password') as checked:
+            with self.assertNumQueries(0):
+                response = self.post('active@test.com', 'correct-password')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response['Retry-After'], '30')
+        checked.assert_not_called()
+        self.assertNotIn('_auth_user_id', self.client.session)
+
+    def test_credential_stuffing_burst_hashes_bounded(self):
+        """A burst of 500 failed logins from one IP hashes at most the IP limit."""
+        with mock.patch('apps.authentication.models.check_password', side_effect=check_password) as checked, \
+                mock.patch('apps.authentication.models.make_password', side_effect=make_password) as made:
+            statuses = [
+                self.post(email, ip='10.0.0.9').status_code
+                for email in [f'victim{i % 50}@test.com' for i in range(499)] + ['active@test.com']
+            ]
+
+        self.assertLessEqual(checked.call_count + made.call_count, 10)
+        self.assertEqual(statuses.count(429), 490)
+        self.assertEqual(throttle_metrics()['rejected'], 490)
+
+        # Other clients are not affected
+        response = self.post('active@test.com', 'correct-password', ip='10.0.0.10')
+        self.assertEqual(response.status_code, 302)
+
+    def test_failures_from_other_ip_do_not_lock_out_victim(self):
+        """Failures for an email from one IP don't block its owner on another IP."""
+        for _ in range(5):
+            self.post('active@test.com', ip='10.0.0.66')
+        self.assertEqual(self.post('active@test.com', 'correct-password', ip='10.0.0.66').status_code, 429)
+
+        response = self.post('active@test.com', 'correct-password', ip='10.0.0.10')
+
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(int(self.client.session['_auth_user_id']), self.user.pk)
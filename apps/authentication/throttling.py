@@ -0,0 +1,188 @@
+"""
+Login throttling backed by the Django cache.
+
+Every failed login costs one PBKDF2 hash (see apps.authentication.hashers),
+so a credential-stuffing burst can keep every worker busy hashing. The
+login view therefore checks LoginThrottle before the form touches the
+database or hashes anything, and rejects clients over the limit with 429.
+
+Failed logins are counted per client IP and per email and client IP in
+sliding windows (two fixed-window counters, the previous one weighted by
+how much of it still overlaps the window). The email rule includes the IP
+so failures from one client cannot lock the owner of an email out of
+logging in from elsewhere; attacks spread over many IPs are left to the
+IP rule. A client reaching the limit of a rule is locked out for
+LOGIN_THROTTLE_BACKOFF seconds, doubling with every further lockout within
+LOGIN_THROTTLE_MAX_BACKOFF (exponential backoff).
+
+Counters live in the LOGIN_THROTTLE_CACHE cache (default 'default'). The
+process-local default (locmem) only limits per worker; use a shared cache
+(file-based or Redis) so the limits hold across gunicorn workers.
+
+Metrics (rejected requests, counted failures, lockouts) are kept in the
+same cache:
+
+    >>> throttle_metrics()
+    {'rejected': 120, 'failures': 15, 'lockouts': 3}
+"""
+import hashlib
+import logging
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import caches
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = 'login_throttle'
+METRICS = ('rejected', 'failures', 'lockouts')
+
+
+class ThrottleRule(NamedTuple):
+    """A sliding-window limit on failed logins."""
+    scope: str  # 'ip' or 'email' (email and IP)
+    limit: int  # Failed logins per window
+    window: int  # Seconds
+
+
+def get_rules() -> List[ThrottleRule]:
+    return [
+        ThrottleRule('ip', settings.LOGIN_THROTTLE_IP_LIMIT, settings.LOGIN_THROTTLE_IP_WINDOW),
+        ThrottleRule('email', settings.LOGIN_THROTTLE_EMAIL_LIMIT, settings.LOGIN_THROTTLE_EMAIL_WINDOW),
+    ]
+
+
+def _cache():
+    return caches[getattr(settings, 'LOGIN_THROTTLE_CACHE', 'default')]
+
+
+def _key(*parts) -> str:
+    return ':'.join((KEY_PREFIX,) + tuple(str(part) for part in parts))
+
+
+def _digest(value: str) -> str:
+    """Fixed-length cache key part for an IP or email."""
+    return hashlib.sha1(value.encode('utf-8')).hexdigest()[:20]
+
+
+def _incr(cache, key: str, timeout: Optional[int]) -> int:
+    """Atomically increment a counter, creating it with a timeout."""
+    if cache.add(key, 1, timeout):
+        return 1
+    try:
+        return cache.incr(key)
+    except ValueError:  # Expired between add() and incr()
+        cache.set(key, 1, timeout)
+        return 1
+
+
+def client_ip(request) -> str:
+    """
+    Client IP of a request.
+
+    With LOGIN_THROTTLE_TRUST_FORWARDED_FOR (behind one trusted proxy) the
+    last X-Forwarded-For entry is used, the address the proxy saw.
+    """
+    if getattr(settings, 'LOGIN_THROTTLE_TRUST_FORWARDED_FOR', False):
+        forwarded = request.META.get('HTTP_X_FORWARDED_FOR', '')
+        if forwarded.strip():
+            return forwarded.split(',')[-1].strip()
+    return request.META.get('REMOTE_ADDR') or 'unknown'
+
+
+def record_metric(name: str, count: int = 1) -> None:
+    cache = _cache()
+    key = _key('metrics', name)
+    if not cache.add(key, count, None):
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            cache.set(key, count, None)
+
+
+def throttle_metrics() -> Dict[str, int]:
+    """Counts of rejected requests, failed logins and lockouts."""
+    values = _cache().get_many([_key('metrics', name) for name in METRICS])
+    return {name: values.get(_key('metrics', name), 0) for name in METRICS}
+
+
+def reset_throttle_metrics() -> None:
+    _cache().delete_many([_key('metrics', name) for name in METRICS])
+
+
+class LoginThrottle:
+    """
+    Throttle state of one login request.
+
+    Example:
+        >>> throttle = LoginThrottle(request, request.POST.get('email'))
+        >>> wait = throttle.check()  # Before validating the form
+        >>> if wait: ...  # Reject with 429 / Retry-After: wait
+        >>> throttle.failure()  # After a failed login
+        >>> throttle.success()  # After a successful login
+    """
+
+    def __init__(self, request, email: Optional[str] = None):
+        self.cache = _cache()
+        self.now = time.time()
+        self.rules = get_rules()
+        ip = client_ip(request)
+        self.clients: List[Tuple[ThrottleRule, str]] = [(self.rules[0], _digest(ip))]
+        email = (email or '').strip().lower()
+        if email:
+            self.clients.append((self.rules[1], _digest(f'{email} {ip}')))
+
+    def _window_keys(self, rule: ThrottleRule, client: str) -> Tuple[str, str]:
+        window = int(self.now // rule.window)
+        return (
+            _key(rule.scope, client, 'w', window),
+            _key(rule.scope, client, 'w', window - 1),
+        )
+
+    def _sliding_count(self, counts: Dict[str, int], rule: ThrottleRule, client: str) -> float:
+        current, previous = self._window_keys(rule, client)
+        overlap = 1 - (self.now % rule.window) / rule.window
+        return counts.get(current, 0) + counts.get(previous, 0) * overlap
+
+    def check(self) -> Optional[int]:
+        """
+        Seconds the client must wait, or None if the login may proceed.
+
+        Only reads the cache (one get_many); rejected requests are counted
+        in the 'rejected' metric.
+        """
+        lock_keys = [_key(rule.scope, client, 'lock') for rule, client in self.clients]
+        values = self.cache.get_many(lock_keys)
+        wait = max((values[key] - self.now for key in lock_keys if key in values), default=0)
+        if wait > 0:
+            record_metric('rejected')
+            return max(1, int(wait + 0.999))
+        return None
+
+    def failure(self) -> None:
+        """Count a failed login; lock out clients that reached a limit."""
+        record_metric('failures')
+        keys = []
+        for rule, client in self.clients:
+            current, _ = self._window_keys(rule, client)
+            _incr(self.cache, current, rule.window * 2)
+            keys.extend(self._window_keys(rule, client))
+
+        counts = self.cache.get_many(keys)
+        for rule, client in self.clients:
+            if self._sliding_count(counts, rule, client) >= rule.limit:
+                self._lock(rule, client)
+
+    def _lock(self, rule: ThrottleRule, client: str) -> None:
+        max_backoff = settings.LOGIN_THROTTLE_MAX_BACKOFF
+        strikes = _incr(self.cache, _key(rule.scope, client, 'strikes'), max_backoff)
+        duration = min(settings.LOGIN_THROTTLE_BACKOFF * 2 ** (strikes - 1), max_backoff)
+        self.cache.set(_key(rule.scope, client, 'lock'), self.now + duration, duration)
+        record_metric('lockouts')
+        logger.warning('Login throttled: %s %s locked for %ss (lockout %s)', rule.scope, client, duration, strikes)
+
+    def success(self) -> None:
+        """Forget the failures of the email from this IP after a successful login."""
+        for rule, client in self.clients[1:]:
+            self.cache.delete_many(list(self._window_keys(rule, client)) + [_key(rule.scope, client, 'strikes')])
@@ -3,7 +3,7 @@ Authentication views for user registration, login, and logout.
 """
 
 from django.shortcuts import render, redirect
-from django.contrib.auth import login, logout, authenticate
+from django.contrib.auth import login, logout
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.urls import reverse
@@ -12,6 +12,7 @@ from django.views.decorators.cache import never_cache
 
 from .forms import SignupForm, LoginForm
 from .models import User
+from .throttling import LoginThrottle
 
 
 def index_view(request):
@@ -66,16 +67,27 @@ def login_view(request):
         return redirect('dashboard')
 
     if request.method == 'POST':
+        # Reject throttled clients before any user lookup or password hash
+        throttle = LoginThrottle(request, request.POST.get('email'))
+        wait = throttle.check()
+        if wait:
+            messages.error(request, f'로그인 시도가 너무 많습니다. {wait}초 후 다시 시도하세요.')
+            response = render(request, 'authentication/login.html', {
+                'form': LoginForm(initial={'email': request.POST.get('email', '')}),
+                'title': '로그인'
+            }, status=429)
+            response['Retry-After'] = str(wait)
+            return response
+
         form = LoginForm(request.POST, request=request)
         if form.is_valid():
-            email = form.cleaned_data['email']
-            password = form.cleaned_data['password']
+            throttle.success()
             remember_me = form.cleaned_data.get('remember_me', False)
 
-            # Authenticate user (using email as username)
-            user = authenticate(request, username=email, password=password)
+            # The form already verified the password; don't authenticate again
+            user = form.get_user()
 
-            if user is not None and user.status == 'active':
+            if user.status == 'active':
                 login(request, user)
 
                 # Set session expiry based on remember_me
@@ -90,6 +102,8 @@ def login_view(request):
             else:
                 # Form validation should handle this, but just in case
                 messages.error(request, '로그인에 실패했습니다.')
+        else:
+            throttle.failure()
     else:
         form = LoginForm()
 
@@ -50,4 +50,74 @@ class SessionValidationMiddleware:
             return redirect('login')
 
         response = self.get_response(request)
-        return response
\ No newline at end of file
+        return response
+
+class DepartmentScopeMiddleware:
+    """
+    Enforce the request user's department scope with PostgreSQL RLS.
+
+    With ANALYTICS_ENFORCE_RLS, the PermissionScope of an authenticated
+    user is stored in the app.departments setting for the duration of the
+    request, including the body of a streaming response
+    (apps.core.routers.department_scope: the primary at once, a replica
+    when a read is routed to it), so the policies of
+    supabase/optional/department_rls.sql filter every query. Requests
+    without a user, management commands and unrestricted users leave it
+    unset (all rows visible).
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from django.conf import settings
+        from django.db import DEFAULT_DB_ALIAS, connections
+
+        if not (getattr(settings, 'ANALYTICS_ENFORCE_RLS', False)
+                and connections[DEFAULT_DB_ALIAS].vendor == 'postgresql'
+                and request.user.is_authenticated):
+            return self.get_response(request)
+
+        from apps.analytics.filters import PermissionScope
+        from apps.core.routers import department_scope
+
+        scope = PermissionScope.for_user(request.user)
+        if scope.unrestricted:
+            return self.get_response(request)
+
+        with department_scope(scope.departments):
+            response = self.get_response(request)
+        if response.streaming and not response.is_async:
+            # The body of a streaming response (downloads, exports) is read
+            # after this returns, so its queries need the scope again
+            response.streaming_content = self._scoped(response.streaming_content, scope.departments)
+        return response
+
+    @staticmethod
+    def _scoped(content, departments):
+        from apps.core.routers import department_scope
+
+        with department_scope(departments):
+            yield from content
+
+
+class ReplicaPinMiddleware:
+    """
+    Per-request read routing state for apps.core.routers.ReplicaRouter.
+
+    Unsafe requests (POST, ...) read from the primary, and so does an
+    authenticated user for REPLICA_STICKY_SECONDS after one of their
+    requests wrote analytics data (read-your-writes).
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        from apps.core.routers import request_routing
+
+        user_id = request.user.pk if request.user.is_authenticated else None
+        with request_routing(user_id, primary=request.method not in self.SAFE_METHODS):
+            return self.get_response(request)
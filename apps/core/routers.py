@@ -0,0 +1,227 @@
+"""
+Database router sending analytics reads to read replicas.
+
+With replicas configured (settings.ANALYTICS_REPLICAS, see config/settings),
+reads of analytics models (dashboards, aggregators, exports) go to a
+healthy replica, chosen at random per query. Everything else uses the
+primary ('default'):
+
+- All writes, and every other app (users, sessions, admin log)
+- Reads inside a transaction on the primary (uploads, reverts, admin
+  edits), so the upload pipeline never diffs against a lagging copy
+- Every read of a POST (or other unsafe) request
+- Read-your-writes: after a request writes analytics data, the user's
+  analytics reads stay on the primary for REPLICA_STICKY_SECONDS
+  (ReplicaPinMiddleware keeps the pin in the cache); use_primary() pins
+  a block of code explicitly
+
+Replica-lag guard: each replica's lag is checked at most every
+REPLICA_LAG_CHECK_INTERVAL seconds per process. Replicas behind by more
+than REPLICA_MAX_LAG_SECONDS, or that cannot be reached, are skipped
+until the next check; with no healthy replica, reads use the primary.
+
+Department scope (ANALYTICS_ENFORCE_RLS): inside department_scope() the
+app.departments setting of the RLS policies is set on the primary at
+once and on a replica only when the router first sends a read to it
+(or a connection is opened in the block), so a request only pays for
+the connections it uses.
+
+    >>> with use_primary():
+    ...     DepartmentKPIAggregator().get_summary()
+"""
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, DatabaseError, connections
+from django.db.backends.signals import connection_created
+
+logger = logging.getLogger(__name__)
+
+REPLICA_APPS = {'analytics'}
+
+# Seconds since the last replayed transaction, or 0 when the replica has
+# replayed everything it received (an idle primary is not lag)
+REPLICA_LAG_SQL = """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+    END
+"""
+
+_use_primary: ContextVar[bool] = ContextVar('replica_use_primary', default=False)
+_wrote: ContextVar[bool] = ContextVar('replica_wrote', default=False)
+_departments: ContextVar[Optional[Tuple[str, ...]]] = ContextVar('department_scope', default=None)
+
+# alias -> (monotonic time of the check, lag in seconds or None if unreachable)
+_lag_checks: Dict[str, Tuple[float, Optional[float]]] = {}
+
+
+def _pin_key(user_id) -> str:
+    return f'replica_pin:user:{user_id}'
+
+
+def pin_user(user_id, seconds: Optional[int] = None) -> None:
+    """Keep a user's analytics reads on the primary for a while."""
+    cache.set(_pin_key(user_id), True, seconds or settings.REPLICA_STICKY_SECONDS)
+
+
+def is_user_pinned(user_id) -> bool:
+    return bool(cache.get(_pin_key(user_id)))
+
+
+@contextmanager
+def use_primary():
+    """Send all reads in the block to the primary."""
+    token = _use_primary.set(True)
+    try:
+        yield
+    finally:
+        _use_primary.reset(token)
+
+
+@contextmanager
+def request_routing(user_id=None, primary: bool = False):
+    """
+    Routing state of one request.
+
+    Reads use the primary if asked to (primary) or if the user is pinned;
+    if the request writes analytics data, the user is pinned for
+    REPLICA_STICKY_SECONDS.
+    """
+    pinned = bool(settings.ANALYTICS_REPLICAS) and user_id is not None and is_user_pinned(user_id)
+    primary_token = _use_primary.set(primary or pinned)
+    wrote_token = _wrote.set(False)
+    try:
+        yield
+    finally:
+        if _wrote.get() and user_id is not None and settings.ANALYTICS_REPLICAS:
+            pin_user(user_id)
+        _use_primary.reset(primary_token)
+        _wrote.reset(wrote_token)
+
+
+@contextmanager
+def department_scope(departments):
+    """
+    Restrict analytics rows to departments with PostgreSQL RLS in the block.
+
+    The setting is applied to the primary right away and to other
+    connections when they are first used, and reset on all of them at
+    the end.
+    """
+    token = _departments.set(tuple(sorted(departments)))
+    try:
+        apply_department_scope(DEFAULT_DB_ALIAS)
+        yield
+    finally:
+        _departments.reset(token)
+        for connection in connections.all(initialized_only=True):
+            if getattr(connection, 'department_scope', None) is not None:
+                connection.department_scope = None
+                if connection.connection is not None:
+                    _set_departments(connection, None)
+
+
+def apply_department_scope(alias: str) -> None:
+    """Set app.departments on a connection, unless it already holds the current scope."""
+    departments = _departments.get()
+    connection = connections[alias]
+    if (departments is None or connection.vendor != 'postgresql'
+            or getattr(connection, 'department_scope', None) == departments):
+        return
+    _set_departments(connection, departments)
+    connection.department_scope = departments
+
+
+def _set_departments(connection, departments: Optional[Tuple[str, ...]]) -> None:
+    """Set (or with None, reset) app.departments of a connection."""
+    with connection.cursor() as cursor:
+        if departments is None:
+            cursor.execute('RESET app.departments')
+        else:
+            cursor.execute(
+                "SELECT set_config('app.departments', %s::text[]::text, false)", [list(departments)]
+            )
+
+
+def _scope_new_connection(sender, connection, **kwargs) -> None:
+    # A reconnect loses session settings
+    connection.department_scope = None
+    if _departments.get() is not None:
+        apply_department_scope(connection.alias)
+
+
+connection_created.connect(_scope_new_connection)
+
+
+def replica_lag(alias: str) -> Optional[float]:
+    """Replication lag of a replica in seconds, or None if it cannot be queried."""
+    connection = connections[alias]
+    if connection.vendor != 'postgresql':
+        return 0.0
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(REPLICA_LAG_SQL)
+            return float(cursor.fetchone()[0])
+    except DatabaseError as e:
+        logger.warning('Replica %s unavailable: %s', alias, e)
+        return None
+
+
+def healthy_replicas() -> List[str]:
+    """Replicas within REPLICA_MAX_LAG_SECONDS (lag checks are cached per process)."""
+    now = time.monotonic()
+    healthy = []
+    for alias in settings.ANALYTICS_REPLICAS:
+        checked = _lag_checks.get(alias)
+        if checked is None or now - checked[0] >= settings.REPLICA_LAG_CHECK_INTERVAL:
+            checked = _lag_checks[alias] = (now, replica_lag(alias))
+            if checked[1] is not None and checked[1] > settings.REPLICA_MAX_LAG_SECONDS:
+                logger.warning('Replica %s is %.1fs behind; reading from the primary', alias, checked[1])
+        lag = checked[1]
+        if lag is not None and lag <= settings.REPLICA_MAX_LAG_SECONDS:
+            healthy.append(alias)
+    return healthy
+
+
+def reset_lag_checks() -> None:
+    _lag_checks.clear()
+
+
+class ReplicaRouter:
+    """Route analytics reads to replicas (see module docstring)."""
+
+    def db_for_read(self, model, **hints):
+        if model._meta.app_label not in REPLICA_APPS or not settings.ANALYTICS_REPLICAS:
+            return None
+        if _use_primary.get() or _wrote.get() or connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return DEFAULT_DB_ALIAS
+        replicas = healthy_replicas()
+        if not replicas:
+            return DEFAULT_DB_ALIAS
+        alias = random.choice(replicas)
+        apply_department_scope(alias)
+        return alias
+
+    def db_for_write(self, model, **hints):
+        if model._meta.app_label in REPLICA_APPS:
+            _wrote.set(True)
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the primary's data
+        databases = {DEFAULT_DB_ALIAS, *settings.ANALYTICS_REPLICAS}
+        if obj1._state.db in databases and obj2._state.db in databases:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db in settings.ANALYTICS_REPLICAS:
+            return False
+        return None
@@ -0,0 +1,221 @@
+"""
+Tests for the analytics read-replica router.
+
+The 'replica' alias of the test settings mirrors the test database;
+the tests check where querysets are routed (QuerySet.db) without
+opening a second connection inside the test transaction.
+
+Test Coverage:
+- Analytics reads go to a replica, writes and other apps to the primary
+- Reads after a write, inside a transaction or under use_primary() stay
+  on the primary
+- Lagging or unreachable replicas are skipped
+- ReplicaPinMiddleware: unsafe requests and read-your-writes pinning
+- Department scope set on the primary at once and on a replica when a
+  read is routed to it, and kept for streamed response bodies
+"""
+from unittest import mock
+
+from django.core.cache import cache
+from django.db import connections, transaction
+from django.http import HttpResponse, StreamingHttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+
+from apps.analytics.models import DepartmentKPI
+from apps.authentication.models import User
+from apps.core import routers
+from apps.core.middleware import DepartmentScopeMiddleware, ReplicaPinMiddleware
+from apps.core.routers import (
+    ReplicaRouter,
+    department_scope,
+    request_routing,
+    reset_lag_checks,
+    use_primary,
+)
+
+
+def outside_transaction():
+    """Hide the atomic block TestCase wraps around each test from the router."""
+    return mock.patch.object(routers.connections['default'], 'in_atomic_block', False)
+
+
+@override_settings(ANALYTICS_REPLICAS=['replica'], REPLICA_MAX_LAG_SECONDS=10.0)
+class ReplicaRouterTest(TestCase):
+    """Test ReplicaRouter."""
+
+    def setUp(self):
+        reset_lag_checks()
+        self.router = ReplicaRouter()
+
+    def test_analytics_reads_use_replica(self):
+        with request_routing(), outside_transaction():
+            self.assertEqual(DepartmentKPI.objects.all().db, 'replica')
+
+    def test_other_apps_are_not_routed(self):
+        self.assertIsNone(self.router.db_for_read(User))
+        self.assertEqual(User.objects.all().db, 'default')
+
+    @override_settings(ANALYTICS_REPLICAS=[])
+    def test_no_replicas_configured(self):
+        self.assertIsNone(self.router.db_for_read(DepartmentKPI))
+
+    def test_reads_after_write_use_primary(self):
+        with request_routing(), outside_transaction():
+            DepartmentKPI.objects.create(evaluation_year=2023, college='공과대학', department='컴퓨터공학과')
+            queryset = DepartmentKPI.objects.all()
+
+            self.assertEqual(queryset.db, 'default')
+            self.assertEqual(queryset.count(), 1)
+
+    def test_use_primary(self):
+        with request_routing(), outside_transaction():
+            with use_primary():
+                self.assertEqual(DepartmentKPI.objects.all().db, 'default')
+            self.assertEqual(DepartmentKPI.objects.all().db, 'replica')
+
+    def test_reads_in_transaction_use_primary(self):
+        with request_routing(), transaction.atomic():
+            self.assertEqual(DepartmentKPI.objects.all().db, 'default')
+
+    def test_lagging_replica_is_skipped(self):
+        with request_routing(), outside_transaction(), mock.patch.object(routers, 'replica_lag', return_value=100.0) as replica_lag:
+            self.assertEqual(DepartmentKPI.objects.all().db, 'default')
+            self.assertEqual(DepartmentKPI.objects.all().db, 'default')
+
+        # The lag is checked once per REPLICA_LAG_CHECK_INTERVAL
+        replica_lag.assert_called_once_with('replica')
+
+    def test_unreachable_replica_is_skipped(self):
+        with request_routing(), outside_transaction(), mock.patch.object(routers, 'replica_lag', return_value=None):
+            self.assertEqual(DepartmentKPI.objects.all().db, 'default')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(self.router.allow_migrate('replica', 'analytics'))
+        self.assertIsNone(self.router.allow_migrate('default', 'analytics'))
+
+
+@override_settings(ANALYTICS_REPLICAS=['replica'], REPLICA_STICKY_SECONDS=30)
+class ReplicaPinMiddlewareTest(TestCase):
+    """Test per-request routing and read-your-writes pinning."""
+
+    def setUp(self):
+        cache.clear()
+        reset_lag_checks()
+        self.factory = RequestFactory()
+        self.user = User(email='user@test.com', name='사용자', role='viewer', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+        self.read_from = []
+
+    def call(self, method, view, user=None):
+        request = getattr(self.factory, method)('/')
+        request.user = user or self.user
+        with outside_transaction():
+            return ReplicaPinMiddleware(view)(request)
+
+    def read_view(self, request):
+        self.read_from.append(DepartmentKPI.objects.all().db)
+        return HttpResponse()
+
+    def write_view(self, request):
+        DepartmentKPI.objects.create(evaluation_year=2023, college='공과대학', department='컴퓨터공학과')
+        return HttpResponse()
+
+    def test_get_reads_from_replica(self):
+        self.call('get', self.read_view)
+
+        self.assertEqual(self.read_from, ['replica'])
+
+    def test_post_reads_from_primary(self):
+        self.call('post', self.read_view)
+
+        self.assertEqual(self.read_from, ['default'])
+
+    def test_user_is_pinned_after_write(self):
+        other = User(email='other@test.com', name='다른 사용자', role='viewer', status='active')
+        other.set_password('testpass123')
+        other.save()
+
+        self.call('post', self.write_view)
+        self.call('get', self.read_view)
+        self.call('get', self.read_view, user=other)
+
+        self.assertEqual(self.read_from, ['default', 'replica'])
+
+    def test_pin_expires(self):
+        self.call('post', self.write_view)
+        cache.delete(f'replica_pin:user:{self.user.pk}')
+
+        self.call('get', self.read_view)
+
+        self.assertEqual(self.read_from, ['replica'])
+
+
+@override_settings(ANALYTICS_REPLICAS=['replica'], REPLICA_MAX_LAG_SECONDS=10.0)
+class DepartmentScopeTest(TestCase):
+    """Test where app.departments is set (the SQL itself needs PostgreSQL)."""
+
+    def setUp(self):
+        reset_lag_checks()
+        for alias in ('default', 'replica'):
+            vendor = mock.patch.object(connections[alias], 'vendor', 'postgresql')
+            vendor.start()
+            self.addCleanup(vendor.stop)
+        set_departments = mock.patch.object(routers, '_set_departments')
+        self.set_departments = set_departments.start()
+        self.addCleanup(set_departments.stop)
+
+    def calls(self):
+        return [(connection.alias, departments) for (connection, departments), _ in self.set_departments.call_args_list]
+
+    def test_replica_scoped_when_read_is_routed(self):
+        with request_routing(), outside_transaction(), mock.patch.object(routers, 'replica_lag', return_value=0.0):
+            with department_scope({'전자공학과', '컴퓨터공학과'}):
+                self.assertEqual(self.calls(), [('default', ('전자공학과', '컴퓨터공학과'))])
+
+                self.assertEqual(DepartmentKPI.objects.all().db, 'replica')
+                self.assertEqual(DepartmentKPI.objects.all().db, 'replica')
+                self.assertEqual(self.calls()[1:], [('replica', ('전자공학과', '컴퓨터공학과'))])
+                self.set_departments.reset_mock()
+
+        self.assertEqual(sorted(self.calls()), [('default', None)])
+
+    def test_unused_replica_is_not_touched(self):
+        with department_scope({'컴퓨터공학과'}):
+            pass
+
+        self.assertEqual(self.calls(), [('default', ('컴퓨터공학과',)), ('default', None)])
+
+    def test_new_connection_is_scoped(self):
+        """A connection opened (or reopened) in the block gets the scope again."""
+        with department_scope({'컴퓨터공학과'}):
+            routers._scope_new_connection(sender=None, connection=connections['default'])
+
+        self.assertEqual(
+            self.calls(),
+            [('default', ('컴퓨터공학과',)), ('default', ('컴퓨터공학과',)), ('default', None)],
+        )
+
+    def test_no_scope_outside_block(self):
+        routers.apply_department_scope('default')
+
+        self.set_departments.assert_not_called()
+
+    @override_settings(ANALYTICS_ENFORCE_RLS=True, ANALYTICS_DEPARTMENT_SCOPING=True)
+    def test_streamed_body_is_scoped(self):
+        """DepartmentScopeMiddleware keeps the scope while a streaming body is read."""
+        user = User(email='viewer@test.com', name='사용자', role='viewer', department='컴퓨터공학과', status='active')
+        seen = []
+
+        def body():
+            seen.append(routers._departments.get())
+            yield b'rows'
+
+        request = RequestFactory().get('/')
+        request.user = user
+        response = DepartmentScopeMiddleware(lambda request: StreamingHttpResponse(body()))(request)
+        self.assertIsNone(routers._departments.get())
+
+        self.assertEqual(b''.join(response.streaming_content), b'rows')
+        self.assertEqual(seen, [('컴퓨터공학과',)])
+        self.assertEqual(self.calls()[-1], ('default', None))
@@ -3,8 +3,36 @@ Django Admin customization for data management.
 
 Clean admin interface for viewing and managing data records.
 File uploads should be done via the dedicated upload page: /data/upload/
+
+Changelists are tuned for large tables:
+- Foreign keys shown in list_display are joined (list_select_related)
+  and edited with autocomplete widgets instead of full <select> lists.
+- Facet choices of free-text columns (CachedAllValuesFieldListFilter)
+  are cached per data version (apps.analytics.versions, bumped by
+  uploads, reverts and admin edits), so SELECT DISTINCT runs once per
+  change instead of on every page load.
+- Above ADMIN_FULL_COUNT_THRESHOLD estimated rows (PostgreSQL planner
+  statistics), the unfiltered total is taken from the estimate (counted
+  exactly on the last page) and the "N total" count of filtered pages is
+  not computed.
+
+Admin edits drop the upload fingerprints (apps.data_upload.diffing) of
+the rows they touch, so the next incremental upload rewrites those rows
+from the file instead of treating them as unchanged.
+
+Rows show the upload that inserted them (upload_batch), and the upload
+history's "revert" action deletes everything an upload inserted
+(apps.data_upload.revert).
 """
-from django.contrib import admin
+import copy
+
+from django.conf import settings
+from django.contrib import admin, messages
+from django.core.cache import cache
+from django.core.paginator import EmptyPage, Paginator
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils.functional import cached_property
 
 from apps.analytics.models import (
     DepartmentKPI,
@@ -14,17 +42,221 @@ from apps.analytics.models import (
     Student,
     UploadHistory,
 )
+from apps.analytics.authors import index_publication_authors
+from apps.analytics.rollups import get_rollup_spec, refresh_rollups
+from apps.analytics.search import search_queryset
+from apps.analytics.versions import bump_data_version, data_version
+from apps.data_upload.diffing import delete_fingerprints, model_row_keys
+from apps.data_upload.exceptions import RevertError
+from apps.data_upload.revert import revert_upload
+from apps.data_upload.utils import FILE_TYPE_SIGNATURES
+
+
+FACET_CACHE_TIMEOUT = 24 * 60 * 60
+
+
+def estimated_row_count(model):
+    """
+    Planner estimate of a table's rows (PostgreSQL), or None.
+
+    Partitioned tables sum the estimates of their partitions.
+    """
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute(
+            """
+            SELECT CASE WHEN c.relkind = 'p' THEN (
+                       SELECT SUM(GREATEST(p.reltuples, 0))
+                       FROM pg_inherits i JOIN pg_class p ON p.oid = i.inhrelid
+                       WHERE i.inhparent = c.oid
+                   ) ELSE GREATEST(c.reltuples, 0) END
+            FROM pg_class c
+            WHERE c.oid = to_regclass(%s)
+            """,
+            [model._meta.db_table]
+        )
+        row = cursor.fetchone()
+    return int(row[0]) if row and row[0] is not None else None
+
+
+def is_large_table(model):
+    estimate = estimated_row_count(model)
+    return estimate is not None and estimate >= settings.ADMIN_FULL_COUNT_THRESHOLD
+
+
+class CachedAllValuesFieldListFilter(admin.AllValuesFieldListFilter):
+    """
+    AllValuesFieldListFilter with its choices cached per data version.
+
+    The model admin sets DATA_TYPE (UploadHistory data type of the model).
+    """
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        super().__init__(field, request, params, model, model_admin, field_path)
+        # One version lookup per request for all filters of the changelist
+        versions = request.__dict__.setdefault('_admin_data_versions', {})
+        if model_admin.DATA_TYPE not in versions:
+            versions[model_admin.DATA_TYPE] = data_version(model_admin.DATA_TYPE)
+        key = ':'.join([
+            'admin_facets', model._meta.label_lower, field_path, str(versions[model_admin.DATA_TYPE]),
+        ])
+        choices = self.lookup_choices
+        self.lookup_choices = cache.get_or_set(key, lambda: list(choices), FACET_CACHE_TIMEOUT)
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Paginator that uses the planner estimate for unfiltered large tables.
+
+    The estimate only sizes the page links: the last estimated page, or
+    one past it, is counted exactly, so the real last page stays
+    reachable and pages past the end are rejected as usual.
+    """
+
+    estimated = False
+
+    @cached_property
+    def count(self):
+        query = getattr(self.object_list, 'query', None)
+        if query is not None and not query.where:
+            estimate = estimated_row_count(self.object_list.model)
+            if estimate is not None and estimate >= settings.ADMIN_FULL_COUNT_THRESHOLD:
+                self.estimated = True
+                return estimate
+        return super().count
+
+    def validate_number(self, number):
+        try:
+            number = super().validate_number(number)
+        except EmptyPage:
+            if not self.count_exactly():
+                raise
+            return super().validate_number(number)
+        if number == self.num_pages and self.count_exactly():
+            return super().validate_number(number)
+        return number
+
+    def count_exactly(self):
+        """Replace an estimated count with COUNT(*); False if it was exact."""
+        if not self.estimated:
+            return False
+        self.estimated = False
+        self.__dict__['count'] = super().count
+        self.__dict__.pop('num_pages', None)
+        return True
+
+
+class LargeTableAdminMixin:
+    """
+    Changelist settings for large analytics tables.
+
+    Admin edits bump the data version of DATA_TYPE in their transaction,
+    so cached facets and columnar snapshots are recomputed.
+    """
+
+    DATA_TYPE = None
+    paginator = EstimatedCountPaginator
+
+    def get_changelist_instance(self, request):
+        # "N total" needs a second COUNT(*) over the whole table. The
+        # ChangeList reads the flag from its model admin while it is built,
+        # so give it a per-request copy instead of changing the shared one.
+        model_admin = copy.copy(self)
+        model_admin.show_full_result_count = self.show_full_result_count and not is_large_table(self.model)
+        return super(LargeTableAdminMixin, model_admin).get_changelist_instance(request)
+
+    def save_model(self, request, obj, form, change):
+        with transaction.atomic():
+            super().save_model(request, obj, form, change)
+            bump_data_version(self.DATA_TYPE)
+
+    def delete_model(self, request, obj):
+        with transaction.atomic():
+            super().delete_model(request, obj)
+            bump_data_version(self.DATA_TYPE)
+
+    def delete_queryset(self, request, queryset):
+        with transaction.atomic():
+            super().delete_queryset(request, queryset)
+            bump_data_version(self.DATA_TYPE)
+
+
+class FingerprintSyncMixin:
+    """
+    Drop the upload fingerprints of rows edited through the admin.
+
+    Keys before and after a save, and of deleted rows, lose their
+    fingerprint. Uses DATA_TYPE; subclasses may override fingerprint_keys().
+    """
+
+    def fingerprint_keys(self, queryset):
+        """Fingerprint row keys of the rows affected by editing queryset."""
+        key_fields = FILE_TYPE_SIGNATURES[self.DATA_TYPE][1].KEY_FIELDS
+        return model_row_keys(queryset.values_list(*key_fields))
+
+    def save_model(self, request, obj, form, change):
+        keys = self.fingerprint_keys(type(obj).objects.filter(pk=obj.pk)) if change else []
+        super().save_model(request, obj, form, change)
+        delete_fingerprints(self.DATA_TYPE, keys + self.fingerprint_keys(type(obj).objects.filter(pk=obj.pk)))
+
+    def delete_model(self, request, obj):
+        keys = self.fingerprint_keys(type(obj).objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        delete_fingerprints(self.DATA_TYPE, keys)
+
+    def delete_queryset(self, request, queryset):
+        keys = self.fingerprint_keys(queryset)
+        super().delete_queryset(request, queryset)
+        delete_fingerprints(self.DATA_TYPE, keys)
+
+
+class RollupRefreshMixin:
+    """
+    Keep monthly rollups in sync with edits made through the admin.
+
+    Rebuilds the months of the rows' dates before and after a save, and
+    of deleted rows. Subclasses set ROLLUP_DATA_TYPE (key of
+    apps.analytics.rollups.ROLLUPS) and may override rollup_dates().
+    """
+
+    ROLLUP_DATA_TYPE = None
+
+    def rollup_dates(self, queryset):
+        """Dates in the rollup of the rows affected by editing queryset."""
+        date_field = get_rollup_spec(self.ROLLUP_DATA_TYPE).date_field
+        return list(queryset.values_list(date_field, flat=True))
+
+    def save_model(self, request, obj, form, change):
+        dates = self.rollup_dates(type(obj).objects.filter(pk=obj.pk)) if change else []
+        super().save_model(request, obj, form, change)
+        refresh_rollups(self.ROLLUP_DATA_TYPE, dates + self.rollup_dates(type(obj).objects.filter(pk=obj.pk)))
+
+    def delete_model(self, request, obj):
+        dates = self.rollup_dates(type(obj).objects.filter(pk=obj.pk))
+        super().delete_model(request, obj)
+        refresh_rollups(self.ROLLUP_DATA_TYPE, dates)
+
+    def delete_queryset(self, request, queryset):
+        dates = self.rollup_dates(queryset)
+        super().delete_queryset(request, queryset)
+        refresh_rollups(self.ROLLUP_DATA_TYPE, dates)
 
 
 @admin.register(DepartmentKPI)
-class DepartmentKPIAdmin(admin.ModelAdmin):
+class DepartmentKPIAdmin(LargeTableAdminMixin, FingerprintSyncMixin, admin.ModelAdmin):
     """Admin for Department KPI - data viewing and management only."""
 
+    DATA_TYPE = 'department_kpi'
+
     list_display = ('evaluation_year', 'college', 'department', 'employment_rate', 'created_at')
-    list_filter = ('evaluation_year', 'college')
+    list_filter = (
+        ('evaluation_year', CachedAllValuesFieldListFilter),
+        ('college', CachedAllValuesFieldListFilter),
+    )
     search_fields = ('college', 'department')
     ordering = ('-evaluation_year', 'college', 'department')
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'upload_batch')
 
     def has_add_permission(self, request):
         """Only admin can add data."""
@@ -40,14 +272,31 @@ class DepartmentKPIAdmin(admin.ModelAdmin):
 
 
 @admin.register(Publication)
-class PublicationAdmin(admin.ModelAdmin):
+class PublicationAdmin(LargeTableAdminMixin, FingerprintSyncMixin, RollupRefreshMixin, admin.ModelAdmin):
     """Admin for Publication - data viewing and management only."""
 
+    DATA_TYPE = ROLLUP_DATA_TYPE = 'publication'
+
     list_display = ('publication_id', 'title', 'first_author', 'journal_name', 'journal_grade', 'publication_date')
     list_filter = ('journal_grade', 'project_linked', 'publication_date')
-    search_fields = ('publication_id', 'title', 'first_author', 'journal_name')
+    # Title / author / journal go through the search index (get_search_results)
+    # instead of ILIKE '%q%' scans
+    search_fields = ('publication_id',)
+    search_help_text = '논문ID, 논문제목, 주저자, 학술지명'
     ordering = ('-publication_date',)
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'upload_batch')
+
+    def get_search_results(self, request, queryset, search_term):
+        """Match the exact publication ID or the search index."""
+        search_term = search_term.strip()
+        if not search_term:
+            return queryset, False
+        matches = search_queryset(queryset, search_term).values('pk')
+        return queryset.filter(Q(publication_id=search_term) | Q(pk__in=matches)), False
+
+    def save_model(self, request, obj, form, change):
+        super().save_model(request, obj, form, change)
+        index_publication_authors([obj])
 
     def has_add_permission(self, request):
         """Only admin can add data."""
@@ -63,14 +312,32 @@ class PublicationAdmin(admin.ModelAdmin):
 
 
 @admin.register(ResearchProject)
-class ResearchProjectAdmin(admin.ModelAdmin):
+class ResearchProjectAdmin(LargeTableAdminMixin, FingerprintSyncMixin, RollupRefreshMixin, admin.ModelAdmin):
     """Admin for Research Projects - data viewing and management only."""
 
+    # Execution rollups are keyed by the project's department
+    DATA_TYPE = ROLLUP_DATA_TYPE = 'research_budget'
+
     list_display = ('project_number', 'project_name', 'principal_investigator', 'department', 'total_budget', 'created_at')
-    list_filter = ('department', 'funding_agency')
+    list_filter = (
+        ('department', CachedAllValuesFieldListFilter),
+        ('funding_agency', CachedAllValuesFieldListFilter),
+    )
     search_fields = ('project_number', 'project_name', 'principal_investigator')
     ordering = ('-created_at',)
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'upload_batch')
+
+    def rollup_dates(self, queryset):
+        """Execution dates of the projects' execution records."""
+        return list(
+            ExecutionRecord.objects.filter(project__in=queryset).values_list('execution_date', flat=True)
+        )
+
+    def fingerprint_keys(self, queryset):
+        """Execution records carry their project's columns in the upload file."""
+        return model_row_keys(
+            ExecutionRecord.objects.filter(project__in=queryset).values_list('execution_id')
+        )
 
     def has_add_permission(self, request):
         """Only admin can add data."""
@@ -86,14 +353,18 @@ class ResearchProjectAdmin(admin.ModelAdmin):
 
 
 @admin.register(ExecutionRecord)
-class ExecutionRecordAdmin(admin.ModelAdmin):
+class ExecutionRecordAdmin(LargeTableAdminMixin, FingerprintSyncMixin, RollupRefreshMixin, admin.ModelAdmin):
     """Admin for Execution Records - data viewing and management only."""
 
+    DATA_TYPE = ROLLUP_DATA_TYPE = 'research_budget'
+
     list_display = ('execution_id', 'project', 'execution_date', 'expense_category', 'amount', 'status')
+    list_select_related = ('project',)
+    autocomplete_fields = ('project',)
     list_filter = ('status', 'execution_date')
     search_fields = ('execution_id', 'project__project_number', 'project__project_name')
     ordering = ('-execution_date',)
-    readonly_fields = ('created_at',)
+    readonly_fields = ('created_at', 'upload_batch')
 
     def has_add_permission(self, request):
         """Only admin can add data."""
@@ -109,14 +380,21 @@ class ExecutionRecordAdmin(admin.ModelAdmin):
 
 
 @admin.register(Student)
-class StudentAdmin(admin.ModelAdmin):
+class StudentAdmin(LargeTableAdminMixin, FingerprintSyncMixin, admin.ModelAdmin):
     """Admin for Student - data viewing and management only."""
 
+    DATA_TYPE = 'student'
+
     list_display = ('student_number', 'name', 'department', 'grade', 'program_type', 'enrollment_status', 'admission_year')
-    list_filter = ('enrollment_status', 'program_type', 'grade', 'admission_year')
+    list_filter = (
+        'enrollment_status',
+        'program_type',
+        ('grade', CachedAllValuesFieldListFilter),
+        ('admission_year', CachedAllValuesFieldListFilter),
+    )
     search_fields = ('student_number', 'name', 'department')
     ordering = ('-admission_year', 'student_number')
-    readonly_fields = ('created_at', 'updated_at')
+    readonly_fields = ('created_at', 'updated_at', 'upload_batch')
 
     def has_add_permission(self, request):
         """Only admin can add data."""
@@ -136,10 +414,31 @@ class UploadHistoryAdmin(admin.ModelAdmin):
     """Admin for Upload History - Read-only audit log."""
 
     list_display = ('file_name', 'data_type', 'user', 'upload_date', 'status', 'rows_processed')
+    list_select_related = ('user',)
     list_filter = ('data_type', 'status', 'upload_date')
-    search_fields = ('file_name', 'user__email', 'user__username')
+    search_fields = ('file_name', 'user__email', 'user__name')
     ordering = ('-upload_date',)
     readonly_fields = ('user', 'file_name', 'file_size', 'data_type', 'upload_date', 'status', 'rows_processed', 'error_message')
+    actions = ('revert_uploads',)
+
+    @admin.action(description='선택한 업로드 되돌리기 (업로드된 행 삭제)', permissions=['revert'])
+    def revert_uploads(self, request, queryset):
+        """Delete the rows inserted by the selected uploads, newest first."""
+        for history in queryset.order_by('-id'):
+            try:
+                deleted = revert_upload(history)
+            except RevertError as e:
+                self.message_user(request, str(e), messages.WARNING)
+                continue
+            self.message_user(
+                request,
+                f'{history.file_name}: {sum(deleted.values())}개 행을 삭제했습니다.',
+                messages.SUCCESS,
+            )
+
+    def has_revert_permission(self, request):
+        """Only admin can revert uploads."""
+        return request.user.role == 'admin'
 
     def has_add_permission(self, request):
         """Disable adding upload history manually."""
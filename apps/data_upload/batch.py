@@ -0,0 +1,420 @@
+"""
+Batch upload ingestion.
+
+Handles uploads made of several parts:
+- Multiple files in one request
+- Zip archives of Excel/CSV files
+- Multi-sheet workbooks (one part per sheet)
+
+Each part is identified with identify_file_type, read and validated
+(optionally in a process pool, see prepare_parts), then saved in the main
+process either in its own transaction or, when UPLOAD_BATCH_ATOMIC is on,
+in one all-or-nothing transaction. Every identified part gets its own
+UploadHistory row.
+
+When an UploadArchive is given, each part's file is archived first and
+parts whose content (and worksheet) was already ingested successfully are
+skipped before reading.
+"""
+import multiprocessing
+import os
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import django
+import pandas as pd
+from django.conf import settings
+from django.db import connections, transaction
+
+from apps.data_upload.parsers import BaseParser
+from apps.data_upload.readers import read_sheet_names
+from apps.data_upload.storage import find_ingested_upload
+from apps.data_upload.utils import identify_file_type
+
+
+UNIDENTIFIED_PART_MESSAGE = '파일의 종류를 인식할 수 없습니다. 파일 헤더를 확인해주세요.'
+
+
+class UploadPart(NamedTuple):
+    """One identifiable unit of a batch upload (a file or a worksheet)."""
+    path: str
+    display_name: str
+    sheet_name: Union[str, int] = 0
+    parser_class: Optional[type] = None
+
+
+def is_zip_file(file_path: str) -> bool:
+    """Return True if the path has a .zip extension."""
+    return os.path.splitext(file_path)[1].lower() == '.zip'
+
+
+def list_sheet_names(file_path: str) -> List[str]:
+    """
+    List worksheet names of an Excel workbook.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Sheet names, or an empty list for non-Excel files
+    """
+    ext = os.path.splitext(file_path)[1].lower()
+    if ext not in ['.xlsx', '.xls']:
+        return []
+
+    return read_sheet_names(file_path)
+
+
+def extract_zip(zip_path: str, dest_dir: str) -> List[Tuple[str, str]]:
+    """
+    Extract supported members of a zip archive.
+
+    Member paths inside the archive are never used as filesystem paths
+    (no zip-slip), and each member is copied with a cap of
+    MAX_FILE_SIZE + 1 bytes so an oversized member is rejected by the
+    parser's size check instead of filling the disk.
+
+    Args:
+        zip_path: Path to zip archive
+        dest_dir: Directory to extract into
+
+    Returns:
+        List of (extracted_path, member_name) tuples
+    """
+    extracted = []
+    limit = BaseParser.MAX_FILE_SIZE + 1
+
+    with zipfile.ZipFile(zip_path) as archive:
+        for index, info in enumerate(archive.infolist()):
+            if info.is_dir() or info.filename.startswith('__MACOSX/'):
+                continue
+
+            base_name = os.path.basename(info.filename)
+            ext = os.path.splitext(base_name)[1].lower()
+            if base_name.startswith('.') or ext not in BaseParser.ALLOWED_EXTENSIONS:
+                continue
+
+            target = os.path.join(dest_dir, f'{index}_{base_name}')
+            with archive.open(info) as src, open(target, 'wb') as dst:
+                remaining = limit
+                while remaining > 0:
+                    chunk = src.read(min(1024 * 1024, remaining))
+                    if not chunk:
+                        break
+                    dst.write(chunk)
+                    remaining -= len(chunk)
+
+            extracted.append((target, info.filename))
+
+    return extracted
+
+
+def expand_upload(files: List[Tuple[str, str]], work_dir: str) -> List[UploadPart]:
+    """
+    Expand uploaded files into identified parts.
+
+    Args:
+        files: List of (file_path, display_name) tuples
+        work_dir: Scratch directory for extracted zip members
+
+    Returns:
+        List of UploadPart, parser_class is None for unidentified parts
+    """
+    candidates = []
+    for file_path, display_name in files:
+        if is_zip_file(file_path):
+            candidates.extend(extract_zip(file_path, work_dir))
+        else:
+            candidates.append((file_path, display_name))
+
+    parts = []
+    for file_path, display_name in candidates:
+        try:
+            sheet_names = list_sheet_names(file_path)
+        except Exception:
+            sheet_names = []  # Unreadable workbook: let the parser report it
+
+        if len(sheet_names) > 1:
+            for sheet_name in sheet_names:
+                parts.append(UploadPart(
+                    path=file_path,
+                    display_name=f'{display_name} [{sheet_name}]',
+                    sheet_name=sheet_name,
+                    parser_class=identify_file_type(file_path, sheet_name=sheet_name),
+                ))
+        else:
+            parts.append(UploadPart(
+                path=file_path,
+                display_name=display_name,
+                parser_class=identify_file_type(file_path),
+            ))
+
+    return parts
+
+
+def _prepare_part(parser_class: type, path: str, sheet_name: Union[str, int]) -> pd.DataFrame:
+    """Process pool entry point: read, clean and validate one part."""
+    return parser_class().prepare(path, sheet_name=sheet_name)
+
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_size = 0
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """
+    Return this process's parse pool, started on first use.
+
+    Workers are spawned (not forked from a process with database
+    connections and threads) and kept for the life of the process.
+    """
+    global _pool, _pool_size
+
+    if _pool is None or _pool_size != max_workers or getattr(_pool, '_broken', False):
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        # Don't hand open database sockets to the workers
+        for connection in connections.all(initialized_only=True):
+            if not connection.in_atomic_block:
+                connection.close()
+        _pool = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=django.setup,  # Before unpickling any task (imports models)
+        )
+        _pool_size = max_workers
+
+    return _pool
+
+
+def prepare_parts(parts: List[UploadPart], max_workers: Optional[int] = None) -> List[Any]:
+    """
+    Read and validate identified parts, in parallel when configured.
+
+    Parallel preparation uses one pool of spawned workers per process
+    (see _get_pool); they never touch the database. Parts are prepared
+    in-process for a single part or max_workers <= 1 (the default).
+
+    Args:
+        parts: Identified upload parts
+        max_workers: Process pool size (default: settings.UPLOAD_PARSE_WORKERS)
+
+    Returns:
+        List aligned with parts: a DataFrame, or the raised exception
+    """
+    if max_workers is None:
+        max_workers = getattr(settings, 'UPLOAD_PARSE_WORKERS', 1)
+
+    if max_workers <= 1 or len(parts) <= 1:
+        results = []
+        for part in parts:
+            try:
+                results.append(_prepare_part(part.parser_class, part.path, part.sheet_name))
+            except Exception as e:
+                results.append(e)
+        return results
+
+    pool = _get_pool(max_workers)
+    futures = [
+        pool.submit(_prepare_part, part.parser_class, part.path, part.sheet_name)
+        for part in parts
+    ]
+
+    results = []
+    for future in futures:
+        try:
+            results.append(future.result())
+        except Exception as e:
+            results.append(e)
+    return results
+
+
+def _part_result(part: UploadPart, result: Dict[str, Any]) -> Dict[str, Any]:
+    """Attach part identification to a parser result dict."""
+    return {
+        'file_name': part.display_name,
+        'data_type': part.parser_class.DATA_TYPE if part.parser_class else None,
+        **result,
+    }
+
+
+def _duplicate_result(part: UploadPart, previous: Any) -> Dict[str, Any]:
+    """Result for a part whose content was already ingested."""
+    return _part_result(part, {
+        'success': True,
+        'rows_processed': 0,
+        'error_message': None,
+        'duplicate_of': previous,
+    })
+
+
+def archive_parts(parts: List[UploadPart], archive: Any) -> Dict[UploadPart, Dict[str, Any]]:
+    """
+    Archive the files of identified parts (each path once).
+
+    Args:
+        parts: Upload parts
+        archive: apps.data_upload.storage.UploadArchive
+
+    Returns:
+        UploadHistory fields per identified part (content_hash, sheet_name)
+    """
+    digests = {}
+    history_fields = {}
+    for part in parts:
+        if part.parser_class is None:
+            continue
+        if part.path not in digests:
+            digests[part.path] = archive.put(part.path)
+        history_fields[part] = {
+            'content_hash': digests[part.path],
+            'sheet_name': part.sheet_name if isinstance(part.sheet_name, str) else None,
+        }
+    return history_fields
+
+
+def ingest_parts(
+    parts: List[UploadPart],
+    user: Any,
+    atomic: Optional[bool] = None,
+    max_workers: Optional[int] = None,
+    parser_options: Optional[Dict[str, Any]] = None,
+    archive: Optional[Any] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Parse and save all parts of a batch upload.
+
+    Args:
+        parts: Parts from expand_upload
+        user: User performing the upload
+        atomic: All-or-nothing mode (default: settings.UPLOAD_BATCH_ATOMIC)
+        max_workers: Process pool size for reading/validation
+        parser_options: Keyword arguments for the parser constructors
+            (e.g. {'incremental': True} or {'staged': True})
+        archive: UploadArchive to store part files in; enables skipping
+            parts that were already ingested
+
+    Returns:
+        One result dict per part with file_name, data_type, success,
+        rows_processed and error_message (plus duplicate_of, the earlier
+        UploadHistory, for skipped parts)
+    """
+    if atomic is None:
+        atomic = getattr(settings, 'UPLOAD_BATCH_ATOMIC', False)
+    parser_options = parser_options or {}
+
+    history_fields = archive_parts(parts, archive) if archive is not None else {}
+    duplicates = {}
+    for part, fields in history_fields.items():
+        previous = find_ingested_upload(fields['content_hash'], fields['sheet_name'])
+        if previous is not None:
+            duplicates[part] = previous
+
+    pending = [part for part in parts if part not in duplicates]
+    identified = [part for part in pending if part.parser_class is not None]
+    prepared = dict(zip(identified, prepare_parts(identified, max_workers)))
+
+    if atomic:
+        results = _ingest_all_or_nothing(pending, prepared, user, parser_options, history_fields)
+    else:
+        results = _ingest_each(pending, prepared, user, parser_options, history_fields)
+
+    by_part = dict(zip(pending, results))
+    return [
+        _duplicate_result(part, duplicates[part]) if part in duplicates else by_part[part]
+        for part in parts
+    ]
+
+
+def _ingest_each(
+    parts: List[UploadPart],
+    prepared: Dict[UploadPart, Any],
+    user: Any,
+    parser_options: Dict[str, Any],
+    history_fields: Dict[UploadPart, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Save every part in its own transaction."""
+    results = []
+    for part in parts:
+        if part.parser_class is None:
+            results.append(_part_result(part, {
+                'success': False,
+                'rows_processed': None,
+                'error_message': UNIDENTIFIED_PART_MESSAGE,
+            }))
+            continue
+
+        parser = part.parser_class(**parser_options)
+        file_size = os.path.getsize(part.path)
+        fields = history_fields.get(part, {})
+        df = prepared[part]
+
+        if isinstance(df, Exception):
+            result = parser.record_failure(user, part.display_name, file_size, df, **fields)
+        else:
+            try:
+                result = parser.ingest(df, user, part.display_name, file_size, **fields)
+            except Exception as e:
+                result = parser.record_failure(user, part.display_name, file_size, e, **fields)
+
+        results.append(_part_result(part, result))
+
+    return results
+
+
+def _ingest_all_or_nothing(
+    parts: List[UploadPart],
+    prepared: Dict[UploadPart, Any],
+    user: Any,
+    parser_options: Dict[str, Any],
+    history_fields: Dict[UploadPart, Dict[str, Any]],
+) -> List[Dict[str, Any]]:
+    """Save every part in one transaction; any failure rolls back all parts."""
+    errors = {}
+    for part in parts:
+        if part.parser_class is None:
+            errors[part] = Exception(UNIDENTIFIED_PART_MESSAGE)
+        elif isinstance(prepared[part], Exception):
+            errors[part] = prepared[part]
+
+    results = {}
+    if not errors:
+        try:
+            with transaction.atomic():
+                for part in parts:
+                    parser = part.parser_class(**parser_options)
+                    try:
+                        results[part] = parser.ingest(
+                            prepared[part], user, part.display_name, os.path.getsize(part.path),
+                            **history_fields.get(part, {})
+                        )
+                    except Exception as e:
+                        errors[part] = e
+                        raise
+        except Exception as e:
+            results = {}
+            if not errors:
+                errors = {part: e for part in parts}
+
+    if not errors:
+        return [_part_result(part, results[part]) for part in parts]
+
+    failed_names = ', '.join(part.display_name for part in errors)
+    batch_results = []
+    for part in parts:
+        error = errors.get(part) or Exception(
+            f'일괄 업로드가 취소되었습니다 (실패한 파일: {failed_names})'
+        )
+
+        if part.parser_class is None:
+            result = {'success': False, 'rows_processed': None, 'error_message': str(error)}
+        else:
+            result = part.parser_class().record_failure(
+                user, part.display_name, os.path.getsize(part.path), error,
+                **history_fields.get(part, {})
+            )
+
+        batch_results.append(_part_result(part, result))
+
+    return batch_results
@@ -0,0 +1,236 @@
+"""
+Resumable chunked uploads.
+
+Large files are sent in chunks so that a dropped connection costs one
+chunk, not the whole upload:
+
+1. init: the client announces the file name and size and gets an upload
+   id and the chunk size
+2. chunks: PUT the bytes at the current offset with their SHA-256; the
+   server streams the body to disk, verifies it and advances the offset.
+   After a failure the client asks for the offset and continues from there.
+3. finalize: once every byte has arrived, the file is handed to the usual
+   upload pipeline (several upload ids form one batch upload)
+
+Each upload is a directory under CHUNKED_UPLOAD_ROOT holding the data
+file and meta.json. meta.json records the verified offset; bytes past it
+(a chunk that was cut off or failed verification) are truncated by the
+next PUT. Nothing is buffered in memory beyond CHUNK_COPY_SIZE, which is
+what makes the larger UPLOAD_MAX_FILE_SIZE_MB limit safe. Uploads left
+idle for CHUNKED_UPLOAD_EXPIRY_HOURS are removed when the next upload
+starts.
+"""
+import hashlib
+import json
+import os
+import re
+import shutil
+import time
+import uuid
+from typing import Any, BinaryIO, Dict, Optional
+
+from django.conf import settings
+
+from apps.data_upload.exceptions import ChunkedUploadError, ChunkOffsetError
+from apps.data_upload.parsers import BaseParser
+
+
+CHUNK_COPY_SIZE = 64 * 1024
+UPLOAD_ID_PATTERN = re.compile(r'^[0-9a-f]{32}$')
+ALLOWED_EXTENSIONS = [*BaseParser.ALLOWED_EXTENSIONS, '.zip']
+
+
+class ChunkedUpload:
+    """An upload in progress (see module docstring)."""
+
+    def __init__(self, upload_id: str, meta: Dict[str, Any]):
+        self.upload_id = upload_id
+        self.meta = meta
+
+    @staticmethod
+    def _directory(upload_id: str) -> str:
+        return os.path.join(str(settings.CHUNKED_UPLOAD_ROOT), upload_id)
+
+    @property
+    def directory(self) -> str:
+        return self._directory(self.upload_id)
+
+    @property
+    def data_path(self) -> str:
+        return os.path.join(self.directory, 'data')
+
+    @property
+    def offset(self) -> int:
+        return self.meta['offset']
+
+    @property
+    def file_size(self) -> int:
+        return self.meta['file_size']
+
+    @property
+    def file_name(self) -> str:
+        return self.meta['file_name']
+
+    @property
+    def is_complete(self) -> bool:
+        return self.offset == self.file_size
+
+    @classmethod
+    def create(cls, user: Any, file_name: str, file_size: int) -> 'ChunkedUpload':
+        """
+        Start an upload.
+
+        Raises:
+            ChunkedUploadError: If the file name or size is not accepted
+        """
+        file_name = os.path.basename(file_name or '')
+        ext = os.path.splitext(file_name)[1].lower()
+        if ext not in ALLOWED_EXTENSIONS:
+            raise ChunkedUploadError(
+                f"Invalid file format '{ext}'. Allowed formats: {', '.join(ALLOWED_EXTENSIONS)}"
+            )
+        if file_size <= 0:
+            raise ChunkedUploadError('File is empty')
+        if file_size > BaseParser.MAX_FILE_SIZE:
+            raise ChunkedUploadError(
+                f'File size ({file_size / (1024 * 1024):.1f}MB) exceeds maximum allowed size '
+                f'({settings.UPLOAD_MAX_FILE_SIZE_MB}MB)'
+            )
+
+        purge_expired_uploads()
+
+        upload = cls(uuid.uuid4().hex, {
+            'user_id': user.pk,
+            'file_name': file_name,
+            'file_size': file_size,
+            'offset': 0,
+        })
+        os.makedirs(upload.directory)
+        open(upload.data_path, 'wb').close()
+        upload._save_meta()
+        return upload
+
+    @classmethod
+    def load(cls, upload_id: str, user: Any) -> 'ChunkedUpload':
+        """
+        Look up an upload of a user.
+
+        Raises:
+            ChunkedUploadError: If there is no such upload for the user
+        """
+        meta_path = os.path.join(cls._directory(upload_id), 'meta.json')
+        if not UPLOAD_ID_PATTERN.match(upload_id) or not os.path.exists(meta_path):
+            raise ChunkedUploadError(f'Upload {upload_id} not found')
+        with open(meta_path, encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['user_id'] != user.pk:
+            raise ChunkedUploadError(f'Upload {upload_id} not found')
+        return cls(upload_id, meta)
+
+    def _save_meta(self) -> None:
+        """Replace meta.json atomically."""
+        temp_path = os.path.join(self.directory, 'meta.json.tmp')
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.meta, f)
+        os.replace(temp_path, os.path.join(self.directory, 'meta.json'))
+
+    def write_chunk(self, offset: int, stream: BinaryIO, length: int, sha256: str) -> int:
+        """
+        Write a chunk from a stream at offset and verify it.
+
+        Args:
+            offset: Position of the chunk, must equal the current offset
+            stream: Readable request body
+            length: Chunk length in bytes (Content-Length)
+            sha256: Expected hex digest of the chunk
+
+        Returns:
+            New offset
+
+        Raises:
+            ChunkOffsetError: If offset is not the current offset
+            ChunkedUploadError: If the chunk is too large, incomplete or
+                does not match its checksum
+        """
+        if offset != self.offset:
+            raise ChunkOffsetError(f'Expected offset {self.offset}, got {offset}')
+        if length <= 0 or length > settings.CHUNKED_UPLOAD_CHUNK_SIZE:
+            raise ChunkedUploadError(
+                f'Chunk length must be between 1 and {settings.CHUNKED_UPLOAD_CHUNK_SIZE} bytes'
+            )
+        if offset + length > self.file_size:
+            raise ChunkedUploadError(f'Chunk ends past the announced file size {self.file_size}')
+
+        digest = hashlib.sha256()
+        received = 0
+        with open(self.data_path, 'r+b') as f:
+            f.truncate(offset)  # Drop unverified bytes of an earlier attempt
+            f.seek(offset)
+            while received < length:
+                block = stream.read(min(CHUNK_COPY_SIZE, length - received))
+                if not block:
+                    break
+                f.write(block)
+                digest.update(block)
+                received += len(block)
+
+            if received != length or digest.hexdigest() != (sha256 or '').lower():
+                f.truncate(offset)
+                if received != length:
+                    raise ChunkedUploadError(f'Chunk incomplete: received {received} of {length} bytes')
+                raise ChunkedUploadError('Chunk checksum mismatch')
+            f.flush()
+            os.fsync(f.fileno())
+
+        self.meta['offset'] = offset + length
+        self._save_meta()
+        return self.offset
+
+    def complete(self, dest_dir: str) -> str:
+        """
+        Move the finished file into dest_dir/<upload id>/ under its original name.
+
+        Returns:
+            Path of the file
+
+        Raises:
+            ChunkedUploadError: If bytes are missing
+        """
+        if not self.is_complete:
+            raise ChunkedUploadError(
+                f'{self.file_name}: upload incomplete ({self.offset} of {self.file_size} bytes)'
+            )
+        path = os.path.join(dest_dir, self.upload_id, self.file_name)
+        os.makedirs(os.path.dirname(path))
+        shutil.move(self.data_path, path)
+        self.delete()
+        return path
+
+    def delete(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+def purge_expired_uploads(now: Optional[float] = None) -> int:
+    """
+    Remove uploads idle for more than CHUNKED_UPLOAD_EXPIRY_HOURS.
+
+    Returns:
+        Number of uploads removed
+    """
+    root = str(settings.CHUNKED_UPLOAD_ROOT)
+    if not os.path.isdir(root):
+        return 0
+
+    cutoff = (now or time.time()) - settings.CHUNKED_UPLOAD_EXPIRY_HOURS * 3600
+    removed = 0
+    for upload_id in os.listdir(root):
+        directory = os.path.join(root, upload_id)
+        meta_path = os.path.join(directory, 'meta.json')
+        try:
+            idle_since = os.path.getmtime(meta_path if os.path.exists(meta_path) else directory)
+        except OSError:
+            continue
+        if idle_since < cutoff:
+            shutil.rmtree(directory, ignore_errors=True)
+            removed += 1
+    return removed
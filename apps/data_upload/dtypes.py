@@ -0,0 +1,80 @@
+"""
+Compact dtypes for uploaded DataFrames.
+
+Left to inference, pandas reads every text column as object dtype, one
+Python str per cell, although most upload columns (단과대학, 학과, 학적상태,
+...) repeat a handful of values over hundreds of thousands of rows.
+Parsers declare COLUMN_DTYPES per upload schema instead:
+
+- 'category' for low-cardinality text: one code per row plus each value
+  once. Read directly as categorical, so the object column is never built.
+- 'str' for identifiers and free text, so numeric-looking IDs (학번,
+  논문ID) keep leading zeros rather than being parsed as integers.
+
+Cleaning then works column-wise in place: categorical columns strip their
+categories (not every row), text columns use the vectorized .str.strip(),
+and integer columns are downcast to the smallest integer type. Values and
+row hashes (apps.data_upload.diffing) are the same as with inferred
+dtypes; float and NaN-holding integer columns are left as read.
+"""
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+
+def read_dtypes(column_dtypes: Dict[str, str]) -> Dict[str, object]:
+    """Map a parser's COLUMN_DTYPES to read_csv/read_excel dtype arguments."""
+    return {column: str if dtype == 'str' else dtype for column, dtype in column_dtypes.items()}
+
+
+def _strip(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def strip_categories(series: pd.Series) -> pd.Series:
+    """
+    Strip whitespace from a categorical column's categories.
+
+    Categories that become equal after stripping (' 공과대학', '공과대학')
+    are merged by remapping the codes.
+    """
+    categories = series.cat.categories
+    stripped = pd.Index([_strip(value) for value in categories])
+    if stripped.equals(categories):
+        return series
+    if stripped.is_unique:
+        return series.cat.rename_categories(stripped)
+
+    merged = stripped.unique()
+    remap = merged.get_indexer(stripped)
+    codes = series.cat.codes.to_numpy()
+    codes = np.where(codes >= 0, remap[codes], -1)
+    return pd.Series(pd.Categorical.from_codes(codes, merged), index=series.index, name=series.name)
+
+
+def strip_strings(series: pd.Series) -> pd.Series:
+    """Strip whitespace from the strings of a text column, leaving other values as they are."""
+    try:
+        stripped = series.str.strip()
+    except AttributeError:  # No strings at all (e.g. Excel time cells)
+        return series
+    return stripped.where(stripped.notna(), series)
+
+
+def compact_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Strip text and downcast integer columns of a DataFrame in place.
+
+    Returns:
+        The same DataFrame
+    """
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            df[column] = strip_categories(values)
+        elif values.dtype == object or pd.api.types.is_string_dtype(values.dtype):
+            df[column] = strip_strings(values)
+        elif pd.api.types.is_integer_dtype(values.dtype) and not pd.api.types.is_extension_array_dtype(values.dtype):
+            df[column] = pd.to_numeric(values, downcast='integer')
+    return df
@@ -39,3 +39,23 @@ class ValueRangeError(ValidationError):
 class DuplicateDataError(ValidationError):
     """Raised when duplicate records are found."""
     pass
+
+
+class RevertError(Exception):
+    """Raised when an upload cannot be reverted (see apps.data_upload.revert)."""
+    pass
+
+
+class StagingError(Exception):
+    """Raised when a staged replace cannot load or swap its tables (see apps.data_upload.staging)."""
+    pass
+
+
+class ChunkedUploadError(Exception):
+    """Raised when a chunked upload request is rejected (see apps.data_upload.chunked)."""
+    pass
+
+
+class ChunkOffsetError(ChunkedUploadError):
+    """Raised when a chunk is not sent at the upload's current offset."""
+    pass
@@ -0,0 +1,87 @@
+"""
+Re-run the ingest of an archived upload.
+
+Usage:
+    python manage.py replay_upload <history_id> [--incremental | --staged]
+"""
+import os
+import shutil
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.models import UploadHistory
+from apps.data_upload.parsers import BaseParser
+from apps.data_upload.storage import get_upload_archive
+from apps.data_upload.utils import FILE_TYPE_SIGNATURES
+
+
+class Command(BaseCommand):
+    help = 'Replay an upload from the upload archive by UploadHistory id'
+
+    def add_arguments(self, parser):
+        parser.add_argument('history_id', type=int, help='UploadHistory id to replay')
+        parser.add_argument(
+            '--incremental',
+            action='store_true',
+            help='Write only the difference against the current data',
+        )
+        parser.add_argument(
+            '--staged',
+            action='store_true',
+            help='Replace the current data through shadow tables (staged replace)',
+        )
+
+    def handle(self, *args, **options):
+        if options['incremental'] and options['staged']:
+            raise CommandError('--incremental and --staged are mutually exclusive.')
+
+        try:
+            history = UploadHistory.objects.select_related('user').get(pk=options['history_id'])
+        except UploadHistory.DoesNotExist:
+            raise CommandError(f'UploadHistory {options["history_id"]} does not exist.')
+
+        if not history.content_hash:
+            raise CommandError(f'Upload {history.id} was not archived (no content hash).')
+        if history.data_type not in FILE_TYPE_SIGNATURES:
+            raise CommandError(f'Unknown data type: {history.data_type}')
+
+        archive = get_upload_archive()
+        ext = next(
+            (ext for ext in BaseParser.ALLOWED_EXTENSIONS if archive.contains(history.content_hash, ext)),
+            None,
+        )
+        if ext is None:
+            raise CommandError(f'Archived file not found: {history.content_hash}')
+
+        parser = FILE_TYPE_SIGNATURES[history.data_type][1](
+            incremental=options['incremental'], staged=options['staged'],
+        )
+        history_fields = {'content_hash': history.content_hash, 'sheet_name': history.sheet_name}
+
+        work_dir = tempfile.mkdtemp(prefix='upload_replay_')
+        try:
+            path = archive.restore(
+                history.content_hash, ext, os.path.join(work_dir, f'{history.content_hash}{ext}')
+            )
+            file_size = os.path.getsize(path)
+
+            try:
+                df = parser.prepare(path, sheet_name=history.sheet_name or 0)
+                result = parser.ingest(df, history.user, history.file_name, file_size, **history_fields)
+            except Exception as e:
+                result = parser.record_failure(
+                    history.user, history.file_name, file_size, e, **history_fields
+                )
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        if not result['success']:
+            raise CommandError(f'Replay failed: {result["error_message"]}')
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Replayed upload {history.id} ({history.file_name}): '
+            f'{result["rows_processed"]} rows processed'
+        ))
+        if result.get('diff_summary'):
+            self.stdout.write(f'  - Diff: {result["diff_summary"]}')
@@ -0,0 +1,39 @@
+"""
+Delete the rows inserted by an upload (see apps.data_upload.revert).
+
+Usage:
+    python manage.py revert_upload <history_id> [--chunk-size 5000]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.analytics.models import UploadHistory
+from apps.data_upload.exceptions import RevertError
+from apps.data_upload.revert import REVERT_CHUNK_SIZE, revert_upload
+
+
+class Command(BaseCommand):
+    help = 'Revert an upload by UploadHistory id, deleting the rows it inserted'
+
+    def add_arguments(self, parser):
+        parser.add_argument('history_id', type=int, help='UploadHistory id to revert')
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=REVERT_CHUNK_SIZE,
+            help=f'Rows deleted per transaction (default {REVERT_CHUNK_SIZE})',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            history = UploadHistory.objects.get(pk=options['history_id'])
+        except UploadHistory.DoesNotExist:
+            raise CommandError(f'UploadHistory {options["history_id"]} does not exist.')
+
+        try:
+            deleted = revert_upload(history, chunk_size=options['chunk_size'])
+        except RevertError as e:
+            raise CommandError(str(e))
+
+        for table, count in deleted.items():
+            self.stdout.write(f'{table}: {count} rows deleted')
+        self.stdout.write(self.style.SUCCESS(f'Upload {history.id} ({history.file_name}) reverted.'))
@@ -8,19 +8,24 @@ Parsers handle:
 - Database insertion with transactions
 - Upload history logging
 
-Each parser extends BaseParser and implements parse() method.
+Each parser extends BaseParser and implements validate_data() and save().
+Reading/validation (prepare) is kept free of database access so that
+batch uploads can run it in worker processes (see apps.data_upload.batch).
 """
 import os
 import pandas as pd
 from abc import ABC, abstractmethod
-from typing import Dict, Any
+from functools import reduce
+from typing import Dict, Any, List, Optional, Tuple, Union
 from decimal import Decimal
+from django.conf import settings
 from django.db import transaction
-from django.utils import timezone
+from django.db.models import Q
 
 from apps.analytics.models import (
     DepartmentKPI,
     Publication,
+    PublicationAuthor,
     ResearchProject,
     ExecutionRecord,
     Student,
@@ -37,6 +42,22 @@ from apps.data_upload.exceptions import (
     FileSizeError,
     ValidationError,
 )
+from apps.data_upload.dtypes import compact_frame, read_dtypes
+from apps.data_upload.diffing import (
+    apply_incremental_upload,
+    build_row_hashes,
+    build_row_keys,
+    record_fingerprints,
+    split_row_key,
+)
+from apps.analytics.authors import index_publication_authors, refresh_author_departments
+from apps.analytics.partitions import prepare_partitions
+from apps.analytics.rollups import refresh_rollups, touched_months
+from apps.analytics.sketches import update_sketches
+from apps.analytics.versions import bump_data_version
+from apps.data_upload.prechecks import check_unique_keys
+from apps.data_upload.readers import read_table
+from apps.data_upload.staging import staged_replace
 
 
 class BaseParser(ABC):
@@ -48,13 +69,67 @@ class BaseParser(ABC):
     - File size validation
     - File reading (Excel/CSV)
     - Data cleaning
+    - Transactional ingest with upload history logging
+    - Incremental (diff-based) ingest keyed by KEY_COLUMNS
 
     Subclasses must implement:
-    - parse(filepath, user): Main parsing logic
+    - validate_data(df): Data-specific validation
+    - save(df): Insert validated rows, returns number of rows processed
+
+    Subclasses declare MODEL plus KEY_COLUMNS (file columns) and KEY_FIELDS
+    (matching MODEL fields) identifying a row across uploads, and
+    TEMPLATE_COLUMNS: the upload template as (Korean header, MODEL lookup)
+    pairs, used to export data in the same layout.
+
+    Data types with a monthly rollup (apps.analytics.rollups) set
+    ROLLUP_DATE_FIELD; save() reports the dates it writes through
+    track_rollup_months() and ingest() rebuilds only those months.
+
+    Rows inserted by save() carry the UploadHistory row of the upload
+    (upload_batch), so a bad upload can be reverted by batch id
+    (apps.data_upload.revert).
+
+    In staged mode the file replaces all data of its type, loaded into
+    shadow tables and swapped in (apps.data_upload.staging).
+
+    Duplicate keys, in the file or (for plain uploads) already stored, are
+    rejected before any model instance is built (apps.data_upload.prechecks).
+
+    COLUMN_DTYPES types the file's text columns at read time ('category'
+    for repeated values, 'str' for IDs and free text; see
+    apps.data_upload.dtypes).
     """
 
-    MAX_FILE_SIZE = 50 * 1024 * 1024  # 50 MB in bytes
+    MAX_FILE_SIZE = settings.UPLOAD_MAX_FILE_SIZE_MB * 1024 * 1024  # In bytes
     ALLOWED_EXTENSIONS = ['.xlsx', '.xls', '.csv']
+    DATA_TYPE = None
+    MODEL = None
+    KEY_COLUMNS: List[str] = []
+    KEY_FIELDS: List[str] = []
+    TEMPLATE_COLUMNS: List[Tuple[str, str]] = []
+    COLUMN_DTYPES: Dict[str, str] = {}
+    ROLLUP_DATE_FIELD: Optional[str] = None
+    DELETE_BATCH_SIZE = 500
+    BULK_LOAD_BATCH_SIZE = 1000
+
+    def __init__(self, incremental: bool = False, staged: bool = False):
+        """
+        Args:
+            incremental: Treat the upload as a full snapshot and write only
+                inserted/changed/deleted rows (see apps.data_upload.diffing)
+            staged: Treat the upload as a full snapshot and replace the
+                data type's tables through shadow tables (see
+                apps.data_upload.staging)
+
+        Raises:
+            ValueError: If both modes are requested
+        """
+        if incremental and staged:
+            raise ValueError('incremental and staged uploads are mutually exclusive')
+        self.incremental = incremental
+        self.staged = staged
+        self.rollup_months = set()
+        self.upload_batch: Optional[UploadHistory] = None
 
     def validate_extension(self, filepath: str) -> None:
         """
@@ -87,15 +162,20 @@ class BaseParser(ABC):
         if size_bytes > self.MAX_FILE_SIZE:
             size_mb = size_bytes / (1024 * 1024)
             raise FileSizeError(
-                f"File size ({size_mb:.1f}MB) exceeds maximum allowed size (50MB)"
+                f"File size ({size_mb:.1f}MB) exceeds maximum allowed size "
+                f"({self.MAX_FILE_SIZE // (1024 * 1024)}MB)"
             )
 
-    def read_file(self, filepath: str) -> pd.DataFrame:
+    def read_file(self, filepath: str, sheet_name: Union[str, int] = 0) -> pd.DataFrame:
         """
-        Read Excel or CSV file into DataFrame.
+        Read Excel or CSV file into DataFrame, typed by COLUMN_DTYPES.
+
+        The fastest installed reader engine is used, falling back to the
+        next on failure (apps.data_upload.readers).
 
         Args:
             filepath: Path to file
+            sheet_name: Worksheet name or index (Excel only, default: first sheet)
 
         Returns:
             DataFrame with file contents
@@ -107,15 +187,10 @@ class BaseParser(ABC):
         ext = ext.lower()
 
         try:
-            if ext == '.csv':
-                df = pd.read_csv(filepath, encoding='utf-8-sig')
-            elif ext in ['.xlsx', '.xls']:
-                engine = 'openpyxl' if ext == '.xlsx' else 'xlrd'
-                df = pd.read_excel(filepath, engine=engine)
-            else:
+            if ext not in self.ALLOWED_EXTENSIONS:
                 raise FileFormatError(f"Unsupported file format: {ext}")
 
-            return df
+            return read_table(filepath, sheet_name=sheet_name, dtype=read_dtypes(self.COLUMN_DTYPES) or None)
 
         except FileNotFoundError:
             raise FileFormatError(f"File not found: {filepath}")
@@ -126,34 +201,329 @@ class BaseParser(ABC):
         """
         Clean DataFrame by stripping whitespace from strings.
 
+        Works in place (no copy): text columns are stripped with vectorized
+        string operations and integer columns downcast (see
+        apps.data_upload.dtypes).
+
         Args:
-            df: Input DataFrame
+            df: Input DataFrame, modified in place
 
         Returns:
             Cleaned DataFrame
         """
-        # Create a copy to avoid modifying original
-        cleaned_df = df.copy()
+        return compact_frame(df)
 
-        # Strip whitespace from string columns
-        for col in cleaned_df.columns:
-            if cleaned_df[col].dtype == 'object':
-                cleaned_df[col] = cleaned_df[col].apply(
-                    lambda x: x.strip() if isinstance(x, str) else x
-                )
+    @abstractmethod
+    def validate_data(self, df: pd.DataFrame) -> None:
+        """
+        Validate cleaned data before insertion.
 
-        return cleaned_df
+        Must be implemented by subclasses.
+
+        Raises:
+            ValidationError: If the data is invalid
+        """
+        raise NotImplementedError
 
     @abstractmethod
-    def parse(self, filepath: str, user: Any) -> Dict[str, Any]:
+    def save(self, df: pd.DataFrame) -> int:
         """
-        Parse file and insert data into database.
+        Insert validated rows into the database.
 
-        Must be implemented by subclasses.
+        Must be implemented by subclasses. Called inside a transaction.
+
+        Args:
+            df: Cleaned and validated DataFrame
+
+        Returns:
+            Number of rows processed
+        """
+        raise NotImplementedError
+
+    def track_rollup_months(self, dates: Any) -> None:
+        """Record months whose rollups must be rebuilt by ingest()."""
+        if self.ROLLUP_DATE_FIELD:
+            self.rollup_months |= touched_months(dates)
+
+    def bulk_load(self, model: type, objects: List[Any], date_field: str) -> None:
+        """
+        Bulk insert rows in date order, creating year partitions first.
+
+        When the table is range-partitioned by year (apps.analytics.partitions)
+        sorting keeps each insert batch within one partition; otherwise the
+        partition check is a no-op.
+
+        Args:
+            model: Model of the objects
+            objects: Unsaved model instances
+            date_field: Date field the table is partitioned by
+        """
+        objects = sorted(objects, key=lambda obj: getattr(obj, date_field))
+        self.tag_batch(objects)
+        prepare_partitions(model, [getattr(obj, date_field) for obj in objects])
+        model.objects.bulk_create(objects, batch_size=self.BULK_LOAD_BATCH_SIZE)
+
+    def tag_batch(self, objects: List[Any]) -> List[Any]:
+        """Set the upload batch of unsaved model instances."""
+        for obj in objects:
+            obj.upload_batch = self.upload_batch
+        return objects
+
+    def delete_by_keys(self, keys: List[str]) -> None:
+        """
+        Delete MODEL rows identified by row keys, in batches.
+
+        Args:
+            keys: Row keys built by apps.data_upload.diffing.build_row_keys
+        """
+        fields = [self.MODEL._meta.get_field(name) for name in self.KEY_FIELDS]
+
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            batch = keys[start:start + self.DELETE_BATCH_SIZE]
+
+            if len(fields) == 1:
+                field = fields[0]
+                values = [split_row_key(key, fields)[field.name] for key in batch]
+                queryset = self.MODEL.objects.filter(**{f'{field.name}__in': values})
+            else:
+                condition = reduce(
+                    lambda left, right: left | right,
+                    (Q(**split_row_key(key, fields)) for key in batch),
+                )
+                queryset = self.MODEL.objects.filter(condition)
+
+            if self.ROLLUP_DATE_FIELD:
+                self.track_rollup_months(queryset.values_list(self.ROLLUP_DATE_FIELD, flat=True))
+            queryset.delete()
+
+    def prepare(self, filepath: str, sheet_name: Union[str, int] = 0) -> pd.DataFrame:
+        """
+        Validate, read, clean and validate a file without touching the database.
+
+        Includes the in-file part of the uniqueness pre-check.
+
+        Args:
+            filepath: Path to file
+            sheet_name: Worksheet name or index (Excel only)
+
+        Returns:
+            Cleaned and validated DataFrame
+
+        Raises:
+            ValidationError: If the file or its data is invalid
+        """
+        self.validate_extension(filepath)
+        self.validate_size(os.path.getsize(filepath))
+
+        df = self.read_file(filepath, sheet_name=sheet_name)
+        df = self.clean_data(df)
+
+        self.validate_data(df)
+        check_unique_keys(self, df, check_database=False)
+        return df
+
+    def record_history(
+        self,
+        user: Any,
+        file_name: str,
+        file_size: int,
+        status: str,
+        rows_processed: Optional[int] = None,
+        error_message: Optional[str] = None,
+        diff_summary: Optional[Dict[str, int]] = None,
+        **history_fields: Any,
+    ) -> UploadHistory:
+        """
+        Create an UploadHistory row for this parser's data type.
+
+        Extra keyword arguments (e.g. content_hash, sheet_name) are stored
+        on the row as-is.
+
+        Returns:
+            Created UploadHistory instance
+        """
+        return UploadHistory.objects.create(
+            user=user,
+            file_name=file_name,
+            file_size=file_size,
+            data_type=self.DATA_TYPE,
+            status=status,
+            rows_processed=rows_processed,
+            error_message=error_message,
+            diff_summary=diff_summary,
+            **history_fields,
+        )
+
+    def ingest(
+        self,
+        df: pd.DataFrame,
+        user: Any,
+        file_name: str,
+        file_size: int,
+        **history_fields: Any,
+    ) -> Dict[str, Any]:
+        """
+        Save a prepared DataFrame and log a successful upload, atomically.
+
+        When called inside an outer transaction this becomes a savepoint,
+        so batch uploads can roll every part back together.
+
+        In incremental mode only the diff against the stored fingerprints is
+        written and rows_processed counts inserted + changed rows. Otherwise
+        all rows are inserted and their fingerprints recorded. Rollup months
+        touched by written or deleted rows are rebuilt in the same
+        transaction; a new version of the data type's sketches
+        (apps.analytics.sketches) is stored with it, or rebuilt once it
+        commits.
+
+        The UploadHistory row is created first so written rows can be
+        tagged with it (upload_batch).
+
+        Staged uploads are handed to ingest_staged(). Plain uploads first
+        check that none of their keys is already stored, so duplicates fail
+        with one DuplicateDataError instead of an IntegrityError mid-insert.
+
+        Returns:
+            Result dict with success status and details
+
+        Raises:
+            DuplicateDataError: If a plain upload conflicts with stored keys
+        """
+        if self.staged:
+            return self.ingest_staged(df, user, file_name, file_size, **history_fields)
+        if not self.incremental:
+            check_unique_keys(self, df)
+
+        diff_summary = None
+        self.rollup_months = set()
+
+        with transaction.atomic():
+            history = self.record_history(
+                user,
+                file_name=file_name,
+                file_size=file_size,
+                status='success',
+                **history_fields,
+            )
+            self.upload_batch = history
+
+            if self.incremental:
+                diff_summary = apply_incremental_upload(self, df)
+                rows_processed = diff_summary['inserted'] + diff_summary['changed']
+            else:
+                rows_processed = self.save(df)
+                if self.KEY_COLUMNS:
+                    record_fingerprints(
+                        self.DATA_TYPE,
+                        build_row_keys(df, self.KEY_COLUMNS),
+                        build_row_hashes(df),
+                    )
+
+            if self.rollup_months:
+                refresh_rollups(self.DATA_TYPE, self.rollup_months)
+                self.rollup_months = set()
+
+            history.rows_processed = rows_processed
+            history.diff_summary = diff_summary
+            history.save(update_fields=['rows_processed', 'diff_summary'])
+            self.upload_batch = None
+            bump_data_version(self.DATA_TYPE)
+
+            # New sketch version; incremental uploads delete rows, so they
+            # rebuild (after commit)
+            update_sketches(self.DATA_TYPE, history, None if self.incremental else df)
+
+        return {
+            'success': True,
+            'rows_processed': rows_processed,
+            'error_message': None,
+            'diff_summary': diff_summary,
+        }
+
+    def ingest_staged(
+        self,
+        df: pd.DataFrame,
+        user: Any,
+        file_name: str,
+        file_size: int,
+        **history_fields: Any,
+    ) -> Dict[str, Any]:
+        """
+        Replace the data type's tables with a prepared DataFrame.
+
+        The UploadHistory row is created up front as 'in_progress' so
+        staged rows can reference it, and becomes 'success' with the
+        swap. If the load fails it is deleted again and the error is
+        raised, so parse() records the failure as usual.
+
+        Returns:
+            Result dict with success status and details
+        """
+        history = self.record_history(
+            user,
+            file_name=file_name,
+            file_size=file_size,
+            status='in_progress',
+            **history_fields,
+        )
+        self.upload_batch = history
+        try:
+            rows_processed = staged_replace(self, df)
+        except Exception:
+            UploadHistory.objects.filter(pk=history.pk).delete()
+            raise
+        finally:
+            self.upload_batch = None
+
+        update_sketches(self.DATA_TYPE, history, None)
+
+        return {
+            'success': True,
+            'rows_processed': rows_processed,
+            'error_message': None,
+            'diff_summary': None,
+        }
+
+    def record_failure(
+        self,
+        user: Any,
+        file_name: str,
+        file_size: int,
+        error: Exception,
+        **history_fields: Any,
+    ) -> Dict[str, Any]:
+        """
+        Log a failed upload and build the failure result dict.
+
+        History logging errors are swallowed so they never mask the
+        original error.
+        """
+        try:
+            self.record_history(
+                user,
+                file_name=file_name,
+                file_size=file_size,
+                status='failed',
+                error_message=str(error),
+                **history_fields,
+            )
+        except Exception:
+            pass  # Don't fail if history logging fails
+
+        return {
+            'success': False,
+            'rows_processed': None,
+            'error_message': str(error)
+        }
+
+    def parse(self, filepath: str, user: Any, **history_fields: Any) -> Dict[str, Any]:
+        """
+        Parse file and insert data into database.
 
         Args:
             filepath: Path to file to parse
             user: User performing the upload
+            **history_fields: Extra UploadHistory fields (e.g. content_hash)
 
         Returns:
             Dict with:
@@ -161,7 +531,15 @@ class BaseParser(ABC):
                 - rows_processed: int or None
                 - error_message: str or None
         """
-        pass
+        file_name = os.path.basename(filepath)
+
+        try:
+            df = self.prepare(filepath)
+            return self.ingest(df, user, file_name, os.path.getsize(filepath), **history_fields)
+
+        except Exception as e:
+            file_size = os.path.getsize(filepath) if os.path.exists(filepath) else 0
+            return self.record_failure(user, file_name, file_size, e, **history_fields)
 
 
 class DepartmentKPIParser(BaseParser):
@@ -180,86 +558,57 @@ class DepartmentKPIParser(BaseParser):
     """
 
     DATA_TYPE = 'department_kpi'
-
-    def parse(self, filepath: str, user: Any) -> Dict[str, Any]:
+    MODEL = DepartmentKPI
+    KEY_COLUMNS = ['평가년도', '단과대학', '학과']
+    KEY_FIELDS = ['evaluation_year', 'college', 'department']
+    TEMPLATE_COLUMNS = [
+        ('평가년도', 'evaluation_year'),
+        ('단과대학', 'college'),
+        ('학과', 'department'),
+        ('졸업생 취업률 (%)', 'employment_rate'),
+        ('전임교원 수 (명)', 'full_time_faculty'),
+        ('초빙교원 수 (명)', 'visiting_faculty'),
+        ('연간 기술이전 수입액 (억원)', 'tech_transfer_income'),
+        ('국제학술대회 개최 횟수', 'intl_conference_count'),
+    ]
+    COLUMN_DTYPES = {
+        '단과대학': 'category',
+        '학과': 'category',
+    }
+
+    def validate_data(self, df: pd.DataFrame) -> None:
+        """Validate Department KPI data."""
+        validate_department_kpi_data(df)
+
+    def save(self, df: pd.DataFrame) -> int:
         """
-        Parse Department KPI Excel/CSV file.
+        Bulk insert Department KPI rows.
 
         Args:
-            filepath: Path to file
-            user: User performing upload
+            df: Cleaned and validated DataFrame
 
         Returns:
-            Result dict with success status and details
+            Number of KPI rows inserted
         """
-        try:
-            # Validate file
-            self.validate_extension(filepath)
-            file_size = os.path.getsize(filepath)
-            self.validate_size(file_size)
-
-            # Read and clean data
-            df = self.read_file(filepath)
-            df = self.clean_data(df)
-
-            # Validate data
-            validate_department_kpi_data(df)
-
-            # Parse and save to database
-            with transaction.atomic():
-                kpi_objects = []
-
-                for _, row in df.iterrows():
-                    kpi = DepartmentKPI(
-                        evaluation_year=int(row['평가년도']),
-                        college=row['단과대학'],
-                        department=row['학과'],
-                        employment_rate=Decimal(str(row['졸업생 취업률 (%)'])) if pd.notna(row['졸업생 취업률 (%)']) else None,
-                        full_time_faculty=int(row['전임교원 수 (명)']) if pd.notna(row['전임교원 수 (명)']) else None,
-                        visiting_faculty=int(row['초빙교원 수 (명)']) if pd.notna(row['초빙교원 수 (명)']) else None,
-                        tech_transfer_income=Decimal(str(row['연간 기술이전 수입액 (억원)'])) if pd.notna(row['연간 기술이전 수입액 (억원)']) else None,
-                        intl_conference_count=int(row['국제학술대회 개최 횟수']) if pd.notna(row['국제학술대회 개최 횟수']) else None,
-                    )
-                    kpi_objects.append(kpi)
-
-                # Bulk insert
-                DepartmentKPI.objects.bulk_create(kpi_objects)
-
-                # Create upload history
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=file_size,
-                    data_type=self.DATA_TYPE,
-                    status='success',
-                    rows_processed=len(kpi_objects)
-                )
-
-            return {
-                'success': True,
-                'rows_processed': len(kpi_objects),
-                'error_message': None
-            }
+        kpi_objects = []
+
+        for _, row in df.iterrows():
+            kpi = DepartmentKPI(
+                evaluation_year=int(row['평가년도']),
+                college=row['단과대학'],
+                department=row['학과'],
+                employment_rate=Decimal(str(row['졸업생 취업률 (%)'])) if pd.notna(row['졸업생 취업률 (%)']) else None,
+                full_time_faculty=int(row['전임교원 수 (명)']) if pd.notna(row['전임교원 수 (명)']) else None,
+                visiting_faculty=int(row['초빙교원 수 (명)']) if pd.notna(row['초빙교원 수 (명)']) else None,
+                tech_transfer_income=Decimal(str(row['연간 기술이전 수입액 (억원)'])) if pd.notna(row['연간 기술이전 수입액 (억원)']) else None,
+                intl_conference_count=int(row['국제학술대회 개최 횟수']) if pd.notna(row['국제학술대회 개최 횟수']) else None,
+            )
+            kpi_objects.append(kpi)
 
-        except Exception as e:
-            # Log failed upload
-            try:
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=os.path.getsize(filepath) if os.path.exists(filepath) else 0,
-                    data_type=self.DATA_TYPE,
-                    status='failed',
-                    error_message=str(e)
-                )
-            except:
-                pass  # Don't fail if history logging fails
+        # Bulk insert
+        DepartmentKPI.objects.bulk_create(self.tag_batch(kpi_objects))
 
-            return {
-                'success': False,
-                'rows_processed': None,
-                'error_message': str(e)
-            }
+        return len(kpi_objects)
 
 
 class PublicationParser(BaseParser):
@@ -281,89 +630,88 @@ class PublicationParser(BaseParser):
     """
 
     DATA_TYPE = 'publication'
-
-    def parse(self, filepath: str, user: Any) -> Dict[str, Any]:
+    MODEL = Publication
+    KEY_COLUMNS = ['논문ID']
+    KEY_FIELDS = ['publication_id']
+    ROLLUP_DATE_FIELD = 'publication_date'
+    TEMPLATE_COLUMNS = [
+        ('논문ID', 'publication_id'),
+        ('게재일', 'publication_date'),
+        ('단과대학', 'college'),
+        ('학과', 'department'),
+        ('논문제목', 'title'),
+        ('주저자', 'first_author'),
+        ('참여저자', 'co_authors'),
+        ('학술지명', 'journal_name'),
+        ('저널등급', 'journal_grade'),
+        ('Impact Factor', 'impact_factor'),
+        ('과제연계여부', 'project_linked'),
+    ]
+    COLUMN_DTYPES = {
+        '논문ID': 'str',
+        '단과대학': 'category',
+        '학과': 'category',
+        '논문제목': 'str',
+        '주저자': 'category',
+        '참여저자': 'str',
+        '학술지명': 'category',
+        '저널등급': 'category',
+        '과제연계여부': 'category',
+    }
+
+    def validate_data(self, df: pd.DataFrame) -> None:
+        """Validate Publication data."""
+        validate_publication_data(df)
+
+    def delete_by_keys(self, keys: List[str]) -> None:
+        """Delete publications by key and recompute their first authors' departments."""
+        first_authors = set()
+        for start in range(0, len(keys), self.DELETE_BATCH_SIZE):
+            first_authors.update(PublicationAuthor.objects.filter(
+                publication__publication_id__in=keys[start:start + self.DELETE_BATCH_SIZE], position=0,
+            ).values_list('author_id', flat=True))
+
+        super().delete_by_keys(keys)
+
+        if first_authors:
+            refresh_author_departments(first_authors)
+
+    def save(self, df: pd.DataFrame) -> int:
         """
-        Parse Publication Excel/CSV file.
+        Bulk insert Publication rows and link them to their authors.
 
         Args:
-            filepath: Path to file
-            user: User performing upload
+            df: Cleaned and validated DataFrame
 
         Returns:
-            Result dict with success status and details
+            Number of publications inserted
         """
-        try:
-            # Validate file
-            self.validate_extension(filepath)
-            file_size = os.path.getsize(filepath)
-            self.validate_size(file_size)
-
-            # Read and clean data
-            df = self.read_file(filepath)
-            df = self.clean_data(df)
-
-            # Validate data
-            validate_publication_data(df)
-
-            # Parse and save to database
-            with transaction.atomic():
-                pub_objects = []
-
-                for _, row in df.iterrows():
-                    pub = Publication(
-                        publication_id=row['논문ID'],
-                        publication_date=pd.to_datetime(row['게재일']).date(),
-                        college=row['단과대학'],
-                        department=row['학과'],
-                        title=row['논문제목'],
-                        first_author=row['주저자'],
-                        co_authors=row['참여저자'] if pd.notna(row['참여저자']) else None,
-                        journal_name=row['학술지명'],
-                        journal_grade=row['저널등급'] if pd.notna(row['저널등급']) else None,
-                        impact_factor=Decimal(str(row['Impact Factor'])) if pd.notna(row['Impact Factor']) else None,
-                        project_linked=row['과제연계여부'] if pd.notna(row['과제연계여부']) else None,
-                    )
-                    pub_objects.append(pub)
-
-                # Bulk insert
-                Publication.objects.bulk_create(pub_objects)
-
-                # Create upload history
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=file_size,
-                    data_type=self.DATA_TYPE,
-                    status='success',
-                    rows_processed=len(pub_objects)
-                )
+        pub_objects = []
+        self.track_rollup_months(pd.to_datetime(df['게재일']))
+
+        for _, row in df.iterrows():
+            pub = Publication(
+                publication_id=row['논문ID'],
+                publication_date=pd.to_datetime(row['게재일']).date(),
+                college=row['단과대학'],
+                department=row['학과'],
+                title=row['논문제목'],
+                first_author=row['주저자'],
+                co_authors=row['참여저자'] if pd.notna(row['참여저자']) else None,
+                journal_name=row['학술지명'],
+                journal_grade=row['저널등급'] if pd.notna(row['저널등급']) else None,
+                impact_factor=Decimal(str(row['Impact Factor'])) if pd.notna(row['Impact Factor']) else None,
+                project_linked=row['과제연계여부'] if pd.notna(row['과제연계여부']) else None,
+            )
+            pub_objects.append(pub)
 
-            return {
-                'success': True,
-                'rows_processed': len(pub_objects),
-                'error_message': None
-            }
+        # Bulk insert (partition-aware)
+        self.bulk_load(Publication, pub_objects, 'publication_date')
 
-        except Exception as e:
-            # Log failed upload
-            try:
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=os.path.getsize(filepath) if os.path.exists(filepath) else 0,
-                    data_type=self.DATA_TYPE,
-                    status='failed',
-                    error_message=str(e)
-                )
-            except:
-                pass
+        # Author index (authors / publication_authors)
+        index_publication_authors(pub_objects)
 
-            return {
-                'success': False,
-                'rows_processed': None,
-                'error_message': str(e)
-            }
+        return len(pub_objects)
 
 
 class ResearchBudgetParser(BaseParser):
@@ -388,97 +736,84 @@ class ResearchBudgetParser(BaseParser):
     """
 
     DATA_TYPE = 'research_budget'
-
-    def parse(self, filepath: str, user: Any) -> Dict[str, Any]:
+    MODEL = ExecutionRecord
+    KEY_COLUMNS = ['집행ID']
+    KEY_FIELDS = ['execution_id']
+    ROLLUP_DATE_FIELD = 'execution_date'
+    TEMPLATE_COLUMNS = [
+        ('집행ID', 'execution_id'),
+        ('과제번호', 'project__project_number'),
+        ('과제명', 'project__project_name'),
+        ('연구책임자', 'project__principal_investigator'),
+        ('소속학과', 'project__department'),
+        ('지원기관', 'project__funding_agency'),
+        ('총연구비', 'project__total_budget'),
+        ('집행일자', 'execution_date'),
+        ('집행항목', 'expense_category'),
+        ('집행금액', 'amount'),
+        ('상태', 'status'),
+        ('비고', 'description'),
+    ]
+    COLUMN_DTYPES = {
+        '집행ID': 'str',
+        '과제번호': 'category',
+        '과제명': 'category',
+        '연구책임자': 'category',
+        '소속학과': 'category',
+        '지원기관': 'category',
+        '집행항목': 'category',
+        '상태': 'category',
+        '비고': 'str',
+    }
+
+    def validate_data(self, df: pd.DataFrame) -> None:
+        """Validate Research Budget data."""
+        validate_research_budget_data(df)
+
+    def save(self, df: pd.DataFrame) -> int:
         """
-        Parse Research Budget Excel/CSV file.
-
-        Creates/updates ResearchProject and creates ExecutionRecords.
+        Create/update ResearchProject rows and create ExecutionRecords.
 
         Args:
-            filepath: Path to file
-            user: User performing upload
+            df: Cleaned and validated DataFrame
 
         Returns:
-            Result dict with success status and details
+            Number of execution records created
         """
-        try:
-            # Validate file
-            self.validate_extension(filepath)
-            file_size = os.path.getsize(filepath)
-            self.validate_size(file_size)
-
-            # Read and clean data
-            df = self.read_file(filepath)
-            df = self.clean_data(df)
-
-            # Validate data
-            validate_research_budget_data(df)
-
-            # Parse and save to database
-            with transaction.atomic():
-                execution_count = 0
-
-                for _, row in df.iterrows():
-                    # Get or create ResearchProject
-                    project, created = ResearchProject.objects.get_or_create(
-                        project_number=row['과제번호'],
-                        defaults={
-                            'project_name': row['과제명'],
-                            'principal_investigator': row['연구책임자'],
-                            'department': row['소속학과'],
-                            'funding_agency': row['지원기관'],
-                            'total_budget': int(row['총연구비']),
-                        }
-                    )
-
-                    # Create ExecutionRecord
-                    ExecutionRecord.objects.create(
-                        execution_id=row['집행ID'],
-                        project=project,
-                        execution_date=pd.to_datetime(row['집행일자']).date(),
-                        expense_category=row['집행항목'],
-                        amount=int(row['집행금액']),
-                        status=row['상태'],
-                        description=row['비고'] if pd.notna(row['비고']) else None,
-                    )
-                    execution_count += 1
-
-                # Create upload history
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=file_size,
-                    data_type=self.DATA_TYPE,
-                    status='success',
-                    rows_processed=execution_count
-                )
+        self.track_rollup_months(pd.to_datetime(df['집행일자']))
+
+        # Get or create each ResearchProject once; its first row supplies the fields
+        projects = {}
+        for _, row in df.drop_duplicates('과제번호').iterrows():
+            projects[row['과제번호']], _ = ResearchProject.objects.get_or_create(
+                project_number=row['과제번호'],
+                defaults={
+                    'project_name': row['과제명'],
+                    'principal_investigator': row['연구책임자'],
+                    'department': row['소속학과'],
+                    'funding_agency': row['지원기관'],
+                    'total_budget': int(row['총연구비']),
+                    'upload_batch': self.upload_batch,
+                }
+            )
 
-            return {
-                'success': True,
-                'rows_processed': execution_count,
-                'error_message': None
-            }
+        execution_objects = [
+            ExecutionRecord(
+                execution_id=row['집행ID'],
+                project=projects[row['과제번호']],
+                execution_date=pd.to_datetime(row['집행일자']).date(),
+                expense_category=row['집행항목'],
+                amount=int(row['집행금액']),
+                status=row['상태'],
+                description=row['비고'] if pd.notna(row['비고']) else None,
+            )
+            for _, row in df.iterrows()
+        ]
 
-        except Exception as e:
-            # Log failed upload
-            try:
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=os.path.getsize(filepath) if os.path.exists(filepath) else 0,
-                    data_type=self.DATA_TYPE,
-                    status='failed',
-                    error_message=str(e)
-                )
-            except:
-                pass
+        # Bulk insert (partition-aware)
+        self.bulk_load(ExecutionRecord, execution_objects, 'execution_date')
 
-            return {
-                'success': False,
-                'rows_processed': None,
-                'error_message': str(e)
-            }
+        return len(execution_objects)
 
 
 class StudentParser(BaseParser):
@@ -498,84 +833,61 @@ class StudentParser(BaseParser):
     """
 
     DATA_TYPE = 'student'
-
-    def parse(self, filepath: str, user: Any) -> Dict[str, Any]:
+    MODEL = Student
+    KEY_COLUMNS = ['학번']
+    KEY_FIELDS = ['student_number']
+    TEMPLATE_COLUMNS = [
+        ('학번', 'student_number'),
+        ('이름', 'name'),
+        ('단과대학', 'college'),
+        ('학과', 'department'),
+        ('학년', 'grade'),
+        ('과정구분', 'program_type'),
+        ('학적상태', 'enrollment_status'),
+        ('성별', 'gender'),
+        ('입학년도', 'admission_year'),
+    ]
+    COLUMN_DTYPES = {
+        '학번': 'str',
+        '이름': 'str',
+        '단과대학': 'category',
+        '학과': 'category',
+        '과정구분': 'category',
+        '학적상태': 'category',
+        '성별': 'category',
+    }
+
+    def validate_data(self, df: pd.DataFrame) -> None:
+        """Validate Student data."""
+        validate_student_data(df)
+
+    def save(self, df: pd.DataFrame) -> int:
         """
-        Parse Student Excel/CSV file.
+        Bulk insert Student rows.
 
         Args:
-            filepath: Path to file
-            user: User performing upload
+            df: Cleaned and validated DataFrame
 
         Returns:
-            Result dict with success status and details
+            Number of students inserted
         """
-        try:
-            # Validate file
-            self.validate_extension(filepath)
-            file_size = os.path.getsize(filepath)
-            self.validate_size(file_size)
-
-            # Read and clean data
-            df = self.read_file(filepath)
-            df = self.clean_data(df)
-
-            # Validate data
-            validate_student_data(df)
-
-            # Parse and save to database
-            with transaction.atomic():
-                student_objects = []
-
-                for _, row in df.iterrows():
-                    student = Student(
-                        student_number=row['학번'],
-                        name=row['이름'],
-                        college=row['단과대학'],
-                        department=row['학과'],
-                        grade=int(row['학년']) if pd.notna(row['학년']) else None,
-                        program_type=row['과정구분'] if pd.notna(row['과정구분']) else None,
-                        enrollment_status=row['학적상태'],
-                        gender=row['성별'] if pd.notna(row['성별']) else None,
-                        admission_year=int(row['입학년도']),
-                    )
-                    student_objects.append(student)
-
-                # Bulk insert
-                Student.objects.bulk_create(student_objects)
-
-                # Create upload history
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=file_size,
-                    data_type=self.DATA_TYPE,
-                    status='success',
-                    rows_processed=len(student_objects)
-                )
+        student_objects = []
+
+        for _, row in df.iterrows():
+            student = Student(
+                student_number=row['학번'],
+                name=row['이름'],
+                college=row['단과대학'],
+                department=row['학과'],
+                grade=int(row['학년']) if pd.notna(row['학년']) else None,
+                program_type=row['과정구분'] if pd.notna(row['과정구분']) else None,
+                enrollment_status=row['학적상태'],
+                gender=row['성별'] if pd.notna(row['성별']) else None,
+                admission_year=int(row['입학년도']),
+            )
+            student_objects.append(student)
 
-            return {
-                'success': True,
-                'rows_processed': len(student_objects),
-                'error_message': None
-            }
+        # Bulk insert
+        Student.objects.bulk_create(self.tag_batch(student_objects))
 
-        except Exception as e:
-            # Log failed upload
-            try:
-                UploadHistory.objects.create(
-                    user=user,
-                    file_name=os.path.basename(filepath),
-                    file_size=os.path.getsize(filepath) if os.path.exists(filepath) else 0,
-                    data_type=self.DATA_TYPE,
-                    status='failed',
-                    error_message=str(e)
-                )
-            except:
-                pass
-
-            return {
-                'success': False,
-                'rows_processed': None,
-                'error_message': str(e)
-            }
+        return len(student_objects)
@@ -0,0 +1,124 @@
+"""
+Uniqueness pre-check for uploads.
+
+Business keys (논문ID, 학번, 집행ID, 평가년도|단과대학|학과 for KPI) are
+unique in the database, so a duplicate used to surface only as an
+IntegrityError from bulk_create, after every row had been turned into a
+model instance. The pre-check finds all conflicting keys up front:
+
+- In-file duplicates: keys are hashed to 64-bit integers and only rows
+  whose hash repeats are compared as strings. This needs no database, so
+  it runs in BaseParser.prepare() (and in batch upload workers).
+- Keys already stored: batched IN queries over the unique key column
+  (OR-ed conditions for composite keys, in smaller batches), run by
+  BaseParser.ingest() before anything is written. Incremental and
+  staged uploads replace stored rows, so they only check the file.
+
+Both lists are reported together in one DuplicateDataError.
+"""
+from functools import reduce
+from typing import Any, List, NamedTuple
+
+import pandas as pd
+from django.db.models import Q
+
+from apps.data_upload.diffing import KEY_SEPARATOR, build_row_keys, split_row_key
+from apps.data_upload.exceptions import DuplicateDataError
+
+
+EXISTING_KEY_BATCH_SIZE = 1000
+# Composite keys are matched by OR-ing one condition per key; SQLite
+# rejects expression trees deeper than 1000
+COMPOSITE_KEY_BATCH_SIZE = 500
+MAX_REPORTED_KEYS = 20
+
+
+class KeyConflicts(NamedTuple):
+    """Conflicting business keys of an upload."""
+    in_file: List[str]  # Keys occurring more than once in the file
+    existing: List[str]  # Keys already stored in the database
+
+    def __bool__(self) -> bool:
+        return bool(self.in_file or self.existing)
+
+    def message(self) -> str:
+        """One-line report listing up to MAX_REPORTED_KEYS keys per kind."""
+        parts = []
+        for label, keys in (('Duplicate keys in file', self.in_file),
+                            ('Keys already uploaded', self.existing)):
+            if keys:
+                shown = ', '.join(keys[:MAX_REPORTED_KEYS])
+                more = f' (+{len(keys) - MAX_REPORTED_KEYS} more)' if len(keys) > MAX_REPORTED_KEYS else ''
+                parts.append(f'{label} ({len(keys)}): {shown}{more}')
+        return '; '.join(parts)
+
+
+def find_duplicate_keys(keys: pd.Series) -> List[str]:
+    """
+    Keys occurring more than once, in order of first occurrence.
+
+    Comparing 64-bit hashes first keeps the string comparison to the few
+    rows whose hash repeats.
+    """
+    hashes = pd.util.hash_pandas_object(keys, index=False)
+    candidates = keys[hashes.duplicated(keep=False).to_numpy()]
+    return candidates[candidates.duplicated()].unique().tolist()
+
+
+def find_existing_keys(parser: Any, keys: pd.Series) -> List[str]:
+    """
+    Keys of parser.MODEL rows already in the database.
+
+    Args:
+        parser: BaseParser subclass instance with KEY_FIELDS
+        keys: Row keys built by apps.data_upload.diffing.build_row_keys
+
+    Returns:
+        Sorted list of stored keys
+    """
+    fields = [parser.MODEL._meta.get_field(name) for name in parser.KEY_FIELDS]
+    unique_keys = keys.drop_duplicates().tolist()
+    batch_size = EXISTING_KEY_BATCH_SIZE if len(fields) == 1 else COMPOSITE_KEY_BATCH_SIZE
+    existing = []
+
+    for start in range(0, len(unique_keys), batch_size):
+        batch = unique_keys[start:start + batch_size]
+
+        if len(fields) == 1:
+            field = fields[0]
+            values = [split_row_key(key, fields)[field.name] for key in batch]
+            stored = parser.MODEL.objects.filter(**{f'{field.name}__in': values}).values_list(field.name)
+        else:
+            condition = reduce(
+                lambda left, right: left | right,
+                (Q(**split_row_key(key, fields)) for key in batch),
+            )
+            stored = parser.MODEL.objects.filter(condition).values_list(*parser.KEY_FIELDS)
+
+        existing.extend(KEY_SEPARATOR.join(str(value) for value in row) for row in stored)
+
+    return sorted(existing)
+
+
+def check_unique_keys(parser: Any, df: pd.DataFrame, check_database: bool = True) -> None:
+    """
+    Reject an upload whose business keys are not unique.
+
+    Args:
+        parser: BaseParser subclass instance with KEY_COLUMNS/KEY_FIELDS
+        df: Cleaned upload DataFrame
+        check_database: Also look up keys already stored
+
+    Raises:
+        DuplicateDataError: Listing every conflicting key
+    """
+    if not parser.KEY_COLUMNS:
+        return
+
+    keys = build_row_keys(df, parser.KEY_COLUMNS)
+    conflicts = KeyConflicts(
+        in_file=find_duplicate_keys(keys),
+        existing=find_existing_keys(parser, keys) if check_database else [],
+    )
+    if conflicts:
+        raise DuplicateDataError(conflicts.message())
@@ -0,0 +1,202 @@
+"""
+Spreadsheet reader engines for uploads.
+
+Full reads (BaseParser.read_file), header sniffing (identify_file_type)
+and sheet listing (batch uploads) go through read_table, read_header and
+read_sheet_names. These try the engines registered for the file's
+extension in ENGINES order. That order is fastest first, as measured by
+benchmarks/bench_readers.py:
+
+- calamine (.xlsx, .xls): Rust reader, used when python-calamine is
+  installed
+- openpyxl (.xlsx): pandas' read-only openpyxl reader
+- xlrd (.xls)
+- pyarrow (.csv): multithreaded Arrow CSV reader, used when pyarrow is
+  installed. Full reads only.
+- c (.csv): pandas' C parser
+
+Engines whose module is not installed are skipped. If an engine fails on
+a file, the next one is tried. The error of the last engine is raised
+only when every engine fails.
+
+Every engine returns the same values for the parsers. In particular, the
+pyarrow engine reads the COLUMN_DTYPES text columns as strings (keeping
+leading zeros) and dates as written, with NaN for missing values, so row
+hashes (apps.data_upload.diffing) do not depend on the engine.
+"""
+import importlib.util
+import logging
+import os
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+SheetName = Union[str, int]
+
+
+class ReaderEngine(NamedTuple):
+    """A way of reading one or more file formats into a DataFrame."""
+    name: str
+    extensions: Tuple[str, ...]
+    module: str  # Import name the engine needs
+    read: Callable[..., pd.DataFrame]  # (path, sheet_name, nrows, dtype) -> DataFrame
+    reads_header: bool = True  # Supports nrows=0 header reads
+    lists_sheets: bool = False  # Usable as a pd.ExcelFile engine
+
+
+def _read_excel(engine: str) -> Callable[..., pd.DataFrame]:
+    def read(path: str, sheet_name: SheetName, nrows: Optional[int], dtype: Optional[Dict[str, Any]]) -> pd.DataFrame:
+        return pd.read_excel(path, sheet_name=sheet_name, nrows=nrows, dtype=dtype, engine=engine)
+    return read
+
+
+def _read_csv_c(path: str, sheet_name: SheetName, nrows: Optional[int], dtype: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    return pd.read_csv(path, encoding='utf-8-sig', nrows=nrows, dtype=dtype)
+
+
+def _read_csv_pyarrow(path: str, sheet_name: SheetName, nrows: Optional[int], dtype: Optional[Dict[str, Any]]) -> pd.DataFrame:
+    """
+    Read a CSV file with pyarrow.csv, matching pandas' C parser.
+
+    Text columns of dtype are read as strings ('category' ones dictionary
+    encoded, which arrive as categoricals). Columns Arrow infers as dates
+    or timestamps are read again as strings, because pandas keeps them as
+    written, and missing values become NaN rather than None.
+    """
+    import pyarrow as pa
+    from pyarrow import csv
+    from pandas._libs.parsers import STR_NA_VALUES  # pandas' default NaN markers
+
+    dtype = dtype or {}
+    column_types = {}
+    for column, column_dtype in dtype.items():
+        if column_dtype is str:
+            column_types[column] = pa.string()
+        elif column_dtype == 'category':
+            column_types[column] = pa.dictionary(pa.int32(), pa.string())
+
+    def read_arrow(**options):
+        return csv.read_csv(path, convert_options=csv.ConvertOptions(
+            column_types=column_types,
+            null_values=sorted(STR_NA_VALUES),
+            strings_can_be_null=True,
+            **options,
+        ))
+
+    table = read_arrow()
+    temporal = [
+        field.name for field in table.schema
+        if pa.types.is_date(field.type) or pa.types.is_timestamp(field.type)
+    ]
+    if temporal:
+        column_types.update((column, pa.string()) for column in temporal)
+        as_written = read_arrow(include_columns=temporal)
+        for column in temporal:
+            table = table.set_column(table.schema.get_field_index(column), column, as_written[column])
+
+    df = table.to_pandas()
+    for field in table.schema:
+        if pa.types.is_null(field.type):  # Empty column: float NaN, as in pandas
+            df[field.name] = np.full(len(df), np.nan)
+        elif pa.types.is_string(field.type) and table[field.name].null_count:
+            df[field.name] = df[field.name].where(df[field.name].notna(), np.nan)
+    casts = {column: column_dtype for column, column_dtype in dtype.items()
+             if column in df.columns and column not in column_types}
+    return df.astype(casts) if casts else df
+
+
+ENGINES: List[ReaderEngine] = [
+    ReaderEngine('calamine', ('.xlsx', '.xls'), 'python_calamine', _read_excel('calamine'), lists_sheets=True),
+    ReaderEngine('openpyxl', ('.xlsx',), 'openpyxl', _read_excel('openpyxl'), lists_sheets=True),
+    ReaderEngine('xlrd', ('.xls',), 'xlrd', _read_excel('xlrd'), lists_sheets=True),
+    ReaderEngine('pyarrow', ('.csv',), 'pyarrow', _read_csv_pyarrow, reads_header=False),
+    ReaderEngine('c', ('.csv',), 'pandas', _read_csv_c),
+]
+
+
+@lru_cache(maxsize=None)
+def is_installed(module: str) -> bool:
+    return importlib.util.find_spec(module) is not None
+
+
+def available_engines(ext: str) -> List[ReaderEngine]:
+    """Installed engines for an extension (e.g. '.xlsx'), fastest first."""
+    return [engine for engine in ENGINES if ext.lower() in engine.extensions and is_installed(engine.module)]
+
+
+def get_engine(name: str) -> ReaderEngine:
+    """Look up a registered engine by name."""
+    for engine in ENGINES:
+        if engine.name == name:
+            return engine
+    raise ValueError(f'Unknown reader engine: {name}')
+
+
+def _extension(path: str) -> str:
+    return os.path.splitext(path)[1].lower()
+
+
+def _with_fallback(path: str, engines: List[ReaderEngine], read: Callable[[ReaderEngine], Any]) -> Any:
+    """Run read with each engine in turn until one succeeds."""
+    if not engines:
+        raise ValueError(f"No reader engine for '{_extension(path)}' files")
+
+    for index, engine in enumerate(engines):
+        try:
+            return read(engine)
+        except FileNotFoundError:
+            raise
+        except Exception as e:
+            if index == len(engines) - 1:
+                raise
+            logger.warning(
+                'Reader engine %s failed on %s (%s); falling back to %s',
+                engine.name, os.path.basename(path), e, engines[index + 1].name,
+            )
+
+
+def read_table(
+    path: str,
+    sheet_name: SheetName = 0,
+    dtype: Optional[Dict[str, Any]] = None,
+    engine: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    Read a whole CSV file or worksheet.
+
+    Args:
+        path: Path to the file
+        sheet_name: Worksheet name or index (Excel only)
+        dtype: Column dtypes, as for pd.read_csv
+        engine: Use only this engine (benchmarks, tests)
+
+    Returns:
+        DataFrame with the file contents
+
+    Raises:
+        ValueError: If no engine reads the extension
+    """
+    engines = [get_engine(engine)] if engine else available_engines(_extension(path))
+    return _with_fallback(path, engines, lambda e: e.read(path, sheet_name, None, dtype))
+
+
+def read_header(path: str, sheet_name: SheetName = 0, engine: Optional[str] = None) -> List[str]:
+    """Column names of a CSV file or worksheet, reading no data rows."""
+    engines = [get_engine(engine)] if engine else [
+        e for e in available_engines(_extension(path)) if e.reads_header
+    ]
+    return _with_fallback(path, engines, lambda e: list(e.read(path, sheet_name, 0, None).columns))
+
+
+def read_sheet_names(path: str) -> List[str]:
+    """Worksheet names of an Excel workbook."""
+    def read(engine: ReaderEngine) -> List[str]:
+        with pd.ExcelFile(path, engine=engine.name) as workbook:
+            return [str(name) for name in workbook.sheet_names]
+
+    engines = [e for e in available_engines(_extension(path)) if e.lists_sheets]
+    return _with_fallback(path, engines, read)
@@ -0,0 +1,138 @@
+"""
+Revert an upload by its batch id.
+
+Rows inserted by an upload carry its UploadHistory id in upload_batch_id
+(see BaseParser.tag_batch), so a bad upload is removed with set-based
+deletes instead of loading and deleting model instances one by one:
+
+- Rows are deleted in chunks of REVERT_CHUNK_SIZE ids, in date order, each
+  chunk in its own short transaction with its derived data: fingerprints
+  (apps.data_upload.diffing), author links (apps.analytics.authors), the
+  rollup months it touched (apps.analytics.rollups) and a data version
+  bump (apps.analytics.versions). An interrupted revert leaves consistent
+  data and can simply be run again.
+- Research projects created by the upload are deleted once no execution
+  records (of any upload) reference them.
+- Sketches of the data type are rebuilt and the upload is marked
+  'reverted'.
+
+Only rows the upload inserted are removed. Rows an incremental upload
+deleted or replaced are not restored; replay the previous upload
+(manage.py replay_upload) for that.
+
+    >>> revert_upload(history)
+    {'execution_records': 1200, 'research_projects': 3}
+"""
+from typing import Dict, List, Optional, Set
+
+from django.db import connection, transaction
+
+from apps.analytics.authors import refresh_author_departments
+from apps.analytics.models import PublicationAuthor, ResearchProject, UploadHistory
+from apps.analytics.rollups import refresh_rollups, touched_months
+from apps.analytics.sketches import update_sketches
+from apps.analytics.versions import bump_data_version
+from apps.data_upload.diffing import delete_fingerprints, model_row_keys
+from apps.data_upload.exceptions import RevertError
+from apps.data_upload.utils import FILE_TYPE_SIGNATURES
+
+
+REVERT_CHUNK_SIZE = 5000
+
+
+def _delete_ids(model: type, ids: List[int], column: Optional[str] = None) -> int:
+    """DELETE rows by primary key (or another column) with one statement; returns the row count."""
+    table = connection.ops.quote_name(model._meta.db_table)
+    column = connection.ops.quote_name(column or model._meta.pk.column)
+    placeholders = ', '.join(['%s'] * len(ids))
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {column} IN ({placeholders})', ids)
+        return cursor.rowcount
+
+
+def _delete_publication_links(publication_ids: List[int]) -> Set[int]:
+    """Delete author links of publications; returns their first authors."""
+    first_authors = set(
+        PublicationAuthor.objects.filter(publication_id__in=publication_ids, position=0)
+        .values_list('author_id', flat=True)
+    )
+    _delete_ids(PublicationAuthor, publication_ids, column='publication_id')
+    return first_authors
+
+
+def revert_upload(history: UploadHistory, chunk_size: Optional[int] = None) -> Dict[str, int]:
+    """
+    Delete the rows inserted by a successful upload.
+
+    Args:
+        history: UploadHistory row of the upload
+        chunk_size: Rows deleted per transaction (default REVERT_CHUNK_SIZE)
+
+    Returns:
+        Dict of table name -> rows deleted
+
+    Raises:
+        RevertError: If the upload did not succeed or was already reverted
+    """
+    if history.status != 'success':
+        raise RevertError(f'Upload {history.id} has status {history.status!r}; only successful uploads can be reverted.')
+    if history.data_type not in FILE_TYPE_SIGNATURES:
+        raise RevertError(f'Unknown data type: {history.data_type}')
+
+    parser_class = FILE_TYPE_SIGNATURES[history.data_type][1]
+    model = parser_class.MODEL
+    date_field = parser_class.ROLLUP_DATE_FIELD
+    key_fields = list(parser_class.KEY_FIELDS)
+    chunk_size = chunk_size or REVERT_CHUNK_SIZE
+
+    order = [date_field, 'pk'] if date_field else ['pk']
+    rows = model.objects.filter(upload_batch_id=history.id).order_by(*order)
+    fields = ['pk'] + key_fields + ([date_field] if date_field else [])
+    first_authors = set()
+    deleted = {model._meta.db_table: 0}
+
+    while True:
+        with transaction.atomic():
+            chunk = list(rows.values_list(*fields)[:chunk_size])
+            if not chunk:
+                break
+            ids = [row[0] for row in chunk]
+
+            if history.data_type == 'publication':
+                first_authors |= _delete_publication_links(ids)
+            deleted[model._meta.db_table] += _delete_ids(model, ids)
+
+            if key_fields:
+                delete_fingerprints(history.data_type, model_row_keys(row[1:1 + len(key_fields)] for row in chunk))
+            if date_field:
+                refresh_rollups(history.data_type, touched_months(row[-1] for row in chunk))
+            bump_data_version(history.data_type)
+
+    if first_authors:
+        refresh_author_departments(first_authors)
+
+    if history.data_type == 'research_budget':
+        deleted[ResearchProject._meta.db_table] = _delete_orphaned_projects(history, chunk_size)
+
+    with transaction.atomic():
+        update_sketches(history.data_type, None, None)
+        UploadHistory.objects.filter(pk=history.pk).update(status='reverted')
+        history.status = 'reverted'
+        bump_data_version(history.data_type)
+
+    return deleted
+
+
+def _delete_orphaned_projects(history: UploadHistory, chunk_size: int) -> int:
+    """Delete projects created by the upload that no execution record references."""
+    orphans = ResearchProject.objects.filter(
+        upload_batch_id=history.id, execution_records__isnull=True,
+    ).order_by('pk').values_list('pk', flat=True)
+    deleted = 0
+    while True:
+        with transaction.atomic():
+            ids = list(orphans[:chunk_size])
+            if not ids:
+                return deleted
+            deleted += _delete_ids(ResearchProject, ids)
+            bump_data_version(history.data_type)
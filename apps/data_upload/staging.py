@@ -0,0 +1,420 @@
+"""
+Staged replace: load an upload into shadow tables and swap them in.
+
+A staged replace treats the file as the complete new contents of its data
+type. Instead of rewriting the live tables inside one long transaction,
+it works on shadow copies so dashboards keep reading the old data without
+waiting on locks:
+
+1. Shadow copies of STAGED_TABLES[data_type] are created in the
+   STAGING_SCHEMA schema (columns, defaults, CHECK constraints and
+   column comments; no indexes yet).
+2. The parser's save() runs in chunks of STAGED_LOAD_CHUNK_SIZE rows, each
+   in its own transaction with search_path set to the staging schema
+   first, so the ORM writes to the shadow tables while every other table
+   (authors, upload_history, ...) resolves to the live one. A failure
+   only drops the shadow tables.
+3. Primary keys, unique and foreign key constraints, indexes, triggers,
+   row-level security policies, grants and the table comment of the live
+   tables are recreated on the shadow tables. Adding the constraints
+   validates the loaded rows, and building indexes after the load is
+   cheaper than maintaining them row by row. Row counts are checked and
+   the shadow tables analyzed.
+4. One short transaction replaces the fingerprints, rebuilds the rollups
+   from the shadow tables, then takes the live tables' locks (waiting at
+   most SWAP_LOCK_TIMEOUT, retried SWAP_ATTEMPTS times) and swaps: the
+   live tables move to RETIRED_SCHEMA, the shadow tables move to public,
+   id sequences and dependent views are re-pointed and the old tables
+   dropped. Readers wait only for these catalog updates. Author
+   departments are recomputed from the new publications afterwards.
+
+Tables with foreign keys from tables outside the data type's group, and
+tables partitioned by year (supabase/optional/partition_by_year.sql), are
+refused: swapping them would drop those links or the partitioning.
+
+Other databases (SQLite in tests), and calls inside an outer transaction
+(atomic batch uploads), replace the rows in place within one transaction
+instead.
+
+    >>> rows_processed = staged_replace(parser, df)
+"""
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+from django.db import OperationalError, connection, transaction
+
+from apps.analytics.authors import refresh_author_departments
+from apps.analytics.models import Author, UploadFingerprint, UploadHistory
+from apps.analytics.partitions import PARTITIONED_TABLES, is_partitioned
+from apps.analytics.rollups import ROLLUPS, rebuild_rollups
+from apps.analytics.versions import bump_data_version
+from apps.data_upload.diffing import build_row_hashes, build_row_keys, record_fingerprints
+from apps.data_upload.exceptions import StagingError
+
+
+STAGING_SCHEMA = 'upload_staging'
+RETIRED_SCHEMA = 'upload_retired'
+STAGED_LOAD_CHUNK_SIZE = 20000
+SWAP_LOCK_TIMEOUT = '2s'
+SWAP_ATTEMPTS = 5
+SWAP_RETRY_DELAY = 1.0  # Seconds, doubled after every attempt
+
+# Tables replaced together per data type, parents first
+STAGED_TABLES: Dict[str, List[str]] = {
+    'department_kpi': ['department_kpi'],
+    'publication': ['publications', 'publication_authors'],
+    'research_budget': ['research_projects', 'execution_records'],
+    'student': ['students'],
+}
+
+LOCK_NOT_AVAILABLE = '55P03'
+
+
+def qn(name: str) -> str:
+    return connection.ops.quote_name(name)
+
+
+def _public(table: str) -> str:
+    return f'public.{qn(table)}'
+
+
+def _staged(table: str) -> str:
+    return f'{qn(STAGING_SCHEMA)}.{qn(table)}'
+
+
+def get_staged_tables(data_type: str) -> List[str]:
+    """
+    Tables a staged replace of a data type swaps.
+
+    Raises:
+        StagingError: If the data type has no staged tables
+    """
+    try:
+        return STAGED_TABLES[data_type]
+    except KeyError:
+        raise StagingError(f"Staged replace is not available for '{data_type}'.")
+
+
+def _replace_fingerprints(parser: Any, df: pd.DataFrame) -> None:
+    UploadFingerprint.objects.filter(data_type=parser.DATA_TYPE).delete()
+    if parser.KEY_COLUMNS:
+        record_fingerprints(parser.DATA_TYPE, build_row_keys(df, parser.KEY_COLUMNS), build_row_hashes(df))
+
+
+def _refresh_authors(data_type: str) -> None:
+    """Recompute every author's department after the publications were replaced."""
+    if data_type == 'publication':
+        refresh_author_departments(Author.objects.values_list('pk', flat=True))
+
+
+def _mark_success(history: UploadHistory, rows_processed: int) -> None:
+    UploadHistory.objects.filter(pk=history.pk).update(
+        status='success', rows_processed=rows_processed, error_message=None,
+    )
+    history.status = 'success'
+    history.rows_processed = rows_processed
+    history.error_message = None
+    bump_data_version(history.data_type)
+
+
+def staged_replace(parser: Any, df: pd.DataFrame, chunk_size: Optional[int] = None) -> int:
+    """
+    Replace the tables of the parser's data type with a prepared DataFrame.
+
+    The parser's upload_batch (UploadHistory row) is marked successful
+    together with the swap.
+
+    Args:
+        parser: BaseParser subclass instance
+        df: Cleaned and validated DataFrame (the complete new data)
+        chunk_size: Rows saved per transaction (default STAGED_LOAD_CHUNK_SIZE)
+
+    Returns:
+        Number of rows processed
+
+    Raises:
+        StagingError: If the tables cannot be staged, or the staged data
+            fails validation
+    """
+    tables = get_staged_tables(parser.DATA_TYPE)
+    if connection.vendor != 'postgresql' or connection.in_atomic_block:
+        return _replace_in_place(parser, df, tables)
+    return ShadowTables(parser.DATA_TYPE, tables).replace(parser, df, chunk_size or STAGED_LOAD_CHUNK_SIZE)
+
+
+def _replace_in_place(parser: Any, df: pd.DataFrame, tables: List[str]) -> int:
+    """Delete and reload the tables in one transaction (no shadow tables)."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            for table in reversed(tables):
+                cursor.execute(f'DELETE FROM {qn(table)}')
+        rows_processed = parser.save(df)
+        _refresh_authors(parser.DATA_TYPE)
+        _replace_fingerprints(parser, df)
+        if parser.DATA_TYPE in ROLLUPS:
+            rebuild_rollups(parser.DATA_TYPE)
+        parser.rollup_months = set()
+        _mark_success(parser.upload_batch, rows_processed)
+    return rows_processed
+
+
+class ShadowTables:
+    """Shadow copies of a data type's tables in STAGING_SCHEMA (PostgreSQL)."""
+
+    def __init__(self, data_type: str, tables: List[str]):
+        self.data_type = data_type
+        self.tables = tables
+        self.lock_key = f'staged_replace:{data_type}'
+
+    def replace(self, parser: Any, df: pd.DataFrame, chunk_size: int) -> int:
+        """Load, validate and swap in the shadow tables."""
+        self.check_tables()
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_try_advisory_lock(hashtext(%s))', [self.lock_key])
+            if not cursor.fetchone()[0]:
+                raise StagingError(f'Another staged replace of {self.data_type} is running.')
+        try:
+            self.create()
+            rows_processed = self.load(parser, df, chunk_size)
+            self.finalize()
+            self.validate(parser.MODEL._meta.db_table, rows_processed)
+            self.swap(parser, df, rows_processed)
+            return rows_processed
+        finally:
+            self.drop()
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT pg_advisory_unlock(hashtext(%s))', [self.lock_key])
+
+    def check_tables(self) -> None:
+        """Refuse partitioned tables and foreign keys from outside the group."""
+        for table in self.tables:
+            if table in PARTITIONED_TABLES and is_partitioned(table):
+                raise StagingError(f'{table} is partitioned; staged replace swaps whole tables only.')
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                SELECT conrelid::regclass::text, conname FROM pg_constraint
+                WHERE contype = 'f'
+                  AND confrelid = ANY(%s::regclass[])
+                  AND NOT conrelid = ANY(%s::regclass[])
+                """,
+                [[_public(t) for t in self.tables]] * 2
+            )
+            outside = cursor.fetchall()
+        if outside:
+            raise StagingError(
+                'Tables outside the staged group reference it: '
+                + ', '.join(f'{table} ({name})' for table, name in outside)
+            )
+
+    def create(self) -> None:
+        """Create empty shadow tables (leftovers of an interrupted load are dropped)."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {qn(STAGING_SCHEMA)}')
+            cursor.execute(f'CREATE SCHEMA IF NOT EXISTS {qn(RETIRED_SCHEMA)}')
+            for table in reversed(self.tables):
+                cursor.execute(f'DROP TABLE IF EXISTS {_staged(table)}')
+            for table in self.tables:
+                cursor.execute(
+                    f'CREATE TABLE {_staged(table)} '
+                    f'(LIKE {_public(table)} INCLUDING ALL EXCLUDING INDEXES)'
+                )
+
+    def _use_staging(self, cursor) -> str:
+        """Resolve unqualified table names to the shadow tables until commit; returns the previous search_path."""
+        cursor.execute('SHOW search_path')
+        previous = cursor.fetchone()[0]
+        cursor.execute("SELECT set_config('search_path', %s, true)", [f'{qn(STAGING_SCHEMA)}, {previous}'])
+        return previous
+
+    def load(self, parser: Any, df: pd.DataFrame, chunk_size: int) -> int:
+        """Save the DataFrame into the shadow tables, one transaction per chunk."""
+        rows_processed = 0
+        for start in range(0, len(df), chunk_size):
+            with transaction.atomic():
+                with connection.cursor() as cursor:
+                    self._use_staging(cursor)
+                rows_processed += parser.save(df.iloc[start:start + chunk_size])
+        parser.rollup_months = set()  # Rollups are rebuilt at the swap
+        return rows_processed
+
+    def _definitions(self, cursor, table: str) -> Dict[str, List[Any]]:
+        """Constraints, indexes, triggers, policies, grants and comment of a live table."""
+        oid = _public(table)
+        definitions = {}
+        cursor.execute(
+            """
+            SELECT conname, pg_get_constraintdef(oid) FROM pg_constraint
+            WHERE conrelid = %s::regclass AND contype IN ('p', 'u', 'x', 'f')
+            ORDER BY contype = 'f', conname
+            """,
+            [oid]
+        )
+        definitions['constraints'] = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT pg_get_indexdef(i.indexrelid) FROM pg_index i
+            WHERE i.indrelid = %s::regclass
+              AND NOT EXISTS (SELECT 1 FROM pg_constraint c WHERE c.conindid = i.indexrelid)
+            """,
+            [oid]
+        )
+        definitions['indexes'] = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            'SELECT pg_get_triggerdef(oid) FROM pg_trigger WHERE tgrelid = %s::regclass AND NOT tgisinternal',
+            [oid]
+        )
+        definitions['triggers'] = [row[0] for row in cursor.fetchall()]
+        cursor.execute(
+            'SELECT relrowsecurity, relforcerowsecurity, obj_description(oid, %s) FROM pg_class WHERE oid = %s::regclass',
+            ['pg_class', oid]
+        )
+        definitions['rls'] = cursor.fetchone()
+        cursor.execute(
+            """
+            SELECT policyname, permissive, roles::text[], cmd, qual, with_check FROM pg_policies
+            WHERE schemaname = 'public' AND tablename = %s
+            """,
+            [table]
+        )
+        definitions['policies'] = cursor.fetchall()
+        cursor.execute(
+            """
+            SELECT a.privilege_type, CASE WHEN a.grantee = 0 THEN NULL ELSE pg_get_userbyid(a.grantee) END
+            FROM pg_class c, aclexplode(c.relacl) a WHERE c.oid = %s::regclass
+            """,
+            [oid]
+        )
+        definitions['grants'] = cursor.fetchall()
+        return definitions
+
+    def _on_staged(self, statement: str, table: str) -> str:
+        """Point an index/trigger definition of the live table at the shadow table."""
+        live, staged = f' ON {_public(table)} ', f' ON {_staged(table)} '
+        if live not in statement:
+            live = f' ON public.{table} '
+        if live not in statement:
+            raise StagingError(f'Cannot copy definition to the staged table: {statement}')
+        return statement.replace(live, staged, 1)
+
+    def finalize(self) -> None:
+        """Recreate constraints, indexes and permissions; adding constraints validates the rows."""
+        with connection.cursor() as cursor:
+            # Definitions are read with the default search_path (names of
+            # live tables unqualified) and executed with the shadow tables
+            # first, so foreign keys between staged tables stay inside the group
+            definitions = {table: self._definitions(cursor, table) for table in self.tables}
+
+        with transaction.atomic(), connection.cursor() as cursor:
+            self._use_staging(cursor)
+            for table in self.tables:
+                staged = _staged(table)
+                table_definitions = definitions[table]
+                for name, definition in table_definitions['constraints']:
+                    cursor.execute(f'ALTER TABLE {staged} ADD CONSTRAINT {qn(name)} {definition}')
+                for statement in table_definitions['indexes'] + table_definitions['triggers']:
+                    cursor.execute(self._on_staged(statement, table))
+
+                row_security, force_row_security, comment = table_definitions['rls']
+                if row_security:
+                    cursor.execute(f'ALTER TABLE {staged} ENABLE ROW LEVEL SECURITY')
+                if force_row_security:
+                    cursor.execute(f'ALTER TABLE {staged} FORCE ROW LEVEL SECURITY')
+                for name, permissive, roles, command, qual, with_check in table_definitions['policies']:
+                    grantees = ', '.join('PUBLIC' if role == 'public' else qn(role) for role in roles)
+                    statement = f'CREATE POLICY {qn(name)} ON {staged} AS {permissive} FOR {command} TO {grantees}'
+                    if qual:
+                        statement += f' USING ({qual})'
+                    if with_check:
+                        statement += f' WITH CHECK ({with_check})'
+                    cursor.execute(statement)
+                for privilege, grantee in table_definitions['grants']:
+                    cursor.execute(f'GRANT {privilege} ON {staged} TO {qn(grantee) if grantee else "PUBLIC"}')
+                if comment:
+                    cursor.execute(f'COMMENT ON TABLE {staged} IS %s', [comment])
+
+        with connection.cursor() as cursor:
+            for table in self.tables:
+                cursor.execute(f'ANALYZE {_staged(table)}')
+
+    def validate(self, model_table: str, rows_processed: int) -> None:
+        """Check the staged row count of the data type's model."""
+        with connection.cursor() as cursor:
+            cursor.execute(f'SELECT COUNT(*) FROM {_staged(model_table)}')
+            staged_rows = cursor.fetchone()[0]
+        if staged_rows != rows_processed:
+            raise StagingError(f'{model_table}: {staged_rows} rows staged, {rows_processed} expected.')
+
+    def swap(self, parser: Any, df: pd.DataFrame, rows_processed: int) -> None:
+        """Swap the shadow tables in, retrying while readers hold the live tables."""
+        delay = SWAP_RETRY_DELAY
+        for attempt in range(1, SWAP_ATTEMPTS + 1):
+            try:
+                with transaction.atomic():
+                    self._swap(parser, df, rows_processed)
+                break
+            except OperationalError as e:
+                if getattr(e.__cause__, 'pgcode', None) != LOCK_NOT_AVAILABLE or attempt == SWAP_ATTEMPTS:
+                    raise
+                time.sleep(delay)
+                delay *= 2
+        _refresh_authors(self.data_type)
+
+    def _dependent_views(self, cursor) -> List[Tuple[str, str, Optional[List[str]]]]:
+        cursor.execute(
+            """
+            SELECT DISTINCT v.oid::regclass::text, pg_get_viewdef(v.oid), v.reloptions
+            FROM pg_depend d
+            JOIN pg_rewrite r ON r.oid = d.objid
+            JOIN pg_class v ON v.oid = r.ev_class
+            WHERE d.classid = 'pg_rewrite'::regclass
+              AND d.refobjid = ANY(%s::regclass[])
+              AND v.relkind = 'v'
+            """,
+            [[_public(t) for t in self.tables]]
+        )
+        return cursor.fetchall()
+
+    def _swap(self, parser: Any, df: pd.DataFrame, rows_processed: int) -> None:
+        with connection.cursor() as cursor:
+            # Derived tables first, computed from the shadow tables before any lock is taken
+            search_path = self._use_staging(cursor)
+            _replace_fingerprints(parser, df)
+            if self.data_type in ROLLUPS:
+                rebuild_rollups(self.data_type)
+            cursor.execute("SELECT set_config('search_path', %s, true)", [search_path])
+
+            cursor.execute("SELECT set_config('lock_timeout', %s, true)", [SWAP_LOCK_TIMEOUT])
+            cursor.execute(
+                f'LOCK TABLE {", ".join(_public(t) for t in self.tables)} IN ACCESS EXCLUSIVE MODE'
+            )
+            views = self._dependent_views(cursor)
+            sequences = []
+            for table in self.tables:
+                cursor.execute('SELECT pg_get_serial_sequence(%s, %s)', [_public(table), 'id'])
+                sequence = cursor.fetchone()[0]
+                if sequence:
+                    sequences.append((table, sequence))
+                    cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY NONE')
+
+            for table in self.tables:
+                cursor.execute(f'ALTER TABLE {_public(table)} SET SCHEMA {qn(RETIRED_SCHEMA)}')
+                cursor.execute(f'ALTER TABLE {_staged(table)} SET SCHEMA public')
+            for table, sequence in sequences:
+                cursor.execute(f'ALTER SEQUENCE {sequence} OWNED BY {_public(table)}.{qn("id")}')
+            for name, definition, options in views:
+                cursor.execute(f'CREATE OR REPLACE VIEW {name} AS {definition}')
+                if options:
+                    cursor.execute(f'ALTER VIEW {name} SET ({", ".join(options)})')
+            cursor.execute(
+                f'DROP TABLE {", ".join(f"{qn(RETIRED_SCHEMA)}.{qn(t)}" for t in self.tables)}'
+            )
+
+        _mark_success(parser.upload_batch, rows_processed)
+
+    def drop(self) -> None:
+        """Drop shadow tables left by a failed load (no-op after a swap)."""
+        with transaction.atomic(), connection.cursor() as cursor:
+            for table in reversed(self.tables):
+                cursor.execute(f'DROP TABLE IF EXISTS {_staged(table)}')
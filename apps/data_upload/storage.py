@@ -0,0 +1,215 @@
+"""
+Content-addressed archive for uploaded source files.
+
+Uploaded files are stored compressed under their SHA-256 digest so that:
+- Re-uploads of an already ingested file are detected by hash before parsing
+- Any UploadHistory row can be replayed from the archive
+  (manage.py replay_upload <history_id>)
+
+Compression uses zstd when the optional `zstandard` package is installed
+and gzip otherwise. Both are readable regardless of the current setting.
+"""
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, Optional
+
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+try:
+    import zstandard
+except ImportError:  # Optional dependency
+    zstandard = None
+
+
+HASH_CHUNK_SIZE = 1024 * 1024  # 1 MB
+COMPRESSION_SUFFIXES = {'zstd': '.zst', 'gzip': '.gz'}
+
+
+def hash_file(file_path: str) -> str:
+    """
+    Compute the SHA-256 digest of a file without loading it into memory.
+
+    Args:
+        file_path: Path to file
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class LocalArchiveBackend:
+    """
+    Local filesystem backend for UploadArchive.
+
+    Objects are sharded by the first two characters of their name
+    (root/ab/abcdef...) to keep directories small.
+    """
+
+    def __init__(self, root: str):
+        self.root = str(root)
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.root, name[:2], name)
+
+    def exists(self, name: str) -> bool:
+        return os.path.exists(self._path(name))
+
+    def open_read(self, name: str) -> BinaryIO:
+        return open(self._path(name), 'rb')
+
+    def save(self, name: str, source_path: str) -> None:
+        """Move a finished temp file into place atomically."""
+        target = self._path(name)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        os.replace(source_path, target)
+
+    def temp_dir(self) -> str:
+        """Directory for in-progress writes (same filesystem as the store)."""
+        os.makedirs(self.root, exist_ok=True)
+        return self.root
+
+
+class UploadArchive:
+    """
+    Compressed, content-addressed store of uploaded files.
+
+    Object names are '<sha256><original extension><compression suffix>',
+    e.g. '3f9a...c1.xlsx.zst', so the reader format survives replays.
+    """
+
+    def __init__(self, backend, compression: str = 'auto'):
+        if compression == 'auto':
+            compression = 'zstd' if zstandard is not None else 'gzip'
+        if compression == 'zstd' and zstandard is None:
+            raise ImportError('zstd compression requires the zstandard package')
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f'Unsupported compression: {compression}')
+
+        self.backend = backend
+        self.compression = compression
+
+    def _find(self, digest: str, ext: str) -> Optional[str]:
+        """Return the stored object name for digest+ext in any compression."""
+        for suffix in COMPRESSION_SUFFIXES.values():
+            name = f'{digest}{ext}{suffix}'
+            if self.backend.exists(name):
+                return name
+        return None
+
+    def contains(self, digest: str, ext: str) -> bool:
+        """Check whether a file with this digest and extension is archived."""
+        return self._find(digest, ext.lower()) is not None
+
+    def put(self, file_path: str, digest: Optional[str] = None) -> str:
+        """
+        Archive a file (no-op if the same content is already stored).
+
+        Args:
+            file_path: Path to file
+            digest: Precomputed SHA-256 digest (computed if omitted)
+
+        Returns:
+            Hex digest of the file
+        """
+        digest = digest or hash_file(file_path)
+        ext = os.path.splitext(file_path)[1].lower()
+
+        if self._find(digest, ext) is not None:
+            return digest
+
+        fd, temp_path = tempfile.mkstemp(dir=self.backend.temp_dir(), suffix='.part')
+        try:
+            with open(file_path, 'rb') as src, os.fdopen(fd, 'wb') as dst:
+                if self.compression == 'zstd':
+                    zstandard.ZstdCompressor(level=10).copy_stream(src, dst)
+                else:
+                    with gzip.GzipFile(fileobj=dst, mode='wb', compresslevel=6) as gz:
+                        shutil.copyfileobj(src, gz, HASH_CHUNK_SIZE)
+
+            self.backend.save(f'{digest}{ext}{COMPRESSION_SUFFIXES[self.compression]}', temp_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return digest
+
+    def restore(self, digest: str, ext: str, dest_path: str) -> str:
+        """
+        Decompress an archived file to dest_path.
+
+        Args:
+            digest: Hex digest of the file
+            ext: Original file extension (e.g. '.xlsx')
+            dest_path: Where to write the restored file
+
+        Returns:
+            dest_path
+
+        Raises:
+            FileNotFoundError: If the file is not archived
+        """
+        name = self._find(digest, ext.lower())
+        if name is None:
+            raise FileNotFoundError(f'Archived file not found: {digest}{ext}')
+
+        with self.backend.open_read(name) as raw, open(dest_path, 'wb') as dst:
+            if name.endswith(COMPRESSION_SUFFIXES['zstd']):
+                if zstandard is None:
+                    raise ImportError('Reading zstd archives requires the zstandard package')
+                zstandard.ZstdDecompressor().copy_stream(raw, dst)
+            else:
+                with gzip.GzipFile(fileobj=raw, mode='rb') as gz:
+                    shutil.copyfileobj(gz, dst, HASH_CHUNK_SIZE)
+
+        return dest_path
+
+
+def get_upload_archive() -> UploadArchive:
+    """
+    Build the archive configured in settings.
+
+    Settings:
+        UPLOAD_ARCHIVE_BACKEND: Dotted path of the backend class
+        UPLOAD_ARCHIVE_ROOT: Backend root (local filesystem directory)
+        UPLOAD_ARCHIVE_COMPRESSION: 'auto', 'zstd' or 'gzip'
+    """
+    backend_class = import_string(getattr(
+        settings, 'UPLOAD_ARCHIVE_BACKEND', 'apps.data_upload.storage.LocalArchiveBackend'
+    ))
+    return UploadArchive(
+        backend_class(settings.UPLOAD_ARCHIVE_ROOT),
+        compression=getattr(settings, 'UPLOAD_ARCHIVE_COMPRESSION', 'auto'),
+    )
+
+
+def find_ingested_upload(content_hash: str, sheet_name: Optional[str] = None):
+    """
+    Find the upload of the same content (and worksheet) the data still reflects.
+
+    Only the latest successful upload of its data type counts: after a
+    later upload (in any mode) or a revert, the same file has to be
+    ingested again to restore its data.
+
+    Args:
+        content_hash: SHA-256 digest of the uploaded file
+        sheet_name: Worksheet name for multi-sheet workbook parts
+
+    Returns:
+        Matching UploadHistory, or None
+    """
+    from apps.analytics.models import UploadHistory
+
+    successful = UploadHistory.objects.filter(status='success').order_by('-upload_date', '-id')
+    previous = successful.filter(content_hash=content_hash, sheet_name=sheet_name).first()
+    if previous is None or successful.filter(data_type=previous.data_type).first() != previous:
+        return None
+    return previous
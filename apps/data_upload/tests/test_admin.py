@@ -0,0 +1,187 @@
+"""
+Tests for admin changelist performance.
+
+Test Coverage:
+- Per-page query counts independent of the number of rows
+- Facet choices cached per data version (uploads and admin edits)
+- Estimated counts above ADMIN_FULL_COUNT_THRESHOLD, exact on the last page
+"""
+import os
+import tempfile
+from datetime import date
+from unittest import mock
+
+import pandas as pd
+
+from django.contrib import admin
+from django.core.cache import cache
+from django.core.paginator import EmptyPage
+from django.test import TestCase, override_settings
+
+from apps.analytics.models import ExecutionRecord, ResearchProject, UploadHistory
+from apps.authentication.models import User
+from apps.data_upload import admin as data_admin
+from apps.data_upload.parsers import ResearchBudgetParser
+
+
+class AdminChangelistTestCase(TestCase):
+    """Logged-in admin with research projects and execution records."""
+
+    def setUp(self):
+        cache.clear()
+        self.admin = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.admin.set_password('testpass123')
+        self.admin.save()
+        self.client.force_login(self.admin)
+
+    def create_rows(self, start, projects, records_per_project=3):
+        for p in range(start, start + projects):
+            project = ResearchProject.objects.create(
+                project_number=f'P-{p}', project_name=f'과제 {p}', principal_investigator='김교수',
+                department=f'학과{p % 3}', funding_agency=f'기관{p % 2}', total_budget=1000,
+            )
+            for r in range(records_per_project):
+                ExecutionRecord.objects.create(
+                    execution_id=f'E-{p}-{r}', project=project, execution_date=date(2023, 3, 1),
+                    expense_category='인건비', amount=100, status='집행완료',
+                )
+            UploadHistory.objects.create(
+                user=self.admin, file_name=f'{p}.csv', file_size=1, data_type='research_budget',
+                status='success', rows_processed=1,
+            )
+
+    def count_queries(self, url):
+        from django.db import connection
+        from django.test.utils import CaptureQueriesContext
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+
+class ChangelistQueryCountTest(AdminChangelistTestCase):
+    """Per-page query counts do not grow with the rows shown."""
+
+    def test_execution_record_changelist(self):
+        """Projects are joined instead of fetched per row."""
+        self.create_rows(0, 2)
+        few = self.count_queries('/admin/analytics/executionrecord/')
+        self.create_rows(2, 30)
+        many = self.count_queries('/admin/analytics/executionrecord/')
+
+        self.assertEqual(few, many)
+        self.assertEqual(many, 5)  # Session, user, filtered count, total count, page
+
+    def test_upload_history_changelist(self):
+        """Uploading users are joined instead of fetched per row."""
+        self.create_rows(0, 2)
+        few = self.count_queries('/admin/analytics/uploadhistory/')
+        self.create_rows(2, 30)
+        many = self.count_queries('/admin/analytics/uploadhistory/')
+
+        self.assertEqual(few, many)
+
+    def test_research_project_changelist(self):
+        """Facet choices are read once per data version."""
+        self.create_rows(0, 5)
+
+        with self.assertNumQueries(8):  # + version, 2x SELECT DISTINCT
+            self.client.get('/admin/analytics/researchproject/')
+        with self.assertNumQueries(6):  # + version
+            self.client.get('/admin/analytics/researchproject/')
+
+
+class FacetCacheTest(AdminChangelistTestCase):
+    """Cached facet choices follow the data version."""
+
+    def departments(self):
+        response = self.client.get('/admin/analytics/researchproject/')
+        spec = next(spec for spec in response.context['cl'].filter_specs if spec.field_path == 'department')
+        return list(spec.lookup_choices)
+
+    def test_new_upload_refreshes_choices(self):
+        """A successful upload of the data type invalidates the cache."""
+        self.create_rows(0, 2)
+        self.assertEqual(self.departments(), ['학과0', '학과1'])
+
+        # Rows written without a new version keep the cached choices
+        ResearchProject.objects.filter(project_number='P-0').update(department='신설학과')
+        self.assertEqual(self.departments(), ['학과0', '학과1'])
+
+        with tempfile.TemporaryDirectory() as test_dir:
+            path = os.path.join(test_dir, 'new.csv')
+            pd.DataFrame([{
+                '집행ID': 'E-new', '과제번호': 'P-new', '과제명': '신규 과제', '연구책임자': '김교수',
+                '소속학과': '학과2', '지원기관': '기관0', '총연구비': 1000, '집행일자': '2023-03-01',
+                '집행항목': '인건비', '집행금액': 100, '상태': '집행완료', '비고': None,
+            }]).to_csv(path, index=False, encoding='utf-8-sig')
+            result = ResearchBudgetParser().parse(path, self.admin)
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(self.departments(), ['신설학과', '학과1', '학과2'])
+
+    def test_admin_edit_refreshes_choices(self):
+        """Saving through the admin bumps the data version."""
+        self.create_rows(0, 1)
+        self.assertEqual(self.departments(), ['학과0'])
+        version = data_admin.data_version('research_budget')
+
+        project = ResearchProject.objects.get()
+        response = self.client.post(f'/admin/analytics/researchproject/{project.pk}/change/', {
+            'project_number': 'P-0', 'project_name': '과제 0', 'principal_investigator': '김교수',
+            'department': '변경학과', 'funding_agency': '기관0', 'total_budget': 1000,
+        })
+
+        self.assertEqual(response.status_code, 302)
+        self.assertNotEqual(data_admin.data_version('research_budget'), version)
+        self.assertEqual(self.departments(), ['변경학과'])
+
+
+@override_settings(ADMIN_FULL_COUNT_THRESHOLD=1000)
+class LargeTableCountTest(AdminChangelistTestCase):
+    """Counts of tables above ADMIN_FULL_COUNT_THRESHOLD."""
+
+    def test_large_table_uses_estimate(self):
+        """The unfiltered count comes from the estimate; no full count."""
+        self.create_rows(0, 2)
+
+        with mock.patch.object(data_admin, 'estimated_row_count', return_value=5000):
+            response = self.client.get('/admin/analytics/executionrecord/')
+            filtered = self.client.get('/admin/analytics/executionrecord/?q=E-0')
+
+        self.assertEqual(response.context['cl'].result_count, 5000)
+        self.assertFalse(response.context['cl'].show_full_result_count)
+        self.assertEqual(filtered.context['cl'].result_count, 3)
+        self.assertIsNone(filtered.context['cl'].full_result_count)
+        # The flag is per request; the registered admin is unchanged
+        self.assertTrue(admin.site._registry[ExecutionRecord].show_full_result_count)
+
+    @override_settings(ADMIN_FULL_COUNT_THRESHOLD=2)
+    def test_estimated_last_page_counts_exactly(self):
+        """Pages past an underestimate are reachable; past an overestimate they are rejected."""
+        self.create_rows(0, 2)
+        records = ExecutionRecord.objects.order_by('id')
+
+        with mock.patch.object(data_admin, 'estimated_row_count', return_value=3):
+            paginator = data_admin.EstimatedCountPaginator(records, 2)
+            self.assertEqual(paginator.num_pages, 2)
+            self.assertEqual(len(paginator.page(3)), 2)
+            self.assertEqual((paginator.count, paginator.num_pages), (6, 3))
+
+        with mock.patch.object(data_admin, 'estimated_row_count', return_value=20):
+            paginator = data_admin.EstimatedCountPaginator(records, 2)
+            self.assertEqual(len(paginator.page(2)), 2)
+            self.assertEqual(paginator.count, 20)
+            with self.assertRaises(EmptyPage):
+                paginator.page(10)
+            self.assertEqual(paginator.num_pages, 3)
+
+    def test_small_table_counts_exactly(self):
+        """Tables below the threshold (or without estimates) count exactly."""
+        self.create_rows(0, 2)
+
+        response = self.client.get('/admin/analytics/executionrecord/')
+
+        self.assertEqual(response.context['cl'].result_count, 6)
+        self.assertTrue(response.context['cl'].show_full_result_count)
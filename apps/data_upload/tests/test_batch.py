@@ -0,0 +1,236 @@
+"""
+Tests for batch upload ingestion.
+
+Tests:
+- Expanding zip archives and multi-sheet workbooks into parts
+- Parallel preparation of parts in a reused process pool, or in-process
+- Per-part transactions with one UploadHistory row per part
+- All-or-nothing mode rolling back every part
+"""
+import os
+import shutil
+import tempfile
+import zipfile
+from unittest import mock
+
+import pandas as pd
+from django.test import TestCase, override_settings
+
+from apps.analytics.models import DepartmentKPI, Student, UploadHistory
+from apps.authentication.models import User
+from apps.data_upload import batch
+from apps.data_upload.batch import (
+    UploadPart,
+    expand_upload,
+    ingest_parts,
+    prepare_parts,
+)
+from apps.data_upload.exceptions import MissingColumnError
+from apps.data_upload.parsers import DepartmentKPIParser, StudentParser
+
+
+KPI_ROWS = pd.DataFrame({
+    '평가년도': [2023, 2024],
+    '단과대학': ['공과대학', '공과대학'],
+    '학과': ['컴퓨터공학과', '전자공학과'],
+    '졸업생 취업률 (%)': [85.5, 80.0],
+    '전임교원 수 (명)': [15, 12],
+    '초빙교원 수 (명)': [5, 3],
+    '연간 기술이전 수입액 (억원)': [10.5, 3.0],
+    '국제학술대회 개최 횟수': [2, 1],
+})
+
+STUDENT_ROWS = pd.DataFrame({
+    '학번': ['2023001', '2023002', '2023003'],
+    '이름': ['김철수', '이영희', '박민수'],
+    '단과대학': ['공과대학', '공과대학', '공과대학'],
+    '학과': ['컴퓨터공학과', '컴퓨터공학과', '전자공학과'],
+    '학년': [1, 2, 3],
+    '과정구분': ['학사', '학사', '학사'],
+    '학적상태': ['재학', '휴학', '재학'],
+    '성별': ['남', '여', '남'],
+    '입학년도': [2023, 2022, 2021],
+})
+
+
+def create_admin_user():
+    """Create an active admin user for upload tests."""
+    user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+    user.set_password('testpass123')
+    user.save()
+    return user
+
+
+class BatchUploadTestCase(TestCase):
+    """Shared fixtures for batch upload tests."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.work_dir = tempfile.mkdtemp()
+        self.user = create_admin_user()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.work_dir, ignore_errors=True)
+
+    def write_workbook(self, name, sheets):
+        """Write {sheet_name: DataFrame} to an .xlsx file."""
+        path = os.path.join(self.test_dir, name)
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            for sheet_name, df in sheets.items():
+                df.to_excel(writer, sheet_name=sheet_name, index=False)
+        return path
+
+    def write_csv(self, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+
+class ExpandUploadTest(BatchUploadTestCase):
+    """Test splitting uploads into identified parts."""
+
+    def test_multi_sheet_workbook_yields_part_per_sheet(self):
+        """Each worksheet should be identified separately."""
+        path = self.write_workbook('registrar.xlsx', {
+            'KPI': KPI_ROWS,
+            'Students': STUDENT_ROWS,
+        })
+
+        parts = expand_upload([(path, 'registrar.xlsx')], self.work_dir)
+
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(parts[0].sheet_name, 'KPI')
+        self.assertEqual(parts[0].parser_class, DepartmentKPIParser)
+        self.assertEqual(parts[1].parser_class, StudentParser)
+        self.assertEqual(parts[1].display_name, 'registrar.xlsx [Students]')
+
+    def test_zip_members_are_extracted_and_identified(self):
+        """Supported zip members become parts; other members are skipped."""
+        kpi_csv = self.write_csv('kpi_2023.csv', KPI_ROWS)
+        student_csv = self.write_csv('students.csv', STUDENT_ROWS)
+        zip_path = os.path.join(self.test_dir, 'batch.zip')
+        with zipfile.ZipFile(zip_path, 'w') as archive:
+            archive.write(kpi_csv, 'yearly/kpi_2023.csv')
+            archive.write(student_csv, '../students.csv')
+            archive.writestr('README.txt', 'ignore me')
+
+        parts = expand_upload([(zip_path, 'batch.zip')], self.work_dir)
+
+        self.assertEqual(
+            [part.parser_class for part in parts],
+            [DepartmentKPIParser, StudentParser],
+        )
+        for part in parts:
+            # Member paths never escape the work directory
+            self.assertEqual(os.path.dirname(part.path), self.work_dir)
+
+    def test_unidentified_part_has_no_parser(self):
+        """Unknown headers should produce a part without a parser class."""
+        path = self.write_csv('unknown.csv', pd.DataFrame({'foo': [1], 'bar': [2]}))
+
+        parts = expand_upload([(path, 'unknown.csv')], self.work_dir)
+
+        self.assertEqual(len(parts), 1)
+        self.assertIsNone(parts[0].parser_class)
+
+
+class PreparePartsTest(BatchUploadTestCase):
+    """Test reading/validating parts in a process pool."""
+
+    def test_parallel_prepare_returns_dataframes_and_errors(self):
+        """Results stay aligned with parts; failures are returned, not raised."""
+        kpi_csv = self.write_csv('kpi.csv', KPI_ROWS)
+        broken_csv = self.write_csv('broken.csv', KPI_ROWS[['평가년도', '단과대학']])
+        student_csv = self.write_csv('students.csv', STUDENT_ROWS)
+        parts = [
+            UploadPart(kpi_csv, 'kpi.csv', parser_class=DepartmentKPIParser),
+            UploadPart(broken_csv, 'broken.csv', parser_class=DepartmentKPIParser),
+            UploadPart(student_csv, 'students.csv', parser_class=StudentParser),
+        ]
+
+        results = prepare_parts(parts, max_workers=2)
+
+        self.assertEqual(len(results[0]), 2)
+        self.assertIsInstance(results[1], MissingColumnError)
+        self.assertEqual(len(results[2]), 3)
+
+        self.assertIs(batch._get_pool(2), batch._get_pool(2))
+
+    @override_settings(UPLOAD_PARSE_WORKERS=1)
+    def test_single_worker_prepares_in_process(self):
+        """With one worker no process pool is started."""
+        parts = [
+            UploadPart(self.write_csv('kpi.csv', KPI_ROWS), 'kpi.csv', parser_class=DepartmentKPIParser),
+            UploadPart(self.write_csv('students.csv', STUDENT_ROWS), 'students.csv', parser_class=StudentParser),
+        ]
+
+        with mock.patch.object(batch, '_get_pool') as get_pool:
+            results = prepare_parts(parts)
+
+        get_pool.assert_not_called()
+        self.assertEqual([len(df) for df in results], [2, 3])
+
+
+class IngestPartsTest(BatchUploadTestCase):
+    """Test saving batch parts with per-part UploadHistory rows."""
+
+    def test_per_part_transactions_keep_successful_parts(self):
+        """A failing part should not roll back the other parts."""
+        path = self.write_workbook('registrar.xlsx', {
+            'KPI': KPI_ROWS,
+            'Students': STUDENT_ROWS,
+            'Broken': STUDENT_ROWS.drop(columns=['입학년도']),
+        })
+        parts = expand_upload([(path, 'registrar.xlsx')], self.work_dir)
+
+        results = ingest_parts(parts, self.user, atomic=False, max_workers=1)
+
+        self.assertEqual([r['success'] for r in results], [True, True, False])
+        self.assertEqual(DepartmentKPI.objects.count(), 2)
+        self.assertEqual(Student.objects.count(), 3)
+
+        history = UploadHistory.objects.order_by('id')
+        self.assertEqual(
+            [(h.file_name, h.status) for h in history],
+            [
+                ('registrar.xlsx [KPI]', 'success'),
+                ('registrar.xlsx [Students]', 'success'),
+                ('registrar.xlsx [Broken]', 'failed'),
+            ],
+        )
+        self.assertEqual(history[1].rows_processed, 3)
+
+    def test_all_or_nothing_rolls_back_every_part(self):
+        """In atomic mode one failing part cancels the whole batch."""
+        path = self.write_workbook('registrar.xlsx', {
+            'KPI': KPI_ROWS,
+            'Broken': STUDENT_ROWS.drop(columns=['입학년도']),
+        })
+        parts = expand_upload([(path, 'registrar.xlsx')], self.work_dir)
+
+        results = ingest_parts(parts, self.user, atomic=True, max_workers=1)
+
+        self.assertFalse(any(r['success'] for r in results))
+        self.assertIn('registrar.xlsx [Broken]', results[0]['error_message'])
+        self.assertEqual(DepartmentKPI.objects.count(), 0)
+        self.assertEqual(
+            list(UploadHistory.objects.values_list('status', flat=True)),
+            ['failed', 'failed'],
+        )
+
+    def test_all_or_nothing_commits_when_every_part_succeeds(self):
+        """In atomic mode a clean batch is saved with one history row per part."""
+        kpi_csv = self.write_csv('kpi.csv', KPI_ROWS)
+        student_csv = self.write_csv('students.csv', STUDENT_ROWS)
+
+        parts = expand_upload(
+            [(kpi_csv, 'kpi.csv'), (student_csv, 'students.csv')],
+            self.work_dir,
+        )
+        results = ingest_parts(parts, self.user, atomic=True, max_workers=1)
+
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(DepartmentKPI.objects.count(), 2)
+        self.assertEqual(Student.objects.count(), 3)
+        self.assertEqual(UploadHistory.objects.filter(status='success').count(), 2)
@@ -0,0 +1,201 @@
+"""
+Tests for resumable chunked uploads.
+
+Test Coverage:
+- init, chunks and finalize ingest a file like a form upload
+- Chunks at the wrong offset or with a wrong checksum are rejected
+  without advancing the offset, and the upload resumes from there
+- Uploads are private to their user and admin only
+- Incomplete uploads cannot be finalized
+- Size limit and extension checks, expiry of idle uploads
+"""
+import hashlib
+import io
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from django.test import TestCase, override_settings
+
+from apps.analytics.models import Publication, UploadHistory
+from apps.analytics.tests.factories import publication_rows
+from apps.authentication.models import User
+from apps.data_upload.chunked import ChunkedUpload, purge_expired_uploads
+from apps.data_upload.exceptions import ChunkedUploadError
+from apps.data_upload.parsers import BaseParser
+
+CHUNK_SIZE = 64
+
+
+def sha256(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ChunkedUploadTest(TestCase):
+    """Test the chunked upload API."""
+
+    def setUp(self):
+        self.chunk_root = tempfile.mkdtemp()
+        self.archive_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(
+            CHUNKED_UPLOAD_ROOT=self.chunk_root,
+            CHUNKED_UPLOAD_CHUNK_SIZE=CHUNK_SIZE,
+            UPLOAD_ARCHIVE_ROOT=self.archive_root,
+        )
+        self.settings_override.enable()
+
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+        self.client.force_login(self.user)
+
+        self.data = publication_rows([
+            ('P1', '2023-03-01', '김교수'), ('P2', '2023-04-01', '이교수'), ('P3', '2023-05-01', '최교수'),
+        ]).to_csv(index=False).encode('utf-8-sig')
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.chunk_root, ignore_errors=True)
+        shutil.rmtree(self.archive_root, ignore_errors=True)
+
+    def init(self, file_name='publications.csv', file_size=None):
+        return self.client.post('/data/upload/chunked/', json.dumps({
+            'file_name': file_name,
+            'file_size': len(self.data) if file_size is None else file_size,
+        }), content_type='application/json')
+
+    def put(self, upload_id, offset, chunk, digest=None):
+        return self.client.put(
+            f'/data/upload/chunked/{upload_id}/?offset={offset}', chunk,
+            content_type='application/octet-stream',
+            HTTP_X_CHUNK_SHA256=digest or sha256(chunk),
+        )
+
+    def send_all(self, upload_id, start=0):
+        for offset in range(start, len(self.data), CHUNK_SIZE):
+            response = self.put(upload_id, offset, self.data[offset:offset + CHUNK_SIZE])
+            self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    def finalize(self, *upload_ids, **options):
+        return self.client.post('/data/upload/chunked/finalize/', json.dumps({
+            'upload_ids': list(upload_ids), **options,
+        }), content_type='application/json')
+
+    def test_upload_is_ingested(self):
+        response = self.init()
+        self.assertEqual(response.status_code, 201)
+        upload_id = response.json()['upload_id']
+        self.assertEqual(response.json()['chunk_size'], CHUNK_SIZE)
+
+        self.assertEqual(self.send_all(upload_id).json(), {'offset': len(self.data), 'file_size': len(self.data)})
+        response = self.finalize(upload_id)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'redirect': '/dashboard/'})
+        self.assertEqual(sorted(Publication.objects.values_list('publication_id', flat=True)), ['P1', 'P2', 'P3'])
+        history = UploadHistory.objects.get()
+        self.assertEqual((history.file_name, history.file_size), ('publications.csv', len(self.data)))
+        self.assertEqual(os.listdir(self.chunk_root), [])
+
+    def test_wrong_offset_is_rejected(self):
+        upload_id = self.init().json()['upload_id']
+        self.put(upload_id, 0, self.data[:CHUNK_SIZE])
+
+        response = self.put(upload_id, 2 * CHUNK_SIZE, self.data[2 * CHUNK_SIZE:3 * CHUNK_SIZE])
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], CHUNK_SIZE)
+
+    def test_checksum_mismatch_keeps_offset(self):
+        upload_id = self.init().json()['upload_id']
+        chunk = self.data[:CHUNK_SIZE]
+
+        response = self.put(upload_id, 0, chunk, digest=sha256(b'other'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['offset'], 0)
+        upload = ChunkedUpload.load(upload_id, self.user)
+        self.assertEqual(os.path.getsize(upload.data_path), 0)
+
+    def test_upload_resumes_from_verified_offset(self):
+        """A cut-off chunk is dropped; the client continues from the status offset."""
+        upload_id = self.init().json()['upload_id']
+        self.put(upload_id, 0, self.data[:CHUNK_SIZE])
+        upload = ChunkedUpload.load(upload_id, self.user)
+        with open(upload.data_path, 'ab') as f:
+            f.write(self.data[CHUNK_SIZE:CHUNK_SIZE + 10])  # Partial write of a failed request
+
+        offset = self.client.get(f'/data/upload/chunked/{upload_id}/').json()['offset']
+        self.assertEqual(offset, CHUNK_SIZE)
+        self.send_all(upload_id, start=offset)
+        self.finalize(upload_id)
+
+        self.assertEqual(Publication.objects.count(), 3)
+        self.assertEqual(UploadHistory.objects.get().file_size, len(self.data))
+
+    def test_incomplete_upload_cannot_be_finalized(self):
+        upload_id = self.init().json()['upload_id']
+        self.put(upload_id, 0, self.data[:CHUNK_SIZE])
+
+        response = self.finalize(upload_id)
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['offset'], CHUNK_SIZE)
+        self.assertFalse(Publication.objects.exists())
+
+    def test_repeated_upload_id_is_rejected(self):
+        upload_id = self.init().json()['upload_id']
+        self.send_all(upload_id)
+
+        response = self.finalize(upload_id, upload_id)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Publication.objects.exists())
+        self.assertEqual(self.finalize(upload_id).status_code, 200)
+        self.assertEqual(Publication.objects.count(), 3)
+
+    def test_uploads_are_private(self):
+        upload_id = self.init().json()['upload_id']
+        other = User(email='other@test.com', name='다른관리자', role='admin', status='active')
+        other.set_password('testpass123')
+        other.save()
+        self.client.force_login(other)
+
+        self.assertEqual(self.client.get(f'/data/upload/chunked/{upload_id}/').status_code, 404)
+        self.assertEqual(self.put(upload_id, 0, self.data[:CHUNK_SIZE]).status_code, 404)
+        self.assertEqual(self.finalize(upload_id).status_code, 404)
+
+    def test_admin_only(self):
+        manager = User(email='manager@test.com', name='매니저', role='manager', status='active')
+        manager.set_password('testpass123')
+        manager.save()
+        self.client.force_login(manager)
+
+        self.assertEqual(self.init().status_code, 403)
+
+    def test_size_and_extension_limits(self):
+        response = self.init(file_size=BaseParser.MAX_FILE_SIZE + 1)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('exceeds maximum allowed size', response.json()['error'])
+
+        response = self.init(file_name='notes.txt')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('Invalid file format', response.json()['error'])
+
+    def test_chunk_past_file_size_is_rejected(self):
+        upload = ChunkedUpload.create(self.user, 'publications.csv', 10)
+
+        with self.assertRaisesMessage(ChunkedUploadError, 'past the announced file size'):
+            upload.write_chunk(0, io.BytesIO(b'x' * 11), 11, sha256(b'x' * 11))
+
+    def test_expired_uploads_are_purged(self):
+        old = ChunkedUpload.create(self.user, 'old.csv', 100)
+        recent = ChunkedUpload.create(self.user, 'recent.csv', 100)
+        stale = time.time() - 25 * 3600
+        os.utime(os.path.join(old.directory, 'meta.json'), (stale, stale))
+
+        self.assertEqual(purge_expired_uploads(), 1)
+        self.assertEqual(os.listdir(self.chunk_root), [recent.upload_id])
@@ -0,0 +1,272 @@
+"""
+Tests for incremental upload diffing.
+
+Tests:
+- Row key / row hash construction
+- Fingerprints recorded on regular uploads
+- Incremental uploads writing only inserted/changed/deleted rows, diffed
+  through a temporary key table
+- Rows without fingerprints (older data, admin edits) rewritten once
+- Diff summary attached to UploadHistory
+"""
+import os
+import shutil
+import tempfile
+from decimal import Decimal
+
+import pandas as pd
+from django.contrib import admin
+from django.db import DatabaseError, connection, transaction
+from django.test import TestCase
+
+from apps.analytics.models import DepartmentKPI, Student, UploadFingerprint, UploadHistory
+from apps.authentication.models import User
+from apps.data_upload.diffing import UPLOAD_KEY_TABLE, build_row_hashes, build_row_keys
+from apps.data_upload.parsers import DepartmentKPIParser, StudentParser
+
+
+def student_rows(rows):
+    """Build a student upload DataFrame from (학번, 이름, 학적상태) tuples."""
+    return pd.DataFrame({
+        '학번': [r[0] for r in rows],
+        '이름': [r[1] for r in rows],
+        '단과대학': ['공과대학'] * len(rows),
+        '학과': ['컴퓨터공학과'] * len(rows),
+        '학년': [1] * len(rows),
+        '과정구분': ['학사'] * len(rows),
+        '학적상태': [r[2] for r in rows],
+        '성별': ['남'] * len(rows),
+        '입학년도': [2023] * len(rows),
+    })
+
+
+class RowKeyHashTest(TestCase):
+    """Test key and hash helpers."""
+
+    def test_composite_keys_normalize_numeric_columns(self):
+        """2023 and 2023.0 should produce the same key."""
+        ints = pd.DataFrame({'평가년도': [2023], '학과': ['컴퓨터공학과']})
+        floats = pd.DataFrame({'평가년도': [2023.0], '학과': ['컴퓨터공학과']})
+
+        self.assertEqual(
+            build_row_keys(ints, ['평가년도', '학과']).iloc[0],
+            build_row_keys(floats, ['평가년도', '학과']).iloc[0],
+        )
+        self.assertEqual(build_row_keys(ints, ['평가년도', '학과']).iloc[0], '2023|컴퓨터공학과')
+
+    def test_row_hash_ignores_column_order(self):
+        """Reordered columns should hash identically."""
+        df = student_rows([('2023001', '김철수', '재학')])
+
+        self.assertEqual(
+            build_row_hashes(df).iloc[0],
+            build_row_hashes(df[list(reversed(df.columns))]).iloc[0],
+        )
+
+    def test_row_hash_ignores_number_dtype(self):
+        """Integral values hash the same as int, float and Decimal; empty cells differ from 0."""
+        ints = pd.DataFrame({'학년': [3], '입학년도': [2023]})
+        floats = pd.DataFrame({'학년': [3.0], '입학년도': [Decimal('2023.00')]})
+
+        self.assertEqual(build_row_hashes(ints).iloc[0], build_row_hashes(floats).iloc[0])
+        self.assertNotEqual(
+            build_row_hashes(pd.DataFrame({'학년': [0.0]})).iloc[0],
+            build_row_hashes(pd.DataFrame({'학년': [None]}, dtype=float)).iloc[0],
+        )
+
+
+class IncrementalUploadTest(TestCase):
+    """Test diff-based ingest against stored fingerprints."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def write_csv(self, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+    def test_regular_upload_records_fingerprints(self):
+        """Full uploads keep the fingerprint table in sync."""
+        path = self.write_csv('students.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023002', '이영희', '재학'),
+        ]))
+
+        result = StudentParser().parse(path, self.user)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(
+            set(UploadFingerprint.objects.filter(data_type='student').values_list('row_key', flat=True)),
+            {'2023001', '2023002'},
+        )
+
+    def test_incremental_upload_writes_only_changes(self):
+        """Inserted, changed and deleted rows are applied; unchanged rows untouched."""
+        first = self.write_csv('students_jan.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023002', '이영희', '재학'),
+            ('2023003', '박민수', '재학'),
+        ]))
+        StudentParser().parse(first, self.user)
+        unchanged_pk = Student.objects.get(student_number='2023001').pk
+
+        second = self.write_csv('students_feb.csv', student_rows([
+            ('2023001', '김철수', '재학'),   # unchanged
+            ('2023002', '이영희', '휴학'),   # changed
+            ('2023004', '최지우', '재학'),   # inserted; 2023003 deleted
+        ]))
+        result = StudentParser(incremental=True).parse(second, self.user)
+
+        self.assertTrue(result['success'])
+        self.assertEqual(result['rows_processed'], 2)
+        self.assertEqual(
+            result['diff_summary'],
+            {'inserted': 1, 'changed': 1, 'deleted': 1, 'unchanged': 1},
+        )
+        self.assertEqual(
+            set(Student.objects.values_list('student_number', flat=True)),
+            {'2023001', '2023002', '2023004'},
+        )
+        self.assertEqual(Student.objects.get(student_number='2023002').enrollment_status, '휴학')
+        self.assertEqual(Student.objects.get(student_number='2023001').pk, unchanged_pk)
+
+        history = UploadHistory.objects.get(file_name='students_feb.csv')
+        self.assertEqual(history.diff_summary['changed'], 1)
+        self.assertEqual(UploadFingerprint.objects.filter(data_type='student').count(), 3)
+
+    def test_incremental_upload_of_same_file_is_noop(self):
+        """Re-uploading an identical snapshot writes nothing."""
+        path = self.write_csv('students.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+        ]))
+        StudentParser().parse(path, self.user)
+
+        result = StudentParser(incremental=True).parse(path, self.user)
+
+        self.assertEqual(result['rows_processed'], 0)
+        self.assertEqual(result['diff_summary']['unchanged'], 1)
+        self.assertEqual(Student.objects.count(), 1)
+
+    def test_blank_number_in_new_row_keeps_others_unchanged(self):
+        """A new row with an empty number cell (int column read as float) changes no other row."""
+        StudentParser().parse(self.write_csv('students.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023002', '이영희', '재학'),
+        ])), self.user)
+
+        df = student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023002', '이영희', '재학'),
+            ('2023003', '박민수', '재학'),
+        ])
+        df['학년'] = [1, 1, None]
+        result = StudentParser(incremental=True).parse(self.write_csv('students_feb.csv', df), self.user)
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(
+            result['diff_summary'],
+            {'inserted': 1, 'changed': 0, 'deleted': 0, 'unchanged': 2},
+        )
+
+    def test_incremental_kpi_uses_composite_key(self):
+        """KPI rows are keyed by 평가년도 + 단과대학 + 학과."""
+        kpi = pd.DataFrame({
+            '평가년도': [2023, 2024],
+            '단과대학': ['공과대학', '공과대학'],
+            '학과': ['컴퓨터공학과', '컴퓨터공학과'],
+            '졸업생 취업률 (%)': [85.5, 86.0],
+            '전임교원 수 (명)': [15, 15],
+            '초빙교원 수 (명)': [5, 5],
+            '연간 기술이전 수입액 (억원)': [10.5, 11.0],
+            '국제학술대회 개최 횟수': [2, 2],
+        })
+        DepartmentKPIParser().parse(self.write_csv('kpi.csv', kpi), self.user)
+
+        kpi.loc[1, '졸업생 취업률 (%)'] = 90.0
+        result = DepartmentKPIParser(incremental=True).parse(
+            self.write_csv('kpi_fixed.csv', kpi), self.user
+        )
+
+        self.assertEqual(result['diff_summary']['changed'], 1)
+        self.assertEqual(DepartmentKPI.objects.count(), 2)
+        self.assertEqual(
+            float(DepartmentKPI.objects.get(evaluation_year=2024).employment_rate), 90.0
+        )
+
+    def test_key_table_is_dropped(self):
+        """The temporary key table only lives for the diff."""
+        path = self.write_csv('students.csv', student_rows([('2023001', '김철수', '재학')]))
+        StudentParser(incremental=True).parse(path, self.user)
+
+        with self.assertRaises(DatabaseError), transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(f'SELECT 1 FROM {UPLOAD_KEY_TABLE}')
+
+    def test_incremental_upload_rejects_duplicate_keys(self):
+        """Duplicate keys inside one file fail the upload."""
+        path = self.write_csv('students.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023001', '김철수', '휴학'),
+        ]))
+
+        result = StudentParser(incremental=True).parse(path, self.user)
+
+        self.assertFalse(result['success'])
+        self.assertIn('2023001', result['error_message'])
+        self.assertEqual(Student.objects.count(), 0)
+
+    def test_incremental_upload_over_rows_without_fingerprints(self):
+        """Rows loaded before fingerprints existed are replaced, not inserted twice."""
+        path = self.write_csv('students.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023002', '이영희', '재학'),
+        ]))
+        StudentParser().parse(path, self.user)
+        UploadFingerprint.objects.all().delete()
+
+        result = StudentParser(incremental=True).parse(self.write_csv('students_feb.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023003', '박민수', '재학'),
+        ])), self.user)
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(
+            result['diff_summary'],
+            {'inserted': 1, 'changed': 1, 'deleted': 1, 'unchanged': 0},
+        )
+        self.assertEqual(
+            set(Student.objects.values_list('student_number', flat=True)), {'2023001', '2023003'},
+        )
+        self.assertEqual(
+            set(UploadFingerprint.objects.values_list('row_key', flat=True)), {'2023001', '2023003'},
+        )
+
+    def test_admin_edits_are_overwritten_by_next_incremental_upload(self):
+        """Admin saves and deletes drop fingerprints, so the file is applied again."""
+        path = self.write_csv('students.csv', student_rows([
+            ('2023001', '김철수', '재학'),
+            ('2023002', '이영희', '재학'),
+        ]))
+        StudentParser().parse(path, self.user)
+        student_admin = admin.site._registry[Student]
+
+        edited = Student.objects.get(student_number='2023001')
+        edited.enrollment_status = '휴학'
+        student_admin.save_model(None, edited, None, True)
+        student_admin.delete_model(None, Student.objects.get(student_number='2023002'))
+        self.assertFalse(UploadFingerprint.objects.exists())
+
+        result = StudentParser(incremental=True).parse(path, self.user)
+
+        self.assertEqual(
+            result['diff_summary'],
+            {'inserted': 1, 'changed': 1, 'deleted': 0, 'unchanged': 0},
+        )
+        self.assertEqual(Student.objects.get(student_number='2023001').enrollment_status, '재학')
+        self.assertTrue(Student.objects.filter(student_number='2023002').exists())
@@ -0,0 +1,108 @@
+"""
+Tests for compact upload dtypes.
+
+Test Coverage:
+- Categorical columns strip (and merge) their categories
+- Text columns strip strings and keep other values
+- Integer columns are downcast, float and nullable columns are kept
+- Parsers read COLUMN_DTYPES and clean in place
+- Row keys and hashes match those of inferred dtypes
+"""
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+from django.test import SimpleTestCase
+
+from apps.data_upload.diffing import build_row_hashes, build_row_keys
+from apps.data_upload.dtypes import compact_frame, strip_categories, strip_strings
+from apps.data_upload.parsers import StudentParser
+
+
+def student_frame():
+    return pd.DataFrame({
+        '학번': ['0023001', '2023002', '2023003'],
+        '이름': [' 김철수', '이영희 ', '박민수'],
+        '단과대학': ['공과대학', ' 공과대학', '자연과학대학'],
+        '학과': ['컴퓨터공학과', '컴퓨터공학과', '수학과'],
+        '학년': [1, 2, 3],
+        '과정구분': ['학사', None, '학사'],
+        '학적상태': ['재학', '재학', '휴학'],
+        '성별': ['남', '여', '남'],
+        '입학년도': [2023, 2022, 2021],
+    })
+
+
+class CompactFrameTest(SimpleTestCase):
+    """Test the column-wise cleaning helpers."""
+
+    def test_strip_categories_merges_equal_values(self):
+        series = pd.Series(['공과대학', ' 공과대학 ', None, '수학과 '], dtype='category')
+
+        stripped = strip_categories(series)
+
+        self.assertEqual(stripped.tolist()[:2], ['공과대학', '공과대학'])
+        self.assertTrue(pd.isna(stripped.iloc[2]))
+        self.assertEqual(stripped.iloc[3], '수학과')
+        self.assertEqual(sorted(stripped.cat.categories), ['공과대학', '수학과'])
+
+    def test_strip_strings_keeps_non_strings(self):
+        series = pd.Series([' a ', 7, None], dtype=object)
+
+        self.assertEqual(strip_strings(series).tolist(), ['a', 7, None])
+
+    def test_integers_are_downcast(self):
+        df = pd.DataFrame({
+            '학년': [1, 2, 3],
+            '입학년도': [2023, 2022, 2021],
+            '취업률': [85.5, 90.0, 78.3],
+            '전임교원': [10, None, 12],
+        })
+
+        cleaned = compact_frame(df)
+
+        self.assertIs(cleaned, df)
+        self.assertEqual(cleaned['학년'].dtype, np.int8)
+        self.assertEqual(cleaned['입학년도'].dtype, np.int16)
+        self.assertEqual(cleaned['취업률'].dtype, np.float64)
+        self.assertEqual(cleaned['전임교원'].dtype, np.float64)
+
+
+class ParserDtypesTest(SimpleTestCase):
+    """Test typed reads in the parsers."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'students.csv')
+        student_frame().to_csv(self.path, index=False, encoding='utf-8-sig')
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_read_file_uses_column_dtypes(self):
+        df = StudentParser().prepare(self.path)
+
+        self.assertEqual(df['학번'].tolist(), ['0023001', '2023002', '2023003'])
+        self.assertIsInstance(df['학과'].dtype, pd.CategoricalDtype)
+        self.assertEqual(sorted(df['단과대학'].cat.categories), ['공과대학', '자연과학대학'])
+        self.assertEqual(df['이름'].tolist(), ['김철수', '이영희', '박민수'])
+        self.assertEqual(df['입학년도'].dtype, np.int16)
+
+    def test_keys_and_hashes_match_inferred_dtypes(self):
+        """Fingerprints of earlier uploads stay valid."""
+        student_frame().assign(학번=['2023001', '2023002', '2023003']).to_csv(
+            self.path, index=False, encoding='utf-8-sig'
+        )
+        inferred = pd.read_csv(self.path, encoding='utf-8-sig')
+        for column in inferred.columns:
+            if inferred[column].dtype == object:
+                inferred[column] = inferred[column].apply(lambda x: x.strip() if isinstance(x, str) else x)
+
+        compact = StudentParser().prepare(self.path)
+
+        self.assertEqual(
+            build_row_keys(compact, ['학번']).tolist(), build_row_keys(inferred, ['학번']).tolist()
+        )
+        self.assertEqual(build_row_hashes(compact).tolist(), build_row_hashes(inferred).tolist())
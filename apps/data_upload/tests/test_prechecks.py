@@ -0,0 +1,151 @@
+"""
+Tests for the upload uniqueness pre-check.
+
+Test Coverage:
+- In-file duplicate keys, single and composite
+- Keys already stored are found with batched queries
+- One report lists every conflicting key
+- Parsers reject conflicts before building model instances
+"""
+import os
+import shutil
+import tempfile
+from unittest import mock
+
+import pandas as pd
+from django.test import TestCase
+
+from apps.analytics.models import DepartmentKPI, Publication, Student
+from apps.analytics.tests.factories import publication_rows
+from apps.authentication.models import User
+from apps.data_upload import prechecks
+from apps.data_upload.exceptions import DuplicateDataError
+from apps.data_upload.parsers import DepartmentKPIParser, PublicationParser, StudentParser
+from apps.data_upload.prechecks import KeyConflicts, check_unique_keys, find_duplicate_keys, find_existing_keys
+
+
+def kpi_rows(rows):
+    """Build a KPI upload DataFrame from (평가년도, 학과) tuples."""
+    return pd.DataFrame({
+        '평가년도': [r[0] for r in rows],
+        '단과대학': ['공과대학'] * len(rows),
+        '학과': [r[1] for r in rows],
+        '졸업생 취업률 (%)': [80.0] * len(rows),
+        '전임교원 수 (명)': [10] * len(rows),
+        '초빙교원 수 (명)': [2] * len(rows),
+        '연간 기술이전 수입액 (억원)': [1.5] * len(rows),
+        '국제학술대회 개최 횟수': [1] * len(rows),
+    })
+
+
+class FindKeyConflictsTest(TestCase):
+    """Test the pre-check helpers."""
+
+    def test_find_duplicate_keys(self):
+        keys = pd.Series(['P1', 'P2', 'P3', 'P2', 'P1', 'P2'])
+
+        self.assertEqual(find_duplicate_keys(keys), ['P2', 'P1'])
+        self.assertEqual(find_duplicate_keys(pd.Series(['P1', 'P2'])), [])
+
+    def test_find_existing_keys_in_batches(self):
+        for number in ['2023001', '2023002', '2023003']:
+            Student.objects.create(
+                student_number=number, name='학생', college='공과대학', department='컴퓨터공학과',
+                enrollment_status='재학', admission_year=2023,
+            )
+        keys = pd.Series(['2023003', '2023001', '2023009'])
+
+        with mock.patch.object(prechecks, 'EXISTING_KEY_BATCH_SIZE', 2):
+            self.assertEqual(find_existing_keys(StudentParser(), keys), ['2023001', '2023003'])
+
+    def test_find_existing_composite_keys(self):
+        DepartmentKPI.objects.create(evaluation_year=2023, college='공과대학', department='컴퓨터공학과')
+        DepartmentKPI.objects.create(evaluation_year=2024, college='공과대학', department='기계공학과')
+        keys = pd.Series(['2023|공과대학|컴퓨터공학과', '2023|공과대학|기계공학과'])
+
+        self.assertEqual(find_existing_keys(DepartmentKPIParser(), keys), ['2023|공과대학|컴퓨터공학과'])
+
+    def test_find_existing_composite_keys_over_several_batches(self):
+        """More composite keys than one batch (SQLite caps the OR expression depth at 1000)."""
+        DepartmentKPI.objects.create(evaluation_year=2023, college='공과대학', department='학과0')
+        DepartmentKPI.objects.create(evaluation_year=2024, college='공과대학', department='학과1499')
+        keys = pd.Series([
+            f'{year}|공과대학|학과{number}' for number in range(1500) for year in (2023, 2024)
+        ])
+
+        self.assertEqual(
+            find_existing_keys(DepartmentKPIParser(), keys),
+            ['2023|공과대학|학과0', '2024|공과대학|학과1499'],
+        )
+
+    def test_report_lists_all_conflicts(self):
+        Publication.objects.create(
+            publication_id='P9', publication_date='2023-01-01', college='공과대학',
+            department='컴퓨터공학과', title='논문', first_author='김교수', journal_name='Journal',
+        )
+        df = publication_rows([
+            ('P1', '2023-03-01', '김교수'), ('P1', '2023-03-01', '김교수'), ('P9', '2023-03-01', '이교수'),
+        ])
+
+        with self.assertRaises(DuplicateDataError) as raised:
+            check_unique_keys(PublicationParser(), df)
+
+        self.assertEqual(
+            str(raised.exception), 'Duplicate keys in file (1): P1; Keys already uploaded (1): P9'
+        )
+
+    def test_report_is_truncated(self):
+        conflicts = KeyConflicts(in_file=[f'P{i}' for i in range(25)], existing=[])
+
+        self.assertTrue(conflicts.message().endswith('P19 (+5 more)'))
+        self.assertFalse(KeyConflicts(in_file=[], existing=[]))
+
+
+class ParserPrecheckTest(TestCase):
+    """Test the pre-check in the upload pipeline."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def upload(self, parser, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return parser.parse(path, self.user)
+
+    def test_in_file_duplicates_fail_before_save(self):
+        df = kpi_rows([(2023, '컴퓨터공학과'), (2023, '컴퓨터공학과'), (2024, '컴퓨터공학과')])
+
+        with mock.patch.object(DepartmentKPIParser, 'save') as save:
+            result = self.upload(DepartmentKPIParser(), 'kpi.csv', df)
+
+        self.assertFalse(result['success'])
+        self.assertIn('2023|공과대학|컴퓨터공학과', result['error_message'])
+        save.assert_not_called()
+
+    def test_stored_keys_fail_plain_upload(self):
+        self.upload(PublicationParser(), 'p1.csv', publication_rows([('P1', '2023-03-01', '김교수')]))
+
+        with mock.patch.object(PublicationParser, 'save') as save:
+            result = self.upload(PublicationParser(), 'p2.csv', publication_rows([
+                ('P1', '2023-03-01', '김교수'), ('P2', '2023-04-01', '이교수'),
+            ]))
+
+        self.assertFalse(result['success'])
+        self.assertEqual(result['error_message'], 'Keys already uploaded (1): P1')
+        save.assert_not_called()
+
+    def test_stored_keys_are_allowed_in_incremental_upload(self):
+        self.upload(PublicationParser(), 'p1.csv', publication_rows([('P1', '2023-03-01', '김교수')]))
+
+        result = self.upload(PublicationParser(incremental=True), 'p2.csv', publication_rows([
+            ('P1', '2023-03-01', '김교수'), ('P2', '2023-04-01', '이교수'),
+        ]))
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(Publication.objects.count(), 2)
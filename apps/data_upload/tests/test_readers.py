@@ -0,0 +1,125 @@
+"""
+Tests for the upload reader engines.
+
+Test Coverage:
+- Installed engines are tried fastest first, falling back on failure
+- Header and sheet-name reads use capable engines only
+- Every installed CSV/XLSX engine gives the same values and row hashes
+"""
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import pandas as pd
+from django.test import SimpleTestCase
+
+from apps.analytics.tests.factories import publication_rows
+from apps.data_upload import readers
+from apps.data_upload.diffing import build_row_hashes
+from apps.data_upload.dtypes import compact_frame, read_dtypes
+from apps.data_upload.parsers import PublicationParser, ResearchBudgetParser, StudentParser
+from apps.data_upload.readers import (
+    ReaderEngine,
+    available_engines,
+    read_header,
+    read_sheet_names,
+    read_table,
+)
+from apps.data_upload.tests.test_dtypes import student_frame
+from apps.data_upload.tests.test_revert import budget_rows
+
+
+def failing_read(path, sheet_name, nrows, dtype):
+    raise ValueError('engine failure')
+
+
+class ReaderEngineSelectionTest(SimpleTestCase):
+    """Test engine order and fallback."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.test_dir, 'data.csv')
+        pd.DataFrame({'학번': ['0023001'], '학과': ['수학과']}).to_csv(self.path, index=False)
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def test_missing_engines_are_skipped(self):
+        with mock.patch.object(readers, 'is_installed', side_effect=lambda module: module != 'python_calamine'):
+            self.assertEqual([e.name for e in available_engines('.XLSX')], ['openpyxl'])
+            self.assertEqual([e.name for e in available_engines('.xls')], ['xlrd'])
+
+    def test_falls_back_to_next_engine(self):
+        engines = [ReaderEngine('broken', ('.csv',), 'pandas', failing_read), readers.get_engine('c')]
+
+        with mock.patch.object(readers, 'ENGINES', engines), self.assertLogs(readers.logger, 'WARNING'):
+            df = read_table(self.path, dtype={'학번': str})
+
+        self.assertEqual(df['학번'].tolist(), ['0023001'])
+
+    def test_last_engine_error_is_raised(self):
+        engines = [ReaderEngine('broken', ('.csv',), 'pandas', failing_read)]
+
+        with mock.patch.object(readers, 'ENGINES', engines), self.assertRaisesMessage(ValueError, 'engine failure'):
+            read_table(self.path)
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            read_table(os.path.join(self.test_dir, 'data.txt'))
+
+    def test_header_read_skips_full_read_engines(self):
+        engines = [ReaderEngine('full', ('.csv',), 'pandas', failing_read, reads_header=False),
+                   readers.get_engine('c')]
+
+        with mock.patch.object(readers, 'ENGINES', engines):
+            self.assertEqual(read_header(self.path), ['학번', '학과'])
+
+    def test_sheet_names(self):
+        path = os.path.join(self.test_dir, 'data.xlsx')
+        with pd.ExcelWriter(path, engine='openpyxl') as writer:
+            pd.DataFrame({'a': [1]}).to_excel(writer, sheet_name='2023', index=False)
+            pd.DataFrame({'a': [1]}).to_excel(writer, sheet_name='2024', index=False)
+
+        self.assertEqual(read_sheet_names(path), ['2023', '2024'])
+
+
+class ReaderEngineParityTest(SimpleTestCase):
+    """Every installed engine reads upload files the same way."""
+
+    FILES = [
+        (StudentParser, student_frame()),
+        (PublicationParser, publication_rows([('P1', '2023-03-01', '김교수'), ('P2', '2023-04-01', ' 이교수')])),
+        (ResearchBudgetParser, budget_rows([('E1', 'R1', '2023-03-02'), ('E2', 'R1', '2023-04-02')])),
+    ]
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def assert_engines_agree(self, ext, write):
+        engines = [engine.name for engine in available_engines(ext)]
+        if len(engines) < 2:
+            raise unittest.SkipTest(f'Only {engines} installed for {ext}')
+
+        for parser_class, df in self.FILES:
+            path = os.path.join(self.test_dir, f'{parser_class.DATA_TYPE}{ext}')
+            write(df, path)
+            dtype = read_dtypes(parser_class.COLUMN_DTYPES)
+            frames = {name: compact_frame(read_table(path, dtype=dtype, engine=name)) for name in engines}
+
+            reference = frames[engines[-1]]
+            for name, frame in frames.items():
+                with self.subTest(parser=parser_class.__name__, engine=name):
+                    self.assertEqual(list(frame.columns), list(reference.columns))
+                    self.assertEqual(frame.astype(str).values.tolist(), reference.astype(str).values.tolist())
+                    self.assertEqual(build_row_hashes(frame).tolist(), build_row_hashes(reference).tolist())
+
+    def test_csv_engines_agree(self):
+        self.assert_engines_agree('.csv', lambda df, path: df.to_csv(path, index=False, encoding='utf-8-sig'))
+
+    def test_xlsx_engines_agree(self):
+        self.assert_engines_agree('.xlsx', lambda df, path: df.to_excel(path, index=False, engine='openpyxl'))
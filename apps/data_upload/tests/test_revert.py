@@ -0,0 +1,207 @@
+"""
+Tests for reverting uploads by batch id.
+
+Test Coverage:
+- Parsers tag inserted rows with their UploadHistory row
+- revert_upload deletes only the upload's rows and their derived data
+  (fingerprints, author links, rollups, sketches)
+- Research projects are kept while other uploads' records use them
+- revert_upload command and admin action
+"""
+import io
+import os
+import shutil
+import tempfile
+from datetime import date
+
+import pandas as pd
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+
+from apps.analytics import sketches
+from apps.analytics.models import (
+    ExecutionRecord,
+    ExecutionRollup,
+    Publication,
+    PublicationAuthor,
+    PublicationRollup,
+    ResearchProject,
+    UploadFingerprint,
+    UploadHistory,
+)
+from apps.analytics.tests.factories import publication_rows
+from apps.authentication.models import User
+from apps.data_upload.exceptions import RevertError
+from apps.data_upload.parsers import PublicationParser, ResearchBudgetParser
+from apps.data_upload.revert import revert_upload
+
+
+def budget_rows(rows):
+    """Build a research budget upload DataFrame from (집행ID, 과제번호, 집행일자) tuples."""
+    return pd.DataFrame({
+        '집행ID': [r[0] for r in rows],
+        '과제번호': [r[1] for r in rows],
+        '과제명': ['AI'] * len(rows),
+        '연구책임자': ['김교수'] * len(rows),
+        '소속학과': ['컴퓨터공학과'] * len(rows),
+        '지원기관': ['NRF'] * len(rows),
+        '총연구비': [1000000] * len(rows),
+        '집행일자': [r[2] for r in rows],
+        '집행항목': ['인건비'] * len(rows),
+        '집행금액': [1000] * len(rows),
+        '상태': ['집행완료'] * len(rows),
+        '비고': [None] * len(rows),
+    })
+
+
+class RevertTestCase(TestCase):
+    """Admin user and a temporary directory for upload files."""
+
+    def setUp(self):
+        cache.clear()
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def upload(self, parser, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        result = parser.parse(path, self.user)
+        self.assertTrue(result['success'], result['error_message'])
+        return UploadHistory.objects.filter(status='success').latest('id')
+
+
+class UploadBatchTest(RevertTestCase):
+    """Test batch tagging by the parsers."""
+
+    def test_rows_are_tagged_with_their_upload(self):
+        """Every inserted row references the UploadHistory row of its upload."""
+        first = self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([('E1', 'R1', '2023-03-02')]))
+        second = self.upload(ResearchBudgetParser(), 'b2.csv', budget_rows([('E2', 'R1', '2023-04-02')]))
+
+        self.assertEqual(first.rows_processed, 1)
+        self.assertEqual(ExecutionRecord.objects.get(execution_id='E1').upload_batch, first)
+        self.assertEqual(ExecutionRecord.objects.get(execution_id='E2').upload_batch, second)
+        # Projects keep the upload that created them
+        self.assertEqual(ResearchProject.objects.get(project_number='R1').upload_batch, first)
+
+
+class RevertUploadTest(RevertTestCase):
+    """Test revert_upload."""
+
+    def test_revert_publication_upload(self):
+        """Only the upload's rows go, with their links, fingerprints and rollups."""
+        columns = ('논문ID', '게재일', '주저자', '참여저자')
+        self.upload(PublicationParser(), 'p1.csv', publication_rows([('P1', '2023-03-01', '김교수', '박교수')], columns))
+        bad = self.upload(PublicationParser(), 'p2.csv', publication_rows([
+            ('P2', '2023-03-15', '이교수', '박교수'), ('P3', '2023-05-01', '이교수', '박교수'),
+            ('P4', '2023-06-01', '최교수', '박교수'),
+        ], columns))
+
+        with self.captureOnCommitCallbacks(execute=True):  # Sketch rebuild
+            deleted = revert_upload(bad, chunk_size=2)
+
+        self.assertEqual(deleted, {'publications': 3})
+        self.assertEqual(list(Publication.objects.values_list('publication_id', flat=True)), ['P1'])
+        self.assertEqual(PublicationAuthor.objects.count(), 2)  # P1: 김교수, 박교수
+        self.assertEqual(
+            list(UploadFingerprint.objects.filter(data_type='publication').values_list('row_key', flat=True)),
+            ['P1'],
+        )
+        self.assertEqual(
+            {row.period_month: row.publication_count for row in PublicationRollup.objects.all()},
+            {date(2023, 3, 1): 1},
+        )
+        self.assertEqual(sketches.estimate_top('publication.first_author', 5), [('김교수', 1)])
+        bad.refresh_from_db()
+        self.assertEqual(bad.status, 'reverted')
+
+    def test_revert_research_budget_upload(self):
+        """Projects created by the upload are kept while other uploads' records use them."""
+        bad = self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([
+            ('E1', 'R1', '2023-03-02'), ('E2', 'R2', '2023-03-05'),
+        ]))
+        self.upload(ResearchBudgetParser(), 'b2.csv', budget_rows([('E3', 'R1', '2023-04-02')]))
+
+        deleted = revert_upload(bad, chunk_size=1)
+
+        self.assertEqual(deleted, {'execution_records': 2, 'research_projects': 1})
+        self.assertEqual(list(ResearchProject.objects.values_list('project_number', flat=True)), ['R1'])
+        self.assertEqual(list(ExecutionRecord.objects.values_list('execution_id', flat=True)), ['E3'])
+        self.assertEqual(
+            list(ExecutionRollup.objects.values_list('period_month', 'amount_sum')),
+            [(date(2023, 4, 1), 1000)],
+        )
+
+    def test_reverted_upload_cannot_be_reverted_again(self):
+        """Only successful uploads can be reverted."""
+        history = self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([('E1', 'R1', '2023-03-02')]))
+        revert_upload(history)
+
+        with self.assertRaises(RevertError):
+            revert_upload(history)
+
+    def test_reverted_rows_can_be_uploaded_again(self):
+        """Fingerprints are removed, so an incremental upload inserts the rows again."""
+        history = self.upload(PublicationParser(), 'p1.csv', publication_rows([('P1', '2023-03-01', '김교수')]))
+        revert_upload(history)
+
+        self.upload(PublicationParser(incremental=True), 'p2.csv', publication_rows([('P1', '2023-03-01', '김교수')]))
+
+        self.assertEqual(UploadHistory.objects.filter(status='success').get().diff_summary['inserted'], 1)
+        self.assertEqual(Publication.objects.count(), 1)
+
+
+class RevertUploadCommandTest(RevertTestCase):
+    """Test manage.py revert_upload."""
+
+    def test_command_reverts_upload(self):
+        history = self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([('E1', 'R1', '2023-03-02')]))
+        out = io.StringIO()
+
+        call_command('revert_upload', str(history.id), '--chunk-size', '10', stdout=out)
+
+        self.assertIn('execution_records: 1 rows deleted', out.getvalue())
+        self.assertFalse(ExecutionRecord.objects.exists())
+
+    def test_command_rejects_unknown_upload(self):
+        with self.assertRaises(CommandError):
+            call_command('revert_upload', '999', stdout=io.StringIO())
+
+
+class RevertUploadAdminActionTest(RevertTestCase):
+    """Test the upload history admin action."""
+
+    def test_admin_action_reverts_selected_uploads(self):
+        history = self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([('E1', 'R1', '2023-03-02')]))
+        self.client.force_login(self.user)
+
+        response = self.client.post('/admin/analytics/uploadhistory/', {
+            'action': 'revert_uploads',
+            '_selected_action': [history.id],
+        })
+
+        self.assertEqual(response.status_code, 302)
+        history.refresh_from_db()
+        self.assertEqual(history.status, 'reverted')
+        self.assertFalse(ExecutionRecord.objects.exists())
+
+    def test_admin_action_requires_admin_role(self):
+        history = self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([('E1', 'R1', '2023-03-02')]))
+        manager = User(email='manager@test.com', name='매니저', role='manager', status='active')
+        manager.set_password('testpass123')
+        manager.save()
+        self.client.force_login(manager)
+
+        self.client.post('/admin/analytics/uploadhistory/', {
+            'action': 'revert_uploads',
+            '_selected_action': [history.id],
+        })
+
+        history.refresh_from_db()
+        self.assertEqual(history.status, 'success')
@@ -0,0 +1,180 @@
+"""
+Tests for staged replace uploads.
+
+The shadow-table swap needs PostgreSQL; on the SQLite test database (and
+inside the test transaction) staged_replace replaces rows in place, which
+these tests cover together with the parts shared with the swap.
+
+Test Coverage:
+- Staged uploads replace the data of their type with derived data
+  (fingerprints, rollups, sketches, upload history, in progress until the swap)
+- A failed staged load leaves the data and records one failure
+- Mode validation in parsers and the upload view
+- Index/trigger definitions are pointed at the shadow table
+"""
+import os
+import shutil
+import tempfile
+from datetime import date
+from unittest import mock
+
+from django.test import TestCase
+
+from apps.analytics import sketches
+from apps.analytics.models import (
+    ExecutionRecord,
+    Publication,
+    PublicationAuthor,
+    PublicationRollup,
+    ResearchProject,
+    UploadFingerprint,
+    UploadHistory,
+)
+from apps.analytics.tests.factories import publication_rows
+from apps.authentication.models import User
+from apps.data_upload.exceptions import StagingError
+from apps.data_upload.parsers import PublicationParser, ResearchBudgetParser
+from apps.data_upload.staging import STAGING_SCHEMA, ShadowTables, get_staged_tables
+from apps.data_upload.tests.test_revert import budget_rows
+
+
+class StagedUploadTest(TestCase):
+    """Test staged replace uploads."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+
+    def upload(self, parser, name, df):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return parser.parse(path, self.user)
+
+    def test_staged_upload_replaces_publications(self):
+        """Rows missing from the file are gone; derived data follows the new rows."""
+        self.upload(PublicationParser(), 'p1.csv', publication_rows([
+            ('P1', '2023-03-01', '김교수'), ('P2', '2023-04-01', '이교수'),
+        ]))
+
+        with self.captureOnCommitCallbacks(execute=True):  # Sketch rebuild
+            result = self.upload(PublicationParser(staged=True), 'p2.csv', publication_rows([
+                ('P2', '2023-04-01', '이교수', '박교수'), ('P3', '2023-05-01', '최교수', '박교수'),
+            ], columns=('논문ID', '게재일', '주저자', '참여저자')))
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(result['rows_processed'], 2)
+        self.assertEqual(
+            sorted(Publication.objects.values_list('publication_id', flat=True)), ['P2', 'P3']
+        )
+        self.assertEqual(PublicationAuthor.objects.count(), 4)
+        self.assertEqual(
+            sorted(UploadFingerprint.objects.filter(data_type='publication').values_list('row_key', flat=True)),
+            ['P2', 'P3'],
+        )
+        self.assertEqual(
+            sorted(PublicationRollup.objects.values_list('period_month', flat=True)),
+            [date(2023, 4, 1), date(2023, 5, 1)],
+        )
+        self.assertEqual(
+            sorted(sketches.estimate_top('publication.first_author', 5)), [('이교수', 1), ('최교수', 1)]
+        )
+
+        history = UploadHistory.objects.latest('id')
+        self.assertEqual((history.status, history.rows_processed), ('success', 2))
+        self.assertEqual(Publication.objects.filter(upload_batch=history).count(), 2)
+
+    def test_staged_upload_replaces_projects(self):
+        """Research projects and execution records are replaced together."""
+        self.upload(ResearchBudgetParser(), 'b1.csv', budget_rows([('E1', 'R1', '2023-03-02')]))
+
+        result = self.upload(ResearchBudgetParser(staged=True), 'b2.csv', budget_rows([
+            ('E2', 'R2', '2023-03-05'), ('E3', 'R2', '2023-04-05'),
+        ]))
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(list(ResearchProject.objects.values_list('project_number', flat=True)), ['R2'])
+        self.assertEqual(
+            sorted(ExecutionRecord.objects.values_list('execution_id', flat=True)), ['E2', 'E3']
+        )
+
+    def test_failed_staged_upload_keeps_data(self):
+        """A failing load leaves the old rows and one failed history row."""
+        self.upload(PublicationParser(), 'p1.csv', publication_rows([('P1', '2023-03-01', '김교수')]))
+
+        with mock.patch.object(PublicationParser, 'save', side_effect=RuntimeError('boom')):
+            result = self.upload(PublicationParser(staged=True), 'p2.csv', publication_rows([
+                ('P2', '2023-04-01', '이교수'),
+            ]))
+
+        self.assertFalse(result['success'])
+        self.assertEqual(list(Publication.objects.values_list('publication_id', flat=True)), ['P1'])
+        self.assertEqual(
+            list(UploadHistory.objects.order_by('id').values_list('status', 'error_message')),
+            [('success', None), ('failed', 'boom')],
+        )
+
+    def test_history_is_in_progress_during_load(self):
+        """The upload's history row is 'in_progress' until the swap."""
+        save = PublicationParser.save
+        statuses = []
+
+        def record_status(parser, df):
+            statuses.append(UploadHistory.objects.get(pk=parser.upload_batch.pk).status)
+            return save(parser, df)
+
+        with mock.patch.object(PublicationParser, 'save', autospec=True, side_effect=record_status):
+            result = self.upload(PublicationParser(staged=True), 'p1.csv', publication_rows([
+                ('P1', '2023-03-01', '김교수'),
+            ]))
+
+        self.assertTrue(result['success'], result['error_message'])
+        self.assertEqual(statuses, ['in_progress'])
+        self.assertEqual(UploadHistory.objects.get().status, 'success')
+
+    def test_modes_are_exclusive(self):
+        with self.assertRaises(ValueError):
+            PublicationParser(incremental=True, staged=True)
+
+    def test_upload_view_rejects_both_modes(self):
+        self.client.force_login(self.user)
+        upload = tempfile.NamedTemporaryFile(suffix='.csv', dir=self.test_dir, delete=False)
+        publication_rows([('P1', '2023-03-01', '김교수')]).to_csv(upload.name, index=False)
+
+        with open(upload.name, 'rb') as f:
+            response = self.client.post('/data/upload/', {
+                'csv_file': f, 'incremental': 'on', 'staged': 'on',
+            }, follow=True)
+
+        self.assertContains(response, '함께 선택할 수 없습니다')
+        self.assertFalse(Publication.objects.exists())
+
+
+class ShadowTablesTest(TestCase):
+    """Test the SQL helpers of the shadow-table swap."""
+
+    def test_definitions_point_at_staged_table(self):
+        shadow = ShadowTables('student', get_staged_tables('student'))
+
+        statement = shadow._on_staged(
+            'CREATE INDEX idx_student_dept ON public.students USING btree (department)', 'students'
+        )
+
+        self.assertEqual(
+            statement,
+            f'CREATE INDEX idx_student_dept ON "{STAGING_SCHEMA}"."students" USING btree (department)',
+        )
+
+    def test_unknown_definition_is_refused(self):
+        shadow = ShadowTables('student', get_staged_tables('student'))
+
+        with self.assertRaises(StagingError):
+            shadow._on_staged('CREATE INDEX x ON public.other USING btree (a)', 'students')
+
+    def test_unknown_data_type_is_refused(self):
+        with self.assertRaises(StagingError):
+            get_staged_tables('unknown')
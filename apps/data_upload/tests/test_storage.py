@@ -0,0 +1,184 @@
+"""
+Tests for the content-addressed upload archive.
+
+Tests:
+- Compressed round-trip (gzip and zstd) keyed by SHA-256
+- Duplicate uploads skipped by hash before parsing, unless superseded
+- Replaying an UploadHistory row from the archive
+"""
+import io
+import os
+import shutil
+import tempfile
+from unittest import skipIf
+
+import pandas as pd
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.test import TestCase, override_settings
+
+from apps.analytics.models import Student, UploadHistory
+from apps.authentication.models import User
+from apps.data_upload import storage
+from apps.data_upload.batch import expand_upload, ingest_parts
+from apps.data_upload.parsers import StudentParser
+from apps.data_upload.revert import revert_upload
+from apps.data_upload.storage import LocalArchiveBackend, UploadArchive, hash_file
+
+
+STUDENT_ROWS = pd.DataFrame({
+    '학번': ['2023001', '2023002'],
+    '이름': ['김철수', '이영희'],
+    '단과대학': ['공과대학', '공과대학'],
+    '학과': ['컴퓨터공학과', '컴퓨터공학과'],
+    '학년': [1, 2],
+    '과정구분': ['학사', '학사'],
+    '학적상태': ['재학', '휴학'],
+    '성별': ['남', '여'],
+    '입학년도': [2023, 2022],
+})
+
+
+class ArchiveTestCase(TestCase):
+    """Shared fixtures: temp directories and an admin user."""
+
+    def setUp(self):
+        self.test_dir = tempfile.mkdtemp()
+        self.archive_root = tempfile.mkdtemp()
+        self.settings_override = override_settings(UPLOAD_ARCHIVE_ROOT=self.archive_root)
+        self.settings_override.enable()
+
+        self.user = User(email='admin@test.com', name='관리자', role='admin', status='active')
+        self.user.set_password('testpass123')
+        self.user.save()
+
+    def tearDown(self):
+        self.settings_override.disable()
+        shutil.rmtree(self.test_dir, ignore_errors=True)
+        shutil.rmtree(self.archive_root, ignore_errors=True)
+
+    def write_csv(self, name, df=STUDENT_ROWS):
+        path = os.path.join(self.test_dir, name)
+        df.to_csv(path, index=False, encoding='utf-8-sig')
+        return path
+
+
+class UploadArchiveTest(ArchiveTestCase):
+    """Test storing and restoring archived files."""
+
+    def assert_round_trip(self, compression, suffix):
+        archive = UploadArchive(LocalArchiveBackend(self.archive_root), compression=compression)
+        path = self.write_csv('students.csv')
+
+        digest = archive.put(path)
+
+        self.assertEqual(digest, hash_file(path))
+        self.assertTrue(os.path.exists(
+            os.path.join(self.archive_root, digest[:2], f'{digest}.csv{suffix}')
+        ))
+
+        restored = archive.restore(digest, '.csv', os.path.join(self.test_dir, 'restored.csv'))
+        with open(path, 'rb') as original, open(restored, 'rb') as copy:
+            self.assertEqual(original.read(), copy.read())
+
+    def test_gzip_round_trip(self):
+        """Files are stored gzip-compressed under their digest and restored byte-exact."""
+        self.assert_round_trip('gzip', '.gz')
+
+    @skipIf(storage.zstandard is None, 'zstandard not installed')
+    def test_zstd_round_trip(self):
+        """Files are stored zstd-compressed when zstandard is available."""
+        self.assert_round_trip('zstd', '.zst')
+
+    def test_same_content_is_stored_once(self):
+        """Identical content under different names maps to one object."""
+        archive = UploadArchive(LocalArchiveBackend(self.archive_root), compression='gzip')
+        first = archive.put(self.write_csv('jan.csv'))
+        second = archive.put(self.write_csv('copy_of_jan.csv'))
+
+        self.assertEqual(first, second)
+        self.assertTrue(archive.contains(first, '.csv'))
+        self.assertEqual(len(os.listdir(os.path.join(self.archive_root, first[:2]))), 1)
+
+
+class DuplicateUploadTest(ArchiveTestCase):
+    """Test short-circuiting uploads that were already ingested."""
+
+    def test_batch_skips_already_ingested_part(self):
+        """A re-uploaded file is archived but not parsed or saved again."""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        path = self.write_csv('students.csv')
+        archive = storage.get_upload_archive()
+
+        first = ingest_parts(
+            expand_upload([(path, 'students.csv')], work_dir), self.user,
+            max_workers=1, archive=archive,
+        )
+        second = ingest_parts(
+            expand_upload([(path, 'students_again.csv')], work_dir), self.user,
+            max_workers=1, archive=archive,
+        )
+
+        history = UploadHistory.objects.get()
+        self.assertEqual(history.content_hash, hash_file(path))
+        self.assertTrue(first[0]['success'])
+        self.assertEqual(second[0]['duplicate_of'], history)
+        self.assertEqual(Student.objects.count(), 2)
+
+    def test_file_superseded_by_later_upload_is_ingested_again(self):
+        """After a staged replace with B (or reverting B), re-uploading A restores A."""
+        work_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, work_dir, True)
+        path_a = self.write_csv('a.csv')
+        path_b = self.write_csv('b.csv', STUDENT_ROWS.assign(학번=['2024001', '2024002']))
+        archive = storage.get_upload_archive()
+
+        def upload(path):
+            return ingest_parts(
+                expand_upload([(path, os.path.basename(path))], work_dir), self.user,
+                max_workers=1, parser_options={'staged': True}, archive=archive,
+            )[0]
+
+        upload(path_a)
+        upload(path_b)
+        result = upload(path_a)
+
+        self.assertNotIn('duplicate_of', result)
+        self.assertTrue(result['success'])
+        self.assertEqual(
+            sorted(Student.objects.values_list('student_number', flat=True)), ['2023001', '2023002']
+        )
+        self.assertIn('duplicate_of', upload(path_a))
+
+        revert_upload(UploadHistory.objects.filter(status='success').latest('upload_date', 'id'))
+        self.assertNotIn('duplicate_of', upload(path_a))
+
+
+class ReplayUploadCommandTest(ArchiveTestCase):
+    """Test manage.py replay_upload."""
+
+    def test_replay_reingests_archived_file(self):
+        """The archived file is parsed again and logged as a new upload."""
+        path = self.write_csv('students.csv')
+        digest = storage.get_upload_archive().put(path)
+        StudentParser().parse(path, self.user, content_hash=digest)
+        history = UploadHistory.objects.get()
+        os.remove(path)
+
+        Student.objects.all().delete()
+        call_command('replay_upload', str(history.id), stdout=io.StringIO())
+
+        self.assertEqual(Student.objects.count(), 2)
+        replayed = UploadHistory.objects.exclude(pk=history.pk).get()
+        self.assertEqual(replayed.status, 'success')
+        self.assertEqual(replayed.file_name, 'students.csv')
+        self.assertEqual(replayed.content_hash, digest)
+
+    def test_replay_requires_archived_upload(self):
+        """Uploads without a content hash cannot be replayed."""
+        StudentParser().parse(self.write_csv('students.csv'), self.user)
+        history = UploadHistory.objects.get()
+
+        with self.assertRaises(CommandError):
+            call_command('replay_upload', str(history.id))
@@ -10,4 +10,7 @@ app_name = 'data_upload'
 
 urlpatterns = [
     path('upload/', views.upload_csv_view, name='upload_csv'),
+    path('upload/chunked/', views.chunked_upload_init_view, name='chunked_init'),
+    path('upload/chunked/finalize/', views.chunked_upload_finalize_view, name='chunked_finalize'),
+    path('upload/chunked/<str:upload_id>/', views.chunked_upload_chunk_view, name='chunked_chunk'),
 ]
@@ -3,7 +3,6 @@ Data Upload Utilities
 
 Smart file type identification based on column headers
 """
-import pandas as pd
 import os
 from apps.data_upload.parsers import (
     DepartmentKPIParser,
@@ -11,6 +10,7 @@ from apps.data_upload.parsers import (
     ResearchBudgetParser,
     StudentParser
 )
+from apps.data_upload.readers import read_header
 
 
 # Define required headers for each file type
@@ -35,7 +35,7 @@ FILE_TYPE_SIGNATURES = {
 }
 
 
-def identify_file_type(file_path: str):
+def identify_file_type(file_path: str, sheet_name=0):
     """
     Identify file type by analyzing column headers.
 
@@ -47,6 +47,7 @@ def identify_file_type(file_path: str):
 
     Args:
         file_path: Path to Excel or CSV file
+        sheet_name: Worksheet name or index (Excel only, default: first sheet)
 
     Returns:
         Parser class (e.g., DepartmentKPIParser) or None
@@ -57,16 +58,11 @@ def identify_file_type(file_path: str):
         ext = ext.lower()
 
         # Read only headers (no data rows)
-        if ext == '.csv':
-            df_header = pd.read_csv(file_path, nrows=0, encoding='utf-8-sig')
-        elif ext in ['.xlsx', '.xls']:
-            engine = 'openpyxl' if ext == '.xlsx' else 'xlrd'
-            df_header = pd.read_excel(file_path, nrows=0, engine=engine)
-        else:
+        if ext not in ['.csv', '.xlsx', '.xls']:
             return None
 
         # Get set of column names from file
-        file_headers = set(df_header.columns)
+        file_headers = set(read_header(file_path, sheet_name=sheet_name))
 
         # Find best match
         best_match = None
@@ -3,12 +3,20 @@ Data Upload Views
 
 Provides unified smart file upload interface
 """
+from django.conf import settings
 from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
 from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.http import JsonResponse
+from django.views.decorators.http import require_http_methods, require_POST
+import json
 import os
+import shutil
+import tempfile
+
+from apps.data_upload.chunked import ChunkedUpload
+from apps.data_upload.exceptions import ChunkedUploadError, ChunkOffsetError
 
 
 @login_required(login_url='/login/')
@@ -17,6 +25,15 @@ def upload_csv_view(request):
     Unified smart file upload view.
 
     Automatically identifies file type by headers and routes to appropriate parser.
+    Several files, zip archives and multi-sheet workbooks are handled as a
+    batch upload (see apps.data_upload.batch).
+
+    Uploaded files are kept in the content-addressed upload archive
+    (see apps.data_upload.storage); a file that was already ingested
+    successfully is recognized by its hash and not processed again.
+
+    Browsers with fetch and Web Crypto send the files through the resumable
+    chunked upload views below instead of this multipart POST.
 
     Permission: Admin only
     """
@@ -26,54 +43,305 @@ def upload_csv_view(request):
         return redirect('dashboard')
 
     if request.method == 'POST':
-        uploaded_file = request.FILES.get('csv_file')
+        uploaded_files = request.FILES.getlist('csv_file')
+        parser_options = {
+            'incremental': request.POST.get('incremental') == 'on',
+            'staged': request.POST.get('staged') == 'on',
+        }
+        if parser_options['incremental'] and parser_options['staged']:
+            messages.error(request, '증분 업로드와 전체 교체는 함께 선택할 수 없습니다.')
+            return redirect('data_upload:upload_csv')
 
-        if not uploaded_file:
+        if not uploaded_files:
             messages.error(request, '파일이 선택되지 않았습니다.')
             return redirect('data_upload:upload_csv')
 
-        # Save file temporarily
-        file_name = uploaded_file.name
-        temp_path = default_storage.save(f'temp/{file_name}', ContentFile(uploaded_file.read()))
-        temp_full_path = os.path.join(default_storage.location, temp_path)
+        # Save files temporarily (copied in chunks, not read into memory)
+        temp_paths = [
+            default_storage.save(f'temp/{uploaded_file.name}', uploaded_file)
+            for uploaded_file in uploaded_files
+        ]
+        files = [
+            (os.path.join(default_storage.location, temp_path), uploaded_file.name)
+            for temp_path, uploaded_file in zip(temp_paths, uploaded_files)
+        ]
 
         try:
-            # Import here to avoid circular dependency
-            from apps.data_upload.utils import identify_file_type
-
-            # Identify file type
-            ParserClass = identify_file_type(temp_full_path)
-
-            if ParserClass is None:
-                messages.error(request, '파일의 종류를 인식할 수 없습니다. 파일 헤더를 확인해주세요.')
-                default_storage.delete(temp_path)
-                return redirect('data_upload:upload_csv')
-
-            # Parse file using identified parser
-            parser = ParserClass()
-            result = parser.parse(temp_full_path, request.user)
-
-            if result['success']:
-                messages.success(
-                    request,
-                    f"{result['rows_processed']}개의 데이터가 성공적으로 처리되었습니다."
-                )
-                # Redirect to appropriate analytics page based on data type
-                return redirect('dashboard')
-            else:
-                messages.error(request, f"파일 처리 중 오류 발생: {result['error_message']}")
-
-        except Exception as e:
-            messages.error(request, f"예상치 못한 오류 발생: {str(e)}")
-
+            return _process_upload(request, files, parser_options)
         finally:
-            # Clean up temporary file
-            if default_storage.exists(temp_path):
-                default_storage.delete(temp_path)
-
-        return redirect('data_upload:upload_csv')
+            # Clean up temporary files
+            for temp_path in temp_paths:
+                if default_storage.exists(temp_path):
+                    default_storage.delete(temp_path)
 
     # GET request - show upload form
     return render(request, 'data_upload/upload_form.html', {
-        'title': 'CSV 데이터 통합 업로드'
+        'title': 'CSV 데이터 통합 업로드',
+        'max_file_size_mb': settings.UPLOAD_MAX_FILE_SIZE_MB,
     })
+
+
+def _process_upload(request, files, parser_options):
+    """
+    Ingest saved upload files and report the results as messages.
+
+    Args:
+        request: HttpRequest
+        files: List of (file_path, original_name) tuples
+        parser_options: Keyword arguments for the parser constructors
+
+    Returns:
+        Redirect to the dashboard on success, back to the form otherwise
+    """
+    try:
+        # Import here to avoid circular dependency
+        from apps.data_upload.batch import is_zip_file, list_sheet_names
+        from apps.data_upload.storage import find_ingested_upload, get_upload_archive
+
+        archive = get_upload_archive()
+        temp_full_path, file_name = files[0]
+        is_batch = (
+            len(files) > 1
+            or is_zip_file(temp_full_path)
+            or len(list_sheet_names(temp_full_path)) > 1
+        )
+
+        if is_batch:
+            return _handle_batch_upload(request, files, parser_options, archive)
+
+        # Skip files that were already ingested
+        content_hash = archive.put(temp_full_path)
+        previous = find_ingested_upload(content_hash)
+        if previous is not None:
+            messages.info(request, _format_duplicate(file_name, previous))
+            return redirect('data_upload:upload_csv')
+
+        from apps.data_upload.utils import identify_file_type
+
+        # Identify file type
+        ParserClass = identify_file_type(temp_full_path)
+
+        if ParserClass is None:
+            messages.error(request, '파일의 종류를 인식할 수 없습니다. 파일 헤더를 확인해주세요.')
+            return redirect('data_upload:upload_csv')
+
+        # Parse file using identified parser
+        parser = ParserClass(**parser_options)
+        result = parser.parse(temp_full_path, request.user, content_hash=content_hash)
+
+        if result['success']:
+            messages.success(
+                request,
+                f"{result['rows_processed']}개의 데이터가 성공적으로 처리되었습니다."
+                f"{_format_diff_summary(result.get('diff_summary'))}"
+            )
+            # Redirect to appropriate analytics page based on data type
+            return redirect('dashboard')
+        else:
+            messages.error(request, f"파일 처리 중 오류 발생: {result['error_message']}")
+
+    except Exception as e:
+        messages.error(request, f"예상치 못한 오류 발생: {str(e)}")
+
+    return redirect('data_upload:upload_csv')
+
+
+def _admin_required_json(request):
+    """403 JSON response for non-admin users of the chunked upload API."""
+    if request.user.role != 'admin':
+        return JsonResponse({'error': '데이터 업로드는 관리자만 가능합니다.'}, status=403)
+    return None
+
+
+def _load_json(request):
+    try:
+        body = json.loads(request.body or b'{}')
+    except ValueError:
+        return {}
+    return body if isinstance(body, dict) else {}
+
+
+@login_required(login_url='/login/')
+@require_POST
+def chunked_upload_init_view(request):
+    """
+    Start a resumable chunked upload (see apps.data_upload.chunked).
+
+    Request JSON: {"file_name": ..., "file_size": ...}
+    Response (201): {"upload_id": ..., "offset": 0, "chunk_size": ...}
+
+    Permission: Admin only
+    """
+    denied = _admin_required_json(request)
+    if denied:
+        return denied
+
+    body = _load_json(request)
+    try:
+        file_size = int(body.get('file_size'))
+    except (TypeError, ValueError):
+        return JsonResponse({'error': 'file_size is required'}, status=400)
+
+    try:
+        upload = ChunkedUpload.create(request.user, body.get('file_name'), file_size)
+    except ChunkedUploadError as e:
+        return JsonResponse({'error': str(e)}, status=400)
+
+    return JsonResponse({
+        'upload_id': upload.upload_id,
+        'offset': upload.offset,
+        'chunk_size': settings.CHUNKED_UPLOAD_CHUNK_SIZE,
+    }, status=201)
+
+
+@login_required(login_url='/login/')
+@require_http_methods(['GET', 'PUT'])
+def chunked_upload_chunk_view(request, upload_id):
+    """
+    Status (GET) of a chunked upload, or the next chunk (PUT).
+
+    A PUT carries the raw chunk bytes, its position in ?offset= and its
+    SHA-256 hex digest in the X-Chunk-SHA256 header. Responses are
+    {"offset": ..., "file_size": ...}; a PUT at the wrong offset gets 409
+    with the offset to continue from.
+
+    Permission: Admin only
+    """
+    denied = _admin_required_json(request)
+    if denied:
+        return denied
+
+    try:
+        upload = ChunkedUpload.load(upload_id, request.user)
+    except ChunkedUploadError as e:
+        return JsonResponse({'error': str(e)}, status=404)
+
+    if request.method == 'PUT':
+        try:
+            offset = int(request.GET.get('offset', ''))
+            length = int(request.META.get('CONTENT_LENGTH') or 0)
+        except ValueError:
+            return JsonResponse({'error': 'offset is required'}, status=400)
+
+        try:
+            upload.write_chunk(offset, request, length, request.headers.get('X-Chunk-SHA256'))
+        except ChunkOffsetError as e:
+            return JsonResponse({'error': str(e), 'offset': upload.offset}, status=409)
+        except ChunkedUploadError as e:
+            return JsonResponse({'error': str(e), 'offset': upload.offset}, status=400)
+
+    return JsonResponse({'offset': upload.offset, 'file_size': upload.file_size})
+
+
+@login_required(login_url='/login/')
+@require_POST
+def chunked_upload_finalize_view(request):
+    """
+    Ingest completed chunked uploads as one upload.
+
+    Request JSON: {"upload_ids": [...], "incremental": bool, "staged": bool}
+    Response: {"redirect": ...}, the page showing the result messages
+
+    Permission: Admin only
+    """
+    denied = _admin_required_json(request)
+    if denied:
+        return denied
+
+    body = _load_json(request)
+    upload_ids = body.get('upload_ids')
+    if not upload_ids or not isinstance(upload_ids, list):
+        return JsonResponse({'error': '파일이 선택되지 않았습니다.'}, status=400)
+    upload_ids = [str(upload_id) for upload_id in upload_ids]
+    if len(set(upload_ids)) != len(upload_ids):
+        return JsonResponse({'error': '같은 파일이 두 번 이상 선택되었습니다.'}, status=400)
+    parser_options = {
+        'incremental': bool(body.get('incremental')),
+        'staged': bool(body.get('staged')),
+    }
+    if parser_options['incremental'] and parser_options['staged']:
+        return JsonResponse({'error': '증분 업로드와 전체 교체는 함께 선택할 수 없습니다.'}, status=400)
+
+    try:
+        uploads = [ChunkedUpload.load(upload_id, request.user) for upload_id in upload_ids]
+    except ChunkedUploadError as e:
+        return JsonResponse({'error': str(e)}, status=404)
+    incomplete = [upload for upload in uploads if not upload.is_complete]
+    if incomplete:
+        return JsonResponse({
+            'error': f'{incomplete[0].file_name}: upload incomplete',
+            'offset': incomplete[0].offset,
+        }, status=409)
+
+    work_dir = tempfile.mkdtemp(prefix='upload_chunked_')
+    try:
+        files = [(upload.complete(work_dir), upload.file_name) for upload in uploads]
+        response = _process_upload(request, files, parser_options)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return JsonResponse({'redirect': response.url})
+
+
+def _format_diff_summary(diff_summary):
+    """Format incremental upload counts for a success message."""
+    if not diff_summary:
+        return ''
+    return (
+        f" (추가 {diff_summary['inserted']}, 변경 {diff_summary['changed']}, "
+        f"삭제 {diff_summary['deleted']}, 동일 {diff_summary['unchanged']})"
+    )
+
+
+def _format_duplicate(file_name, previous):
+    """Message for an upload whose content was already ingested."""
+    return (
+        f"{file_name}: 이미 처리된 파일입니다 "
+        f"({previous.upload_date:%Y-%m-%d %H:%M} 업로드, {previous.rows_processed}건). "
+        f"다시 처리하지 않았습니다."
+    )
+
+
+def _handle_batch_upload(request, files, parser_options, archive=None):
+    """
+    Ingest a multi-file / zip / multi-sheet upload and report per-part results.
+
+    Args:
+        request: HttpRequest
+        files: List of (temp_full_path, original_name) tuples
+        parser_options: Keyword arguments for the parser constructors
+        archive: UploadArchive for the part files
+    """
+    from apps.data_upload.batch import expand_upload, ingest_parts
+
+    work_dir = tempfile.mkdtemp(prefix='upload_batch_')
+    try:
+        parts = expand_upload(files, work_dir)
+        if not parts:
+            messages.error(request, '업로드할 수 있는 파일이 없습니다.')
+            return redirect('data_upload:upload_csv')
+
+        results = ingest_parts(
+            parts, request.user, parser_options=parser_options, archive=archive
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    for result in results:
+        if result.get('duplicate_of'):
+            messages.info(request, _format_duplicate(result['file_name'], result['duplicate_of']))
+        elif result['success']:
+            messages.success(
+                request,
+                f"{result['file_name']}: {result['rows_processed']}개의 데이터가 성공적으로 처리되었습니다."
+                f"{_format_diff_summary(result.get('diff_summary'))}"
+            )
+        else:
+            messages.error(
+                request,
+                f"{result['file_name']}: 파일 처리 중 오류 발생: {result['error_message']}"
+            )
+
+    if all(result['success'] for result in results):
+        return redirect('dashboard')
+    return redirect('data_upload:upload_csv')
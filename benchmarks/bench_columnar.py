@@ -0,0 +1,144 @@
+#!/usr/bin/env python
+"""
+Benchmark: aggregator calls from the ORM vs. columnar snapshots.
+
+Fills a throwaway test database with synthetic publications, students and
+research budgets, then times each aggregator method with columnar=False
+(one query per call) and with a loaded snapshot (columnar=True: the data
+version lookup plus NumPy, and NumPy alone with the version cached by
+ANALYTICS_COLUMNAR_VERSION_TTL), checking both return the same result.
+Also reports the snapshot load time.
+
+The test database is SQLite in the same process, so the ORM figures
+leave out the network round trip a remote PostgreSQL adds to every call.
+
+Usage:
+    python benchmarks/bench_columnar.py [--rows 100000] [--repeat 5]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date
+from decimal import Decimal
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test import override_settings  # noqa: E402
+
+from apps.analytics.aggregators import (  # noqa: E402
+    PublicationAggregator,
+    ResearchBudgetAggregator,
+    StudentAggregator,
+)
+from apps.analytics.columnar import load_snapshot  # noqa: E402
+from apps.analytics.models import ExecutionRecord, Publication, ResearchProject, Student  # noqa: E402
+
+DEPARTMENTS = ['컴퓨터공학과', '기계공학과', '전기공학과', '화학공학과', '수학과', '물리학과', '경영학과']
+NAMES = ['김민준', '이서연', '박지훈', '최수아', '정도윤', '강하은', '조현우', '윤지민']
+
+CALLS = [
+    (PublicationAggregator, 'get_total_publication_count', {'department': '수학과', 'year': 2023}),
+    (PublicationAggregator, 'get_publications_by_journal_grade', {}),
+    (PublicationAggregator, 'get_average_impact_factor', {'journal_grade': 'SCIE'}),
+    (ResearchBudgetAggregator, 'get_total_budget_and_execution', {}),
+    (ResearchBudgetAggregator, 'get_budget_by_department', {}),
+    (ResearchBudgetAggregator, 'get_execution_by_category', {}),
+    (StudentAggregator, 'get_total_students_and_enrollment_rate', {}),
+    (StudentAggregator, 'get_students_by_department', {}),
+    (StudentAggregator, 'get_students_by_admission_year', {}),
+]
+
+
+def fill(rng, rows):
+    Publication.objects.bulk_create([
+        Publication(
+            publication_id=f'PUB-{i:07d}', publication_date=date(rng.randint(2015, 2024), rng.randint(1, 12), 1),
+            college='공과대학', department=rng.choice(DEPARTMENTS), title=f'논문 {i}',
+            first_author=rng.choice(NAMES), journal_name='Journal',
+            journal_grade=rng.choice(['SCIE', 'KCI', 'SCOPUS']),
+            impact_factor=Decimal(rng.randint(0, 999)) / 100,
+        )
+        for i in range(rows)
+    ], batch_size=5000)
+    Student.objects.bulk_create([
+        Student(
+            student_number=f'{2015 + i % 10}{i:06d}', name=rng.choice(NAMES), college='공과대학',
+            department=rng.choice(DEPARTMENTS), grade=rng.randint(1, 4), program_type='학사',
+            enrollment_status=rng.choice(['재학', '휴학', '졸업']), gender=rng.choice(['남', '여']),
+            admission_year=2015 + i % 10,
+        )
+        for i in range(rows)
+    ], batch_size=5000)
+    projects = ResearchProject.objects.bulk_create([
+        ResearchProject(
+            project_number=f'RP-{i:05d}', project_name=f'과제 {i}', principal_investigator=rng.choice(NAMES),
+            department=rng.choice(DEPARTMENTS), funding_agency='NRF', total_budget=rng.randint(10 ** 7, 10 ** 9),
+        )
+        for i in range(rows // 20)
+    ], batch_size=5000)
+    ExecutionRecord.objects.bulk_create([
+        ExecutionRecord(
+            execution_id=f'EX-{i:07d}', project=projects[i // 20], execution_date=date(2023, 3, 1),
+            expense_category=rng.choice(['인건비', '장비비', '재료비']), amount=rng.randint(1000, 10 ** 7),
+            status='집행완료',
+        )
+        for i in range(len(projects) * 20)
+    ], batch_size=5000)
+
+
+def best_of(repeat, func):
+    """Best wall time of repeat runs, and the last result."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0)
+    try:
+        fill(random.Random(0), args.rows)
+
+        print(f'{args.rows:,} publications and students, {args.rows:,} execution records (best of {args.repeat})')
+        for data_type in ('publication', 'research_budget', 'student'):
+            load_time, _ = best_of(1, lambda: load_snapshot(data_type))
+            print(f'  load {data_type} snapshot: {load_time * 1000:8.1f} ms')
+
+        print(f'  {"method":40} {"ORM ms":>8} {"columnar ms":>12} {"version cached":>15}')
+        for aggregator_class, method, kwargs in CALLS:
+            def call(columnar):
+                return getattr(aggregator_class(columnar=columnar), method)(**kwargs)
+
+            orm_time, expected = best_of(args.repeat, lambda: call(False))
+            columnar_time, actual = best_of(args.repeat, lambda: call(True))
+            with override_settings(ANALYTICS_COLUMNAR_VERSION_TTL=3600):
+                cached_time, _ = best_of(args.repeat, lambda: call(True))
+            if actual != expected:
+                print(f'MISMATCH in {aggregator_class.__name__}.{method}')
+                return 1
+            print(f'  {method:40} {orm_time * 1000:8.2f} {columnar_time * 1000:12.3f} {cached_time * 1000:15.3f}')
+        print('  results identical')
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
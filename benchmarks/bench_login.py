@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Benchmark: logins per second per worker.
+
+Posts to the login view of a throwaway in-memory database with the
+production password hashers and reports logins/sec for the current flow
+(one password verification, LoginForm.get_user reused by the view) and
+for the previous flow, which ran authenticate() again after the form.
+
+Usage:
+    python benchmarks/bench_login.py [--logins 20] [--iterations 600000]
+"""
+import argparse
+import os
+import sys
+import time
+
+import django
+
+# Setup Django environment (test settings: in-memory SQLite test database)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+from django.contrib.auth import authenticate  # noqa: E402
+from django.db import connection  # noqa: E402
+from django.test import Client  # noqa: E402
+from django.test.utils import override_settings, setup_test_environment  # noqa: E402
+
+from apps.authentication.models import User  # noqa: E402
+from config.settings import base  # noqa: E402
+
+EMAIL = 'bench@university.ac.kr'
+PASSWORD = 'bench-password'
+
+
+def time_logins(client, count):
+    """Seconds per login through the login view."""
+    start = time.perf_counter()
+    for _ in range(count):
+        response = client.post('/login/', {'email': EMAIL, 'password': PASSWORD})
+        assert response.status_code == 302, response.status_code
+        client.logout()
+    return (time.perf_counter() - start) / count
+
+
+def time_authenticate(count):
+    """Seconds per extra authenticate() call of the previous flow."""
+    start = time.perf_counter()
+    for _ in range(count):
+        assert authenticate(None, username=EMAIL, password=PASSWORD) is not None
+    return (time.perf_counter() - start) / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--iterations', type=int, default=None,
+                        help='PASSWORD_HASH_ITERATIONS (default: Django default)')
+    args = parser.parse_args()
+
+    setup_test_environment()
+    connection.creation.create_test_db(verbosity=0)
+
+    with override_settings(PASSWORD_HASHERS=base.PASSWORD_HASHERS, PASSWORD_HASH_ITERATIONS=args.iterations):
+        user = User(email=EMAIL, name='Bench', role='viewer', status='active')
+        user.set_password(PASSWORD)
+        user.save()
+        iterations = user.password.split('$')[1]
+
+        client = Client()
+        time_logins(client, 1)  # Warm up (URL resolver, templates)
+        single = time_logins(client, args.logins)
+        extra = time_authenticate(args.logins)
+
+    print(f'PBKDF2 iterations: {iterations}, {args.logins} logins')
+    print(f'  current flow  (1 hash)  : {single * 1000:7.1f} ms/login  {1 / single:6.1f} logins/sec')
+    print(f'  previous flow (2 hashes): {(single + extra) * 1000:7.1f} ms/login  '
+          f'{1 / (single + extra):6.1f} logins/sec')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,137 @@
+#!/usr/bin/env python
+"""
+Benchmark: upload reader engines per file format.
+
+Writes synthetic student, publication and research budget uploads as CSV
+and XLSX, and times every registered engine of apps.data_upload.readers
+on each: full reads typed by the parser's COLUMN_DTYPES, and header
+reads (identify_file_type). Engines that are not installed are listed
+as such. The ENGINES order in readers.py follows these results.
+
+Usage:
+    python benchmarks/bench_readers.py [--rows 50000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+import pandas as pd  # noqa: E402
+
+from apps.data_upload.dtypes import read_dtypes  # noqa: E402
+from apps.data_upload.parsers import PublicationParser, ResearchBudgetParser, StudentParser  # noqa: E402
+from apps.data_upload.readers import ENGINES, is_installed, read_header, read_table  # noqa: E402
+
+DEPARTMENTS = {
+    '공과대학': ['컴퓨터공학과', '기계공학과', '전기공학과', '화학공학과'],
+    '자연과학대학': ['수학과', '물리학과', '화학과'],
+    '경영대학': ['경영학과', '회계학과'],
+}
+NAMES = ['김민준', '이서연', '박지훈', '최수아', '정도윤', '강하은', '조현우', '윤지민']
+
+
+def students(rng, rows):
+    records = []
+    for i in range(rows):
+        college = rng.choice(list(DEPARTMENTS))
+        records.append({
+            '학번': f'{2015 + i % 10}{i:06d}', '이름': rng.choice(NAMES), '단과대학': college,
+            '학과': rng.choice(DEPARTMENTS[college]), '학년': rng.randint(1, 4), '과정구분': '학사',
+            '학적상태': rng.choice(['재학', '휴학', '졸업']), '성별': rng.choice(['남', '여']),
+            '입학년도': 2015 + i % 10,
+        })
+    return pd.DataFrame(records)
+
+
+def publications(rng, rows):
+    records = []
+    for i in range(rows):
+        college = rng.choice(list(DEPARTMENTS))
+        records.append({
+            '논문ID': f'PUB-{i:07d}', '게재일': f'20{rng.randint(15, 24)}-{rng.randint(1, 12):02d}-01',
+            '단과대학': college, '학과': rng.choice(DEPARTMENTS[college]), '논문제목': f'연구 논문 {i}',
+            '주저자': rng.choice(NAMES), '참여저자': ';'.join(rng.sample(NAMES, 2)), '학술지명': 'Journal',
+            '저널등급': rng.choice(['SCIE', 'KCI', 'SCOPUS']), 'Impact Factor': round(rng.uniform(0, 10), 2),
+            '과제연계여부': rng.choice(['Y', 'N']),
+        })
+    return pd.DataFrame(records)
+
+
+def budgets(rng, rows):
+    records = []
+    for i in range(rows):
+        project = i // 20
+        records.append({
+            '집행ID': f'EX-{i:07d}', '과제번호': f'RP-{project:05d}', '과제명': f'과제 {project}',
+            '연구책임자': NAMES[project % len(NAMES)], '소속학과': '컴퓨터공학과', '지원기관': 'NRF',
+            '총연구비': 100000000, '집행일자': f'2023-{rng.randint(1, 12):02d}-15',
+            '집행항목': rng.choice(['인건비', '장비비', '재료비']), '집행금액': rng.randint(1000, 10 ** 7),
+            '상태': '집행완료', '비고': None,
+        })
+    return pd.DataFrame(records)
+
+
+FILES = [(StudentParser, students), (PublicationParser, publications), (ResearchBudgetParser, budgets)]
+FORMATS = {
+    '.csv': lambda df, path: df.to_csv(path, index=False, encoding='utf-8-sig'),
+    '.xlsx': lambda df, path: df.to_excel(path, index=False, engine='openpyxl'),
+}
+
+
+def best_of(repeat, func):
+    """Best wall time of repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    print(f'{args.rows:,} rows per file, best of {args.repeat} (ms)')
+    print(f'  {"file":22} {"engine":10} {"full read":>10} {"header":>8}')
+
+    with tempfile.TemporaryDirectory() as directory:
+        for parser_class, build in FILES:
+            df = build(rng, args.rows)
+            dtype = read_dtypes(parser_class.COLUMN_DTYPES)
+
+            for ext, write in FORMATS.items():
+                path = os.path.join(directory, parser_class.DATA_TYPE + ext)
+                write(df, path)
+                label = os.path.basename(path)
+
+                for engine in ENGINES:
+                    if ext not in engine.extensions:
+                        continue
+                    if not is_installed(engine.module):
+                        print(f'  {label:22} {engine.name:10} {"not installed":>19}')
+                        continue
+                    full = best_of(args.repeat, lambda: read_table(path, dtype=dtype, engine=engine.name))
+                    header = (
+                        f'{best_of(args.repeat, lambda: read_header(path, engine=engine.name)) * 1000:8.1f}'
+                        if engine.reads_header else f'{"-":>8}'
+                    )
+                    print(f'  {label:22} {engine.name:10} {full * 1000:10.1f} {header}')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
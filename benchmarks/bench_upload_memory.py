@@ -0,0 +1,150 @@
+#!/usr/bin/env python
+"""
+Benchmark: memory of a read + cleaned student upload.
+
+Writes a synthetic student CSV and reads and cleans it in a fresh process
+per pipeline. It reports the resident set size (peak and after cleaning,
+above the process baseline) and the DataFrame's own size, per 100k rows:
+
+- inferred: pd.read_csv with inferred (object) dtypes, then df.copy()
+  and a per-cell strip over every object column (the previous pipeline)
+- compact: StudentParser.read_file + clean_data (COLUMN_DTYPES, in-place
+  vectorized strip, integer downcast)
+
+RSS is read from /proc/self/status, so the RSS columns need Linux.
+
+Usage:
+    python benchmarks/bench_upload_memory.py [--rows 200000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+
+import django
+
+# Setup Django environment
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings.test')
+django.setup()
+
+import pandas as pd  # noqa: E402
+
+from apps.data_upload.parsers import StudentParser  # noqa: E402
+
+COLLEGES = {
+    '공과대학': ['컴퓨터공학과', '기계공학과', '전기공학과', '화학공학과', '건축학과'],
+    '자연과학대학': ['수학과', '물리학과', '화학과', '생명과학과'],
+    '인문대학': ['국어국문학과', '영어영문학과', '사학과', '철학과'],
+    '경영대학': ['경영학과', '회계학과'],
+}
+SURNAMES = '김이박최정강조윤장임'
+GIVEN = '민서지현우준영수하은도윤'
+
+
+def write_students(path, rows):
+    """Synthetic student upload with the repetition of a real file."""
+    rng = random.Random(0)
+    records = []
+    for i in range(rows):
+        college = rng.choice(list(COLLEGES))
+        program = rng.choice(['학사'] * 8 + ['석사', '박사'])
+        records.append({
+            '학번': f'{2015 + i % 10}{i:06d}',
+            '이름': rng.choice(SURNAMES) + ''.join(rng.sample(GIVEN, 2)),
+            '단과대학': college,
+            '학과': rng.choice(COLLEGES[college]),
+            '학년': rng.randint(1, 4) if program == '학사' else 0,
+            '과정구분': program,
+            '학적상태': rng.choice(['재학'] * 6 + ['휴학', '졸업']),
+            '성별': rng.choice(['남', '여']),
+            '입학년도': 2015 + i % 10,
+        })
+    pd.DataFrame(records).to_csv(path, index=False, encoding='utf-8-sig')
+
+
+def inferred_pipeline(path):
+    df = pd.read_csv(path, encoding='utf-8-sig')
+    cleaned_df = df.copy()
+    for col in cleaned_df.columns:
+        if cleaned_df[col].dtype == 'object':
+            cleaned_df[col] = cleaned_df[col].apply(lambda x: x.strip() if isinstance(x, str) else x)
+    return cleaned_df
+
+
+def compact_pipeline(path):
+    parser = StudentParser()
+    return parser.clean_data(parser.read_file(path))
+
+
+PIPELINES = {'inferred': inferred_pipeline, 'compact': compact_pipeline}
+
+
+def status_kb(field):
+    """A VmRSS/VmHWM value of this process in KiB (0 off Linux)."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field + ':'):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return 0
+
+
+def measure(name, path):
+    """Run one pipeline in this process and print its memory as JSON."""
+    gc.collect()
+    baseline = status_kb('VmRSS')
+    df = PIPELINES[name](path)
+    gc.collect()
+    print(json.dumps({
+        'peak_kb': status_kb('VmHWM') - baseline,
+        'final_kb': status_kb('VmRSS') - baseline,
+        'frame_bytes': int(df.memory_usage(deep=True).sum()),
+    }))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--rows', type=int, default=200000)
+    parser.add_argument('--measure', choices=list(PIPELINES), help=argparse.SUPPRESS)
+    parser.add_argument('--path', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        measure(args.measure, args.path)
+        return 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'students.csv')
+        write_students(path, args.rows)
+
+        results = {}
+        for name in PIPELINES:
+            output = subprocess.run(
+                [sys.executable, os.path.abspath(__file__), '--measure', name, '--path', path],
+                check=True, capture_output=True, text=True,
+            ).stdout
+            results[name] = json.loads(output.strip().splitlines()[-1])
+
+    per_100k = 100000 / args.rows
+    print(f'{args.rows:,} student rows, MiB per 100k rows')
+    print(f'  {"pipeline":10} {"peak RSS":>10} {"RSS after":>10} {"DataFrame":>10}')
+    for name, result in results.items():
+        print(
+            f'  {name:10} {result["peak_kb"] / 1024 * per_100k:10.1f} '
+            f'{result["final_kb"] / 1024 * per_100k:10.1f} '
+            f'{result["frame_bytes"] / 2 ** 20 * per_100k:10.1f}'
+        )
+    inferred, compact = results['inferred'], results['compact']
+    print(f'  DataFrame {inferred["frame_bytes"] / compact["frame_bytes"]:.1f}x smaller')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -56,6 +56,8 @@ MIDDLEWARE = [
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'apps.core.middleware.SessionValidationMiddleware',  # Custom session validation
+    'apps.core.middleware.ReplicaPinMiddleware',  # Read-your-writes for replica reads
+    'apps.core.middleware.DepartmentScopeMiddleware',  # RLS scope (ANALYTICS_ENFORCE_RLS)
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -100,9 +102,35 @@ else:
         }
     }
 
+# Read replicas for analytics reads (see apps.core.routers). Each becomes a
+# 'replica<N>' alias with the primary's credentials:
+# - PostgreSQL: SUPABASE_REPLICA_HOSTS=host1[:port],host2[:port]
+# - SQLite (local routing tests): DATABASE_REPLICA_NAMES=replica1.sqlite3,...
+_sqlite = DATABASES['default']['ENGINE'].endswith('sqlite3')
+_replicas = os.environ.get('DATABASE_REPLICA_NAMES' if _sqlite else 'SUPABASE_REPLICA_HOSTS', '')
+for _number, _replica in enumerate([value.strip() for value in _replicas.split(',') if value.strip()], 1):
+    if _sqlite:
+        DATABASES[f'replica{_number}'] = {**DATABASES['default'], 'NAME': BASE_DIR / _replica}
+    else:
+        _host, _, _port = _replica.partition(':')
+        DATABASES[f'replica{_number}'] = {**DATABASES['default'], 'HOST': _host, 'PORT': _port or DATABASES['default']['PORT']}
+ANALYTICS_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+DATABASE_ROUTERS = ['apps.core.routers.ReplicaRouter']
+
 # Password validation - Disabled for simplified signup
 AUTH_PASSWORD_VALIDATORS = []
 
+# Password hashing (see apps.authentication.hashers). PBKDF2 iterations of
+# new hashes; unset = Django's default. Stored hashes are rehashed on login.
+PASSWORD_HASH_ITERATIONS = int(os.environ.get('PASSWORD_HASH_ITERATIONS', '0')) or None
+PASSWORD_HASHERS = [
+    'apps.authentication.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
+
 # Internationalization
 LANGUAGE_CODE = 'ko-kr'
 TIME_ZONE = 'Asia/Seoul'
@@ -123,6 +151,87 @@ else:
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Batch upload (multiple files / zip / multi-sheet workbooks)
+# Worker processes used to read and validate upload parts in parallel
+# (1: in the request process). Each web worker process starts its own pool
+# of spawned processes on the first parallel upload and keeps it.
+UPLOAD_PARSE_WORKERS = int(os.environ.get('UPLOAD_PARSE_WORKERS', '1'))
+# Save all parts in one all-or-nothing transaction instead of one per part
+UPLOAD_BATCH_ATOMIC = os.environ.get('UPLOAD_BATCH_ATOMIC', 'False') == 'True'
+
+# Content-addressed archive of uploaded source files (see apps.data_upload.storage)
+UPLOAD_ARCHIVE_BACKEND = os.environ.get(
+    'UPLOAD_ARCHIVE_BACKEND', 'apps.data_upload.storage.LocalArchiveBackend'
+)
+UPLOAD_ARCHIVE_ROOT = os.environ.get('UPLOAD_ARCHIVE_ROOT', str(BASE_DIR / 'upload_archive'))
+# 'auto' (zstd if installed, else gzip), 'zstd' or 'gzip'
+UPLOAD_ARCHIVE_COMPRESSION = os.environ.get('UPLOAD_ARCHIVE_COMPRESSION', 'auto')
+
+# Largest accepted upload file (and zip member), in MB. Uploads are streamed
+# to disk, never held in memory
+UPLOAD_MAX_FILE_SIZE_MB = int(os.environ.get('UPLOAD_MAX_FILE_SIZE_MB', '200'))
+
+# Resumable chunked uploads (see apps.data_upload.chunked): files in progress
+# are written here; uploads idle for CHUNKED_UPLOAD_EXPIRY_HOURS are removed
+CHUNKED_UPLOAD_ROOT = os.environ.get('CHUNKED_UPLOAD_ROOT', str(BASE_DIR / 'upload_chunks'))
+CHUNKED_UPLOAD_CHUNK_SIZE = int(os.environ.get('CHUNKED_UPLOAD_CHUNK_SIZE', str(8 * 1024 * 1024)))
+CHUNKED_UPLOAD_EXPIRY_HOURS = int(os.environ.get('CHUNKED_UPLOAD_EXPIRY_HOURS', '24'))
+
+# Answer aggregator queries from the monthly rollup tables where the filters
+# allow it (see apps.analytics.rollups; backfill with refresh_rollups first)
+ANALYTICS_USE_ROLLUPS = os.environ.get('ANALYTICS_USE_ROLLUPS', 'False') == 'True'
+
+# Answer dashboard tiles (distinct counts, top-K) from HyperLogLog /
+# Count-Min sketches stored per upload (see apps.analytics.sketches)
+ANALYTICS_APPROXIMATE_TILES = os.environ.get('ANALYTICS_APPROXIMATE_TILES', 'False') == 'True'
+
+# Answer aggregator counts/sums/averages from in-process NumPy snapshots of
+# the analytics tables while they are current (see apps.analytics.columnar).
+# The data version is looked up at most every ANALYTICS_COLUMNAR_VERSION_TTL
+# seconds per process, so answers can lag an upload, revert or admin edit by
+# up to that long (0: look it up on every call, never stale)
+ANALYTICS_COLUMNAR_SNAPSHOTS = os.environ.get('ANALYTICS_COLUMNAR_SNAPSHOTS', 'False') == 'True'
+ANALYTICS_COLUMNAR_VERSION_TTL = int(os.environ.get('ANALYTICS_COLUMNAR_VERSION_TTL', '5'))
+
+# Restrict viewers to their own department's rows
+# (see apps.analytics.filters.PermissionScope)
+ANALYTICS_DEPARTMENT_SCOPING = os.environ.get('ANALYTICS_DEPARTMENT_SCOPING', 'False') == 'True'
+
+# Also enforce the scope with PostgreSQL row-level security for every query
+# (needs ANALYTICS_DEPARTMENT_SCOPING; apply supabase/optional/department_rls.sql first)
+ANALYTICS_ENFORCE_RLS = os.environ.get('ANALYTICS_ENFORCE_RLS', 'False') == 'True'
+
+# Login throttling (see apps.authentication.throttling): failed logins per
+# sliding window per client IP and per email and client IP, then exponential
+# backoff.
+# Use a cache shared by all workers (file-based or Redis) in production.
+LOGIN_THROTTLE_CACHE = os.environ.get('LOGIN_THROTTLE_CACHE', 'default')
+LOGIN_THROTTLE_IP_LIMIT = int(os.environ.get('LOGIN_THROTTLE_IP_LIMIT', '20'))
+LOGIN_THROTTLE_IP_WINDOW = int(os.environ.get('LOGIN_THROTTLE_IP_WINDOW', '300'))  # seconds
+LOGIN_THROTTLE_EMAIL_LIMIT = int(os.environ.get('LOGIN_THROTTLE_EMAIL_LIMIT', '5'))
+LOGIN_THROTTLE_EMAIL_WINDOW = int(os.environ.get('LOGIN_THROTTLE_EMAIL_WINDOW', '900'))  # seconds
+LOGIN_THROTTLE_BACKOFF = int(os.environ.get('LOGIN_THROTTLE_BACKOFF', '30'))  # first lockout, seconds
+LOGIN_THROTTLE_MAX_BACKOFF = int(os.environ.get('LOGIN_THROTTLE_MAX_BACKOFF', '3600'))
+# Use the last X-Forwarded-For address (only behind a trusted proxy)
+LOGIN_THROTTLE_TRUST_FORWARDED_FOR = os.environ.get('LOGIN_THROTTLE_TRUST_FORWARDED_FOR', 'False') == 'True'
+# Hash the password of logins with unknown emails too, so they take as long
+# as wrong passwords and response times don't reveal which emails exist.
+# Costs one full password hash of CPU per such attempt (an unauthenticated
+# client can make every one of them pay it, up to the throttle limits).
+LOGIN_EQUALIZE_TIMING = os.environ.get('LOGIN_EQUALIZE_TIMING', 'False') == 'True'
+
+# Admin changelists of tables with more (estimated) rows skip exact
+# COUNT(*) totals (see apps.data_upload.admin)
+ADMIN_FULL_COUNT_THRESHOLD = int(os.environ.get('ADMIN_FULL_COUNT_THRESHOLD', '100000'))
+
+# Replica routing: a user's analytics reads stay on the primary for this
+# many seconds after they wrote analytics data (read-your-writes), and
+# replicas lagging more than REPLICA_MAX_LAG_SECONDS are skipped (checked
+# every REPLICA_LAG_CHECK_INTERVAL seconds per process)
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', '30'))
+REPLICA_MAX_LAG_SECONDS = float(os.environ.get('REPLICA_MAX_LAG_SECONDS', '10'))
+REPLICA_LAG_CHECK_INTERVAL = float(os.environ.get('REPLICA_LAG_CHECK_INTERVAL', '5'))
+
 # Default primary key field type
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
@@ -58,6 +58,19 @@ else:
         }
     }
 
+# Read replicas (see apps.core.routers): DATABASE_REPLICA_URLS (comma
+# separated URLs) and/or SUPABASE_REPLICA_HOSTS (host[:port] with the
+# primary's credentials)
+DATABASES = {'default': DATABASES['default']}
+_replica_urls = [url.strip() for url in os.environ.get('DATABASE_REPLICA_URLS', '').split(',') if url.strip()]
+_replica_hosts = [host.strip() for host in os.environ.get('SUPABASE_REPLICA_HOSTS', '').split(',') if host.strip()]
+for _number, _url in enumerate(_replica_urls, 1):
+    DATABASES[f'replica{_number}'] = dj_database_url.parse(_url, conn_max_age=600, conn_health_checks=True)
+for _number, _replica in enumerate(_replica_hosts, len(_replica_urls) + 1):
+    _host, _, _port = _replica.partition(':')
+    DATABASES[f'replica{_number}'] = {**DATABASES['default'], 'HOST': _host, 'PORT': _port or DATABASES['default'].get('PORT')}
+ANALYTICS_REPLICAS = [alias for alias in DATABASES if alias != 'default']
+
 # Email configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = os.environ.get('EMAIL_HOST', 'smtp.gmail.com')
@@ -11,14 +11,28 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'test_db.sqlite3',
-    }
+    },
+    # Stand-in read replica for the router tests: mirrors the test database
+    'replica': {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': BASE_DIR / 'test_db.sqlite3',
+        'TEST': {'MIRROR': 'default'},
+    },
 }
 
+# Analytics reads stay on the primary; router tests enable the replica
+ANALYTICS_REPLICAS = []
+
 # Speed up tests
 PASSWORD_HASHERS = [
     'django.contrib.auth.hashers.MD5PasswordHasher',  # Faster for tests
 ]
 
+# Every test client logs in from 127.0.0.1 and the locmem cache outlives
+# single tests; throttling tests override these limits
+LOGIN_THROTTLE_IP_LIMIT = 100000
+LOGIN_THROTTLE_EMAIL_LIMIT = 100000
+
 # Test-specific settings
 DEBUG = True  # Enable DEBUG for better error messages in tests
 TEMPLATE_DEBUG = True
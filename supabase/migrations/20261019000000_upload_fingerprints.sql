@@ -0,0 +1,23 @@
+-- ============================================================
+-- 증분 업로드 (Incremental upload diffing)
+-- Created: 2026-10-19
+-- ============================================================
+
+-- 데이터 타입별 행 지문 (row_key → 내용 해시)
+CREATE TABLE upload_fingerprints (
+    id BIGSERIAL PRIMARY KEY,
+    data_type VARCHAR(50) NOT NULL CHECK (data_type IN ('department_kpi', 'publication', 'research_budget', 'student')),
+    row_key VARCHAR(255) NOT NULL,
+    row_hash VARCHAR(16) NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_fingerprint_type_key UNIQUE (data_type, row_key)
+);
+
+COMMENT ON TABLE upload_fingerprints IS '증분 업로드용 행 단위 내용 지문';
+COMMENT ON COLUMN upload_fingerprints.row_key IS '행 키 (논문ID, 학번, 집행ID, KPI는 평가년도|단과대학|학과)';
+COMMENT ON COLUMN upload_fingerprints.row_hash IS '행 내용 64비트 해시 (16진수)';
+
+-- 업로드 이력에 변경 요약 추가
+ALTER TABLE upload_history ADD COLUMN diff_summary JSONB;
+
+COMMENT ON COLUMN upload_history.diff_summary IS '증분 업로드 변경 요약 (inserted, changed, deleted, unchanged)';
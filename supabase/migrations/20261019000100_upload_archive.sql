@@ -0,0 +1,14 @@
+-- ============================================================
+-- 업로드 원본 파일 보관소 (Content-addressed upload archive)
+-- Created: 2026-10-19
+-- ============================================================
+
+-- 보관된 원본 파일의 SHA-256 및 시트명 (여러 시트 워크북의 경우)
+ALTER TABLE upload_history ADD COLUMN content_hash VARCHAR(64);
+ALTER TABLE upload_history ADD COLUMN sheet_name VARCHAR(255);
+
+-- 중복 업로드 탐지 (해시 + 시트 + 상태)
+CREATE INDEX idx_upload_content_hash ON upload_history(content_hash, sheet_name, status);
+
+COMMENT ON COLUMN upload_history.content_hash IS '보관된 원본 파일 SHA-256';
+COMMENT ON COLUMN upload_history.sheet_name IS '워크북 시트명 (여러 시트 업로드 시)';
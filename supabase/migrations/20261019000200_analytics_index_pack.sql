@@ -0,0 +1,89 @@
+-- ============================================================
+-- 분석 쿼리 인덱스 팩 (Analytics index pack)
+-- Created: 2026-10-19
+--
+-- Composite, covering (INCLUDE) and expression indexes matching the
+-- query shapes of apps/analytics (aggregators, views, v_* views).
+-- Verified with apps/analytics/query_plans.py (EXPLAIN harness).
+-- ============================================================
+
+-- ------------------------------------------------------------
+-- 중복 인덱스 제거
+-- ------------------------------------------------------------
+
+-- idx_exec_project와 동일 (project_id); 아래 idx_exec_project_amount로 대체
+DROP INDEX IF EXISTS idx_exec_project_fk;
+DROP INDEX IF EXISTS idx_exec_project;
+
+-- idx_upload_user_date(user_id, upload_date)의 선두 컬럼과 동일
+DROP INDEX IF EXISTS idx_upload_user_fk;
+
+-- ------------------------------------------------------------
+-- department_kpi
+-- ------------------------------------------------------------
+
+-- 대시보드: 학과별 최신 평가년도(Max) 조회 후 취업률 조회 (index-only)
+CREATE INDEX IF NOT EXISTS idx_dept_kpi_dept_year
+    ON department_kpi(department, evaluation_year DESC)
+    INCLUDE (employment_rate);
+
+-- ------------------------------------------------------------
+-- publications
+-- ------------------------------------------------------------
+
+-- 학과별 논문 수 (GROUP BY department; idx_pub_college_dept는 college가 선두)
+-- 및 학과 + 게재일 범위 조회
+CREATE INDEX IF NOT EXISTS idx_pub_dept_date
+    ON publications(department, publication_date);
+
+-- 저널등급별 분포 / 평균 Impact Factor (index-only); idx_pub_journal_grade 대체
+CREATE INDEX IF NOT EXISTS idx_pub_grade_if
+    ON publications(journal_grade)
+    INCLUDE (impact_factor);
+DROP INDEX IF EXISTS idx_pub_journal_grade;
+
+-- v_publication_stats: 뷰의 GROUP BY 식과 동일한 식 인덱스 (index-only)
+CREATE INDEX IF NOT EXISTS idx_pub_year_expr
+    ON publications ((EXTRACT(YEAR FROM publication_date)), college, department, journal_grade)
+    INCLUDE (impact_factor, project_linked);
+
+-- ------------------------------------------------------------
+-- research_projects / execution_records
+-- ------------------------------------------------------------
+
+-- 학과별 연구비 합계 (index-only); idx_project_department 대체
+CREATE INDEX IF NOT EXISTS idx_project_dept_budget
+    ON research_projects(department)
+    INCLUDE (total_budget);
+DROP INDEX IF EXISTS idx_project_department;
+
+-- v_project_execution_rate: 과제별 집행금액 합계 (index-only)
+CREATE INDEX IF NOT EXISTS idx_exec_project_amount
+    ON execution_records(project_id)
+    INCLUDE (amount);
+
+-- 집행항목별 금액 합계 (index-only); idx_exec_expense_category 대체
+CREATE INDEX IF NOT EXISTS idx_exec_category_amount
+    ON execution_records(expense_category)
+    INCLUDE (amount);
+DROP INDEX IF EXISTS idx_exec_expense_category;
+
+-- ------------------------------------------------------------
+-- students
+-- ------------------------------------------------------------
+
+-- v_department_student_stats: 학과별 조건부 집계 (index-only); idx_student_college_dept 대체
+CREATE INDEX IF NOT EXISTS idx_student_dept_stats
+    ON students(college, department)
+    INCLUDE (enrollment_status, gender, program_type);
+DROP INDEX IF EXISTS idx_student_college_dept;
+
+-- 과정구분별 분포
+CREATE INDEX IF NOT EXISTS idx_student_program
+    ON students(program_type);
+
+ANALYZE department_kpi;
+ANALYZE publications;
+ANALYZE research_projects;
+ANALYZE execution_records;
+ANALYZE students;
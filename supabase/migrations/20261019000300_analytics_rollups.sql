@@ -0,0 +1,85 @@
+-- ============================================================
+-- 월별 집계 테이블 (Monthly rollups)
+-- Created: 2026-10-19
+--
+-- 추이 차트용 사전 집계. 업로드 시 변경된 월만 기본 테이블에서
+-- 다시 집계된다 (apps/analytics/rollups.py).
+-- ============================================================
+
+-- ------------------------------------------------------------
+-- 월별 논문 집계 (publication_rollups)
+-- ------------------------------------------------------------
+CREATE TABLE publication_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    period_month DATE NOT NULL CHECK (EXTRACT(DAY FROM period_month) = 1),
+    college VARCHAR(100) NOT NULL,
+    department VARCHAR(100) NOT NULL,
+    journal_grade VARCHAR(20) NOT NULL DEFAULT '',
+    publication_count INTEGER NOT NULL,
+    impact_factor_sum NUMERIC(14,2) NOT NULL DEFAULT 0,
+    impact_factor_count INTEGER NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_pub_rollup_key UNIQUE (period_month, college, department, journal_grade)
+);
+
+CREATE INDEX idx_pub_rollup_dept_month ON publication_rollups(department, period_month);
+
+COMMENT ON TABLE publication_rollups IS '월별 논문 집계 (단과대학/학과/저널등급별)';
+COMMENT ON COLUMN publication_rollups.period_month IS '기준월 (매월 1일)';
+COMMENT ON COLUMN publication_rollups.journal_grade IS '저널등급 (등급 없음은 빈 문자열)';
+COMMENT ON COLUMN publication_rollups.impact_factor_sum IS 'Impact Factor 합계';
+COMMENT ON COLUMN publication_rollups.impact_factor_count IS 'Impact Factor 보유 논문 수 (평균 = 합계 / 건수)';
+
+-- ------------------------------------------------------------
+-- 월별 집행 집계 (execution_rollups)
+-- ------------------------------------------------------------
+CREATE TABLE execution_rollups (
+    id BIGSERIAL PRIMARY KEY,
+    period_month DATE NOT NULL CHECK (EXTRACT(DAY FROM period_month) = 1),
+    department VARCHAR(100) NOT NULL,
+    expense_category VARCHAR(100) NOT NULL,
+    record_count INTEGER NOT NULL,
+    amount_sum BIGINT NOT NULL,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_exec_rollup_key UNIQUE (period_month, department, expense_category)
+);
+
+CREATE INDEX idx_exec_rollup_category_month ON execution_rollups(expense_category, period_month);
+
+COMMENT ON TABLE execution_rollups IS '월별 연구비 집행 집계 (과제 소속학과/집행항목별)';
+COMMENT ON COLUMN execution_rollups.period_month IS '기준월 (매월 1일)';
+COMMENT ON COLUMN execution_rollups.amount_sum IS '집행금액 합계';
+
+-- ------------------------------------------------------------
+-- 기존 데이터 백필
+-- ------------------------------------------------------------
+INSERT INTO publication_rollups (
+    period_month, college, department, journal_grade,
+    publication_count, impact_factor_sum, impact_factor_count
+)
+SELECT
+    date_trunc('month', publication_date)::date,
+    college,
+    department,
+    COALESCE(journal_grade, ''),
+    COUNT(*),
+    COALESCE(SUM(impact_factor), 0),
+    COUNT(impact_factor)
+FROM publications
+GROUP BY 1, 2, 3, 4;
+
+INSERT INTO execution_rollups (
+    period_month, department, expense_category, record_count, amount_sum
+)
+SELECT
+    date_trunc('month', e.execution_date)::date,
+    p.department,
+    e.expense_category,
+    COUNT(*),
+    SUM(e.amount)
+FROM execution_records e
+JOIN research_projects p ON p.id = e.project_id
+GROUP BY 1, 2, 3;
+
+ANALYZE publication_rollups;
+ANALYZE execution_rollups;
@@ -0,0 +1,63 @@
+-- ============================================================
+-- 논문 검색 인덱스 (Publication full-text search)
+-- Created: 2026-10-19
+--
+-- 논문제목 / 주저자 / 학술지명 검색용 GIN 표현식 인덱스.
+-- 한국어는 형태소 분석기 없이 검색할 수 있도록 단어별 2-gram(bigram)
+-- 토큰으로 tsvector를 만든다. pg_trgm의 3-gram은 2음절 단어(예: '반도')를
+-- 인덱스로 찾을 수 없으므로 사용하지 않는다.
+--
+-- 가중치: 논문제목 A, 주저자 B, 학술지명 C (ts_rank 순위에 반영)
+-- 검색 API: apps/analytics/search.py (SQLite 테스트는 Python n-gram 인덱스 사용)
+-- ============================================================
+
+-- ------------------------------------------------------------
+-- 토큰화: 소문자 변환 후 영숫자/한글 이외 문자로 단어 분리,
+-- 단어별 중복 없는 2-gram (1글자 단어는 그대로)
+-- apps.analytics.search.bigrams()와 동일한 규칙
+-- ------------------------------------------------------------
+CREATE OR REPLACE FUNCTION search_bigrams(value TEXT)
+RETURNS TEXT[] AS $$
+    SELECT COALESCE(array_agg(DISTINCT gram), '{}')
+    FROM (
+        SELECT CASE
+                   WHEN char_length(word) = 1 THEN word
+                   ELSE substr(word, i, 2)
+               END AS gram
+        FROM regexp_split_to_table(lower(COALESCE(value, '')), '[^[:alnum:]가-힣]+') AS word,
+             generate_series(1, GREATEST(char_length(word) - 1, 1)) AS i
+        WHERE word <> ''
+    ) grams
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+COMMENT ON FUNCTION search_bigrams(TEXT) IS '검색용 단어별 2-gram 토큰';
+
+-- 논문 검색 벡터 (인덱스 표현식과 검색 조건에서 동일하게 사용)
+CREATE OR REPLACE FUNCTION publication_search_vector(title TEXT, first_author TEXT, journal_name TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(array_to_tsvector(search_bigrams(title)), 'A')
+        || setweight(array_to_tsvector(search_bigrams(first_author)), 'B')
+        || setweight(array_to_tsvector(search_bigrams(journal_name)), 'C')
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+COMMENT ON FUNCTION publication_search_vector(TEXT, TEXT, TEXT) IS '논문 검색 tsvector (제목 A, 주저자 B, 학술지명 C)';
+
+-- 검색어의 모든 2-gram을 포함 (AND); 토큰이 없으면 NULL
+CREATE OR REPLACE FUNCTION publication_search_query(value TEXT)
+RETURNS tsquery AS $$
+    SELECT string_agg(quote_literal(gram), ' & ')::tsquery
+    FROM unnest(search_bigrams(value)) AS gram
+$$ LANGUAGE sql IMMUTABLE PARALLEL SAFE;
+
+COMMENT ON FUNCTION publication_search_query(TEXT) IS '논문 검색 tsquery (검색어 2-gram AND)';
+
+-- ------------------------------------------------------------
+-- GIN 표현식 인덱스
+-- WHERE publication_search_vector(title, first_author, journal_name)
+--       @@ publication_search_query('...')
+-- ------------------------------------------------------------
+CREATE INDEX IF NOT EXISTS idx_pub_search
+    ON publications
+    USING GIN (publication_search_vector(title, first_author, journal_name));
+
+ANALYZE publications;
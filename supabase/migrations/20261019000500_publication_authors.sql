@@ -0,0 +1,97 @@
+-- ============================================================
+-- 저자 색인 (Publication author index)
+-- Created: 2026-10-19
+--
+-- publications.first_author / co_authors(세미콜론 구분)를 정규화한
+-- 저자 테이블과 논문-저자 연결 테이블. 업로드 시 PublicationParser가
+-- 일괄 생성한다 (apps/analytics/authors.py). 저자별 논문 수, 공동연구
+-- 네트워크, 학과 간 공동연구 행렬은 이 테이블의 인덱스로 조회한다.
+--
+-- 저자명 정규화: 앞뒤 공백 제거, 연속 공백은 한 칸, 최대 100자
+-- (apps.analytics.authors.normalize_author_name과 동일)
+-- ============================================================
+
+-- ------------------------------------------------------------
+-- 저자 (authors)
+-- ------------------------------------------------------------
+CREATE TABLE authors (
+    id BIGSERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    department VARCHAR(100),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    CONSTRAINT uq_author_name UNIQUE (name)
+);
+
+CREATE INDEX idx_author_department ON authors(department) INCLUDE (name);
+
+COMMENT ON TABLE authors IS '저자 (주저자/참여저자 정규화)';
+COMMENT ON COLUMN authors.department IS '가장 최근 주저자 논문의 학과 (참여저자로만 등장하면 NULL)';
+
+-- ------------------------------------------------------------
+-- 논문-저자 연결 (publication_authors)
+-- ------------------------------------------------------------
+CREATE TABLE publication_authors (
+    id BIGSERIAL PRIMARY KEY,
+    publication_id BIGINT NOT NULL,
+    author_id BIGINT NOT NULL,
+    position SMALLINT NOT NULL,
+    CONSTRAINT uq_pub_author UNIQUE (publication_id, author_id),
+    CONSTRAINT fk_pub_author_publication
+        FOREIGN KEY (publication_id) REFERENCES publications(id) ON DELETE CASCADE,
+    CONSTRAINT fk_pub_author_author
+        FOREIGN KEY (author_id) REFERENCES authors(id) ON DELETE CASCADE
+);
+
+-- 저자별 논문 수 / 저자별 논문 목록 (index-only)
+-- uq_pub_author(publication_id, author_id)는 공동저자 self-join에 사용
+CREATE INDEX idx_pub_author_author ON publication_authors(author_id, position) INCLUDE (publication_id);
+
+COMMENT ON TABLE publication_authors IS '논문-저자 연결';
+COMMENT ON COLUMN publication_authors.publication_id IS 'publications.id (논문ID 아님)';
+COMMENT ON COLUMN publication_authors.position IS '저자 순서 (0 = 주저자, 1.. = 참여저자 내 순서)';
+
+-- ------------------------------------------------------------
+-- 기존 데이터 백필
+-- ------------------------------------------------------------
+CREATE TEMPORARY TABLE author_names AS
+SELECT publication_id, name, MIN(position) AS position
+FROM (
+    SELECT p.id AS publication_id,
+           left(btrim(regexp_replace(p.first_author, '\s+', ' ', 'g')), 100) AS name,
+           0 AS position
+    FROM publications p
+    UNION ALL
+    SELECT p.id,
+           left(btrim(regexp_replace(c.name, '\s+', ' ', 'g')), 100),
+           c.position::INTEGER
+    FROM publications p,
+         regexp_split_to_table(p.co_authors, ';') WITH ORDINALITY AS c(name, position)
+) names
+WHERE name <> ''
+GROUP BY publication_id, name;
+
+INSERT INTO authors (name)
+SELECT DISTINCT name FROM author_names
+ON CONFLICT (name) DO NOTHING;
+
+INSERT INTO publication_authors (publication_id, author_id, position)
+SELECT n.publication_id, a.id, n.position
+FROM author_names n
+JOIN authors a ON a.name = n.name
+ON CONFLICT (publication_id, author_id) DO NOTHING;
+
+UPDATE authors a
+SET department = latest.department
+FROM (
+    SELECT DISTINCT ON (pa.author_id) pa.author_id, p.department
+    FROM publication_authors pa
+    JOIN publications p ON p.id = pa.publication_id
+    WHERE pa.position = 0
+    ORDER BY pa.author_id, p.publication_date DESC, p.id DESC
+) latest
+WHERE a.id = latest.author_id;
+
+DROP TABLE author_names;
+
+ANALYZE authors;
+ANALYZE publication_authors;
@@ -0,0 +1,30 @@
+-- ============================================================
+-- 근사 집계 스케치 (Approximate-count sketches)
+-- Created: 2026-10-19
+--
+-- 대시보드 타일(학과 수, 주저자별 논문 수 상위)을 HyperLogLog /
+-- Count-Min 스케치로 근사 계산한다. 업로드 성공 시마다 새 버전이
+-- 저장되고 최근 3개 버전만 유지된다 (apps/analytics/sketches.py).
+-- 오차 범위는 apps/analytics/sketches.py 참조.
+-- ============================================================
+
+CREATE TABLE data_sketches (
+    id BIGSERIAL PRIMARY KEY,
+    name VARCHAR(100) NOT NULL,
+    kind VARCHAR(20) NOT NULL CHECK (kind IN ('hll', 'cms_topk')),
+    upload_id BIGINT REFERENCES upload_history(id) ON DELETE SET NULL,
+    row_count BIGINT NOT NULL,
+    metadata JSONB NOT NULL DEFAULT '{}',
+    payload BYTEA NOT NULL,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+-- 스케치별 최신 버전 조회 (ORDER BY id DESC LIMIT 1)
+CREATE INDEX idx_sketch_name_id ON data_sketches(name, id DESC);
+
+COMMENT ON TABLE data_sketches IS '근사 집계 스케치 (데이터 버전별)';
+COMMENT ON COLUMN data_sketches.name IS '스케치명 (예: publication.first_author)';
+COMMENT ON COLUMN data_sketches.kind IS 'hll: 고유값 수, cms_topk: 상위 K 빈도';
+COMMENT ON COLUMN data_sketches.upload_id IS '버전을 만든 업로드 (재구성 시 NULL)';
+COMMENT ON COLUMN data_sketches.row_count IS '스케치에 반영된 행 수';
+COMMENT ON COLUMN data_sketches.metadata IS '스케치 파라미터 및 상위 K 후보';
@@ -0,0 +1,46 @@
+-- ============================================================
+-- 업로드 배치 ID (Upload batch ids for fast rollback)
+-- Created: 2026-10-19
+--
+-- 업로드로 삽입된 행에 업로드 이력 ID(upload_batch_id)를 기록해 잘못된
+-- 업로드를 배치 단위로 되돌린다 (apps/data_upload/revert.py,
+-- manage.py revert_upload, 업로드 이력 admin 액션).
+-- 되돌릴 때는 upload_batch_id 인덱스로 행을 찾아 청크 단위로 삭제한다.
+-- 업로드 이전부터 있던 행과 admin에서 추가한 행은 NULL이다.
+-- supabase/optional/partition_by_year.sql이 먼저 적용된 경우 파티션 테이블에
+-- 이미 컬럼이 있으므로 IF NOT EXISTS로 건너뛴다.
+-- ============================================================
+
+-- 되돌린 업로드 상태
+ALTER TABLE upload_history DROP CONSTRAINT IF EXISTS upload_history_status_check;
+ALTER TABLE upload_history ADD CONSTRAINT upload_history_status_check
+    CHECK (status IN ('success', 'failed', 'reverted'));
+
+COMMENT ON COLUMN upload_history.status IS '처리 상태 (success, failed, reverted)';
+
+-- ------------------------------------------------------------
+-- 배치 ID 컬럼 (NULL 허용 컬럼 추가는 테이블 재작성 없이 즉시 완료)
+-- ------------------------------------------------------------
+ALTER TABLE department_kpi ADD COLUMN IF NOT EXISTS upload_batch_id BIGINT
+    REFERENCES upload_history(id) ON DELETE SET NULL;
+ALTER TABLE publications ADD COLUMN IF NOT EXISTS upload_batch_id BIGINT
+    REFERENCES upload_history(id) ON DELETE SET NULL;
+ALTER TABLE research_projects ADD COLUMN IF NOT EXISTS upload_batch_id BIGINT
+    REFERENCES upload_history(id) ON DELETE SET NULL;
+ALTER TABLE execution_records ADD COLUMN IF NOT EXISTS upload_batch_id BIGINT
+    REFERENCES upload_history(id) ON DELETE SET NULL;
+ALTER TABLE students ADD COLUMN IF NOT EXISTS upload_batch_id BIGINT
+    REFERENCES upload_history(id) ON DELETE SET NULL;
+
+-- 배치별 행 조회 (되돌리기, 업로드 이력 삭제 시 SET NULL)
+CREATE INDEX IF NOT EXISTS idx_kpi_upload_batch ON department_kpi(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_pub_upload_batch ON publications(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_project_upload_batch ON research_projects(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_exec_upload_batch ON execution_records(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS idx_student_upload_batch ON students(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+
+COMMENT ON COLUMN department_kpi.upload_batch_id IS '행을 삽입한 업로드 (upload_history.id)';
+COMMENT ON COLUMN publications.upload_batch_id IS '행을 삽입한 업로드 (upload_history.id)';
+COMMENT ON COLUMN research_projects.upload_batch_id IS '과제를 처음 생성한 업로드 (upload_history.id)';
+COMMENT ON COLUMN execution_records.upload_batch_id IS '행을 삽입한 업로드 (upload_history.id)';
+COMMENT ON COLUMN students.upload_batch_id IS '행을 삽입한 업로드 (upload_history.id)';
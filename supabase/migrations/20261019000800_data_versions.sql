@@ -0,0 +1,23 @@
+-- ============================================================
+-- 데이터 버전 (Per-data-type data versions)
+-- Created: 2026-10-19
+--
+-- 데이터 타입별 변경 카운터. 업로드, 업로드 되돌리기, 파티션 분리,
+-- admin 편집이 같은 트랜잭션에서 version을 1 증가시킨다
+-- (apps/analytics/versions.py). admin 필터 선택지 캐시와 컬럼형
+-- 스냅샷(apps/analytics/columnar.py)이 버전으로 갱신 여부를 판단하므로
+-- 모든 워커 프로세스가 같은 버전을 본다.
+-- ============================================================
+
+CREATE TABLE data_versions (
+    data_type VARCHAR(50) PRIMARY KEY
+        CHECK (data_type IN ('department_kpi', 'publication', 'research_budget', 'student')),
+    version BIGINT NOT NULL DEFAULT 0,
+    updated_at TIMESTAMP NOT NULL DEFAULT NOW()
+);
+
+INSERT INTO data_versions (data_type)
+VALUES ('department_kpi'), ('publication'), ('research_budget'), ('student');
+
+COMMENT ON TABLE data_versions IS '데이터 타입별 변경 카운터 (캐시 무효화)';
+COMMENT ON COLUMN data_versions.version IS '데이터 변경 시마다 1 증가';
@@ -0,0 +1,15 @@
+-- ============================================================
+-- 진행 중인 업로드 상태 (In-progress upload status)
+-- Created: 2026-10-19
+--
+-- 스테이징 업로드(apps/data_upload/staging.py)는 적재 행이 참조할 업로드
+-- 이력을 먼저 만들고 교체와 함께 'success'로 바꾼다. 그동안의 상태를
+-- 'failed'가 아닌 'in_progress'로 기록한다. 적재가 실패하면 행은 삭제되고
+-- 실패 이력이 따로 기록된다.
+-- ============================================================
+
+ALTER TABLE upload_history DROP CONSTRAINT IF EXISTS upload_history_status_check;
+ALTER TABLE upload_history ADD CONSTRAINT upload_history_status_check
+    CHECK (status IN ('success', 'failed', 'reverted', 'in_progress'));
+
+COMMENT ON COLUMN upload_history.status IS '처리 상태 (success, failed, reverted, in_progress)';
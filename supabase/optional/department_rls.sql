@@ -0,0 +1,94 @@
+-- ============================================================
+-- 학과 단위 행 수준 보안 (Optional: department row-level security)
+-- Created: 2026-10-19
+--
+-- 요청 사용자의 PermissionScope(apps/analytics/filters.py)를 데이터베이스가
+-- 직접 적용하도록 분석 테이블에 RLS 정책을 만든다. 선택 적용 스크립트이므로
+-- supabase/migrations에 두지 않는다. 적용:
+--
+--     psql "$DATABASE_URL" -f supabase/optional/department_rls.sql
+--
+-- 이후 ANALYTICS_DEPARTMENT_SCOPING=True, ANALYTICS_ENFORCE_RLS=True로 설정하면
+-- DepartmentScopeMiddleware가 요청마다 app.departments 설정에 허용 학과
+-- 배열(text[] 리터럴, 예: '{컴퓨터공학과}')을 넣고 요청이 끝나면 RESET한다.
+--
+-- - app.departments 미설정(관리 명령, 업로드, admin/manager): 모든 행
+-- - '{}': 행 없음
+-- - 테이블 소유자(Django 접속 계정)에게도 적용되도록 FORCE ROW LEVEL SECURITY
+--   (슈퍼유저와 BYPASSRLS 역할에는 적용되지 않는다)
+-- - 허용 학과 배열은 (SELECT ...) 서브쿼리로 질의당 한 번만 계산된다 (InitPlan)
+-- - 뷰는 security_invoker(PostgreSQL 15+)로 바꿔 조회자 권한으로 정책이 적용되게 한다
+-- ============================================================
+
+BEGIN;
+
+-- ------------------------------------------------------------
+-- 허용 학과 (NULL = 제한 없음)
+-- ------------------------------------------------------------
+CREATE OR REPLACE FUNCTION app_scope_departments()
+RETURNS TEXT[] AS $$
+    SELECT NULLIF(current_setting('app.departments', true), '')::TEXT[];
+$$ LANGUAGE sql STABLE;
+
+COMMENT ON FUNCTION app_scope_departments() IS '요청 사용자의 허용 학과 (NULL = 제한 없음)';
+
+-- ------------------------------------------------------------
+-- department 컬럼이 있는 테이블
+-- ------------------------------------------------------------
+DO $$
+DECLARE
+    t TEXT;
+BEGIN
+    FOREACH t IN ARRAY ARRAY[
+        'department_kpi', 'publications', 'research_projects', 'students',
+        'publication_rollups', 'execution_rollups'
+    ]
+    LOOP
+        IF to_regclass(t) IS NULL THEN
+            CONTINUE;
+        END IF;
+        EXECUTE format('ALTER TABLE %I ENABLE ROW LEVEL SECURITY', t);
+        EXECUTE format('ALTER TABLE %I FORCE ROW LEVEL SECURITY', t);
+        EXECUTE format('DROP POLICY IF EXISTS department_scope ON %I', t);
+        EXECUTE format(
+            'CREATE POLICY department_scope ON %I USING ('
+            '(SELECT app_scope_departments()) IS NULL '
+            'OR department = ANY ((SELECT app_scope_departments())))',
+            t
+        );
+    END LOOP;
+END $$;
+
+-- ------------------------------------------------------------
+-- 학과를 부모 행으로 판단하는 테이블
+-- 부모 테이블의 정책이 서브쿼리에도 적용된다.
+-- ------------------------------------------------------------
+ALTER TABLE execution_records ENABLE ROW LEVEL SECURITY;
+ALTER TABLE execution_records FORCE ROW LEVEL SECURITY;
+DROP POLICY IF EXISTS department_scope ON execution_records;
+CREATE POLICY department_scope ON execution_records USING (
+    (SELECT app_scope_departments()) IS NULL
+    OR project_id IN (SELECT id FROM research_projects)
+);
+
+DO $$
+BEGIN
+    IF to_regclass('publication_authors') IS NOT NULL THEN
+        ALTER TABLE publication_authors ENABLE ROW LEVEL SECURITY;
+        ALTER TABLE publication_authors FORCE ROW LEVEL SECURITY;
+        DROP POLICY IF EXISTS department_scope ON publication_authors;
+        CREATE POLICY department_scope ON publication_authors USING (
+            (SELECT app_scope_departments()) IS NULL
+            OR publication_id IN (SELECT id FROM publications)
+        );
+    END IF;
+END $$;
+
+-- ------------------------------------------------------------
+-- 뷰: 조회자 권한으로 실행 (정책 적용)
+-- ------------------------------------------------------------
+ALTER VIEW v_project_execution_rate SET (security_invoker = true);
+ALTER VIEW v_department_student_stats SET (security_invoker = true);
+ALTER VIEW v_publication_stats SET (security_invoker = true);
+
+COMMIT;
@@ -0,0 +1,325 @@
+-- ============================================================
+-- 연도별 범위 파티셔닝 (Optional: yearly range partitioning)
+-- Created: 2026-10-19
+--
+-- execution_records를 execution_date로, publications를 publication_date로
+-- 연도별 범위 파티셔닝한다. 선택 적용 마이그레이션이므로
+-- supabase/migrations에 두지 않는다. 적용:
+--
+--     psql "$DATABASE_URL" -f supabase/optional/partition_by_year.sql
+--
+-- 기존 데이터는 연도별 파티션으로 복사되고 다음 연도 파티션이 함께 생성된다.
+-- 이후 파티션 생성/분리/보관은 manage.py manage_partitions 로 한다
+-- (apps/analytics/partitions.py). 업로드 시 필요한 연도 파티션은 자동 생성된다.
+--
+-- 제약 조건 변경:
+-- - 파티션 테이블의 PK/UNIQUE에는 파티션 키가 포함되어야 하므로
+--   PK는 (id, 날짜), 업무 키 UNIQUE는 (execution_id/publication_id, 날짜)가 된다.
+-- - 업무 키의 전역 유일성은 파티션하지 않은 키 테이블(execution_record_keys,
+--   publication_keys)의 PK가 보장한다. 부모 테이블의 문장 단위 트리거가
+--   INSERT/UPDATE/DELETE된 행의 키를 같은 트랜잭션에서 반영하므로, 다른
+--   날짜로 같은 키를 넣으면 키 테이블 PK 위반(unique_violation)으로 실패한다.
+--   트리거는 부모 테이블에 대한 문장에만 동작하므로 파티션에 직접 쓰지 않는다
+--   (파티션 분리 시 키 삭제는 manage_partitions detach가 담당한다).
+-- - id는 기존 시퀀스를 그대로 사용한다.
+-- - publication_authors → publications FK는 제거된다 (연결 행은 애플리케이션이 정리).
+-- - upload_batch_id(20261019000700)는 마지막 컬럼으로 만든다. 마이그레이션 적용
+--   전이면 기존 행은 NULL로 복사된다.
+-- ============================================================
+
+BEGIN;
+
+-- ------------------------------------------------------------
+-- 연도 파티션 생성 함수
+-- 기본(default) 파티션에 해당 연도 행이 있으면 새 파티션으로 옮긴다.
+-- ------------------------------------------------------------
+CREATE OR REPLACE FUNCTION create_year_partition(parent TEXT, partition_year INTEGER)
+RETURNS TEXT AS $$
+DECLARE
+    partition_name TEXT := format('%s_y%s', parent, partition_year);
+    default_name TEXT := parent || '_default';
+    range_start DATE := make_date(partition_year, 1, 1);
+    range_end DATE := make_date(partition_year + 1, 1, 1);
+    date_column TEXT;
+BEGIN
+    IF to_regclass(partition_name) IS NOT NULL THEN
+        RETURN partition_name;
+    END IF;
+
+    SELECT a.attname INTO date_column
+    FROM pg_partitioned_table pt
+    JOIN pg_attribute a ON a.attrelid = pt.partrelid AND a.attnum = pt.partattrs[0]
+    WHERE pt.partrelid = parent::regclass;
+
+    IF date_column IS NULL THEN
+        RAISE EXCEPTION '% is not a partitioned table', parent;
+    END IF;
+
+    IF to_regclass(default_name) IS NOT NULL THEN
+        EXECUTE format('ALTER TABLE %I DETACH PARTITION %I', parent, default_name);
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, parent, range_start, range_end
+        );
+        -- 부모가 아닌 새 파티션에 직접 넣는다: 행이 옮겨질 뿐 키는 그대로다
+        EXECUTE format(
+            'INSERT INTO %I SELECT * FROM %I WHERE %I >= %L AND %I < %L',
+            partition_name, default_name, date_column, range_start, date_column, range_end
+        );
+        EXECUTE format(
+            'DELETE FROM %I WHERE %I >= %L AND %I < %L',
+            default_name, date_column, range_start, date_column, range_end
+        );
+        EXECUTE format('ALTER TABLE %I ATTACH PARTITION %I DEFAULT', parent, default_name);
+    ELSE
+        EXECUTE format(
+            'CREATE TABLE %I PARTITION OF %I FOR VALUES FROM (%L) TO (%L)',
+            partition_name, parent, range_start, range_end
+        );
+    END IF;
+
+    RETURN partition_name;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION create_year_partition(TEXT, INTEGER) IS '연도 범위 파티션 생성 (기본 파티션의 해당 연도 행 이동)';
+
+-- ------------------------------------------------------------
+-- 업무 키 전역 유일성: 키 테이블 동기화 트리거 함수
+-- 트리거 인자: 키 테이블, 키 컬럼, 날짜 컬럼
+-- ------------------------------------------------------------
+CREATE OR REPLACE FUNCTION sync_partition_keys()
+RETURNS TRIGGER AS $$
+DECLARE
+    key_table TEXT := TG_ARGV[0];
+    key_column TEXT := TG_ARGV[1];
+    date_column TEXT := TG_ARGV[2];
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        EXECUTE format(
+            'DELETE FROM %I k USING old_rows o WHERE k.%I = o.%I',
+            key_table, key_column, key_column
+        );
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        EXECUTE format(
+            'INSERT INTO %I (%I, %I) SELECT %I, %I FROM new_rows',
+            key_table, key_column, date_column, key_column, date_column
+        );
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+COMMENT ON FUNCTION sync_partition_keys() IS '파티션 테이블 업무 키를 키 테이블에 반영 (전역 유일성)';
+
+-- 의존 뷰는 테이블 교체 후 다시 생성
+DROP VIEW IF EXISTS v_project_execution_rate;
+DROP VIEW IF EXISTS v_publication_stats;
+
+-- ------------------------------------------------------------
+-- execution_records
+-- ------------------------------------------------------------
+ALTER TABLE execution_records RENAME TO execution_records_unpartitioned;
+ALTER SEQUENCE execution_records_id_seq OWNED BY NONE;
+
+CREATE TABLE execution_records (
+    id BIGINT NOT NULL DEFAULT nextval('execution_records_id_seq'),
+    execution_id VARCHAR(50) NOT NULL,
+    project_id BIGINT NOT NULL,
+    execution_date DATE NOT NULL,
+    expense_category VARCHAR(100) NOT NULL,
+    amount BIGINT NOT NULL,
+    status VARCHAR(20) NOT NULL CHECK (status IN ('집행완료', '처리중')),
+    description TEXT,
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    upload_batch_id BIGINT REFERENCES upload_history(id) ON DELETE SET NULL
+) PARTITION BY RANGE (execution_date);
+
+CREATE TABLE execution_records_default PARTITION OF execution_records DEFAULT;
+
+DO $$
+DECLARE
+    y INTEGER;
+BEGIN
+    FOR y IN
+        SELECT generate_series(
+            COALESCE(MIN(EXTRACT(YEAR FROM execution_date))::INTEGER, EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER),
+            EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER + 1
+        )
+        FROM execution_records_unpartitioned
+    LOOP
+        PERFORM create_year_partition('execution_records', y);
+    END LOOP;
+END $$;
+
+INSERT INTO execution_records SELECT * FROM execution_records_unpartitioned;
+DROP TABLE execution_records_unpartitioned;
+ALTER SEQUENCE execution_records_id_seq OWNED BY execution_records.id;
+
+ALTER TABLE execution_records ADD CONSTRAINT execution_records_pkey PRIMARY KEY (id, execution_date);
+ALTER TABLE execution_records ADD CONSTRAINT uq_execution_id_date UNIQUE (execution_id, execution_date);
+ALTER TABLE execution_records ADD CONSTRAINT fk_execution_project
+    FOREIGN KEY (project_id) REFERENCES research_projects(id) ON DELETE CASCADE;
+
+CREATE INDEX idx_exec_date ON execution_records(execution_date);
+CREATE INDEX idx_exec_status ON execution_records(status);
+CREATE INDEX idx_exec_project_amount ON execution_records(project_id) INCLUDE (amount);
+CREATE INDEX idx_exec_category_amount ON execution_records(expense_category) INCLUDE (amount);
+CREATE INDEX idx_exec_upload_batch ON execution_records(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+
+CREATE TABLE execution_record_keys (
+    execution_id VARCHAR(50) PRIMARY KEY,
+    execution_date DATE NOT NULL
+);
+INSERT INTO execution_record_keys SELECT execution_id, execution_date FROM execution_records;
+
+CREATE TRIGGER trg_execution_record_keys_insert
+    AFTER INSERT ON execution_records REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_partition_keys('execution_record_keys', 'execution_id', 'execution_date');
+CREATE TRIGGER trg_execution_record_keys_update
+    AFTER UPDATE ON execution_records REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_partition_keys('execution_record_keys', 'execution_id', 'execution_date');
+CREATE TRIGGER trg_execution_record_keys_delete
+    AFTER DELETE ON execution_records REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_partition_keys('execution_record_keys', 'execution_id', 'execution_date');
+
+COMMENT ON TABLE execution_record_keys IS '집행ID 전역 유일성 (파티션된 execution_records의 키, 트리거로 동기화)';
+
+COMMENT ON TABLE execution_records IS '연구비 상세 집행 내역 (집행일자 연도별 파티션)';
+COMMENT ON COLUMN execution_records.execution_id IS '집행ID (예: T2301001)';
+
+-- ------------------------------------------------------------
+-- publications
+-- ------------------------------------------------------------
+-- publication_authors(20261019000500)의 FK는 id만 참조하므로 제거한다.
+-- 논문 삭제 시 연결 행 삭제는 Django(on_delete=CASCADE)와
+-- manage_partitions detach가 담당한다.
+ALTER TABLE IF EXISTS publication_authors DROP CONSTRAINT IF EXISTS fk_pub_author_publication;
+
+ALTER TABLE publications RENAME TO publications_unpartitioned;
+ALTER SEQUENCE publications_id_seq OWNED BY NONE;
+
+CREATE TABLE publications (
+    id BIGINT NOT NULL DEFAULT nextval('publications_id_seq'),
+    publication_id VARCHAR(50) NOT NULL,
+    publication_date DATE NOT NULL,
+    college VARCHAR(100) NOT NULL,
+    department VARCHAR(100) NOT NULL,
+    title TEXT NOT NULL,
+    first_author VARCHAR(100) NOT NULL,
+    co_authors TEXT,
+    journal_name VARCHAR(255) NOT NULL,
+    journal_grade VARCHAR(20),
+    impact_factor NUMERIC(5,2),
+    project_linked VARCHAR(1) CHECK (project_linked IN ('Y', 'N')),
+    created_at TIMESTAMP NOT NULL DEFAULT NOW(),
+    upload_batch_id BIGINT REFERENCES upload_history(id) ON DELETE SET NULL
+) PARTITION BY RANGE (publication_date);
+
+CREATE TABLE publications_default PARTITION OF publications DEFAULT;
+
+DO $$
+DECLARE
+    y INTEGER;
+BEGIN
+    FOR y IN
+        SELECT generate_series(
+            COALESCE(MIN(EXTRACT(YEAR FROM publication_date))::INTEGER, EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER),
+            EXTRACT(YEAR FROM CURRENT_DATE)::INTEGER + 1
+        )
+        FROM publications_unpartitioned
+    LOOP
+        PERFORM create_year_partition('publications', y);
+    END LOOP;
+END $$;
+
+INSERT INTO publications SELECT * FROM publications_unpartitioned;
+DROP TABLE publications_unpartitioned;
+ALTER SEQUENCE publications_id_seq OWNED BY publications.id;
+
+ALTER TABLE publications ADD CONSTRAINT publications_pkey PRIMARY KEY (id, publication_date);
+ALTER TABLE publications ADD CONSTRAINT uq_publication_id_date UNIQUE (publication_id, publication_date);
+
+CREATE INDEX idx_pub_date ON publications(publication_date);
+CREATE INDEX idx_pub_college_dept ON publications(college, department);
+CREATE INDEX idx_pub_first_author ON publications(first_author);
+CREATE INDEX idx_pub_dept_date ON publications(department, publication_date);
+CREATE INDEX idx_pub_grade_if ON publications(journal_grade) INCLUDE (impact_factor);
+CREATE INDEX idx_pub_upload_batch ON publications(upload_batch_id) WHERE upload_batch_id IS NOT NULL;
+CREATE INDEX idx_pub_year_expr
+    ON publications ((EXTRACT(YEAR FROM publication_date)), college, department, journal_grade)
+    INCLUDE (impact_factor, project_linked);
+
+CREATE TABLE publication_keys (
+    publication_id VARCHAR(50) PRIMARY KEY,
+    publication_date DATE NOT NULL
+);
+INSERT INTO publication_keys SELECT publication_id, publication_date FROM publications;
+
+CREATE TRIGGER trg_publication_keys_insert
+    AFTER INSERT ON publications REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_partition_keys('publication_keys', 'publication_id', 'publication_date');
+CREATE TRIGGER trg_publication_keys_update
+    AFTER UPDATE ON publications REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_partition_keys('publication_keys', 'publication_id', 'publication_date');
+CREATE TRIGGER trg_publication_keys_delete
+    AFTER DELETE ON publications REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION sync_partition_keys('publication_keys', 'publication_id', 'publication_date');
+
+COMMENT ON TABLE publication_keys IS '논문ID 전역 유일성 (파티션된 publications의 키, 트리거로 동기화)';
+
+-- 검색 인덱스 (20261019000400_publication_search.sql 적용 시)
+DO $$
+BEGIN
+    IF to_regproc('publication_search_vector') IS NOT NULL THEN
+        CREATE INDEX idx_pub_search
+            ON publications
+            USING GIN (publication_search_vector(title, first_author, journal_name));
+    END IF;
+END $$;
+
+COMMENT ON TABLE publications IS '논문 게재 목록 및 성과 (게재일 연도별 파티션)';
+
+-- ------------------------------------------------------------
+-- 뷰 재생성 (20251102000000_initial_schema.sql과 동일)
+-- ------------------------------------------------------------
+CREATE OR REPLACE VIEW v_project_execution_rate AS
+SELECT
+    p.id,
+    p.project_number,
+    p.project_name,
+    p.principal_investigator,
+    p.department,
+    p.funding_agency,
+    p.total_budget,
+    COALESCE(SUM(e.amount), 0) AS total_executed,
+    CASE
+        WHEN p.total_budget > 0 THEN
+            ROUND((COALESCE(SUM(e.amount), 0)::NUMERIC / p.total_budget * 100), 2)
+        ELSE 0
+    END AS execution_rate_percent
+FROM research_projects p
+LEFT JOIN execution_records e ON p.id = e.project_id
+GROUP BY p.id, p.project_number, p.project_name, p.principal_investigator, p.department, p.funding_agency, p.total_budget;
+
+COMMENT ON VIEW v_project_execution_rate IS '연구 과제별 집행률 계산 뷰';
+
+CREATE OR REPLACE VIEW v_publication_stats AS
+SELECT
+    EXTRACT(YEAR FROM publication_date)::INTEGER AS publication_year,
+    college,
+    department,
+    journal_grade,
+    COUNT(*) AS publication_count,
+    AVG(impact_factor) AS avg_impact_factor,
+    COUNT(*) FILTER (WHERE project_linked = 'Y') AS project_linked_count
+FROM publications
+GROUP BY EXTRACT(YEAR FROM publication_date), college, department, journal_grade;
+
+COMMENT ON VIEW v_publication_stats IS '논문 게재 통계 뷰';
+
+COMMIT;
+
+ANALYZE execution_records;
+ANALYZE publications;